@@ -5,3 +5,7 @@ class AdminDashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admin_dashboard'
     verbose_name = 'Admin Dashboard'
+    
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import admin_dashboard.signals  # noqa
@@ -0,0 +1,54 @@
+"""
+Refresh Dashboard Stats Management Command
+
+Rebuilds the dashboard stats snapshots (see zenithedge.stats_snapshot) so
+page loads read precomputed counters instead of computing them.
+
+Usage:
+    python manage.py refresh_dashboard_stats [--months 6 12]
+
+Cron Setup (every minute):
+    * * * * * cd /home/username/zenithedge_trading_hub && python manage.py refresh_dashboard_stats >> logs/cron.log 2>&1
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_dashboard.stats import ADMIN_OVERVIEW, build_admin_overview
+from signals.dashboard_stats import (
+    MAX_TRACK_RECORD_MONTHS, SIGNAL_DASHBOARD, TRACK_RECORD, build_signal_dashboard, build_track_record,
+)
+from zenithedge.stats_snapshot import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Rebuild cached dashboard statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            nargs='+',
+            default=[6],
+            help='Track record periods to rebuild (default: 6)'
+        )
+
+    def handle(self, *args, **options):
+        builders = [
+            (ADMIN_OVERVIEW, build_admin_overview),
+            (SIGNAL_DASHBOARD, build_signal_dashboard),
+        ]
+        for months in options['months']:
+            months = max(1, min(months, MAX_TRACK_RECORD_MONTHS))
+            builders.append((f'{TRACK_RECORD}:{months}', lambda months=months: build_track_record(months)))
+
+        for name, builder in builders:
+            started = time.perf_counter()
+            try:
+                refresh_snapshot(name, builder)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"❌ {name}: {e}"))
+                continue
+            self.stdout.write(f"📊 {name} rebuilt in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        self.stdout.write(self.style.SUCCESS("✅ Dashboard stats refreshed"))
@@ -0,0 +1,114 @@
+"""
+Startup Audit Management Command
+
+Measures the cold start of passenger_wsgi.application in a fresh
+interpreter: import time and peak RSS against the configured budget, an
+``-X importtime`` breakdown by package, and heavy libraries that were
+imported at startup (see zenithedge.startup_audit).
+
+Usage:
+    python manage.py startup_audit [--top 20] [--repeat 3]
+    python manage.py startup_audit --check   # exit 1 when over budget (CI)
+
+Budgets:
+    STARTUP_IMPORT_BUDGET_MS / STARTUP_RSS_BUDGET_MB settings, or
+    --budget-ms / --budget-rss-mb
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from zenithedge.startup_audit import check_budget, group_by_package, import_chain, measure_startup
+
+
+class Command(BaseCommand):
+    help = 'Audit import time and memory of the WSGI application cold start'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            default='passenger_wsgi',
+            help='Module defining the WSGI application (default: passenger_wsgi)'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Packages to list in the breakdown (default: 20)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Timed runs; the fastest is checked against the budget (default: 3)'
+        )
+        parser.add_argument(
+            '--budget-ms',
+            type=float,
+            help='Import time budget (default: STARTUP_IMPORT_BUDGET_MS)'
+        )
+        parser.add_argument(
+            '--budget-rss-mb',
+            type=float,
+            help='Peak RSS budget (default: STARTUP_RSS_BUDGET_MB)'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with an error when the budget is exceeded'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the report as JSON'
+        )
+
+    def handle(self, *args, **options):
+        target = options['target']
+
+        try:
+            runs = [measure_startup(target) for _ in range(max(1, options['repeat']))]
+            profile = measure_startup(target, importtime=True)
+        except Exception as e:
+            raise CommandError(f"Startup probe failed: {e}")
+
+        best = min(runs, key=lambda run: run['import_ms'])
+        packages = group_by_package(profile['records'])
+        violations = check_budget(best, options['budget_ms'], options['budget_rss_mb'])
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'target': target,
+                'import_ms': round(best['import_ms'], 1),
+                'rss_mb': round(best['rss_mb'], 1),
+                'heavy_modules': best['heavy_modules'],
+                'packages': {name: {**entry, 'ms': round(entry['ms'], 1)} for name, entry in packages.items()},
+                'violations': violations,
+            }, indent=2))
+        else:
+            self._print_report(target, best, profile, packages, options['top'])
+
+        if violations:
+            message = "Startup over budget: " + '; '.join(violations)
+            if options['check']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(f"⚠️  {message}"))
+        elif not options['json']:
+            self.stdout.write(self.style.SUCCESS("✅ Startup within budget"))
+
+    def _print_report(self, target, best, profile, packages, top):
+        self.stdout.write(f"🚀 Cold start of {target}.application")
+        self.stdout.write(f"⏱️  Import time: {best['import_ms']:.0f}ms")
+        self.stdout.write(f"💾 Peak RSS: {best['rss_mb']:.1f}MB")
+        self.stdout.write("")
+        self.stdout.write("📦 Import time by package (self time, -X importtime):")
+        for name, entry in list(packages.items())[:top]:
+            kind = 'project' if entry['project'] else 'library'
+            self.stdout.write(f"   {name:<28} {entry['ms']:>8.1f}ms  {entry['modules']:>4} modules  ({kind})")
+
+        if profile['heavy_modules']:
+            self.stdout.write("")
+            self.stdout.write(self.style.WARNING("🐢 Heavy modules imported at startup:"))
+            for name in profile['heavy_modules']:
+                chain = import_chain(profile['records'], name)
+                self.stdout.write(f"   {name} <- {' <- '.join(chain) or '?'}")
@@ -0,0 +1,23 @@
+"""
+Signal handlers that mark the admin control panel counters stale
+
+Tables without a receiver here are picked up when the snapshot TTL expires.
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .stats import ADMIN_OVERVIEW
+from signals.performance import performance_recomputed
+from zenithedge.stats_snapshot import mark_stale_on_commit
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+@receiver(post_save, sender='signals.Signal')
+@receiver(post_delete, sender='signals.Signal')
+@receiver(post_save, sender='signals.StrategyPerformance')
+@receiver(post_delete, sender='signals.StrategyPerformance')
+@receiver(performance_recomputed)  # bulk writes send no post_save
+def invalidate_admin_overview(sender, **kwargs):
+    mark_stale_on_commit(ADMIN_OVERVIEW)
@@ -0,0 +1,208 @@
+"""
+Admin Dashboard Statistics
+Builds the admin control panel counters as one stats snapshot
+(see zenithedge.stats_snapshot) using one conditional aggregate per table.
+"""
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from bot.models import BotConversation
+from signals.models import Signal, StrategyPerformance, SessionRule, RiskControl, TradeJournalEntry
+from zenithedge.stats_snapshot import get_snapshot
+try:
+    from propcoach.models import PropChallenge, FirmTemplate
+except ImportError:
+    PropChallenge = None
+    FirmTemplate = None
+try:
+    from zenithmentor.models import ApprenticeProfile, Scenario, SimulationRun, SkillBadge
+except ImportError:
+    ApprenticeProfile = None
+    Scenario = None
+    SimulationRun = None
+    SkillBadge = None
+try:
+    from zennews.models import NewsArticle, MarketSentiment
+except ImportError:
+    NewsArticle = None
+    MarketSentiment = None
+try:
+    from support.models import SupportTicket
+except ImportError:
+    SupportTicket = None
+
+ADMIN_OVERVIEW = 'admin_overview'
+
+
+def _counts(model, **filters):
+    """COUNT(*) plus one filtered count per keyword, in a single query"""
+    if model is None:
+        return {'total': 0, **{name: 0 for name in filters}}
+    return model.objects.aggregate(
+        total=Count('pk'),
+        **{name: Count('pk', filter=condition) for name, condition in filters.items()}
+    )
+
+
+def build_admin_overview():
+    """
+    Compute every admin_dashboard counter
+
+    Returns:
+        Dict of template values (JSON-serializable)
+    """
+    now = timezone.now()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = now - timedelta(days=7)
+
+    # ===== USER STATISTICS =====
+    user_filters = {
+        'active': Q(last_login__gte=week_start),
+        'new_today': Q(date_joined__gte=today_start),
+        'new_week': Q(date_joined__gte=week_start),
+        'staff': Q(is_staff=True),
+    }
+    has_email_verified = hasattr(CustomUser, 'email_verified')
+    if has_email_verified:
+        user_filters['verified'] = Q(is_active=True, email_verified=True)
+    users = _counts(CustomUser, **user_filters)
+
+    # ===== SIGNAL STATISTICS =====
+    signals = _counts(
+        Signal,
+        # Signals marked allowed and not blocked by risk controls
+        active=Q(is_allowed=True, is_risk_blocked=False),
+        # Use received_at (webhook receipt) as signal timestamp
+        today=Q(received_at__gte=today_start),
+        # Pending = not allowed yet
+        pending=Q(is_allowed=False),
+        # Executed/settled signals are those with an outcome
+        executed=Q(outcome__in=['win', 'loss']),
+        wins=Q(outcome='win'),
+        losses=Q(outcome='loss'),
+        risk_blocks_today=Q(is_risk_blocked=True, received_at__gte=today_start),
+    )
+    settled = signals['wins'] + signals['losses']
+    win_rate = (signals['wins'] / settled * 100) if settled > 0 else 0
+
+    # ===== STRATEGY STATISTICS =====
+    try:
+        strategies = StrategyPerformance.objects.aggregate(
+            total=Count('pk'),
+            active=Count('pk', filter=Q(total_trades__gt=0)),
+            # Total P&L derived from strategy performance summary
+            total_pnl=Sum('total_pnl'),
+        )
+    except Exception:
+        strategies = {'total': 0, 'active': 0, 'total_pnl': None}
+    strategy_performance = [
+        {
+            'strategy_name': row['strategy_name'],
+            'win_rate': float(row['win_rate'] or 0),
+            'total_trades': row['total_trades'] or 0,
+            'total_pnl': float(row['total_pnl'] or 0),
+        }
+        for row in StrategyPerformance.objects.values('strategy_name').annotate(
+            win_rate=Avg('win_rate'),
+            total_trades=Sum('total_trades'),
+            total_pnl=Sum('total_pnl')
+        ).order_by('-win_rate')[:5]
+    ]
+
+    # ===== SESSION STATISTICS =====
+    session_filters = {'active': Q(is_blocked=False)}
+    has_created_at = hasattr(SessionRule, 'created_at')
+    if has_created_at:
+        session_filters['today'] = Q(created_at__gte=today_start)
+    sessions = _counts(SessionRule, **session_filters)
+
+    # ===== ZENITHMENTOR STATISTICS =====
+    simulations = _counts(SimulationRun, completed=Q(status='completed'), active=Q(status='in_progress'))
+    badges_awarded = (
+        SkillBadge.objects.aggregate(total=Count('badgeaward'))['total'] or 0
+    ) if SkillBadge else 0
+
+    # ===== PROPCOACH / BOT / NEWS / SUPPORT / JOURNAL =====
+    challenges = _counts(PropChallenge, active=Q(status='active'), passed=Q(status='passed'))
+    conversations = _counts(BotConversation, today=Q(created_at__gte=today_start))
+    news = _counts(NewsArticle, today=Q(published_at__gte=today_start))
+    tickets = _counts(
+        SupportTicket, open=Q(status='open'), pending=Q(status='pending'), resolved=Q(status='resolved')
+    )
+    journal = _counts(TradeJournalEntry, week=Q(created_at__gte=week_start))
+
+    return {
+        # User stats
+        'total_users': users['total'],
+        'active_users': users['active'],
+        'new_users_today': users['new_today'],
+        'new_users_week': users['new_week'],
+        'staff_users': users['staff'],
+        'verified_users': users['verified'] if has_email_verified else 0,
+
+        # Signal stats
+        'total_signals': signals['total'],
+        'active_signals': signals['active'],
+        'signals_today': signals['today'],
+        'signals_pending': signals['pending'],
+        'signals_executed': signals['executed'],
+        'winning_signals': signals['wins'],
+        'losing_signals': signals['losses'],
+        'total_pnl': float(strategies['total_pnl'] or 0),
+        'win_rate': win_rate,
+
+        # Strategy stats
+        'total_strategies': strategies['total'],
+        'active_strategies': strategies['active'],
+        'strategy_performance': strategy_performance,
+
+        # Session stats
+        'total_sessions': sessions['total'],
+        'active_sessions': sessions['active'],
+        'sessions_today': sessions['today'] if has_created_at else 0,
+
+        # Risk control
+        'risk_blocks_today': signals['risk_blocks_today'],
+        'active_risk_controls': RiskControl.objects.filter(is_active=True).count(),
+
+        # ZenithMentor
+        'total_apprentices': _counts(ApprenticeProfile)['total'],
+        'total_scenarios': _counts(Scenario)['total'],
+        'total_simulations': simulations['total'],
+        'completed_simulations': simulations['completed'],
+        'active_simulations': simulations['active'],
+        'total_badges_awarded': badges_awarded,
+
+        # PropCoach
+        'total_challenges': challenges['total'],
+        'active_challenges': challenges['active'],
+        'passed_challenges': challenges['passed'],
+        'prop_firms': _counts(FirmTemplate)['total'],
+
+        # Bot
+        'total_conversations': conversations['total'],
+        'conversations_today': conversations['today'],
+
+        # News
+        'total_news': news['total'],
+        'news_today': news['today'],
+        'sentiment_records': _counts(MarketSentiment)['total'],
+
+        # Support
+        'total_tickets': tickets['total'],
+        'open_tickets': tickets['open'],
+        'pending_tickets': tickets['pending'],
+        'resolved_tickets': tickets['resolved'],
+
+        # Journal
+        'total_journal_entries': journal['total'],
+        'journal_entries_week': journal['week'],
+    }
+
+
+def admin_overview_snapshot():
+    """The admin control panel counters (cached; see zenithedge.stats_snapshot)"""
+    return get_snapshot(ADMIN_OVERVIEW, build_admin_overview)
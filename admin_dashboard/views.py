@@ -6,14 +6,13 @@ from django.shortcuts import render, redirect
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.db.models import Count, Sum, Avg, Q
+from django.db.models import Count, Sum, Q
 from django.utils import timezone
 from datetime import timedelta
-from decimal import Decimal
 
+from .stats import admin_overview_snapshot
 from accounts.models import CustomUser
 from signals.models import Signal, StrategyPerformance, SessionRule, RiskControl, TradeJournalEntry
-from bot.models import BotConversation
 try:
     from analytics.models import BacktestResult
 except ImportError:
@@ -45,100 +44,8 @@ except ImportError:
 def admin_dashboard(request):
     """Main admin control panel."""
     
-    # Time ranges
-    now = timezone.now()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = now - timedelta(days=7)
-    month_start = now - timedelta(days=30)
-    
-    # ===== USER STATISTICS =====
-    total_users = CustomUser.objects.count()
-    active_users = CustomUser.objects.filter(last_login__gte=week_start).count()
-    new_users_today = CustomUser.objects.filter(date_joined__gte=today_start).count()
-    new_users_week = CustomUser.objects.filter(date_joined__gte=week_start).count()
-    staff_users = CustomUser.objects.filter(is_staff=True).count()
-    verified_users = CustomUser.objects.filter(is_active=True, email_verified=True).count() if hasattr(CustomUser, 'email_verified') else 0
-    
-    # ===== SIGNAL STATISTICS =====
-    total_signals = Signal.objects.count()
-    # Signals marked allowed and not blocked by risk controls
-    active_signals = Signal.objects.filter(is_allowed=True, is_risk_blocked=False).count()
-    # Use received_at (webhook receipt) as signal timestamp
-    signals_today = Signal.objects.filter(received_at__gte=today_start).count()
-    # Pending = not allowed yet
-    signals_pending = Signal.objects.filter(is_allowed=False).count()
-    # Executed/settled signals are those with an outcome
-    signals_executed = Signal.objects.filter(outcome__in=['win', 'loss']).count()
-    
-    # Signal performance
-    winning_signals = Signal.objects.filter(outcome='win').count()
-    losing_signals = Signal.objects.filter(outcome='loss').count()
-    # Total P&L derived from strategy performance summary (if available)
-    try:
-        total_pnl = StrategyPerformance.objects.aggregate(total=Sum('total_pnl'))['total'] or Decimal('0.00')
-    except Exception:
-        total_pnl = Decimal('0.00')
-    
-    win_rate = (winning_signals / (winning_signals + losing_signals) * 100) if (winning_signals + losing_signals) > 0 else 0
-    
-    # ===== STRATEGY STATISTICS =====
-    total_strategies = StrategyPerformance.objects.count()
-    active_strategies = StrategyPerformance.objects.filter(total_trades__gt=0).count()
-    strategy_performance = StrategyPerformance.objects.values('strategy_name').annotate(
-        win_rate=Avg('win_rate'),
-        total_trades=Sum('total_trades'),
-        total_pnl=Sum('total_pnl')
-    ).order_by('-win_rate')[:5]
-    
-    # ===== SESSION STATISTICS =====
-    total_sessions = SessionRule.objects.count()
-    # Active sessions = non-blocked sessions
-    active_sessions = SessionRule.objects.filter(is_blocked=False).count()
-    sessions_today = SessionRule.objects.filter(created_at__gte=today_start).count() if hasattr(SessionRule, 'created_at') else 0
-    
-    # ===== RISK CONTROL =====
-    # Use received_at instead of created_at for Signal model
-    risk_blocks_today = Signal.objects.filter(
-        is_risk_blocked=True,
-        received_at__gte=today_start
-    ).count()
-    
-    active_risk_controls = RiskControl.objects.filter(is_active=True).count()
-    
-    # ===== ZENITHMENTOR STATISTICS =====
-    total_apprentices = ApprenticeProfile.objects.count() if ApprenticeProfile else 0
-    total_scenarios = Scenario.objects.count() if Scenario else 0
-    total_simulations = SimulationRun.objects.count() if SimulationRun else 0
-    completed_simulations = SimulationRun.objects.filter(status='completed').count() if SimulationRun else 0
-    active_simulations = SimulationRun.objects.filter(status='in_progress').count() if SimulationRun else 0
-    total_badges_awarded = SkillBadge.objects.annotate(
-        award_count=Count('badgeaward')
-    ).aggregate(total=Sum('award_count'))['total'] or 0 if SkillBadge else 0
-    
-    # ===== PROPCOACH STATISTICS =====
-    total_challenges = PropChallenge.objects.count() if PropChallenge else 0
-    active_challenges = PropChallenge.objects.filter(status='active').count() if PropChallenge else 0
-    passed_challenges = PropChallenge.objects.filter(status='passed').count() if PropChallenge else 0
-    prop_firms = FirmTemplate.objects.count() if FirmTemplate else 0
-    
-    # ===== BOT STATISTICS =====
-    total_conversations = BotConversation.objects.count()
-    conversations_today = BotConversation.objects.filter(created_at__gte=today_start).count()
-    
-    # ===== NEWS STATISTICS =====
-    total_news = NewsArticle.objects.count() if NewsArticle else 0
-    news_today = NewsArticle.objects.filter(published_at__gte=today_start).count() if NewsArticle else 0
-    sentiment_records = MarketSentiment.objects.count() if MarketSentiment else 0
-    
-    # ===== SUPPORT STATISTICS =====
-    total_tickets = SupportTicket.objects.count() if SupportTicket else 0
-    open_tickets = SupportTicket.objects.filter(status='open').count() if SupportTicket else 0
-    pending_tickets = SupportTicket.objects.filter(status='pending').count() if SupportTicket else 0
-    resolved_tickets = SupportTicket.objects.filter(status='resolved').count() if SupportTicket else 0
-    
-    # ===== JOURNAL STATISTICS =====
-    total_journal_entries = TradeJournalEntry.objects.count()
-    journal_entries_week = TradeJournalEntry.objects.filter(created_at__gte=week_start).count()
+    # Counters come from a shared stats snapshot (see admin_dashboard.stats)
+    snapshot = admin_overview_snapshot()
     
     # ===== RECENT ACTIVITY =====
     # Order recent signals by receipt time
@@ -155,71 +62,8 @@ def admin_dashboard(request):
     }
     
     context = {
-        # User stats
-        'total_users': total_users,
-        'active_users': active_users,
-        'new_users_today': new_users_today,
-        'new_users_week': new_users_week,
-        'staff_users': staff_users,
-        'verified_users': verified_users,
-        
-        # Signal stats
-        'total_signals': total_signals,
-        'active_signals': active_signals,
-        'signals_today': signals_today,
-        'signals_pending': signals_pending,
-        'signals_executed': signals_executed,
-        'winning_signals': winning_signals,
-        'losing_signals': losing_signals,
-        'total_pnl': total_pnl,
-        'win_rate': win_rate,
-        
-        # Strategy stats
-        'total_strategies': total_strategies,
-        'active_strategies': active_strategies,
-        'strategy_performance': strategy_performance,
-        
-        # Session stats
-        'total_sessions': total_sessions,
-        'active_sessions': active_sessions,
-        'sessions_today': sessions_today,
-        
-        # Risk control
-        'risk_blocks_today': risk_blocks_today,
-        'active_risk_controls': active_risk_controls,
-        
-        # ZenithMentor
-        'total_apprentices': total_apprentices,
-        'total_scenarios': total_scenarios,
-        'total_simulations': total_simulations,
-        'completed_simulations': completed_simulations,
-        'active_simulations': active_simulations,
-        'total_badges_awarded': total_badges_awarded,
-        
-        # PropCoach
-        'total_challenges': total_challenges,
-        'active_challenges': active_challenges,
-        'passed_challenges': passed_challenges,
-        'prop_firms': prop_firms,
-        
-        # Bot
-        'total_conversations': total_conversations,
-        'conversations_today': conversations_today,
-        
-        # News
-        'total_news': total_news,
-        'news_today': news_today,
-        'sentiment_records': sentiment_records,
-        
-        # Support
-        'total_tickets': total_tickets,
-        'open_tickets': open_tickets,
-        'pending_tickets': pending_tickets,
-        'resolved_tickets': resolved_tickets,
-        
-        # Journal
-        'total_journal_entries': total_journal_entries,
-        'journal_entries_week': journal_entries_week,
+        **snapshot.value,
+        **snapshot.context(),
         
         # Recent activity
         'recent_signals': recent_signals,
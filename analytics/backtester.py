@@ -1,23 +1,107 @@
 """
 Trade Backtester Module
 Simulates historical trading based on saved Signal data and outcomes.
+
+Signals, their latest journal outcome, evaluation and AI score are read
+in one query into NumPy arrays; equity, drawdown and per-strategy stats
+are then computed with array operations instead of a Python loop with a
+journal lookup per signal.
 """
+from __future__ import annotations
 
-from decimal import Decimal
-from datetime import datetime, timedelta
+import random
+from datetime import datetime
 from typing import Dict, List, Optional
-from django.db.models import Q
+
+from django.db.models import OuterRef, Q, Subquery
+
+from zenithedge.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+# Outcome codes used in the simulation arrays
+WIN = 1
+LOSS = -1
+BREAKEVEN = 0
+
+OUTCOME_NAMES = {WIN: 'win', LOSS: 'loss', BREAKEVEN: 'breakeven'}
+
+
+class SignalArrays:
+    """
+    Column arrays for a set of signals, ordered by received_at.
+
+    Numeric columns are NumPy arrays; text and datetime columns are object
+    arrays so they can be masked the same way.
+    """
+
+    FIELDS = ('id', 'received_at', 'symbol', 'side', 'strategy', 'price', 'sl', 'tp',
+              'ai_score', 'journal_outcome', 'evaluation_passed', 'evaluation_overridden')
+
+    def __init__(self, rows):
+        columns = list(zip(*rows)) if rows else [()] * len(self.FIELDS)
+        data = dict(zip(self.FIELDS, columns))
+
+        self.id = np.array(data['id'], dtype=np.int64)
+        self.received_at = np.array(data['received_at'], dtype=object)
+        self.symbol = np.array(data['symbol'], dtype=object)
+        self.side = np.array(data['side'], dtype=object)
+        self.strategy = np.array(data['strategy'], dtype=object)
+        self.sl = np.array([float(v) for v in data['sl']], dtype=float)
+        self.tp = np.array([float(v) for v in data['tp']], dtype=float)
+        self.price = np.array([np.nan if v is None else float(v) for v in data['price']], dtype=float)
+        self.ai_score = np.array([v or 0 for v in data['ai_score']], dtype=np.int64)
+        self.outcome = self._outcomes(
+            np.array(data['journal_outcome'], dtype=object),
+            np.array(data['evaluation_passed'], dtype=object),
+            np.array(data['evaluation_overridden'], dtype=object),
+        )
+
+    def __len__(self):
+        return len(self.id)
+
+    @staticmethod
+    def _outcomes(journal, passed, overridden):
+        """
+        Trade outcome per signal:
+        1. journal outcome (green = win, red = loss, breakeven/pending = breakeven)
+        2. blocked and not overridden by the evaluation = loss
+           (validates the blocking system)
+        3. otherwise a simulated 50% win rate
+        """
+        outcome = np.zeros(len(journal), dtype=np.int8)
+        journal_win = journal == 'green'
+        journal_loss = journal == 'red'
+        journal_even = (journal == 'breakeven') | (journal == 'pending')
+        from_journal = journal_win | journal_loss | journal_even
+
+        blocked = ~from_journal & (passed == False) & (overridden == False)  # noqa: E712 (None = no evaluation)
+        simulated = ~from_journal & ~blocked
+
+        outcome[journal_win] = WIN
+        outcome[journal_loss | blocked] = LOSS
+        # Default: simulate 50% win rate if no data available
+        draws = np.array([random.random() for _ in range(int(simulated.sum()))])
+        outcome[simulated] = np.where(draws > 0.5, WIN, LOSS)
+        return outcome
+
+    def entries(self):
+        """Entry prices; without a price, estimate from SL/TP"""
+        is_buy = np.array([str(side).upper() == 'BUY' for side in self.side], dtype=bool)
+        # BUY: entry just above SL; SELL: entry just below SL
+        estimated = np.where(is_buy, self.sl + (self.tp - self.sl) * 0.1, self.sl - (self.sl - self.tp) * 0.1)
+        return np.where(np.isnan(self.price), estimated, self.price)
 
 
 class TradeBacktester:
     """
     Backtest trading strategies using historical signal data.
     """
-    
+
     def __init__(self, user, initial_balance=10000, risk_per_trade=0.01, slippage=0.0001):
         """
         Initialize backtester.
-        
+
         Args:
             user: User instance
             initial_balance: Starting capital (default: 10000)
@@ -28,7 +112,53 @@ class TradeBacktester:
         self.starting_capital = initial_balance
         self.risk_per_trade = risk_per_trade
         self.slippage = slippage
-    
+
+    def _base_query(
+        self,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        filters: Optional[Dict] = None
+    ) -> Q:
+        """Signal filter for everything except the strategy"""
+        filters = filters or {}
+
+        # Build query for signals
+        query = Q(user=self.user)
+
+        if symbol:
+            query &= Q(symbol__icontains=symbol)
+
+        if timeframe:
+            query &= Q(timeframe__icontains=timeframe)
+
+        if start_date:
+            query &= Q(received_at__gte=start_date)
+
+        if end_date:
+            query &= Q(received_at__lte=end_date)
+
+        # Apply additional filters
+        min_score = filters.get('min_score')
+        if min_score:
+            query &= Q(ai_score__ai_score__gte=min_score)
+
+        return query
+
+    def _fetch(self, query: Q) -> SignalArrays:
+        """Load matching signals with journal outcome, evaluation and score in one query"""
+        from signals.models import Signal, TradeJournalEntry
+
+        latest_journal = TradeJournalEntry.objects.filter(signal=OuterRef('pk')).order_by('-id')
+        rows = Signal.objects.filter(query).annotate(
+            journal_outcome=Subquery(latest_journal.values('outcome')[:1])
+        ).order_by('received_at', 'id').values_list(
+            'id', 'received_at', 'symbol', 'side', 'strategy', 'price', 'sl', 'tp',
+            'ai_score__ai_score', 'journal_outcome', 'evaluation__passed', 'evaluation__is_overridden'
+        )
+        return SignalArrays(list(rows))
+
     def run(
         self,
         strategy: str,
@@ -40,7 +170,7 @@ class TradeBacktester:
     ) -> Dict:
         """
         Run backtest with specified parameters.
-        
+
         Args:
             strategy: Strategy name to filter signals
             symbol: Symbol filter (None = all symbols)
@@ -48,158 +178,100 @@ class TradeBacktester:
             start_date: Start date for backtest
             end_date: End date for backtest
             filters: Additional filters (min_score, ignore_news, etc.)
-        
+
         Returns:
             Dict with backtest results including stats and trade details
         """
-        from signals.models import Signal, TradeJournalEntry
-        
-        filters = filters or {}
-        
-        # Build query for signals
-        query = Q(user=self.user)
-        
+        query = self._base_query(symbol, timeframe, start_date, end_date, filters)
         if strategy:
             query &= Q(strategy__icontains=strategy)
-        
-        if symbol:
-            query &= Q(symbol__icontains=symbol)
-        
-        if timeframe:
-            query &= Q(timeframe__icontains=timeframe)
-        
-        if start_date:
-            query &= Q(received_at__gte=start_date)
-        
-        if end_date:
-            query &= Q(received_at__lte=end_date)
-        
-        # Apply additional filters
-        min_score = filters.get('min_score')
-        if min_score:
-            query &= Q(ai_score__ai_score__gte=min_score)
-        
-        # Get signals matching criteria
-        signals = Signal.objects.filter(query).select_related(
-            'ai_score', 'evaluation'
-        ).order_by('received_at')
-        
+
         # Run backtest simulation
-        results = self._simulate_trades(signals, filters)
-        
-        return results
-    
-    def _simulate_trades(self, signals, filters: Dict) -> Dict:
+        return self._simulate_trades(self._fetch(query))
+
+    def _simulate_trades(self, signals: SignalArrays, mask: Optional[np.ndarray] = None) -> Dict:
         """
         Simulate trades based on signals and calculate statistics.
+
+        Args:
+            signals: Fetched signal arrays
+            mask: Boolean selection of signals to trade (default: all)
         """
-        from signals.models import TradeJournalEntry
-        
-        equity = self.starting_capital
-        peak_equity = equity
-        max_drawdown = 0.0
-        
-        equity_curve = [{'date': 'Start', 'equity': float(equity)}]
-        trade_details = []
-        
-        winning_trades = 0
-        losing_trades = 0
-        total_profit = 0.0
-        total_loss = 0.0
-        rr_ratios = []
-        
-        for idx, signal in enumerate(signals):
-            # Determine trade outcome
-            outcome = self._get_trade_outcome(signal)
-            
-            if outcome is None:
-                continue  # Skip signals with no determinable outcome
-            
-            # Calculate position size (1% risk)
-            risk_amount = equity * self.risk_per_trade
-            
-            # Calculate R (risk in pips/points)
-            sl = float(signal.sl)
-            tp = float(signal.tp)
-            
-            # If price is None, estimate entry point based on SL/TP
-            if signal.price is None:
-                if signal.side.upper() == 'BUY':
-                    # For BUY: entry is typically just above SL
-                    entry = sl + (tp - sl) * 0.1
-                else:
-                    # For SELL: entry is typically just below SL
-                    entry = sl - (sl - tp) * 0.1
-            else:
-                entry = float(signal.price)
-            
-            risk_pips = abs(entry - sl)
-            reward_pips = abs(tp - entry)
-            
-            if risk_pips == 0:
-                continue  # Invalid signal
-            
-            rr_ratio = reward_pips / risk_pips
-            
-            # Calculate P&L based on outcome
-            if outcome == 'win':
-                pnl = risk_amount * rr_ratio
-                # Apply slippage (reduces profit)
-                pnl *= (1 - self.slippage)
-                total_profit += pnl
-                winning_trades += 1
-            elif outcome == 'loss':
-                pnl = -risk_amount
-                # Apply slippage (increases loss slightly)
-                pnl *= (1 + self.slippage)
-                total_loss += abs(pnl)
-                losing_trades += 1
-            else:  # breakeven
-                pnl = 0
-            
-            # Update equity
-            equity += pnl
-            
-            # Track drawdown
-            if equity > peak_equity:
-                peak_equity = equity
-            
-            drawdown = ((peak_equity - equity) / peak_equity) * 100 if peak_equity > 0 else 0
-            max_drawdown = max(max_drawdown, drawdown)
-            
-            # Add to equity curve
-            equity_curve.append({
-                'date': signal.received_at.strftime('%Y-%m-%d %H:%M') if signal.received_at else f'Trade {idx+1}',
-                'equity': float(equity)
-            })
-            
-            # Store trade details
-            trade_details.append({
-                'id': signal.id,
-                'date': signal.received_at.strftime('%Y-%m-%d %H:%M') if signal.received_at else 'Unknown',
-                'symbol': signal.symbol,
-                'side': signal.side,
-                'entry': entry,
-                'sl': sl,
-                'tp': tp,
-                'rr': round(rr_ratio, 2),
-                'outcome': outcome,
-                'pnl': round(pnl, 2),
-                'equity': round(equity, 2),
-                'ai_score': signal.ai_score.ai_score if signal.ai_score else 0,
-                'strategy': signal.strategy,
-            })
-            
-            if outcome in ['win', 'loss']:
-                rr_ratios.append(rr_ratio)
-        
+        selected = np.ones(len(signals), dtype=bool) if mask is None else mask.copy()
+
+        entry = signals.entries()
+        risk_pips = np.abs(entry - signals.sl)
+        reward_pips = np.abs(signals.tp - entry)
+
+        # Skip invalid signals (no risk)
+        selected &= risk_pips != 0
+        idx = np.flatnonzero(selected)
+
+        outcome = signals.outcome[idx]
+        rr = reward_pips[idx] / risk_pips[idx]
+        is_win = outcome == WIN
+        is_loss = outcome == LOSS
+
+        # P&L per trade in units of risk: wins earn R:R less slippage,
+        # losses lose 1R plus slippage, breakevens are flat
+        r_multiple = np.where(is_win, rr * (1 - self.slippage), np.where(is_loss, -(1 + self.slippage), 0.0))
+
+        # Each trade risks a fixed fraction of the equity before it
+        growth = 1 + self.risk_per_trade * r_multiple
+        equity = self.starting_capital * np.cumprod(growth)
+        equity_before = np.concatenate(([float(self.starting_capital)], equity[:-1]))
+        pnl = equity_before * self.risk_per_trade * r_multiple
+
+        # Track drawdown from the running peak (including starting capital)
+        peak = np.maximum.accumulate(np.concatenate(([float(self.starting_capital)], equity)))[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
+        max_drawdown = float(max(drawdown.max(initial=0.0), 0.0))
+
+        winning_trades = int(is_win.sum())
+        losing_trades = int(is_loss.sum())
+        total_profit = float(pnl[is_win].sum())
+        total_loss = float(np.abs(pnl[is_loss]).sum())
+        decided_rr = rr[is_win | is_loss]
+        ending_equity = float(equity[-1]) if len(equity) else float(self.starting_capital)
+
+        dates = [
+            received_at.strftime('%Y-%m-%d %H:%M') if received_at else None
+            for received_at in signals.received_at[idx]
+        ]
+
+        equity_curve = [{'date': 'Start', 'equity': float(self.starting_capital)}]
+        equity_curve.extend(
+            {'date': date or f'Trade {n + 1}', 'equity': float(value)}
+            for n, (date, value) in enumerate(zip(dates, equity))
+        )
+
+        trade_details = [
+            {
+                'id': int(signals.id[i]),
+                'date': date or 'Unknown',
+                'symbol': signals.symbol[i],
+                'side': signals.side[i],
+                'entry': float(entry[i]),
+                'sl': float(signals.sl[i]),
+                'tp': float(signals.tp[i]),
+                'rr': round(float(rr[n]), 2),
+                'outcome': OUTCOME_NAMES[int(outcome[n])],
+                'pnl': round(float(pnl[n]), 2),
+                'equity': round(float(equity[n]), 2),
+                'ai_score': int(signals.ai_score[i]),
+                'strategy': signals.strategy[i],
+            }
+            for n, (i, date) in enumerate(zip(idx, dates))
+        ]
+
         # Calculate statistics
         total_trades = winning_trades + losing_trades
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        avg_rr = sum(rr_ratios) / len(rr_ratios) if rr_ratios else 0
+        avg_rr = float(decided_rr.mean()) if len(decided_rr) else 0
         profit_factor = (total_profit / total_loss) if total_loss > 0 else 0
-        total_pnl = equity - self.starting_capital
-        
+        total_pnl = ending_equity - self.starting_capital
+
         return {
             'total_trades': total_trades,
             'winning_trades': winning_trades,
@@ -210,50 +282,35 @@ class TradeBacktester:
             'profit_factor': round(profit_factor, 2),
             'total_pnl': round(total_pnl, 2),
             'starting_capital': self.starting_capital,
-            'ending_equity': round(equity, 2),
+            'ending_equity': round(ending_equity, 2),
             'equity_curve': equity_curve,
             'trade_details': trade_details,
+            'strategy_stats': self._strategy_stats(signals.strategy[idx], is_win, is_loss, pnl),
         }
-    
-    def _get_trade_outcome(self, signal) -> Optional[str]:
-        """
-        Determine trade outcome from journal or signal data.
-        Returns: 'win', 'loss', 'breakeven', or None
-        """
-        from signals.models import TradeJournalEntry
-        
-        # Check if there's a journal entry
-        try:
-            journal = TradeJournalEntry.objects.get(signal=signal)
-            if journal.outcome:
-                if journal.outcome == 'green':
-                    return 'win'
-                elif journal.outcome == 'red':
-                    return 'loss'
-                elif journal.outcome in ['breakeven', 'pending']:
-                    return 'breakeven'
-        except TradeJournalEntry.DoesNotExist:
-            pass
-        
-        # Fallback: use signal status if available
-        if hasattr(signal, 'status'):
-            if signal.status == 'hit_tp':
-                return 'win'
-            elif signal.status == 'hit_sl':
-                return 'loss'
-        
-        # Fallback: use evaluation result
-        if hasattr(signal, 'evaluation'):
-            # If signal was blocked, assume it would have been a loss
-            # (validates the blocking system)
-            if not signal.evaluation.passed and not signal.evaluation.is_overridden:
-                return 'loss'
-        
-        # Default: simulate 50% win rate if no data available
-        # In production, you might want to be more sophisticated
-        import random
-        return 'win' if random.random() > 0.5 else 'loss'
-    
+
+    @staticmethod
+    def _strategy_stats(strategies, is_win, is_loss, pnl) -> List[Dict]:
+        """Per-strategy trade counts, win rate and P&L of a simulated run"""
+        if not len(strategies):
+            return []
+        names, group = np.unique(strategies.astype(str), return_inverse=True)
+        wins = np.bincount(group, weights=is_win, minlength=len(names))
+        losses = np.bincount(group, weights=is_loss, minlength=len(names))
+        pnl_sum = np.bincount(group, weights=pnl, minlength=len(names))
+        decided = wins + losses
+
+        return [
+            {
+                'strategy': str(name),
+                'total_trades': int(decided[g]),
+                'winning_trades': int(wins[g]),
+                'losing_trades': int(losses[g]),
+                'win_rate': round(float(wins[g] / decided[g] * 100), 2) if decided[g] else 0,
+                'total_pnl': round(float(pnl_sum[g]), 2),
+            }
+            for g, name in enumerate(names)
+        ]
+
     def compare_strategies(
         self,
         strategies: List[str],
@@ -263,17 +320,28 @@ class TradeBacktester:
     ) -> List[Dict]:
         """
         Compare multiple strategies side by side.
+
+        Signals for all strategies are fetched once; each strategy is then
+        simulated on its own slice of the arrays.
         """
+        query = self._base_query(symbol, start_date=start_date, end_date=end_date)
+        strategy_query = Q()
+        for strategy in strategies:
+            if strategy:
+                strategy_query |= Q(strategy__icontains=strategy)
+            else:
+                strategy_query = Q()
+                break
+        signals = self._fetch(query & strategy_query)
+
+        names = [str(name).lower() for name in signals.strategy]
         results = []
-        
+
         for strategy in strategies:
-            result = self.run(
-                strategy=strategy,
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date
-            )
+            needle = (strategy or '').lower()
+            mask = np.array([needle in name for name in names], dtype=bool)
+            result = self._simulate_trades(signals, mask)
             result['strategy'] = strategy
             results.append(result)
-        
+
         return results
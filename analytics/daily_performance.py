@@ -0,0 +1,207 @@
+"""
+Set-based daily performance aggregation
+
+Fills DailyPerformanceCache for every user and day in a date range with
+four GROUP BY (user, day) queries - signal counts/scores, winning
+strategies, winning sessions and journal pips - and writes the rows with
+bulk upserts, instead of ~10 queries plus an update_or_create per user
+per day.
+"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from multiprocessing import get_context
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import connection, connections
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT ... ON CONFLICT statement
+BULK_BATCH_SIZE = 500
+
+# total_pips precision (SQLite sums decimals as floats)
+PIPS_QUANTUM = Decimal('0.01')
+
+UPDATE_FIELDS = [
+    'total_signals', 'allowed_signals', 'rejected_signals',
+    'win_count', 'loss_count', 'breakeven_count',
+    'total_pips', 'avg_ai_score', 'best_strategy', 'best_session',
+    'updated_at',
+]
+
+
+def _day_bounds(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """Aware [start of start_date, start of the day after end_date)"""
+    start = timezone.make_aware(datetime.combine(start_date, time.min))
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+    return start, end
+
+
+def _best_by_day(queryset, field: str) -> Dict[Tuple[int, date], str]:
+    """(user_id, day) -> value of ``field`` with the most wins (ties: first by name)"""
+    rows = queryset.values('user_id', 'day', field).annotate(count=Count('id')).order_by()
+    best = {}
+    for row in rows:
+        key = (row['user_id'], row['day'])
+        value = row[field] or ''
+        current = best.get(key)
+        if current is None or row['count'] > current[1] or (row['count'] == current[1] and value < current[0]):
+            best[key] = (value, row['count'])
+    return {key: value for key, (value, _count) in best.items()}
+
+
+def compute_daily_performance(start_date: date, end_date: date,
+                              user_ids: Sequence[int]) -> List:
+    """
+    Build (unsaved) DailyPerformanceCache rows for ``user_ids`` x days
+
+    Every user gets a row for every day in [start_date, end_date], with
+    zeros on days without activity (as the per-user command did).
+
+    Returns:
+        List of DailyPerformanceCache instances
+    """
+    from analytics.models import DailyPerformanceCache
+    from signals.models import Signal, TradeJournalEntry
+
+    start, end = _day_bounds(start_date, end_date)
+    user_ids = list(user_ids)
+
+    signals = Signal.objects.filter(
+        user_id__in=user_ids, received_at__gte=start, received_at__lt=end
+    ).annotate(day=TruncDate('received_at'))
+
+    counts = {
+        (row['user_id'], row['day']): row
+        for row in signals.values('user_id', 'day').annotate(
+            total=Count('id'),
+            allowed=Count('id', filter=Q(is_allowed=True)),
+            rejected=Count('id', filter=Q(is_allowed=False)),
+            wins=Count('id', filter=Q(outcome='win')),
+            losses=Count('id', filter=Q(outcome='loss')),
+            breakevens=Count('id', filter=Q(outcome='breakeven')),
+            avg_ai_score=Avg('ai_score__ai_score'),
+        ).order_by()
+    }
+
+    winners = signals.filter(outcome='win')
+    best_strategy = _best_by_day(winners, 'strategy')
+    best_session = _best_by_day(winners, 'session')
+
+    pips = {
+        (row['user_id'], row['day']): row['pips']
+        for row in TradeJournalEntry.objects.filter(
+            user_id__in=user_ids, created_at__gte=start, created_at__lt=end, pips__isnull=False
+        ).annotate(day=TruncDate('created_at'))
+        .values('user_id', 'day').annotate(pips=Sum('pips')).order_by()
+    }
+
+    entries = []
+    day = start_date
+    while day <= end_date:
+        for user_id in user_ids:
+            key = (user_id, day)
+            row = counts.get(key, {})
+            entries.append(DailyPerformanceCache(
+                user_id=user_id,
+                date=day,
+                total_signals=row.get('total', 0),
+                allowed_signals=row.get('allowed', 0),
+                rejected_signals=row.get('rejected', 0),
+                win_count=row.get('wins', 0),
+                loss_count=row.get('losses', 0),
+                breakeven_count=row.get('breakevens', 0),
+                total_pips=Decimal(pips.get(key) or 0).quantize(PIPS_QUANTUM),
+                avg_ai_score=row.get('avg_ai_score') or 0.0,
+                best_strategy=best_strategy.get(key, ''),
+                best_session=best_session.get(key, ''),
+            ))
+        day += timedelta(days=1)
+    return entries
+
+
+def upsert_daily_performance(entries: List) -> int:
+    """Insert or update DailyPerformanceCache rows on (user, date)"""
+    from analytics.models import DailyPerformanceCache
+
+    if not entries:
+        return 0
+    options = {}
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = ['user', 'date']
+    # MySQL has no conflict target; the (user, date) unique key applies
+    DailyPerformanceCache.objects.bulk_create(
+        entries,
+        batch_size=BULK_BATCH_SIZE,
+        update_conflicts=True,
+        update_fields=UPDATE_FIELDS,
+        **options
+    )
+    return len(entries)
+
+
+def aggregate_range(start_date: date, end_date: date, user_ids: Sequence[int]) -> int:
+    """Compute and upsert one date range; returns rows written"""
+    return upsert_daily_performance(compute_daily_performance(start_date, end_date, user_ids))
+
+
+def _aggregate_chunk(args) -> Tuple[date, date, int]:
+    start_date, end_date, user_ids = args
+    return start_date, end_date, aggregate_range(start_date, end_date, user_ids)
+
+
+def date_chunks(start_date: date, end_date: date, chunk_days: int) -> Iterable[Tuple[date, date]]:
+    """Split [start_date, end_date] into consecutive ranges of ``chunk_days``"""
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end + timedelta(days=1)
+
+
+def aggregate_daily_performance(start_date: date, end_date: date, user_ids: Sequence[int],
+                                chunk_days: int = 7, workers: int = 1,
+                                progress: Optional[Callable] = None) -> int:
+    """
+    Fill DailyPerformanceCache for a date range, optionally in parallel
+
+    Args:
+        start_date: First day (inclusive)
+        end_date: Last day (inclusive)
+        user_ids: Users to aggregate
+        chunk_days: Days per chunk (bounds memory and transaction size)
+        workers: Worker processes for chunks (1 = in-process)
+        progress: Called with (chunk_start, chunk_end, rows) after each chunk
+
+    Returns:
+        Number of rows written
+    """
+    user_ids = list(user_ids)
+    chunks = [(start, end, user_ids) for start, end in date_chunks(start_date, end_date, max(1, chunk_days))]
+    total = 0
+
+    if workers <= 1 or len(chunks) <= 1:
+        results = (_aggregate_chunk(chunk) for chunk in chunks)
+        pool = None
+    else:
+        # Children must not inherit the parent's open database connections
+        connections.close_all()
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('fork'))
+        results = pool.map(_aggregate_chunk, chunks)
+
+    try:
+        for start, end, rows in results:
+            total += rows
+            if progress:
+                progress(start, end, rows)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    logger.info(f"Aggregated {total} daily performance rows in {len(chunks)} chunks")
+    return total
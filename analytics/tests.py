@@ -1,3 +1,307 @@
-from django.test import TestCase
+import random
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from signals.testing import insert_signal
+
+from .backtester import BREAKEVEN, LOSS, WIN, SignalArrays, TradeBacktester
+from .daily_performance import aggregate_daily_performance, compute_daily_performance
+from .models import DailyPerformanceCache
+
+
+START = datetime(2025, 3, 3, 8, 0, tzinfo=dt_timezone.utc)
+
+
+def signal_row(n, journal=None, passed=None, overridden=None, side='BUY', strategy='Trend',
+               price=1.1000, sl=1.0950, tp=1.1100, ai_score=None):
+    """Row in SignalArrays.FIELDS order"""
+    return (
+        n, START + timedelta(hours=n), 'EURUSD', side, strategy, price, sl, tp,
+        ai_score, journal, passed, overridden,
+    )
+
+
+def legacy_simulation(rows, starting_capital=10000, risk_per_trade=0.01, slippage=0.0001):
+    """The per-signal loop the array simulation replaced"""
+    equity = starting_capital
+    peak_equity = equity
+    max_drawdown = 0.0
+    equity_curve = [equity]
+    winning_trades = losing_trades = 0
+    total_profit = total_loss = 0.0
+
+    for _, _, _, side, _, price, sl, tp, _, journal, passed, overridden in rows:
+        if journal == 'green':
+            outcome = 'win'
+        elif journal == 'red':
+            outcome = 'loss'
+        elif journal in ('breakeven', 'pending'):
+            outcome = 'breakeven'
+        elif passed is not None and not passed and not overridden:
+            outcome = 'loss'
+        else:
+            outcome = 'win' if random.random() > 0.5 else 'loss'
+
+        risk_amount = equity * risk_per_trade
+        if price is None:
+            entry = sl + (tp - sl) * 0.1 if side.upper() == 'BUY' else sl - (sl - tp) * 0.1
+        else:
+            entry = price
+        risk_pips = abs(entry - sl)
+        if risk_pips == 0:
+            continue
+        rr_ratio = abs(tp - entry) / risk_pips
+
+        if outcome == 'win':
+            pnl = risk_amount * rr_ratio * (1 - slippage)
+            total_profit += pnl
+            winning_trades += 1
+        elif outcome == 'loss':
+            pnl = -risk_amount * (1 + slippage)
+            total_loss += abs(pnl)
+            losing_trades += 1
+        else:
+            pnl = 0
+
+        equity += pnl
+        peak_equity = max(peak_equity, equity)
+        drawdown = ((peak_equity - equity) / peak_equity) * 100 if peak_equity > 0 else 0
+        max_drawdown = max(max_drawdown, drawdown)
+        equity_curve.append(equity)
+
+    return {
+        'winning_trades': winning_trades,
+        'losing_trades': losing_trades,
+        'max_drawdown': round(max_drawdown, 2),
+        'profit_factor': round(total_profit / total_loss, 2) if total_loss > 0 else 0,
+        'ending_equity': round(equity, 2),
+        'equity_curve': equity_curve,
+    }
+
+
+class SignalArraysTestCase(SimpleTestCase):
+    """Test outcome mapping of fetched signal rows"""
+
+    def test_journal_outcomes_map_to_trade_outcomes(self):
+        """green = win, red = loss, breakeven and pending = breakeven"""
+        signals = SignalArrays([
+            signal_row(1, journal='green'),
+            signal_row(2, journal='red'),
+            signal_row(3, journal='breakeven'),
+            signal_row(4, journal='pending'),
+        ])
+
+        self.assertEqual(list(signals.outcome), [WIN, LOSS, BREAKEVEN, BREAKEVEN])
+
+    def test_blocked_evaluation_is_a_loss(self):
+        """Blocked and not overridden = loss; the journal still wins over the evaluation"""
+        with mock.patch('analytics.backtester.random.random', return_value=0.9):
+            signals = SignalArrays([
+                signal_row(1, passed=False, overridden=False),
+                signal_row(2, passed=False, overridden=True),
+                signal_row(3, passed=True, overridden=False),
+                signal_row(4),
+                signal_row(5, journal='green', passed=False, overridden=False),
+            ])
+
+        self.assertEqual(list(signals.outcome), [LOSS, WIN, WIN, WIN, WIN])
+
+
+class TradeBacktesterTestCase(SimpleTestCase):
+    """Test the array simulation against the per-signal loop"""
+
+    def setUp(self):
+        self.backtester = TradeBacktester(user=None)
+
+    def _rows(self, count=300):
+        rng = random.Random(11)
+        journals = [None, None, 'green', 'red', 'breakeven', 'pending']
+        evaluations = [(None, None), (False, False), (False, True), (True, False)]
+        rows = []
+        for n in range(count):
+            side = rng.choice(['BUY', 'SELL'])
+            entry = 1.1 + rng.uniform(-0.01, 0.01)
+            risk, reward = rng.uniform(0.001, 0.005), rng.uniform(0.001, 0.01)
+            sl, tp = (entry - risk, entry + reward) if side == 'BUY' else (entry + risk, entry - reward)
+            price = rng.choice([entry, None, sl])  # None estimates the entry, sl has no risk
+            passed, overridden = rng.choice(evaluations)
+            rows.append(signal_row(
+                n, journal=rng.choice(journals), passed=passed, overridden=overridden, side=side,
+                strategy=rng.choice(['Trend', 'SMC Breakout', 'smc']), price=price, sl=sl, tp=tp,
+            ))
+        return rows
+
+    def test_matches_legacy_loop_on_fixed_seed(self):
+        """Equity curve, drawdown and profit factor equal the old loop's"""
+        rows = self._rows()
+
+        random.seed(42)
+        expected = legacy_simulation(rows)
+        random.seed(42)
+        result = self.backtester._simulate_trades(SignalArrays(rows))
+
+        self.assertEqual(result['winning_trades'], expected['winning_trades'])
+        self.assertEqual(result['losing_trades'], expected['losing_trades'])
+        self.assertEqual(result['max_drawdown'], expected['max_drawdown'])
+        self.assertEqual(result['profit_factor'], expected['profit_factor'])
+        self.assertEqual(result['ending_equity'], expected['ending_equity'])
+        curve = [point['equity'] for point in result['equity_curve']]
+        self.assertEqual(len(curve), len(expected['equity_curve']))
+        for value, legacy in zip(curve, expected['equity_curve']):
+            self.assertAlmostEqual(value, legacy, places=6)
+
+    def test_compare_strategies_masks_each_strategy(self):
+        """Each strategy is simulated on the signals whose name contains it"""
+        rows = [
+            signal_row(1, journal='green', strategy='Trend'),
+            signal_row(2, journal='red', strategy='SMC Breakout'),
+            signal_row(3, journal='green', strategy='smc'),
+            signal_row(4, journal='red', strategy='Trend Pullback'),
+        ]
+
+        with mock.patch.object(TradeBacktester, '_fetch', return_value=SignalArrays(rows)) as fetch:
+            results = self.backtester.compare_strategies(['trend', 'SMC', ''])
+
+        fetch.assert_called_once()
+        trades = {r['strategy']: [t['id'] for t in r['trade_details']] for r in results}
+        self.assertEqual(trades, {'trend': [1, 4], 'SMC': [2, 3], '': [1, 2, 3, 4]})
+        self.assertEqual([r['winning_trades'] for r in results], [1, 1, 2])
+
+
+def legacy_day(user_id, day):
+    """
+    The per-user, per-day numbers of the old aggregation command
+
+    Best strategy/session are returned as the set of names tied for the
+    most wins (the old query picked one of them in row order).
+    """
+    from django.db.models import Avg, Sum
+    from signals.models import Signal, TradeJournalEntry
+
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    end = datetime.combine(day, time.max, tzinfo=dt_timezone.utc)
+    signals = Signal.objects.filter(user_id=user_id, received_at__gte=start, received_at__lte=end)
+
+    def tied(field):
+        wins = Counter(signals.filter(outcome='win').values_list(field, flat=True))
+        top = max(wins.values(), default=0)
+        return {name or '' for name, count in wins.items() if count == top} or {''}
+
+    return {
+        'total_signals': signals.count(),
+        'allowed_signals': signals.filter(is_allowed=True).count(),
+        'rejected_signals': signals.filter(is_allowed=False).count(),
+        'win_count': signals.filter(outcome='win').count(),
+        'loss_count': signals.filter(outcome='loss').count(),
+        'breakeven_count': signals.filter(outcome='breakeven').count(),
+        'total_pips': TradeJournalEntry.objects.filter(
+            user_id=user_id, created_at__gte=start, created_at__lte=end, pips__isnull=False
+        ).aggregate(Sum('pips'))['pips__sum'] or Decimal('0.00'),
+        'avg_ai_score': signals.filter(ai_score__isnull=False).aggregate(
+            Avg('ai_score__ai_score')
+        )['ai_score__ai_score__avg'] or 0.0,
+        'best_strategy': tied('strategy'),
+        'best_session': tied('session'),
+    }
+
+
+class DailyPerformanceTestCase(TestCase):
+    """Test the grouped daily performance aggregation against the per-user queries"""
+
+    START = date(2025, 3, 3)
+    END = date(2025, 3, 9)
+
+    def setUp(self):
+        from accounts.models import CustomUser
+        from signals.models import TradeJournalEntry, TradeScore
+
+        self.users = [
+            CustomUser.objects.create_user(email=f'{name}@example.com', password='x')
+            for name in ('alice', 'bob', 'idle')
+        ]
+        active = self.users[:2]
+        rng = random.Random(5)
+
+        for n in range(160):
+            user = rng.choice(active)
+            received_at = datetime.combine(
+                self.START + timedelta(days=rng.randrange(7)), time(rng.randrange(24), rng.randrange(60)),
+                tzinfo=dt_timezone.utc,
+            )
+            signal = insert_signal(
+                user=user, symbol='EURUSD', timeframe='1h', side='buy', sl=1.09, tp=1.12, price=1.1,
+                confidence=70, strategy=rng.choice(['trend', 'smc', 'breakout']), regime='Trend',
+                session=rng.choice(['asian', 'london', 'newyork']), received_at=received_at,
+                is_allowed=rng.random() > 0.3, outcome=rng.choice(['win', 'loss', 'breakeven', 'pending']),
+            )
+            if rng.random() > 0.4:
+                TradeScore.objects.create(signal_id=signal.pk, ai_score=rng.randrange(101), version='test')
+            if rng.random() > 0.5:
+                entry = TradeJournalEntry.objects.create(
+                    user=user, decision='took', pips=Decimal(rng.randrange(-400, 400)) / 10
+                )
+                TradeJournalEntry.objects.filter(pk=entry.pk).update(created_at=received_at)
+
+        # Signals outside the range are ignored
+        insert_signal(
+            user=active[0], symbol='EURUSD', timeframe='1h', side='buy', sl=1.09, tp=1.12, confidence=70,
+            strategy='trend', regime='Trend', outcome='win',
+            received_at=datetime.combine(self.END + timedelta(days=1), time.min, tzinfo=dt_timezone.utc),
+        )
+
+    def test_matches_per_user_queries(self):
+        """Counts, pips and scores equal the old numbers; ties go to the first name"""
+        entries = compute_daily_performance(self.START, self.END, [u.pk for u in self.users])
+
+        self.assertEqual(len(entries), 7 * 3)
+        fields = ['total_signals', 'allowed_signals', 'rejected_signals', 'win_count', 'loss_count',
+                  'breakeven_count', 'total_pips']
+        for entry in entries:
+            legacy = legacy_day(entry.user_id, entry.date)
+            legacy['total_pips'] = Decimal(legacy['total_pips']).quantize(Decimal('0.01'))
+            for field in fields:
+                self.assertEqual(getattr(entry, field), legacy[field], (entry.user_id, entry.date, field))
+            self.assertAlmostEqual(entry.avg_ai_score, legacy['avg_ai_score'])
+            self.assertEqual(entry.best_strategy, min(legacy['best_strategy']))
+            self.assertEqual(entry.best_session, min(legacy['best_session']))
+
+        idle = [e for e in entries if e.user_id == self.users[2].pk]
+        self.assertEqual(len(idle), 7)
+        for entry in idle:
+            self.assertEqual(
+                (entry.total_signals, entry.win_count, entry.total_pips, entry.avg_ai_score, entry.best_strategy),
+                (0, 0, Decimal('0.00'), 0.0, '')
+            )
+        self.assertTrue(any(len(legacy_day(e.user_id, e.date)['best_strategy']) > 1 for e in entries))
+
+    def test_chunked_backfill_upserts_every_day(self):
+        """A multi-day backfill in chunks writes one row per user and day, idempotently"""
+        user_ids = [u.pk for u in self.users]
+        chunks = []
+
+        written = aggregate_daily_performance(
+            self.START, self.END, user_ids, chunk_days=3, progress=lambda *chunk: chunks.append(chunk)
+        )
+        aggregate_daily_performance(self.START, self.END, user_ids, chunk_days=3)
+
+        self.assertEqual(written, 21)
+        self.assertEqual(
+            [(start, end) for start, end, _ in chunks],
+            [(date(2025, 3, 3), date(2025, 3, 5)), (date(2025, 3, 6), date(2025, 3, 8)),
+             (date(2025, 3, 9), date(2025, 3, 9))]
+        )
+        self.assertEqual(DailyPerformanceCache.objects.count(), 21)
+
+        expected = {
+            (e.user_id, e.date): (e.total_signals, e.win_count, e.total_pips, e.best_strategy)
+            for e in compute_daily_performance(self.START, self.END, user_ids)
+        }
+        stored = {
+            (row.user_id, row.date): (row.total_signals, row.win_count, row.total_pips, row.best_strategy)
+            for row in DailyPerformanceCache.objects.all()
+        }
+        self.assertEqual(stored, expected)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AutopsyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'autopsy'
+    
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import autopsy.signals  # noqa
@@ -9,10 +9,12 @@ Pipeline:
 
 NO external APIs. NO cloud costs. 100% local intelligence.
 """
+import json
 import logging
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Tuple, Optional
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from datetime import datetime
+from datetime import datetime, timedelta, timezone as dt_timezone
 
 from autopsy.insight_parser import InsightParser
 from autopsy.insight_scorer import InsightScorer
@@ -20,6 +22,12 @@ from autopsy.variation_engine import VariationEngine
 
 logger = logging.getLogger('autopsy')
 
+# News considered relevant to a bar (either side of its timestamp)
+NEWS_WINDOW = timedelta(hours=4)
+
+# Rows per bulk insert / per processing batch for NDJSON ingestion
+INGEST_BATCH_SIZE = 500
+
 
 class ZenithMarketAnalyst:
     """
@@ -56,68 +64,13 @@ class ZenithMarketAnalyst:
             # Step 2: Calculate insight index and component scores
             insight_index, score_breakdown = self.scorer.calculate_insight_index(parsed)
             
-            # Get quality label
-            quality_label = self.scorer.get_quality_label(insight_index)
-            
-            # Step 3: Generate natural language insight
-            insight_text, vocab_hash = self.variation_engine.generate_insight(parsed)
-            
-            # Step 4: Generate actionable suggestion
-            suggestion = self.variation_engine.generate_suggestion(parsed)
-            
-            # Step 5: Extract chart labels
-            chart_labels = self.parser.extract_chart_labels(parsed)
-            
-            # Step 6: Integrate news context (if available)
-            news_context = self._get_news_context(parsed)
-            
-            # Build complete insight object
-            insight_data = {
-                # Core identification
-                'symbol': parsed['symbol'],
-                'timeframe': parsed['timeframe'],
-                'timestamp': parsed['timestamp'],
-                
-                # Market metadata
-                'regime': parsed['regime'],
-                'structure': parsed['structure'],
-                'momentum': parsed['momentum'],
-                'volume_state': parsed['volume_state'],
-                'session': parsed['session'],
-                'expected_behavior': parsed['expected_behavior'],
-                'strength': parsed['strength'],
-                'risk_notes': parsed['risk_notes'],
-                
-                # AI-generated content
-                'insight_text': insight_text,
-                'suggestion': suggestion,
-                'insight_index': insight_index,
-                'quality_label': quality_label,
-                
-                # Scoring breakdown
-                'structure_clarity': score_breakdown['structure_clarity'],
-                'regime_stability': score_breakdown['regime_stability'],
-                'volume_quality': score_breakdown['volume_quality'],
-                'momentum_alignment': score_breakdown['momentum_alignment'],
-                'session_validity': score_breakdown['session_validity'],
-                'risk_level': score_breakdown['risk_level'],
-                
-                # News integration
-                'news_impact': news_context.get('impact', ''),
-                'news_context': news_context.get('context', ''),
-                
-                # Chart labels
-                'chart_labels': chart_labels,
-                
-                # Variation tracking
-                'vocabulary_hash': vocab_hash,
-                
-                # Raw data
-                'raw_metadata': parsed['raw_metadata'],
-            }
+            # Steps 3-6: Text, suggestion, chart labels and news context
+            insight_data = self._build_insight_data(
+                parsed, insight_index, score_breakdown, self._get_news_context(parsed)
+            )
             
             logger.info(f"Processed insight for {parsed['symbol']} {parsed['timeframe']}: "
-                       f"Index={insight_index}, Hash={vocab_hash[:8]}")
+                       f"Index={insight_index}, Hash={insight_data['vocabulary_hash'][:8]}")
             
             return insight_data
             
@@ -125,6 +78,70 @@ class ZenithMarketAnalyst:
             logger.error(f"Error processing bar: {e}", exc_info=True)
             raise
     
+    def _build_insight_data(self, parsed: Dict[str, Any], insight_index: int,
+                            score_breakdown: Dict[str, int], news_context: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Generate text for a parsed, scored bar and assemble the insight object
+        """
+        # Get quality label
+        quality_label = self.scorer.get_quality_label(insight_index)
+        
+        # Generate natural language insight
+        insight_text, vocab_hash = self.variation_engine.generate_insight(parsed)
+        
+        # Generate actionable suggestion
+        suggestion = self.variation_engine.generate_suggestion(parsed)
+        
+        # Extract chart labels
+        chart_labels = self.parser.extract_chart_labels(parsed)
+        
+        # Build complete insight object
+        insight_data = {
+            # Core identification
+            'symbol': parsed['symbol'],
+            'timeframe': parsed['timeframe'],
+            'timestamp': parsed['timestamp'],
+            
+            # Market metadata
+            'regime': parsed['regime'],
+            'structure': parsed['structure'],
+            'momentum': parsed['momentum'],
+            'volume_state': parsed['volume_state'],
+            'session': parsed['session'],
+            'expected_behavior': parsed['expected_behavior'],
+            'strength': parsed['strength'],
+            'risk_notes': parsed['risk_notes'],
+            
+            # AI-generated content
+            'insight_text': insight_text,
+            'suggestion': suggestion,
+            'insight_index': insight_index,
+            'quality_label': quality_label,
+            
+            # Scoring breakdown
+            'structure_clarity': score_breakdown['structure_clarity'],
+            'regime_stability': score_breakdown['regime_stability'],
+            'volume_quality': score_breakdown['volume_quality'],
+            'momentum_alignment': score_breakdown['momentum_alignment'],
+            'session_validity': score_breakdown['session_validity'],
+            'risk_level': score_breakdown['risk_level'],
+            
+            # News integration
+            'news_impact': news_context.get('impact', ''),
+            'news_context': news_context.get('context', ''),
+            
+            # Chart labels
+            'chart_labels': chart_labels,
+            
+            # Variation tracking
+            'vocabulary_hash': vocab_hash,
+            
+            # Raw data
+            'raw_metadata': parsed['raw_metadata'],
+        }
+        
+        return insight_data
+    
     def _get_news_context(self, metadata: Dict[str, Any]) -> Dict[str, str]:
         """
         Get relevant news context for this market moment
@@ -132,66 +149,83 @@ class ZenithMarketAnalyst:
         Integrates with zennews app
         """
         try:
-            from zennews.models import NewsEvent
-            from django.db.models import Q
-            from datetime import timedelta
-            
             symbol = metadata['symbol']
             timestamp = metadata['timestamp']
             
             # Get news within +/- 4 hours
-            time_window_start = timestamp - timedelta(hours=4)
-            time_window_end = timestamp + timedelta(hours=4)
-            
-            # Find relevant news
-            relevant_news = NewsEvent.objects.filter(
-                Q(impact_level__in=['high', 'medium']) &
-                Q(published_at__gte=time_window_start) &
-                Q(published_at__lte=time_window_end)
-            ).filter(
-                Q(headline__icontains=symbol[:3]) |  # Currency pair
-                Q(symbol__icontains=symbol[:3])
-            ).order_by('-impact_level', 'published_at')[:3]
-            
-            if not relevant_news:
-                return {'impact': 'none', 'context': ''}
-            
-            # Build context string
-            news_items = []
-            highest_impact = 'none'
-            
-            for news in relevant_news:
-                time_diff = (news.published_at - timestamp).total_seconds() / 60
-                
-                if abs(time_diff) < 60:  # Within 1 hour
-                    if time_diff > 0:
-                        time_str = f"in {int(time_diff)} minutes"
-                    else:
-                        time_str = f"{int(abs(time_diff))} minutes ago"
-                else:
-                    hours = abs(time_diff) / 60
-                    time_str = f"{int(hours)} hours ago" if time_diff < 0 else f"in {int(hours)} hours"
-                
-                news_items.append(f"{news.headline} {time_str}")
-                
-                if news.impact_level == 'high':
-                    highest_impact = 'high'
-                elif news.impact_level == 'medium' and highest_impact != 'high':
-                    highest_impact = 'medium'
-                elif highest_impact == 'none':
-                    highest_impact = 'low'
+            candidates = self._fetch_news(symbol, timestamp - NEWS_WINDOW, timestamp + NEWS_WINDOW)
             
-            context_text = ". ".join(news_items) if news_items else ""
-            
-            return {
-                'impact': highest_impact,
-                'context': context_text
-            }
+            return self._build_news_context(candidates, timestamp)
             
         except Exception as e:
             logger.warning(f"Could not fetch news context: {e}")
             return {'impact': '', 'context': ''}
     
+    def _fetch_news(self, symbol: str, start: datetime, end: datetime) -> list:
+        """
+        Medium/high impact news for ``symbol`` published in [start, end]
+        
+        One query on the symbol -> news index (pair, its currencies);
+        ordered by publication time, callers pick the relevant items.
+        """
+        from zennews.utils.symbol_index import related_news
+        
+        news = related_news(symbol, since=start, until=end, impact_levels=['high', 'medium'])
+        news.sort(key=lambda n: n.published_at or n.timestamp)
+        return news
+    
+    def _build_news_context(self, candidates: list, timestamp: datetime) -> Dict[str, str]:
+        """
+        Build the news context for a bar from pre-fetched candidates
+        
+        Keeps the 3 items within +/- 4 hours of the bar, ordered like the
+        original query (impact level descending, then publication time).
+        """
+        window_start = timestamp - NEWS_WINDOW
+        window_end = timestamp + NEWS_WINDOW
+        
+        relevant_news = [
+            n for n in candidates if window_start <= (n.published_at or n.timestamp) <= window_end
+        ]
+        # Stable sort keeps publication order within an impact level
+        relevant_news.sort(key=lambda n: n.impact_level, reverse=True)
+        relevant_news = relevant_news[:3]
+        
+        if not relevant_news:
+            return {'impact': 'none', 'context': ''}
+        
+        # Build context string
+        news_items = []
+        highest_impact = 'none'
+        
+        for news in relevant_news:
+            time_diff = ((news.published_at or news.timestamp) - timestamp).total_seconds() / 60
+            
+            if abs(time_diff) < 60:  # Within 1 hour
+                if time_diff > 0:
+                    time_str = f"in {int(time_diff)} minutes"
+                else:
+                    time_str = f"{int(abs(time_diff))} minutes ago"
+            else:
+                hours = abs(time_diff) / 60
+                time_str = f"{int(hours)} hours ago" if time_diff < 0 else f"in {int(hours)} hours"
+            
+            news_items.append(f"{news.headline} {time_str}")
+            
+            if news.impact_level == 'high':
+                highest_impact = 'high'
+            elif news.impact_level == 'medium' and highest_impact != 'high':
+                highest_impact = 'medium'
+            elif highest_impact == 'none':
+                highest_impact = 'low'
+        
+        context_text = ". ".join(news_items) if news_items else ""
+        
+        return {
+            'impact': highest_impact,
+            'context': context_text
+        }
+    
     def save_insight(self, insight_data: Dict[str, Any]) -> Any:
         """
         Save insight to database
@@ -218,6 +252,188 @@ class ZenithMarketAnalyst:
             logger.error(f"Error saving insight: {e}", exc_info=True)
             raise
     
+    def process_bars(self, rows: List[Tuple[int, Dict[str, Any]]]) -> Tuple[list, list]:
+        """
+        Batch version of process_bar for replays and symbol onboarding
+        
+        Bars are parsed, then scored together; news is fetched once per
+        (symbol, hour) and shared by every bar in that hour.
+        
+        Args:
+            rows: (row_number, raw_metadata) pairs
+            
+        Returns:
+            (processed, errors) - processed is a list of (row_number,
+            insight_data); errors is a list of {'row', 'error'} dicts
+        """
+        parsed_rows = []
+        errors = []
+        
+        for row, raw_metadata in rows:
+            try:
+                parsed_rows.append((row, self.parser.parse(raw_metadata)))
+            except Exception as e:
+                errors.append({'row': row, 'error': str(e)})
+        
+        scores = self.scorer.calculate_insight_index_batch([parsed for _, parsed in parsed_rows])
+        
+        news_by_hour = {}
+        processed = []
+        
+        for (row, parsed), (insight_index, score_breakdown) in zip(parsed_rows, scores):
+            try:
+                news_context = self._get_batched_news_context(parsed, news_by_hour)
+                processed.append((row, self._build_insight_data(
+                    parsed, insight_index, score_breakdown, news_context
+                )))
+            except Exception as e:
+                errors.append({'row': row, 'error': str(e)})
+        
+        return processed, errors
+    
+    def _get_batched_news_context(self, metadata: Dict[str, Any], cache: Dict) -> Dict[str, str]:
+        """
+        News context using one prefetch per (symbol, hour)
+        
+        The prefetch covers the hour plus the +/- 4 hour window, so every
+        bar in the hour finds its items in the shared candidate list.
+        """
+        try:
+            symbol = metadata['symbol']
+            timestamp = metadata['timestamp']
+            hour = timestamp.replace(minute=0, second=0, microsecond=0)
+            
+            key = (symbol, hour)
+            if key not in cache:
+                cache[key] = self._fetch_news(
+                    symbol, hour - NEWS_WINDOW, hour + timedelta(hours=1) + NEWS_WINDOW
+                )
+            
+            return self._build_news_context(cache[key], timestamp)
+            
+        except Exception as e:
+            logger.warning(f"Could not fetch news context: {e}")
+            return {'impact': '', 'context': ''}
+    
+    def save_insights(self, processed: List[Tuple[int, Dict[str, Any]]]) -> Tuple[list, list]:
+        """
+        Bulk-save processed bars
+        
+        Bars that already exist (same symbol, timeframe and timestamp) or
+        repeat within the batch are reported instead of saved.
+        
+        Args:
+            processed: (row_number, insight_data) pairs from process_bars
+            
+        Returns:
+            (created, errors) - created is a list of (row_number,
+            MarketInsight); errors is a list of {'row', 'error'} dicts
+        """
+        from autopsy.models import MarketInsight
+        
+        if not processed:
+            return [], []
+        
+        def bar_key(data):
+            timestamp = data['timestamp']
+            if timezone.is_naive(timestamp):
+                timestamp = timezone.make_aware(timestamp, dt_timezone.utc)
+            return data['symbol'], data['timeframe'], timestamp
+        
+        timestamps = [bar_key(data)[2] for _, data in processed]
+        existing = set(
+            MarketInsight.objects.filter(
+                symbol__in={data['symbol'] for _, data in processed},
+                timeframe__in={data['timeframe'] for _, data in processed},
+                timestamp__gte=min(timestamps),
+                timestamp__lte=max(timestamps),
+            ).values_list('symbol', 'timeframe', 'timestamp')
+        )
+        
+        rows = []
+        objects = []
+        errors = []
+        
+        for row, data in processed:
+            key = bar_key(data)
+            if key in existing:
+                errors.append({'row': row, 'error': f"Insight already exists for {key[0]} {key[1]} {key[2].isoformat()}"})
+                continue
+            existing.add(key)
+            
+            # quality_label is not a model field (used only for API responses)
+            objects.append(MarketInsight(**{k: v for k, v in data.items() if k != 'quality_label'}))
+            rows.append(row)
+        
+        try:
+            with transaction.atomic():
+                objects = MarketInsight.objects.bulk_create(objects, batch_size=INGEST_BATCH_SIZE)
+            created = list(zip(rows, objects))
+        except IntegrityError:
+            # A concurrent writer got there first - save row by row to report which
+            created = []
+            for row, obj in zip(rows, objects):
+                try:
+                    with transaction.atomic():
+                        obj.save()
+                    created.append((row, obj))
+                except IntegrityError as e:
+                    errors.append({'row': row, 'error': str(e)})
+        
+        logger.info(f"Bulk saved {len(created)} insights ({len(errors)} rejected)")
+        
+        return created, errors
+    
+    def ingest_ndjson(self, lines: Iterable, batch_size: int = INGEST_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Process and save an NDJSON stream of bar metadata (one JSON object per line)
+        
+        Lines are handled in batches of ``batch_size`` so arbitrarily long
+        streams run in bounded memory. Errors never abort the stream; they
+        are reported per line.
+        
+        Returns:
+            {'received', 'created', 'failed', 'errors': [{'row', 'error'}]}
+        """
+        summary = {'received': 0, 'created': 0, 'failed': 0, 'errors': []}
+        batch = []
+        
+        def flush():
+            processed, errors = self.process_bars(batch)
+            created, save_errors = self.save_insights(processed)
+            errors = sorted(errors + save_errors, key=lambda e: e['row'])
+            summary['created'] += len(created)
+            summary['failed'] += len(errors)
+            summary['errors'].extend(errors)
+            batch.clear()
+        
+        for row, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            line = line.strip()
+            if not line:
+                continue
+            
+            summary['received'] += 1
+            try:
+                raw_metadata = json.loads(line)
+                if not isinstance(raw_metadata, dict):
+                    raise ValueError("Expected a JSON object")
+            except ValueError as e:
+                summary['failed'] += 1
+                summary['errors'].append({'row': row, 'error': f"Invalid JSON: {e}"})
+                continue
+            
+            batch.append((row, raw_metadata))
+            if len(batch) >= batch_size:
+                flush()
+        
+        if batch:
+            flush()
+        
+        summary['errors'].sort(key=lambda e: e['row'])
+        return summary
+    
     def get_latest_insights(self, symbol: str = None, timeframe: str = None, 
                            limit: int = 50) -> list:
         """
@@ -11,9 +11,11 @@ Calculates Insight Index (0-100) based on:
 
 NO external APIs - pure mathematical scoring
 """
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 from datetime import datetime, time
 
+import numpy as np
+
 
 class InsightScorer:
     """
@@ -67,6 +69,38 @@ class InsightScorer:
         
         return int(total), breakdown
     
+    COMPONENTS = (
+        'structure_clarity', 'regime_stability', 'volume_quality',
+        'momentum_alignment', 'session_validity', 'risk_level',
+    )
+    
+    def calculate_insight_index_batch(self, metadata_list: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, int]]]:
+        """
+        Score many bars at once (batch ingestion)
+        
+        Component scores come from the same rules as calculate_insight_index;
+        the weighted sum is done as one integer matrix product.
+        
+        Returns:
+            List of (total_score, breakdown_dict), in input order
+        """
+        if not metadata_list:
+            return []
+        
+        scorers = [getattr(self, f'_score_{name}') for name in self.COMPONENTS]
+        matrix = np.array(
+            [[score(metadata) for score in scorers] for metadata in metadata_list],
+            dtype=np.int64,
+        )
+        weights = np.array([self.weights[name] for name in self.COMPONENTS], dtype=np.int64)
+        # Components and weights are integers, so floor division matches int(total / 100)
+        totals = (matrix @ weights) // 100
+        
+        return [
+            (int(total), dict(zip(self.COMPONENTS, map(int, row))))
+            for total, row in zip(totals, matrix)
+        ]
+    
     def _score_structure_clarity(self, metadata: Dict[str, Any]) -> int:
         """
         Score structural clarity (0-100)
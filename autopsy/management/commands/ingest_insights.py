@@ -0,0 +1,69 @@
+"""
+Management command to bulk-ingest Pine Script bar metadata from NDJSON.
+
+Usage:
+    python manage.py ingest_insights bars.ndjson
+    python manage.py ingest_insights - < bars.ndjson      # read stdin
+    python manage.py ingest_insights bars.ndjson --batch-size 1000
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from autopsy.insight_engine import INGEST_BATCH_SIZE, analyst
+
+
+class Command(BaseCommand):
+    help = 'Generate and bulk-save Market Analyst insights from an NDJSON file of bar metadata'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="NDJSON file (one bar metadata object per line), or '-' for stdin"
+        )
+        
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=INGEST_BATCH_SIZE,
+            help=f'Bars processed and inserted per batch (default: {INGEST_BATCH_SIZE})'
+        )
+        
+        parser.add_argument(
+            '--show-errors',
+            type=int,
+            default=20,
+            help='Number of per-line errors to print (default: 20)'
+        )
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive")
+        
+        self.stdout.write("\n📥 Ingesting Market Insights")
+        self.stdout.write(f"{'=' * 50}")
+        
+        if path == '-':
+            summary = analyst.ingest_ndjson(sys.stdin, batch_size=batch_size)
+        else:
+            try:
+                with open(path, encoding='utf-8') as stream:
+                    summary = analyst.ingest_ndjson(stream, batch_size=batch_size)
+            except OSError as e:
+                raise CommandError(f"Cannot read {path}: {e}")
+        
+        self.stdout.write(f"   Received: {summary['received']}")
+        self.stdout.write(f"   Created:  {summary['created']}")
+        self.stdout.write(f"   Failed:   {summary['failed']}")
+        
+        for error in summary['errors'][:options['show_errors']]:
+            self.stdout.write(self.style.WARNING(f"   ⚠️  line {error['row']}: {error['error']}"))
+        
+        if summary['failed']:
+            self.stdout.write(self.style.WARNING(f"\n⚠️  {summary['failed']} line(s) rejected"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"\n✅ All {summary['created']} insights saved"))
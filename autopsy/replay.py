@@ -12,6 +12,10 @@ from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Minutes after the insight searched for its patterns (BOS, FVG, order
+# block, breakout); later bars only feed the aggregated outcome
+PATTERN_WINDOW = timedelta(hours=2)
+
 
 class OHLCVReplay:
     """
@@ -38,51 +42,66 @@ class OHLCVReplay:
         self.start_time = insight.received_at
         self.end_time = self.start_time + horizon_delta
     
-    def fetch_candles(self, from_dt, to_dt):
+    def fetch_candles(self, from_dt, to_dt, timeframe=None):
         """
         Fetch historical OHLCV candles from database.
         
-        Queries the marketdata.OHLCVCandle model for 1-minute candles
-        in the specified time range. These are used to build higher
-        timeframe OHLCV data for outcome evaluation.
+        Reads the marketdata rollup pyramid at the coarsest resolution
+        that still gives a usable candle count (e.g. 24 hourly bars for a
+        24H horizon instead of 1,440 minute bars). Partial buckets at the
+        window edges come from finer levels, and ranges without rollups
+        fall back to raw 1-minute candles, so the aggregated OHLC is exact.
+        
+        Args:
+            from_dt: Window start (inclusive)
+            to_dt: Window end (inclusive)
+            timeframe: Force a resolution (default: auto-select)
         """
         try:
-            from marketdata.models import OHLCVCandle
+            from marketdata.rollups import load_candles
             
-            # Fetch 1-minute candles (finest granularity)
-            candles = OHLCVCandle.objects.filter(
-                symbol=self.symbol,
-                timeframe='1m',
-                timestamp__gte=from_dt,
-                timestamp__lte=to_dt
-            ).order_by('timestamp').values(
-                'timestamp', 'open_price', 'high', 'low', 'close', 'volume'
-            )
+            candles = load_candles(self.symbol, from_dt, to_dt, timeframe=timeframe)
             
             if not candles:
                 print(f"No candles found for {self.symbol} {from_dt} to {to_dt}")
                 return None
             
-            # Convert to list of dicts for processing
-            return [
-                {
-                    'timestamp': c['timestamp'],
-                    'open': float(c['open_price']),
-                    'high': float(c['high']),
-                    'low': float(c['low']),
-                    'close': float(c['close']),
-                    'volume': float(c['volume']) if c['volume'] else 0
-                }
-                for c in candles
-            ]
+            self.metadata['candle_count'] = len(candles)
+            self.metadata['timeframes'] = sorted({c['timeframe'] for c in candles})
+            
+            return candles
             
         except ImportError:
-            print(f"⚠️  marketdata app not available, cannot fetch candles")
+            print("⚠️  marketdata app not available, cannot fetch candles")
             return None
         except Exception as e:
             print(f"Error fetching candles: {e}")
             return None
     
+    def fetch_pattern_candles(self) -> List[Dict]:
+        """
+        Evenly spaced 1-minute candles for pattern re-detection.
+        
+        The pyramid read used for aggregation mixes resolutions at the
+        window edges, while the FVG/order block/breakout checks compare
+        neighbouring bars, so they run on a uniform 1m series. Only the
+        first PATTERN_WINDOW after the insight is read, which keeps long
+        horizons on the cheap rollup path. Reuses the already fetched
+        candles when they are all 1m.
+        """
+        from marketdata.rollups import BASE_TIMEFRAME, load_candles
+        
+        end_time = min(self.end_time, self.start_time + PATTERN_WINDOW)
+        
+        if self.candles and all(c['timeframe'] == BASE_TIMEFRAME for c in self.candles):
+            return [c for c in self.candles if c['timestamp'] <= end_time]
+        
+        try:
+            return load_candles(self.symbol, self.start_time, end_time, timeframe=BASE_TIMEFRAME)
+        except Exception as e:
+            logger.error(f"Pattern candle fetch error: {e}")
+            return []
+    
     def _fetch_from_database(self, start_time, end_time) -> List[Dict]:
         """Fetch candles from local database"""
         try:
@@ -452,8 +471,8 @@ def replay_insight(insight, horizon_delta: timedelta, broker_api=None) -> Option
         # Get aggregated OHLCV
         ohlcv = replay.get_aggregated_ohlcv()
         
-        # Add pattern verification
-        detector = PatternReDetector(insight, candles)
+        # Add pattern verification on the uniform 1m series
+        detector = PatternReDetector(insight, replay.fetch_pattern_candles())
         verification = detector.verify_all_patterns()
         
         ohlcv['pattern_verification'] = verification
@@ -0,0 +1,26 @@
+"""
+Signal handlers that invalidate the compiled template registry
+"""
+import logging
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from zenithedge.local_store import bump_version_on_commit
+
+from .template_registry import VOCABULARY_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender='autopsy.VariationVocabulary')
+@receiver([post_save, post_delete], sender='autopsy.InsightTemplate')
+def invalidate_compiled_vocabulary(sender, instance, **kwargs):
+    """
+    Bump the shared vocabulary version so every worker rebuilds its tables
+
+    Usage-count updates go through ``QuerySet.update`` and do not fire
+    this, so counters never cause a rebuild. The bump waits for the
+    transaction to commit, so no worker rebuilds from uncommitted rows.
+    """
+    logger.debug(f"{sender.__name__} changed - bumping vocabulary version on commit")
+    bump_version_on_commit(VOCABULARY_VERSION)
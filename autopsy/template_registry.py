@@ -0,0 +1,100 @@
+"""
+Zenith Market Analyst - Template Registry
+
+Per-process cache of compiled vocabulary and sentence templates.
+
+Engines used to rebuild their vocabulary dicts, template banks and DB
+vocabulary on every instantiation (i.e. on every webhook). Tables are now
+built once per worker and shared; those that depend on the database are
+keyed on a cross-process version counter that is bumped whenever
+``VariationVocabulary`` or ``InsightTemplate`` rows change.
+"""
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Callable, Dict, Optional
+
+from zenithedge.local_store import clear_versioned, get_versioned
+
+# Version counter bumped by autopsy.signals when vocabulary/templates change
+VOCABULARY_VERSION = 'autopsy.vocabulary'
+
+
+class CompiledTemplate:
+    """
+    Template string parsed once into literal/slot segments.
+
+    Rendering joins the precomputed segments instead of scanning the
+    string for placeholders on every call.
+    """
+
+    __slots__ = ('source', 'segments', 'slots')
+
+    def __init__(self, source: str):
+        self.source = source
+        self.segments = tuple(
+            (literal, field)
+            for literal, field, _spec, _conversion in Formatter().parse(source)
+        )
+        self.slots = tuple(dict.fromkeys(field for _, field in self.segments if field))
+
+    def render(self, values: Dict[str, Any], default: Optional[Callable[[str], str]] = None) -> str:
+        """
+        Fill slots from ``values``.
+
+        Args:
+            values: Slot name -> value
+            default: Called for slots missing from ``values``; if omitted a
+                missing slot raises KeyError (like ``str.format``)
+
+        Returns:
+            Rendered text (a slot repeated in the template gets the same value)
+        """
+        resolved = {}
+        out = []
+        for literal, field in self.segments:
+            if literal:
+                out.append(literal)
+            if field is None:
+                continue
+            value = resolved.get(field)
+            if value is None:
+                if field in values:
+                    value = str(values[field])
+                elif default is not None:
+                    value = default(field)
+                else:
+                    raise KeyError(field)
+                resolved[field] = value
+            out.append(value)
+        return ''.join(out)
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.source!r})"
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile (and memoize) a template string"""
+    return CompiledTemplate(source)
+
+
+def get_compiled(name: str, builder: Callable[[], Any], version_key: Optional[str] = None) -> Any:
+    """
+    Return the cached table ``name``, building it on first use.
+
+    Args:
+        name: Registry key
+        builder: Zero-argument callable producing the (read-only) table
+        version_key: Shared version counter the table depends on; the table
+            is rebuilt when the counter moves. ``None`` caches for the
+            lifetime of the process.
+
+    Returns:
+        The shared table. Callers must treat it as immutable.
+    """
+    return get_versioned(f'template_registry.{name}', builder, version_key)
+
+
+def clear_registry():
+    """Drop every cached table in this process (used by tests)"""
+    clear_versioned()
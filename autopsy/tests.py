@@ -1,3 +1,325 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from marketdata.models import OHLCVCandle
+from marketdata.rollups import refresh_rollups
+from zenithedge.local_store import bump_version, close_connections
+
+from .models import MarketInsight
+from .replay import PATTERN_WINDOW, OHLCVReplay
+from .template_registry import CompiledTemplate, clear_registry, get_compiled
+from .uniqueness import UniquenessStore
+
+
+class UniquenessStoreTestCase(SimpleTestCase):
+    """Test cases for the cross-process insight uniqueness store"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'uniqueness.sqlite3')
+
+    def tearDown(self):
+        close_connections()
+        shutil.rmtree(self.tmpdir)
+
+    def test_add_detects_exact_duplicates(self):
+        """The second add of the same text reports a duplicate"""
+        store = UniquenessStore('test', path=self.path)
+
+        self.assertTrue(store.add("Trending environment confirmed with liquidity building."))
+        self.assertFalse(store.add("Trending environment confirmed with liquidity building."))
+        self.assertTrue(store.add("Ranging conditions persist; pullback anticipated."))
+
+    def test_state_is_shared_between_instances(self):
+        """A fresh instance (new worker) sees text recorded by another"""
+        UniquenessStore('test', path=self.path).add("Momentum cooling near highs.")
+
+        self.assertTrue(UniquenessStore('test', path=self.path).seen("Momentum cooling near highs."))
+        self.assertFalse(UniquenessStore('other', path=self.path).seen("Momentum cooling near highs."))
+
+    def test_bloom_rotation_keeps_memory_bounded(self):
+        """Older generations are dropped once the active one fills up"""
+        store = UniquenessStore('test', path=self.path, capacity=10)
+
+        for i in range(25):
+            store.add(f"insight number {i}")
+
+        self.assertTrue(store.seen("insight number 24"))
+        self.assertFalse(store.seen("insight number 0"))
+
+    def test_near_duplicate_similarity(self):
+        """MinHash similarity is high for paraphrases and low for unrelated text"""
+        store = UniquenessStore('test', path=self.path)
+        store.remember("Momentum is building near key liquidity zones during the London session overlap")
+
+        similar = store.max_similarity("Momentum is building near key liquidity zones during the New York session overlap")
+        unrelated = store.max_similarity("Central bank minutes surprised markets with a hawkish tone")
+
+        self.assertGreater(similar, 0.6)
+        self.assertLess(unrelated, 0.2)
+
+    def test_near_capacity_evicts_oldest(self):
+        """Only the most recent signatures are kept for near-duplicate checks"""
+        store = UniquenessStore('test', path=self.path, near_capacity=10)
+
+        for i in range(200):
+            store.remember(f"unique narrative token{i} alpha{i} beta{i}")
+
+        conn = store._conn()
+        count = conn.execute('SELECT COUNT(*) FROM minhash_signatures').fetchone()[0]
+        self.assertLess(count, 10 + 64)
+
+
+class TemplateRegistryTestCase(SimpleTestCase):
+    """Test cases for the per-process compiled template registry"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(LOCAL_STORE_DIR=self.tmpdir)
+        self.settings_override.enable()
+        clear_registry()
+
+    def tearDown(self):
+        clear_registry()
+        close_connections()
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir)
+
+    def test_compiled_template_render(self):
+        """Slots are filled from values, then defaults; repeats stay consistent"""
+        template = CompiledTemplate("{a} then {b}, finally {a}.")
+
+        self.assertEqual(template.slots, ('a', 'b'))
+        self.assertEqual(template.render({'a': 1, 'b': 'two'}), "1 then two, finally 1.")
+        self.assertEqual(template.render({'a': 'x'}, default=str.upper), "x then B, finally x.")
+        with self.assertRaises(KeyError):
+            template.render({'a': 'x'})
+
+    def test_table_is_built_once(self):
+        """Repeated lookups reuse the cached table"""
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return {'built': len(calls)}
+
+        first = get_compiled('test_table', builder)
+        second = get_compiled('test_table', builder)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_version_bump_triggers_rebuild(self):
+        """Bumping the shared version rebuilds on the next check"""
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return len(calls)
+
+        with mock.patch('zenithedge.local_store.VERSION_CHECK_INTERVAL', 0):
+            self.assertEqual(get_compiled('test_table', builder, version_key='test'), 1)
+            self.assertEqual(get_compiled('test_table', builder, version_key='test'), 1)
+
+            bump_version('test')
+
+            self.assertEqual(get_compiled('test_table', builder, version_key='test'), 2)
+
+
+class VocabularyUsageTestCase(TestCase):
+    """Test cases for write-behind vocabulary usage counts"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(LOCAL_STORE_DIR=self.tmpdir)
+        self.settings_override.enable()
+        clear_registry()
+
+    def tearDown(self):
+        clear_registry()
+        close_connections()
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir)
+
+    def test_usage_counts_buffered_then_flushed(self):
+        """Phrase uses cost no query and are written with one UPDATE"""
+        from .models import VariationVocabulary
+        from .variation_engine import VOCABULARY_USAGE, VariationEngine
+
+        bullish = VariationVocabulary.objects.create(
+            category='bias', base_phrase='bullish', variations=['bullish', 'constructive']
+        )
+        neutral = VariationVocabulary.objects.create(
+            category='bias', base_phrase='neutral', variations=['balanced']
+        )
+        engine = VariationEngine()
+        engine.load_vocabulary_from_db()
+        VOCABULARY_USAGE.flush()
+
+        with self.assertNumQueries(0):
+            for phrase in ('constructive', 'bullish', 'constructive', 'balanced', 'unknown'):
+                engine.update_usage_stats('', 'bias', phrase)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(VOCABULARY_USAGE.flush(), 2)
+
+        bullish.refresh_from_db()
+        neutral.refresh_from_db()
+        self.assertEqual((bullish.usage_count, neutral.usage_count), (3, 1))
+        self.assertIsNotNone(bullish.last_used)
+
+    def test_vocabulary_version_bumped_on_commit(self):
+        """Edits bump the shared version only once their transaction commits"""
+        from zenithedge.local_store import get_version
+        from .models import VariationVocabulary
+        from .template_registry import VOCABULARY_VERSION
+
+        before = get_version(VOCABULARY_VERSION)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            VariationVocabulary.objects.create(category='bias', base_phrase='bearish', variations=['heavy'])
+            self.assertEqual(get_version(VOCABULARY_VERSION), before)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_version(VOCABULARY_VERSION), before + 1)
+
+
+class BatchInsightIngestionTestCase(TestCase):
+    """Test cases for NDJSON batch insight ingestion"""
+
+    def setUp(self):
+        from .insight_engine import ZenithMarketAnalyst
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            LOCAL_STORE_DIR=self.tmpdir, WEBHOOK_TOKEN='batch-token', INSIGHT_BATCH_RATE_LIMIT=2
+        )
+        self.settings_override.enable()
+        self.analyst = ZenithMarketAnalyst()
+        self.start = datetime(2025, 3, 3, 8, 0, tzinfo=dt_timezone.utc)
+
+    def tearDown(self):
+        close_connections()
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir)
+
+    def _post_batch(self, body, token='batch-token'):
+        url = reverse('autopsy:submit_insights_batch')
+        if token:
+            url += f'?token={token}'
+        return self.client.post(url, data=body, content_type='application/x-ndjson')
+
+    def _bar(self, minutes, **overrides):
+        bar = {
+            'symbol': 'EURUSD',
+            'timeframe': '1m',
+            'timestamp': (self.start + timedelta(minutes=minutes)).isoformat(),
+            'regime': 'trending',
+            'structure': 'bos',
+            'momentum': 'increasing',
+            'volume_state': 'spike',
+            'session': 'london',
+            'expected_behavior': 'Expansion',
+            'strength': 40 + minutes % 50,
+            'risk_notes': ['High volatility'] if minutes % 2 else [],
+        }
+        bar.update(overrides)
+        return bar
+
+    def test_batch_scores_match_single_bar_scoring(self):
+        """Batch scoring gives the same index and breakdown as the per-bar path"""
+        parsed = [self.analyst.parser.parse(self._bar(i, regime=r))
+                  for i, r in enumerate(['trending', 'volatile', 'ranging', 'unknown'])]
+
+        batch = self.analyst.scorer.calculate_insight_index_batch(parsed)
+
+        self.assertEqual(batch, [self.analyst.scorer.calculate_insight_index(p) for p in parsed])
+
+    def test_ingest_reports_errors_per_line(self):
+        """Valid lines are bulk-saved; bad and duplicate lines are reported"""
+        lines = [json.dumps(self._bar(i)) for i in range(5)]
+        lines.insert(2, '{not json')
+        lines.append(json.dumps({'symbol': 'EURUSD'}))
+        lines.append(json.dumps(self._bar(0)))
+
+        summary = self.analyst.ingest_ndjson(lines, batch_size=3)
+
+        self.assertEqual(summary['received'], 8)
+        self.assertEqual(summary['created'], 5)
+        self.assertEqual([e['row'] for e in summary['errors']], [3, 7, 8])
+        self.assertEqual(MarketInsight.objects.filter(symbol='EURUSD').count(), 5)
+
+    def test_news_is_fetched_once_per_symbol_hour(self):
+        """Bars in the same hour share a single news query"""
+        with mock.patch.object(self.analyst, '_fetch_news', return_value=[]) as fetch:
+            processed, errors = self.analyst.process_bars(
+                [(i, self._bar(i * 10)) for i in range(12)]
+            )
+
+        self.assertEqual(len(processed), 12)
+        self.assertEqual(errors, [])
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_batch_endpoint(self):
+        """The NDJSON endpoint returns the ingestion summary"""
+        body = '\n'.join(json.dumps(self._bar(i)) for i in range(3)) + '\n\n'
+
+        response = self._post_batch(body)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 3)
+        self.assertEqual(response.json()['status'], 'success')
+
+    def test_batch_endpoint_requires_token_and_is_rate_limited(self):
+        """Missing or wrong tokens are rejected; batches are limited per token and IP"""
+        body = json.dumps(self._bar(0)) + '\n'
+
+        self.assertEqual(self._post_batch(body, token=None).status_code, 401)
+        self.assertEqual(self._post_batch(body, token='wrong').status_code, 403)
+        self.assertFalse(MarketInsight.objects.exists())
+
+        statuses = [self._post_batch(body).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+
+class ReplayResolutionTestCase(TestCase):
+    """Test cases for the replay's candle resolutions"""
+
+    def setUp(self):
+        self.start = datetime(2025, 1, 6, 0, 0, tzinfo=dt_timezone.utc)
+        OHLCVCandle.objects.bulk_create([
+            OHLCVCandle(
+                symbol='EURUSD', timeframe='1m', timestamp=self.start + timedelta(minutes=i),
+                open_price=Decimal('1.08'), high=Decimal('1.09'), low=Decimal('1.07'), close=Decimal('1.08'),
+            )
+            for i in range(1440)
+        ])
+        refresh_rollups('EURUSD', self.start, self.start + timedelta(minutes=1439))
+
+    def test_patterns_use_uniform_minutes(self):
+        """Aggregation reads the pyramid; pattern re-detection gets evenly spaced 1m bars"""
+        insight = SimpleNamespace(symbol='EURUSD', received_at=self.start + timedelta(minutes=7))
+        replay = OHLCVReplay(insight, timedelta(hours=20))
+        replay.candles = replay.fetch_candles(replay.start_time, replay.end_time)
+
+        self.assertIn('1h', replay.metadata['timeframes'])
+        pattern_candles = replay.fetch_pattern_candles()
+        self.assertEqual(len(pattern_candles), PATTERN_WINDOW // timedelta(minutes=1) + 1)
+        self.assertEqual({c['timeframe'] for c in pattern_candles}, {'1m'})
+        self.assertEqual(pattern_candles[-1]['timestamp'], replay.start_time + PATTERN_WINDOW)
+
+    def test_short_horizon_reuses_minute_candles(self):
+        """A horizon shorter than the pattern window is read once, at 1m"""
+        insight = SimpleNamespace(symbol='EURUSD', received_at=self.start + timedelta(minutes=7))
+        replay = OHLCVReplay(insight, timedelta(minutes=30))
+        replay.candles = replay.fetch_candles(replay.start_time, replay.end_time, timeframe='1m')
+
+        with self.assertNumQueries(0):
+            pattern_candles = replay.fetch_pattern_candles()
+        self.assertEqual(pattern_candles, replay.candles)
@@ -0,0 +1,362 @@
+"""
+Cross-Process Uniqueness Store
+
+Bounded, persistent duplicate detection for generated insight and
+narrative text, shared by every worker through one SQLite (WAL) file:
+
+- Exact duplicates: rotating Bloom filter (two generations). When the
+  active generation fills up, the older one is cleared and becomes
+  active, so memory stays fixed while recent text is always remembered.
+- Near duplicates: MinHash signatures over word sets with LSH banding.
+  Only texts sharing a band bucket are compared, and only the most
+  recent ``near_capacity`` signatures are kept.
+
+Both checks are O(1) in the number of texts ever generated and survive
+worker restarts.
+
+Usage:
+    store = get_uniqueness_store('market_insight')
+    if store.add(text):            # True if text was not seen before
+        ...
+    similarity = store.max_similarity(text)   # 0.0 - 1.0 (Jaccard estimate)
+"""
+import hashlib
+import logging
+import math
+import random
+import re
+import sqlite3
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from zenithedge.local_store import get_connection, get_store_path
+
+logger = logging.getLogger(__name__)
+
+
+STORE_FILENAME = 'uniqueness.sqlite3'
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+class UniquenessStore:
+    """
+    Rotating Bloom filter + MinHash/LSH index in a shared SQLite file
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bloom_generations (
+            namespace TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            generation INTEGER NOT NULL,
+            item_count INTEGER NOT NULL DEFAULT 0,
+            bits BLOB NOT NULL,
+            UNIQUE (namespace, slot)
+        );
+        CREATE TABLE IF NOT EXISTS minhash_signatures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            namespace TEXT NOT NULL,
+            signature BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS lsh_buckets (
+            namespace TEXT NOT NULL,
+            band INTEGER NOT NULL,
+            bucket TEXT NOT NULL,
+            signature_id INTEGER NOT NULL,
+            PRIMARY KEY (namespace, bucket, signature_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS lsh_buckets_signature ON lsh_buckets (signature_id);
+    """
+
+    def __init__(self, namespace: str = 'default', path: Optional[str] = None,
+                 capacity: int = 50000, error_rate: float = 0.001,
+                 num_perm: int = 64, bands: int = 32, near_capacity: int = 2000,
+                 max_candidates: int = 16):
+        """
+        Args:
+            namespace: Logical set name (several sets share one file)
+            path: SQLite file (default: LOCAL_STORE_DIR/uniqueness.sqlite3)
+            capacity: Texts per Bloom generation (two generations kept)
+            error_rate: Target Bloom false-positive rate at capacity
+            num_perm: MinHash permutations per signature
+            bands: LSH bands (num_perm must divide evenly). 32 bands of 2
+                   rows surface candidates from ~0.2 Jaccard upwards
+            near_capacity: Signatures kept for near-duplicate checks
+            max_candidates: LSH candidates compared per query
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.namespace = namespace
+        self.path = path or get_store_path(STORE_FILENAME)
+        self.capacity = capacity
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.near_capacity = near_capacity
+        self.max_candidates = max_candidates
+
+        # Bloom sizing: m = -n ln p / (ln 2)^2, k = (m / n) ln 2
+        self.num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_bytes = (self.num_bits + 7) // 8
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+
+        # Fixed permutations so every process computes identical signatures
+        rng = random.Random(0x5A5A)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._sig_format = f'<{num_perm}I'
+        self._schema_ready = False
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = get_connection(self.path)
+        if not self._schema_ready:
+            conn.executescript(self.SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    # ------------------------------------------------------------------
+    # Exact duplicates (rotating Bloom filter)
+    # ------------------------------------------------------------------
+
+    def _bit_positions(self, text: str) -> List[int]:
+        """Kirsch-Mitzenmacher double hashing from one SHA-256 digest"""
+        digest = hashlib.sha256(text.encode('utf-8')).digest()
+        h1, h2 = struct.unpack('<QQ', digest[:16])
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def _generations(self, conn) -> List[Tuple[int, int, int, int]]:
+        """(rowid, slot, generation, item_count) for both slots, newest first"""
+        rows = conn.execute(
+            'SELECT rowid, slot, generation, item_count FROM bloom_generations '
+            'WHERE namespace = ? ORDER BY generation DESC',
+            (self.namespace,)
+        ).fetchall()
+
+        if len(rows) < 2:
+            for slot, generation in ((0, 1), (1, 0)):
+                conn.execute(
+                    'INSERT OR IGNORE INTO bloom_generations (namespace, slot, generation, item_count, bits) '
+                    'VALUES (?, ?, ?, 0, zeroblob(?))',
+                    (self.namespace, slot, generation, self.num_bytes)
+                )
+            rows = conn.execute(
+                'SELECT rowid, slot, generation, item_count FROM bloom_generations '
+                'WHERE namespace = ? ORDER BY generation DESC',
+                (self.namespace,)
+            ).fetchall()
+        return rows
+
+    def _read_bits(self, conn, rowid: int, positions: List[int]) -> bool:
+        """True if every position is set in the generation stored at rowid"""
+        if hasattr(conn, 'blobopen'):
+            with conn.blobopen('bloom_generations', 'bits', rowid, readonly=True) as blob:
+                return all(blob[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+        bits = conn.execute('SELECT bits FROM bloom_generations WHERE rowid = ?', (rowid,)).fetchone()[0]
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    def _set_bits(self, conn, rowid: int, positions: List[int]):
+        if hasattr(conn, 'blobopen'):
+            with conn.blobopen('bloom_generations', 'bits', rowid) as blob:
+                for pos in positions:
+                    blob[pos >> 3] = blob[pos >> 3] | (1 << (pos & 7))
+            return
+
+        bits = bytearray(conn.execute('SELECT bits FROM bloom_generations WHERE rowid = ?', (rowid,)).fetchone()[0])
+        for pos in positions:
+            bits[pos >> 3] |= 1 << (pos & 7)
+        conn.execute('UPDATE bloom_generations SET bits = ? WHERE rowid = ?', (bytes(bits), rowid))
+
+    def seen(self, text: str) -> bool:
+        """True if ``text`` is (probably) in the store"""
+        try:
+            conn = self._conn()
+            positions = self._bit_positions(text)
+            return any(self._read_bits(conn, row[0], positions) for row in self._generations(conn))
+        except sqlite3.Error as e:
+            logger.warning(f"Uniqueness store unavailable ({e}); treating text as unseen")
+            return False
+
+    def add(self, text: str) -> bool:
+        """
+        Atomically check and record ``text``.
+
+        Returns:
+            True if the text was new, False if it was already present
+        """
+        try:
+            conn = self._conn()
+            positions = self._bit_positions(text)
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                generations = self._generations(conn)
+                if any(self._read_bits(conn, row[0], positions) for row in generations):
+                    conn.execute('COMMIT')
+                    return False
+
+                active_rowid, _, active_gen, active_count = generations[0]
+                if active_count >= self.capacity:
+                    # Rotate: wipe the older generation and make it active
+                    active_rowid = generations[1][0]
+                    conn.execute(
+                        'UPDATE bloom_generations SET generation = ?, item_count = 0, bits = zeroblob(?) '
+                        'WHERE rowid = ?',
+                        (active_gen + 1, self.num_bytes, active_rowid)
+                    )
+
+                self._set_bits(conn, active_rowid, positions)
+                conn.execute(
+                    'UPDATE bloom_generations SET item_count = item_count + 1 WHERE rowid = ?',
+                    (active_rowid,)
+                )
+                conn.execute('COMMIT')
+                return True
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+        except sqlite3.Error as e:
+            logger.warning(f"Uniqueness store unavailable ({e}); treating text as unique")
+            return True
+
+    # ------------------------------------------------------------------
+    # Near duplicates (MinHash + LSH)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def tokenize(text: str) -> set:
+        """Lower-cased word set (matches the composer's word-overlap metric)"""
+        return set(_WORD_RE.findall(text.lower()))
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of the text's word set"""
+        words = self.tokenize(text)
+        if not words:
+            return tuple([_MAX_HASH] * self.num_perm)
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(w.encode('utf-8'), digest_size=8).digest(), 'little')
+            for w in words
+        ]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[str]:
+        """One bucket key per band (band number is part of the key)"""
+        r = self.rows_per_band
+        return [
+            hashlib.blake2b(struct.pack(f'<I{r}I', i, *signature[i * r:(i + 1) * r]), digest_size=8).hexdigest()
+            for i in range(self.bands)
+        ]
+
+    def _similarity(self, sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / self.num_perm
+
+    def max_similarity(self, text: str, signature: Optional[Tuple[int, ...]] = None) -> float:
+        """
+        Highest estimated Jaccard similarity to any remembered text.
+
+        Texts below the LSH threshold (~0.2) are not candidates and read as 0.
+        """
+        try:
+            conn = self._conn()
+            signature = signature or self.signature(text)
+            keys = self._band_keys(signature)
+
+            # Candidates sharing the most bands are the most similar ones
+            placeholders = ','.join('?' * len(keys))
+            rows = conn.execute(
+                f'SELECT s.signature FROM minhash_signatures s JOIN ('
+                f'  SELECT signature_id, COUNT(*) AS shared FROM lsh_buckets'
+                f'  WHERE namespace = ? AND bucket IN ({placeholders})'
+                f'  GROUP BY signature_id ORDER BY shared DESC LIMIT ?'
+                f') c ON c.signature_id = s.id',
+                [self.namespace, *keys, self.max_candidates]
+            ).fetchall()
+
+            best = 0.0
+            for (blob,) in rows:
+                best = max(best, self._similarity(signature, struct.unpack(self._sig_format, blob)))
+            return best
+
+        except sqlite3.Error as e:
+            logger.warning(f"Uniqueness store unavailable ({e}); skipping near-duplicate check")
+            return 0.0
+
+    def remember(self, text: str, signature: Optional[Tuple[int, ...]] = None):
+        """Index ``text`` for near-duplicate checks, evicting the oldest beyond capacity"""
+        try:
+            conn = self._conn()
+            signature = signature or self.signature(text)
+            keys = self._band_keys(signature)
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = conn.execute(
+                    'INSERT INTO minhash_signatures (namespace, signature) VALUES (?, ?)',
+                    (self.namespace, struct.pack(self._sig_format, *signature))
+                )
+                sig_id = cursor.lastrowid
+                conn.executemany(
+                    'INSERT OR IGNORE INTO lsh_buckets (namespace, band, bucket, signature_id) VALUES (?, ?, ?, ?)',
+                    [(self.namespace, band, key, sig_id) for band, key in enumerate(keys)]
+                )
+
+                # Amortised eviction keeps the index at ~near_capacity entries
+                if sig_id % 64 == 0:
+                    cutoff = conn.execute(
+                        'SELECT id FROM minhash_signatures WHERE namespace = ? '
+                        'ORDER BY id DESC LIMIT 1 OFFSET ?',
+                        (self.namespace, self.near_capacity)
+                    ).fetchone()
+                    if cutoff:
+                        stale = 'SELECT id FROM minhash_signatures WHERE namespace = ? AND id <= ?'
+                        conn.execute(f'DELETE FROM lsh_buckets WHERE signature_id IN ({stale})',
+                                     (self.namespace, cutoff[0]))
+                        conn.execute('DELETE FROM minhash_signatures WHERE namespace = ? AND id <= ?',
+                                     (self.namespace, cutoff[0]))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+        except sqlite3.Error as e:
+            logger.warning(f"Uniqueness store unavailable ({e}); text not indexed")
+
+    def check_and_remember(self, text: str) -> float:
+        """
+        Near-duplicate check followed by indexing the text.
+
+        Returns:
+            Uniqueness score (1.0 = nothing similar, 0.0 = identical)
+        """
+        signature = self.signature(text)
+        similarity = self.max_similarity(text, signature)
+        self.remember(text, signature)
+        return 1.0 - similarity
+
+
+_stores: Dict[str, UniquenessStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_uniqueness_store(namespace: str = 'default', **kwargs) -> UniquenessStore:
+    """Per-process store instance for a namespace"""
+    with _stores_lock:
+        store = _stores.get(namespace)
+        if store is None:
+            store = _stores[namespace] = UniquenessStore(namespace=namespace, **kwargs)
+        return store
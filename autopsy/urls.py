@@ -14,6 +14,7 @@ urlpatterns = [
     
     # API Endpoints
     path('api/submit-insight/', views.submit_insight_webhook, name='submit_insight'),
+    path('api/submit-insights/batch/', views.submit_insights_batch, name='submit_insights_batch'),
     path('api/get-insights/', views.get_insights_api, name='get_insights'),
     path('api/chart-labels/<str:symbol>/', views.get_chart_labels, name='chart_labels'),
     path('api/recent-insights/', views.recent_insights_api, name='recent_insights'),
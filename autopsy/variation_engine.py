@@ -11,9 +11,17 @@ NO REPETITION. EVER.
 """
 import random
 import hashlib
+import logging
 from typing import Dict, List, Any, Tuple
-from django.utils import timezone
-from django.db.models import F
+
+from autopsy.template_registry import VOCABULARY_VERSION, compile_template, get_compiled
+from autopsy.uniqueness import get_uniqueness_store
+from zenithedge.write_behind import CounterBuffer
+
+logger = logging.getLogger(__name__)
+
+# Phrase usage per VariationVocabulary row, written in bulk
+VOCABULARY_USAGE = CounterBuffer('autopsy.VariationVocabulary', 'usage_count', touch_field='last_used')
 
 
 class VariationEngine:
@@ -22,10 +30,67 @@ class VariationEngine:
     """
     
     def __init__(self):
-        # Core vocabulary categories (loaded from DB in production)
-        self.vocabulary = self._init_vocabulary()
-        self.templates = self._init_templates()
-        self.used_hashes = set()  # Track recent insights to avoid duplication
+        # Shared across workers and restarts; bounded by rotating Bloom generations
+        self.uniqueness = get_uniqueness_store('market_insight')
+    
+    @property
+    def vocabulary(self) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+        """Compiled vocabulary (defaults + active DB rows), shared per process"""
+        return self._tables()['vocabulary']
+    
+    @property
+    def templates(self) -> Tuple[Dict[str, Any], ...]:
+        """Compiled sentence templates (defaults + active DB rows), shared per process"""
+        return self._tables()['templates']
+    
+    def _tables(self) -> Dict[str, Any]:
+        return get_compiled('variation_engine', self._build_tables, version_key=VOCABULARY_VERSION)
+    
+    def _build_tables(self) -> Dict[str, Any]:
+        """
+        Build the read-only vocabulary and template tables
+        
+        Runs once per process and again only after VariationVocabulary or
+        InsightTemplate rows change (see autopsy.signals).
+        """
+        vocabulary = self._init_vocabulary()
+        templates = self._init_templates()
+        phrase_rows: Dict[Tuple[str, str], List[int]] = {}
+        
+        try:
+            from autopsy.models import InsightTemplate, VariationVocabulary
+            
+            for entry in VariationVocabulary.objects.filter(is_active=True):
+                subcategory = entry.subcategory or 'default'
+                vocabulary.setdefault(entry.category, {}).setdefault(subcategory, []).extend(entry.variations)
+                for phrase in entry.variations:
+                    phrase_rows.setdefault((entry.category, phrase), []).append(entry.pk)
+            
+            for row in InsightTemplate.objects.filter(is_active=True):
+                templates.append({
+                    'id': row.template_id,
+                    'structure': row.structure,
+                    'slots': row.slots,
+                    'regime_filter': row.regime_filter,
+                    'structure_filter': row.structure_filter,
+                })
+        except Exception as e:
+            # Fallback to hardcoded vocabulary
+            logger.debug(f"DB vocabulary unavailable: {e}")
+        
+        for template in templates:
+            template['compiled'] = compile_template(template['structure'])
+            template['slots'] = template['compiled'].slots
+        
+        return {
+            'vocabulary': {
+                category: {sub: tuple(phrases) for sub, phrases in subcategories.items()}
+                for category, subcategories in vocabulary.items()
+            },
+            'templates': tuple(templates),
+            # (category, phrase) -> VariationVocabulary ids, for usage stats
+            'phrase_rows': {key: tuple(ids) for key, ids in phrase_rows.items()},
+        }
     
     def _init_vocabulary(self) -> Dict[str, Dict[str, List[str]]]:
         """
@@ -286,9 +351,8 @@ class VariationEngine:
             # Calculate hash
             vocab_hash = self._calculate_hash(insight_text)
             
-            # Check uniqueness
-            if not force_unique or vocab_hash not in self.used_hashes:
-                self.used_hashes.add(vocab_hash)
+            # Check uniqueness (atomic check-and-record across workers)
+            if not force_unique or self.uniqueness.add(insight_text):
                 return insight_text, vocab_hash
             
             attempt += 1
@@ -303,12 +367,15 @@ class VariationEngine:
         regime = metadata.get('regime', 'unknown')
         structure = metadata.get('structure', 'none')
         
-        # Filter templates by applicability
-        applicable = self.templates.copy()
+        # Filter templates by applicability (DB templates may be scoped)
+        applicable = [
+            t for t in self.templates
+            if (not t.get('regime_filter') or regime in t['regime_filter'])
+            and (not t.get('structure_filter') or structure in t['structure_filter'])
+        ]
         
-        # Could add logic to filter by regime/structure
-        # For now, random selection for maximum variation
-        return random.choice(applicable)
+        # Random selection for maximum variation
+        return random.choice(applicable or self.templates)
     
     def _fill_template(self, template: Dict[str, Any], metadata: Dict[str, Any]) -> str:
         """
@@ -321,7 +388,7 @@ class VariationEngine:
         
         # Fill template
         try:
-            insight = template['structure'].format(**slots)
+            insight = template['compiled'].render(slots)
         except KeyError as e:
             # Missing slot - use fallback
             return self._generate_fallback(metadata)
@@ -480,42 +547,19 @@ class VariationEngine:
     def load_vocabulary_from_db(self):
         """
         Load vocabulary variations from database (for production use)
+        
+        DB rows are merged into the shared compiled tables; this only makes
+        sure they are built now rather than on the first insight.
         """
-        try:
-            from autopsy.models import VariationVocabulary
-            
-            db_vocab = VariationVocabulary.objects.filter(is_active=True)
-            
-            for entry in db_vocab:
-                category = entry.category
-                subcategory = entry.subcategory or 'default'
-                
-                if category not in self.vocabulary:
-                    self.vocabulary[category] = {}
-                
-                if subcategory not in self.vocabulary[category]:
-                    self.vocabulary[category][subcategory] = []
-                
-                # Add variations
-                self.vocabulary[category][subcategory].extend(entry.variations)
-                
-        except Exception as e:
-            # Fallback to hardcoded vocabulary
-            pass
+        self._tables()
     
     def update_usage_stats(self, vocabulary_hash: str, category: str, phrase: str):
         """
         Update database usage statistics for vocabulary tracking
+        
+        Rows containing the phrase are looked up in the compiled tables and
+        their counts buffered (see ``VOCABULARY_USAGE``), so using a phrase
+        costs no query; the counts are written in bulk every few seconds.
         """
-        try:
-            from autopsy.models import VariationVocabulary
-            
-            VariationVocabulary.objects.filter(
-                category=category,
-                variations__contains=[phrase]
-            ).update(
-                usage_count=F('usage_count') + 1,
-                last_used=timezone.now()
-            )
-        except Exception:
-            pass
+        for row_id in self._tables()['phrase_rows'].get((category, phrase), ()):
+            VOCABULARY_USAGE.incr(row_id)
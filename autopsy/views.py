@@ -103,10 +103,12 @@ def strategy_detail(request, strategy_name):
 # ZENITH MARKET ANALYST - VISUAL INSIGHTS MODE VIEWS
 # ============================================================================
 
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_http_methods
 from autopsy.models import MarketInsight
+import hmac
 import json
 import logging
 
@@ -179,6 +181,77 @@ def submit_insight_webhook(request):
         }, status=500)
 
 
+@csrf_exempt
+@require_POST
+def submit_insights_batch(request):
+    """
+    Batch webhook for replays and symbol onboarding
+    
+    POST /autopsy/api/submit-insights/batch/?token=YOUR_TOKEN
+    
+    Body is NDJSON: one bar metadata object (same shape as
+    submit_insight_webhook) per line. The body is read line by line and
+    insights are bulk-inserted in batches. Errors are reported per line
+    and never abort the rest of the stream.
+    
+    Requires the TradingView webhook token (WEBHOOK_TOKEN); requests are
+    rate limited per token and IP (INSIGHT_BATCH_RATE_LIMIT per minute).
+    
+    Response:
+    {
+        "status": "success" | "partial",
+        "received": 1000,
+        "created": 998,
+        "failed": 2,
+        "errors": [{"row": 17, "error": "Missing required fields: regime"}, ...]
+    }
+    """
+    token = request.GET.get('token')
+    expected_token = getattr(settings, 'WEBHOOK_TOKEN', None)
+    if not expected_token:
+        logger.error("WEBHOOK_TOKEN not configured in settings")
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Webhook not configured on server'
+        }, status=500)
+    if not token:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Missing token parameter. Use: ?token=YOUR_TOKEN'
+        }, status=401)
+    if not hmac.compare_digest(token, expected_token):
+        logger.warning(f"Invalid batch webhook token from {request.META.get('REMOTE_ADDR')}")
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid token'
+        }, status=403)
+    
+    try:
+        from autopsy.insight_engine import analyst
+        
+        summary = analyst.ingest_ndjson(request)
+        
+        logger.info(f"Batch insight webhook: {summary['created']}/{summary['received']} created")
+        
+        if not summary['received']:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Empty NDJSON body'
+            }, status=400)
+        
+        return JsonResponse({
+            'status': 'partial' if summary['failed'] else 'success',
+            **summary,
+        })
+        
+    except Exception as e:
+        logger.error(f"Batch webhook processing error: {e}", exc_info=True)
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=500)
+
+
 @login_required
 def market_analyst_view(request):
     """
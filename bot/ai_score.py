@@ -7,25 +7,22 @@ This module provides functions to:
 2. Train a predictive model from historical data
 3. Score new signals based on learned patterns
 """
+from __future__ import annotations
 
 import os
 import json
 import pickle
-import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 
-try:
-    from xgboost import XGBClassifier
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    from sklearn.ensemble import RandomForestClassifier
-    XGBOOST_AVAILABLE = False
+from zenithedge.lazy_imports import is_available, lazy_import
 
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
+# NumPy/pandas/scikit-learn are imported on first use, not at startup
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+XGBOOST_AVAILABLE = is_available('xgboost')
 
 # Model storage path
 MODEL_DIR = Path(__file__).parent / 'models'
@@ -154,6 +151,9 @@ def train_model(dataframe: pd.DataFrame, target_col: str = 'outcome') -> Tuple[o
     Returns:
         Tuple of (trained_model, scaler)
     """
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
     # Prepare features
     feature_cols = [col for col in dataframe.columns if col not in [target_col, 'signal_id']]
     X = dataframe[feature_cols]
@@ -173,6 +173,7 @@ def train_model(dataframe: pd.DataFrame, target_col: str = 'outcome') -> Tuple[o
     
     # Train model
     if XGBOOST_AVAILABLE:
+        from xgboost import XGBClassifier
         model = XGBClassifier(
             n_estimators=100,
             max_depth=6,
@@ -183,6 +184,7 @@ def train_model(dataframe: pd.DataFrame, target_col: str = 'outcome') -> Tuple[o
         )
         print("📊 Training XGBoost model...")
     else:
+        from sklearn.ensemble import RandomForestClassifier
         model = RandomForestClassifier(
             n_estimators=100,
             max_depth=10,
@@ -559,36 +561,32 @@ def integrate_news_bias(symbol: str, base_score: float) -> Tuple[float, float, D
         Tuple of (adjusted_score, bias_adjustment, news_data)
     """
     try:
-        from zennews.models import NewsEvent
+        from zennews.utils.sentiment_buckets import sentiment_window
+        from zennews.utils.symbol_index import related_news
         from django.utils import timezone
-        import numpy as np
         
-        # Get recent news for this symbol (last 3 hours)
-        recent_news = NewsEvent.objects.filter(
-            symbol=symbol,
-            timestamp__gte=timezone.now() - timezone.timedelta(hours=3)
-        ).order_by('-timestamp')
+        # Recent news stats for this symbol (last 3 hours) from the sentiment buckets
+        since = timezone.now() - timezone.timedelta(hours=3)
+        stats = sentiment_window(symbol, since=since)
+        news_count = stats['count']
         
-        if not recent_news.exists():
+        if not news_count:
             return base_score, 0.0, {'news_count': 0, 'message': 'No recent news'}
         
         # Calculate news bias
-        sentiments = [news.sentiment for news in recent_news]
-        avg_sentiment = float(np.mean(sentiments))
+        avg_sentiment = float(stats['avg_sentiment'])
         
-        # Weight by impact level
+        # Weight by impact level (unknown levels weigh 1.0)
         impact_weights = {
             'high': 1.5,
             'medium': 1.0,
             'low': 0.5
         }
         
-        weighted_impacts = []
-        for news in recent_news:
-            weight = impact_weights.get(news.impact_level, 1.0)
-            weighted_impacts.append(weight)
-        
-        avg_impact_weight = float(np.mean(weighted_impacts)) if weighted_impacts else 1.0
+        impact = stats['impact']
+        weight_total = sum(impact_weights[level] * impact[level] for level in impact_weights)
+        weight_total += (news_count - sum(impact.values())) * 1.0
+        avg_impact_weight = weight_total / news_count
         
         # Calculate bias adjustment (-10 to +10)
         # Formula: sentiment (-1 to 1) * impact_weight (0.5 to 1.5) * 5 (scaling factor)
@@ -599,7 +597,7 @@ def integrate_news_bias(symbol: str, base_score: float) -> Tuple[float, float, D
         
         # Prepare news data for logging
         news_data = {
-            'news_count': recent_news.count(),
+            'news_count': news_count,
             'avg_sentiment': round(avg_sentiment, 3),
             'avg_impact_weight': round(avg_impact_weight, 2),
             'bias_adjustment': round(bias_adjustment, 2),
@@ -609,7 +607,7 @@ def integrate_news_bias(symbol: str, base_score: float) -> Tuple[float, float, D
                     'sentiment': round(news.sentiment, 2),
                     'impact': news.impact_level,
                 }
-                for news in recent_news[:3]
+                for news in related_news(symbol, since=since, limit=3, exact=True)
             ]
         }
         
@@ -635,35 +633,20 @@ def get_news_sentiment_summary(symbol: str, hours: int = 24) -> Dict:
         Dict with sentiment summary
     """
     try:
-        from zennews.models import NewsEvent
-        from django.utils import timezone
-        from django.db.models import Avg, Count
-        import numpy as np
+        from zennews.utils.sentiment_buckets import sentiment_window
         
-        news_query = NewsEvent.objects.filter(
-            symbol=symbol,
-            timestamp__gte=timezone.now() - timezone.timedelta(hours=hours)
-        )
+        # Answered from the 15-minute sentiment buckets
+        stats = sentiment_window(symbol, hours=hours)
         
-        if not news_query.exists():
+        if not stats['count']:
             return {
                 'status': 'no_data',
                 'news_count': 0,
                 'message': f'No news found for {symbol} in last {hours} hours'
             }
         
-        # Aggregate statistics
-        stats = news_query.aggregate(
-            avg_sentiment=Avg('sentiment'),
-            total_count=Count('id')
-        )
-        
         # Impact breakdown
-        impact_counts = {
-            'high': news_query.filter(impact_level='high').count(),
-            'medium': news_query.filter(impact_level='medium').count(),
-            'low': news_query.filter(impact_level='low').count(),
-        }
+        impact_counts = stats['impact']
         
         # Sentiment label
         avg_sent = stats['avg_sentiment'] or 0
@@ -677,7 +660,7 @@ def get_news_sentiment_summary(symbol: str, hours: int = 24) -> Dict:
         return {
             'status': 'success',
             'symbol': symbol,
-            'news_count': stats['total_count'],
+            'news_count': stats['count'],
             'avg_sentiment': round(avg_sent, 3),
             'sentiment_label': sentiment_label,
             'impact_breakdown': impact_counts,
@@ -712,8 +695,8 @@ def integrate_cognition_bias(symbol: str, user, signal_data: Dict) -> Tuple[floa
         - breakdown_data: Dict with detailed cognition metrics
     """
     try:
-        from cognition.models import TraderPsychology, MarketRegime, SignalCluster
-        from cognition.utils import SignalClusterer
+        from cognition.models import TraderPsychology, MarketRegime
+        from cognition.utils.signal_clusterer import get_cluster_index
         from django.utils import timezone
         from datetime import timedelta
         import logging
@@ -793,23 +776,20 @@ def integrate_cognition_bias(symbol: str, user, signal_data: Dict) -> Tuple[floa
         # Predict which cluster this signal belongs to and get reliability
         try:
             if signal_data:
-                clusterer = SignalClusterer()
+                # Pre-fitted centroids, loaded once per process (no queries here)
+                cluster_index = get_cluster_index()
                 
-                # Check if we have trained clusters
-                cluster_count = SignalCluster.objects.count()
-                if cluster_count > 0:
+                if cluster_index is not None:
                     # Predict cluster for this signal
-                    cluster_id, cluster_confidence = clusterer.predict_cluster(signal_data)
-                    
-                    # Get cluster from database
-                    cluster = SignalCluster.objects.filter(cluster_id=cluster_id).first()
+                    cluster_id, cluster_confidence = cluster_index.assign(signal_data)
+                    cluster = cluster_index.clusters.get(cluster_id)
                     
                     if cluster:
-                        cluster_reliability = cluster.get_cluster_reliability_score()
+                        cluster_reliability = cluster['reliability']
                         breakdown['cluster_reliability'] = round(cluster_reliability, 3)
                         breakdown['cluster_id'] = cluster_id
-                        breakdown['cluster_name'] = cluster.cluster_name
-                        breakdown['cluster_win_rate'] = round(cluster.win_rate, 2)
+                        breakdown['cluster_name'] = cluster['name']
+                        breakdown['cluster_win_rate'] = round(cluster['win_rate'], 2)
                         breakdown['cluster_confidence'] = round(cluster_confidence, 2)
                         
                         # Interpret cluster
@@ -533,10 +533,11 @@ def score_signal(signal):
     Returns:
         TradeScore instance (saved to DB)
     """
-    from signals.models import TradeScore, ScoringWeights
+    from signals.models import TradeScore
+    from signals.config_cache import get_active_scoring_weights
     
-    # Get active weights
-    weights_obj = ScoringWeights.get_active_weights()
+    # Get active weights (cached per worker)
+    weights_obj = get_active_scoring_weights()
     weights = weights_obj.weights
     
     # Create scorer with strategy-specific adjustments
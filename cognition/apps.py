@@ -5,3 +5,7 @@ class CognitionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cognition'
     verbose_name = 'Cognitive Intelligence'
+    
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import cognition.signals  # noqa
@@ -0,0 +1,60 @@
+"""
+Management command to fit / update the persisted signal clusters.
+
+Usage:
+    python manage.py refit_signal_clusters            # incremental (new outcomes only)
+    python manage.py refit_signal_clusters --full     # recluster all history
+    python manage.py refit_signal_clusters --full --clusters 8
+
+Run incrementally from cron; a full refit is only needed occasionally
+(or when changing the number of clusters).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cognition.utils.signal_clusterer import DEFAULT_CLUSTERS, refit_signal_clusters
+
+
+class Command(BaseCommand):
+    help = 'Fit (MiniBatchKMeans) or incrementally update the persisted signal clusters'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recluster all resolved signals instead of folding in new outcomes'
+        )
+        
+        parser.add_argument(
+            '--clusters',
+            type=int,
+            default=DEFAULT_CLUSTERS,
+            help=f'Number of clusters (default: {DEFAULT_CLUSTERS}); a change forces a full refit'
+        )
+    
+    def handle(self, *args, **options):
+        n_clusters = options['clusters']
+        if n_clusters < 2:
+            raise CommandError("--clusters must be at least 2")
+        
+        self.stdout.write("\n🧠 Refitting Signal Clusters")
+        self.stdout.write(f"{'=' * 50}")
+        
+        try:
+            summary = refit_signal_clusters(n_clusters=n_clusters, full=options['full'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        
+        if summary['mode'] == 'skipped':
+            self.stdout.write(self.style.WARNING(
+                f"⚠️  Only {summary['signals']} resolved signals - need at least {n_clusters}"
+            ))
+            return
+        
+        if not summary['signals']:
+            self.stdout.write(self.style.WARNING("⚠️  No new resolved signals"))
+            return
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ {summary['mode'].title()} refit: {summary['signals']} signals, {summary['clusters']} clusters"
+        ))
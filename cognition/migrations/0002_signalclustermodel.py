@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cognition', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SignalClusterModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(default='default', max_length=50, unique=True)),
+                ('feature_names', models.JSONField(default=list)),
+                ('scaler_mean', models.JSONField(default=list)),
+                ('scaler_scale', models.JSONField(default=list)),
+                ('centroids', models.JSONField(default=list)),
+                ('cluster_stats', models.JSONField(default=list, help_text='Per-cluster running totals used for incremental metric updates')),
+                ('n_samples_seen', models.IntegerField(default=0)),
+                ('last_outcome_at', models.DateTimeField(blank=True, help_text='Latest Signal.updated_at already folded into the model', null=True)),
+                ('fitted_at', models.DateTimeField(blank=True, help_text='Last full refit', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
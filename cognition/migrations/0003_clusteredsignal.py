@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cognition', '0002_signalclustermodel'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='signalclustermodel',
+            name='last_outcome_at',
+        ),
+        migrations.CreateModel(
+            name='ClusteredSignal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signal_id', models.BigIntegerField()),
+                ('cluster_id', models.IntegerField()),
+                ('folded_at', models.DateTimeField(auto_now_add=True)),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='folded_signals', to='cognition.signalclustermodel')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='clusteredsignal',
+            constraint=models.UniqueConstraint(fields=('model', 'signal_id'), name='cognition_unique_folded_signal'),
+        ),
+    ]
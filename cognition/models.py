@@ -274,6 +274,59 @@ class SignalCluster(models.Model):
         return performance_score * sample_penalty * self.confidence_interval
 
 
+class SignalClusterModel(models.Model):
+    """
+    Fitted clustering state shared by the SignalCluster rows
+    
+    Scaler parameters and centroids are persisted so scoring can assign a
+    signal to its nearest cluster without refitting, and later refits can
+    update the centroids incrementally from new outcomes.
+    """
+    name = models.CharField(max_length=50, unique=True, default='default')
+    
+    # Feature scaling (StandardScaler parameters)
+    feature_names = models.JSONField(default=list)
+    scaler_mean = models.JSONField(default=list)
+    scaler_scale = models.JSONField(default=list)
+    
+    # Cluster centres in scaled feature space, indexed by cluster_id
+    centroids = models.JSONField(default=list)
+    cluster_stats = models.JSONField(
+        default=list,
+        help_text="Per-cluster running totals used for incremental metric updates"
+    )
+    
+    # Refit bookkeeping
+    n_samples_seen = models.IntegerField(default=0)
+    fitted_at = models.DateTimeField(null=True, blank=True, help_text="Last full refit")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Cluster model '{self.name}' ({len(self.centroids)} clusters, {self.n_samples_seen} signals)"
+
+
+class ClusteredSignal(models.Model):
+    """
+    A resolved signal already folded into a cluster model
+
+    Incremental refits skip these, so saving a resolved signal again never
+    counts it twice. The Signal id is stored as a plain integer so folding
+    never touches the signals table; a full refit starts the list over.
+    """
+    model = models.ForeignKey(SignalClusterModel, on_delete=models.CASCADE, related_name='folded_signals')
+    signal_id = models.BigIntegerField()
+    cluster_id = models.IntegerField()
+    folded_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'signal_id'], name='cognition_unique_folded_signal'),
+        ]
+    
+    def __str__(self):
+        return f"Signal {self.signal_id} -> cluster {self.cluster_id}"
+
+
 class PropFirmPrediction(models.Model):
     """
     Predicts likelihood of passing prop firm challenge based on trading metrics
@@ -0,0 +1,19 @@
+"""
+Signal handlers that invalidate the per-process cluster index
+"""
+import logging
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from zenithedge.local_store import bump_version_on_commit
+
+from .utils.signal_clusterer import CLUSTER_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+@receiver([post_save, post_delete], sender='cognition.SignalCluster')
+@receiver([post_save, post_delete], sender='cognition.SignalClusterModel')
+def invalidate_cluster_index(sender, instance, **kwargs):
+    """Bump the shared cluster version (on commit) so every worker reloads its centroids"""
+    bump_version_on_commit(CLUSTER_VERSION)
@@ -0,0 +1,115 @@
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from signals.models import Signal
+from zenithedge.local_store import clear_versioned, close_connections
+
+from .models import SignalCluster, SignalClusterModel
+from .utils.signal_clusterer import get_cluster_index, refit_signal_clusters
+
+
+class SignalClusterIndexTestCase(TestCase):
+    """Test cases for the persisted, pre-fitted signal clusterer"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(LOCAL_STORE_DIR=self.tmpdir)
+        self.settings_override.enable()
+        clear_versioned()
+        self.start = datetime(2025, 2, 3, 0, 0, tzinfo=dt_timezone.utc)
+
+    def tearDown(self):
+        clear_versioned()
+        close_connections()
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir)
+
+    def _rows(self, count, offset=0):
+        """Two obvious groups: high-confidence 1h London signals, low-confidence 5m Asia signals"""
+        rows = []
+        for i in range(offset, offset + count):
+            london = i % 2 == 0
+            rows.append({
+                'id': i + 1,
+                'symbol': 'EURUSD' if london else 'USDJPY',
+                'timeframe': '1h' if london else '5m',
+                'strategy': 'smc' if london else 'scalp',
+                'confidence': 85 + i % 5 if london else 40 + i % 5,
+                'timestamp': None,
+                'received_at': self.start + timedelta(days=i % 5, hours=9 if london else 2),
+                'price': 1.1, 'sl': 1.09, 'tp': 1.12,
+                'outcome': 'win' if london else 'loss',
+            })
+        return rows
+
+    def _refit(self, rows, **kwargs):
+        """Refit against ``rows`` as the resolved signals in the database"""
+        def queryset(rows):
+            fake = mock.MagicMock()
+            fake.exclude.side_effect = lambda id__in: queryset(
+                [row for row in rows if row['id'] not in {folded['signal_id'] for folded in id__in}]
+            )
+            fake.order_by.return_value.values.return_value = rows
+            return fake
+        with mock.patch.object(Signal.objects, 'filter', return_value=queryset(rows)):
+            return refit_signal_clusters(**kwargs)
+
+    def test_no_model_means_no_index(self):
+        """Scoring stays neutral until clusters have been fitted"""
+        self.assertIsNone(get_cluster_index())
+
+    def test_full_fit_persists_centroids_and_metrics(self):
+        """A full fit stores scaler/centroids and per-cluster metrics"""
+        summary = self._refit(self._rows(40), n_clusters=2)
+
+        self.assertEqual(summary['mode'], 'full')
+        state = SignalClusterModel.objects.get()
+        self.assertEqual(len(state.centroids), 2)
+        self.assertEqual(state.n_samples_seen, 40)
+
+        win_rates = sorted(SignalCluster.objects.values_list('win_rate', flat=True))
+        self.assertEqual(win_rates, [0.0, 1.0])
+
+    def test_index_assigns_nearest_centroid(self):
+        """The cached index maps a new signal to the cluster of its group"""
+        self._refit(self._rows(40), n_clusters=2)
+        index = get_cluster_index()
+
+        london_id, confidence = index.assign({
+            'confidence': 87, 'timeframe': '1H', 'timestamp': '2025-02-10T09:00:00Z'
+        })
+
+        self.assertEqual(index.clusters[london_id]['win_rate'], 1.0)
+        self.assertGreater(confidence, 0.3)
+
+    def test_incremental_update_folds_in_new_outcomes(self):
+        """Later refits only add new outcomes to the running totals"""
+        self._refit(self._rows(40), n_clusters=2)
+        summary = self._refit(self._rows(10, offset=40), n_clusters=2)
+
+        self.assertEqual(summary['mode'], 'incremental')
+        state = SignalClusterModel.objects.get()
+        self.assertEqual(state.n_samples_seen, 50)
+        self.assertEqual(sum(SignalCluster.objects.values_list('signal_count', flat=True)), 50)
+
+    def test_resaved_signals_are_not_folded_twice(self):
+        """Signals already folded in are skipped however often they are saved"""
+        rows = self._rows(40)
+        self._refit(rows, n_clusters=2)
+        before = list(SignalClusterModel.objects.get().centroids)
+
+        summary = self._refit(rows + self._rows(4, offset=40), n_clusters=2)
+        self.assertEqual(summary['signals'], 4)
+        self.assertEqual(self._refit(rows + self._rows(4, offset=40), n_clusters=2)['signals'], 0)
+
+        state = SignalClusterModel.objects.get()
+        self.assertEqual(state.n_samples_seen, 44)
+        self.assertEqual(state.folded_signals.count(), 44)
+        self.assertNotEqual(state.centroids, before)
+
+        self._refit(rows, n_clusters=2, full=True)
+        self.assertEqual(SignalClusterModel.objects.get().folded_signals.count(), 40)
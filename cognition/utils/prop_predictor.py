@@ -3,17 +3,16 @@ Prop Firm Challenge Predictor
 Predicts probability of passing prop firm challenges using ML
 """
 import logging
-import numpy as np
 from typing import Dict, List, Tuple
 
+from zenithedge.lazy_imports import is_available, lazy_import
+
 logger = logging.getLogger(__name__)
 
-try:
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.preprocessing import StandardScaler
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+np = lazy_import('numpy')
+
+SKLEARN_AVAILABLE = is_available('sklearn')
+if not SKLEARN_AVAILABLE:
     logger.warning("scikit-learn not available")
 
 
@@ -24,8 +23,14 @@ class PropFirmPredictor:
     
     def __init__(self):
         """Initialize predictor"""
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42) if SKLEARN_AVAILABLE else None
-        self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
+        if SKLEARN_AVAILABLE:
+            from sklearn.ensemble import RandomForestClassifier
+            from sklearn.preprocessing import StandardScaler
+            self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+            self.scaler = StandardScaler()
+        else:
+            self.model = None
+            self.scaler = None
         self.is_trained = False
     
     def predict(self, user_metrics: Dict) -> Dict:
@@ -11,49 +11,25 @@ import logging
 from typing import Dict, List, Tuple
 from collections import Counter
 
+from zenithedge.lazy_imports import is_available, spacy_model
+
 logger = logging.getLogger(__name__)
 
-# Lazy imports for NLP libraries
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
+# NLP libraries are imported on first use, not at startup
+TEXTBLOB_AVAILABLE = is_available('textblob')
+if not TEXTBLOB_AVAILABLE:
     logger.warning("TextBlob not available")
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    VADER_AVAILABLE = True
-except ImportError:
-    VADER_AVAILABLE = False
+VADER_AVAILABLE = is_available('vaderSentiment')
+if not VADER_AVAILABLE:
     logger.warning("VADER not available")
 
-try:
-    import spacy
-    try:
-        nlp = spacy.load('en_core_web_sm')
-        SPACY_AVAILABLE = True
-    except OSError:
-        SPACY_AVAILABLE = False
-        logger.warning("spaCy model not available")
-except ImportError:
-    SPACY_AVAILABLE = False
+SPACY_AVAILABLE = is_available('spacy')
+if not SPACY_AVAILABLE:
     logger.warning("spaCy not available")
 
-try:
-    import nltk
-    from nltk.tokenize import word_tokenize
-    from nltk.corpus import stopwords
-    NLTK_AVAILABLE = True
-    # Try to use stopwords, download if not available
-    try:
-        stopwords.words('english')
-    except LookupError:
-        logger.info("Downloading NLTK stopwords")
-        nltk.download('stopwords', quiet=True)
-        nltk.download('punkt', quiet=True)
-except ImportError:
-    NLTK_AVAILABLE = False
+NLTK_AVAILABLE = is_available('nltk')
+if not NLTK_AVAILABLE:
     logger.warning("NLTK not available")
 
 
@@ -144,7 +120,11 @@ class PsychologyAnalyzer:
     
     def __init__(self):
         """Initialize the psychology analyzer"""
-        self.vader_analyzer = SentimentIntensityAnalyzer() if VADER_AVAILABLE else None
+        if VADER_AVAILABLE:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            self.vader_analyzer = SentimentIntensityAnalyzer()
+        else:
+            self.vader_analyzer = None
         
     def analyze(self, text: str) -> Dict:
         """
@@ -202,6 +182,7 @@ class PsychologyAnalyzer:
         # TextBlob sentiment
         if TEXTBLOB_AVAILABLE:
             try:
+                from textblob import TextBlob
                 blob = TextBlob(text)
                 sentiments.append(blob.sentiment.polarity)
             except Exception as e:
@@ -286,7 +267,8 @@ class PsychologyAnalyzer:
             entities['symbols'].extend([m.upper() for m in matches])
         
         # Use spaCy if available
-        if SPACY_AVAILABLE:
+        nlp = spacy_model()
+        if nlp is not None:
             try:
                 doc = nlp(text)
                 # Extract organizations (could be brokers, firms)
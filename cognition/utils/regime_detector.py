@@ -2,25 +2,25 @@
 Market Regime Detector for Cognition Module
 Classifies market state using pandas and technical indicators
 """
+from __future__ import annotations
+
 import logging
-import numpy as np
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 
+from zenithedge.lazy_imports import is_available, lazy_import
+
 logger = logging.getLogger(__name__)
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+PANDAS_AVAILABLE = is_available('pandas')
+if not PANDAS_AVAILABLE:
     logger.warning("pandas not available")
 
-try:
-    from sklearn.preprocessing import StandardScaler
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+SKLEARN_AVAILABLE = is_available('sklearn')
+if not SKLEARN_AVAILABLE:
     logger.warning("scikit-learn not available")
 
 
@@ -31,7 +31,11 @@ class RegimeDetector:
     
     def __init__(self):
         """Initialize regime detector"""
-        self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
+        if SKLEARN_AVAILABLE:
+            from sklearn.preprocessing import StandardScaler
+            self.scaler = StandardScaler()
+        else:
+            self.scaler = None
     
     def detect_regime(self, ohlc_data: pd.DataFrame) -> Dict:
         """
@@ -2,29 +2,41 @@
 Signal Clusterer for Cognition Module
 Groups similar trading signals using scikit-learn clustering
 """
+from __future__ import annotations
+
 import logging
-import numpy as np
-from typing import Dict, List, Tuple
+import math
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+from zenithedge.lazy_imports import is_available, lazy_import
 
 logger = logging.getLogger(__name__)
 
-try:
-    from sklearn.cluster import KMeans
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.metrics import silhouette_score
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+SKLEARN_AVAILABLE = is_available('sklearn')
+if not SKLEARN_AVAILABLE:
     logger.warning("scikit-learn not available")
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+PANDAS_AVAILABLE = is_available('pandas')
+if not PANDAS_AVAILABLE:
     logger.warning("pandas not available")
 
 
+# Features available when a signal is scored (no outcome yet)
+CLUSTER_FEATURES = ['confidence', 'timeframe_minutes', 'hour', 'day_of_week']
+
+TIMEFRAME_MINUTES = {'1m': 1, '5m': 5, '15m': 15, '1h': 60, '4h': 240, '1d': 1440}
+
+# Persisted model name and the shared version bumped when it changes
+CLUSTER_MODEL_NAME = 'default'
+CLUSTER_VERSION = 'cognition.signal_clusters'
+
+DEFAULT_CLUSTERS = 5
+
+
 class SignalClusterer:
     """
     Clusters trading signals by behavior and performance patterns
@@ -38,7 +50,11 @@ class SignalClusterer:
             n_clusters: Number of clusters to create
         """
         self.n_clusters = n_clusters
-        self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
+        if SKLEARN_AVAILABLE:
+            from sklearn.preprocessing import StandardScaler
+            self.scaler = StandardScaler()
+        else:
+            self.scaler = None
         self.kmeans = None
     
     def cluster_signals(self, signals_data: List[Dict]) -> Dict:
@@ -68,6 +84,8 @@ class SignalClusterer:
             scaled_features = self.scaler.fit_transform(features)
             
             # Perform clustering
+            from sklearn.cluster import KMeans
+            from sklearn.metrics import silhouette_score
             self.kmeans = KMeans(n_clusters=self.n_clusters, random_state=42, n_init=10)
             cluster_labels = self.kmeans.fit_predict(scaled_features)
             
@@ -121,8 +139,7 @@ class SignalClusterer:
         
         if 'timeframe' in df.columns:
             # Convert timeframe to numeric (minutes)
-            timeframe_map = {'1m': 1, '5m': 5, '15m': 15, '1h': 60, '4h': 240, '1d': 1440}
-            df['timeframe_minutes'] = df['timeframe'].map(timeframe_map).fillna(15)
+            df['timeframe_minutes'] = df['timeframe'].map(TIMEFRAME_MINUTES).fillna(15)
             feature_cols.append('timeframe_minutes')
         
         # Strategy features
@@ -253,7 +270,11 @@ class SignalClusterer:
             (cluster_id, reliability_score)
         """
         if self.kmeans is None or not SKLEARN_AVAILABLE:
-            return 0, 0.5
+            # Use the persisted, pre-fitted centroids
+            index = get_cluster_index()
+            if index is None:
+                return 0, 0.5
+            return index.assign(signal_features)
         
         try:
             # Convert features to array
@@ -309,3 +330,287 @@ def cluster_signals(signals_data: List[Dict], n_clusters: int = 5) -> Dict:
     """
     clusterer = SignalClusterer(n_clusters=n_clusters)
     return clusterer.cluster_signals(signals_data)
+
+
+def _parse_signal_time(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+        try:
+            seconds = float(value)
+            return datetime.fromtimestamp(seconds / 1000 if seconds > 1e11 else seconds, tz=dt_timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            pass
+    return None
+
+
+def signal_feature_vector(signal_data: Dict) -> np.ndarray:
+    """
+    Feature vector (CLUSTER_FEATURES order) for a signal dict
+    
+    Accepts the scoring payload (timestamp string, timeframe like '4H')
+    as well as Signal rows from ``values()`` (received_at datetime).
+    """
+    when = _parse_signal_time(signal_data.get('timestamp')) or _parse_signal_time(signal_data.get('received_at'))
+    if when is None:
+        from django.utils import timezone
+        when = timezone.now()
+    
+    timeframe = str(signal_data.get('timeframe') or '15m').lower()
+    if timeframe.isdigit():
+        minutes = int(timeframe)
+    else:
+        minutes = TIMEFRAME_MINUTES.get(timeframe, 15)
+    
+    try:
+        confidence = float(signal_data.get('confidence') or 50)
+    except (TypeError, ValueError):
+        confidence = 50.0
+    
+    return np.array([confidence, minutes, when.hour, when.weekday()], dtype=float)
+
+
+class ClusterIndex:
+    """
+    Read-only nearest-centroid lookup built from the persisted model
+    
+    Assignment is a handful of NumPy operations on a (k, n_features)
+    array - no sklearn objects and no queries.
+    """
+    
+    def __init__(self, mean: np.ndarray, scale: np.ndarray, centroids: np.ndarray, clusters: Dict[int, Dict]):
+        self.mean = mean
+        self.scale = scale
+        self.centroids = centroids
+        self.clusters = clusters
+    
+    def assign(self, signal_data: Dict) -> Tuple[int, float]:
+        """
+        Returns:
+            (cluster_id, confidence) - confidence is 1 / (1 + distance to centroid)
+        """
+        scaled = (signal_feature_vector(signal_data) - self.mean) / self.scale
+        distances = ((self.centroids - scaled) ** 2).sum(axis=1)
+        cluster_id = int(distances.argmin())
+        return cluster_id, float(1.0 / (1.0 + math.sqrt(distances[cluster_id])))
+
+
+def _load_cluster_index() -> Optional[ClusterIndex]:
+    from cognition.models import SignalCluster, SignalClusterModel
+    
+    state = SignalClusterModel.objects.filter(name=CLUSTER_MODEL_NAME).first()
+    if state is None or not state.centroids:
+        return None
+    
+    clusters = {
+        cluster.cluster_id: {
+            'name': cluster.cluster_name,
+            'reliability': cluster.get_cluster_reliability_score(),
+            'win_rate': cluster.win_rate,
+        }
+        for cluster in SignalCluster.objects.all()
+    }
+    
+    return ClusterIndex(
+        mean=np.array(state.scaler_mean, dtype=float),
+        scale=np.array(state.scaler_scale, dtype=float),
+        centroids=np.array(state.centroids, dtype=float),
+        clusters=clusters,
+    )
+
+
+def get_cluster_index() -> Optional[ClusterIndex]:
+    """
+    Per-process nearest-centroid index (None until clusters have been fitted)
+    
+    Reloaded only when the model or a SignalCluster row changes
+    (see cognition.signals).
+    """
+    from zenithedge.local_store import get_versioned
+    
+    return get_versioned('cognition.cluster_index', _load_cluster_index, CLUSTER_VERSION)
+
+
+def _risk_reward(row: Dict) -> Optional[float]:
+    try:
+        price, sl, tp = float(row['price']), float(row['sl']), float(row['tp'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    risk = abs(price - sl)
+    return abs(tp - price) / risk if risk > 0 else None
+
+
+def _empty_stats() -> Dict:
+    return {
+        'n': 0, 'wins': 0, 'gross_profit': 0.0, 'gross_loss': 0.0,
+        'sum_r': 0.0, 'sum_r2': 0.0, 'sum_rr': 0.0, 'n_rr': 0,
+        'symbols': {}, 'timeframes': {}, 'strategies': {},
+    }
+
+
+def _accumulate(stats: Dict, row: Dict):
+    """Fold one resolved signal into a cluster's running totals (R multiples)"""
+    rr = _risk_reward(row)
+    r = (rr if rr is not None else 1.0) if row['outcome'] == 'win' else -1.0
+    
+    stats['n'] += 1
+    stats['wins'] += int(row['outcome'] == 'win')
+    if r > 0:
+        stats['gross_profit'] += r
+    else:
+        stats['gross_loss'] += -r
+    stats['sum_r'] += r
+    stats['sum_r2'] += r * r
+    if rr is not None:
+        stats['sum_rr'] += rr
+        stats['n_rr'] += 1
+    
+    for key, field in (('symbols', 'symbol'), ('timeframes', 'timeframe'), ('strategies', 'strategy')):
+        value = row.get(field) or ''
+        stats[key][value] = stats[key].get(value, 0) + 1
+
+
+def _cluster_metrics(stats: Dict) -> Dict:
+    """SignalCluster field values from running totals"""
+    n = stats['n']
+    win_rate = stats['wins'] / n if n else 0.5
+    profit_factor = stats['gross_profit'] / stats['gross_loss'] if stats['gross_loss'] > 0 else 1.0
+    mean_r = stats['sum_r'] / n if n else 0.0
+    variance = stats['sum_r2'] / (n - 1) - mean_r * mean_r * n / (n - 1) if n > 1 else 0.0
+    sharpe = mean_r / math.sqrt(variance) if variance > 0 else 0.0
+    
+    def top(counter, count=1):
+        return [k for k, _ in sorted(counter.items(), key=lambda kv: -kv[1])[:count]]
+    
+    return {
+        'signal_count': n,
+        'win_rate': float(win_rate),
+        'avg_profit_factor': float(profit_factor),
+        'avg_risk_reward': float(stats['sum_rr'] / stats['n_rr']) if stats['n_rr'] else 1.5,
+        'sharpe_ratio': float(sharpe),
+        'reliability_score': SignalClusterer()._calculate_reliability(win_rate, profit_factor, sharpe, n),
+        'typical_symbols': top(stats['symbols'], 3),
+        'typical_timeframe': (top(stats['timeframes']) or [''])[0][:10],
+        'strategy_pattern': (top(stats['strategies']) or ['Unknown'])[0][:100],
+    }
+
+
+def refit_signal_clusters(n_clusters: int = DEFAULT_CLUSTERS, full: bool = False,
+                          batch_size: int = 256) -> Dict:
+    """
+    Fit or incrementally update the persisted signal clusters
+    
+    The first run (or ``full=True``) fits a StandardScaler and MiniBatchKMeans
+    on every resolved signal. Later runs only read resolved signals not yet
+    folded in (tracked by id in ClusteredSignal, so saving a resolved signal
+    again never counts it twice); each is assigned to its nearest centroid,
+    which moves towards it with a 1/count learning rate (the MiniBatchKMeans
+    update), and the cluster's running totals are updated.
+    
+    Args:
+        n_clusters: Number of clusters (changing it forces a full refit)
+        full: Recluster all history instead of updating incrementally
+        batch_size: MiniBatchKMeans batch size for full fits
+        
+    Returns:
+        Summary dict with mode, signals processed and cluster count
+    """
+    from django.db import transaction
+    from django.utils import timezone
+    from cognition.models import ClusteredSignal, SignalCluster, SignalClusterModel
+    from signals.models import Signal
+    
+    state = SignalClusterModel.objects.filter(name=CLUSTER_MODEL_NAME).first()
+    full = full or state is None or len(state.centroids) != n_clusters
+    
+    resolved = Signal.objects.filter(outcome__in=['win', 'loss'])
+    if not full:
+        resolved = resolved.exclude(id__in=state.folded_signals.values('signal_id'))
+    
+    rows = list(resolved.order_by('updated_at').values(
+        'id', 'symbol', 'timeframe', 'strategy', 'confidence', 'timestamp', 'received_at',
+        'price', 'sl', 'tp', 'outcome',
+    ))
+    summary = {'mode': 'full' if full else 'incremental', 'signals': len(rows), 'clusters': n_clusters}
+    
+    if not rows:
+        return summary
+    
+    features = np.array([signal_feature_vector(row) for row in rows])
+    
+    if full:
+        if not SKLEARN_AVAILABLE:
+            raise RuntimeError("scikit-learn is required for a full cluster refit")
+        if len(rows) < n_clusters:
+            summary['mode'] = 'skipped'
+            return summary
+        
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.preprocessing import StandardScaler
+        scaler = StandardScaler().fit(features)
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters, batch_size=batch_size, random_state=42, n_init=3
+        ).fit(scaler.transform(features))
+        
+        mean, scale = scaler.mean_, scaler.scale_
+        centroids = kmeans.cluster_centers_
+        labels = [int(label) for label in kmeans.labels_]
+        stats = [_empty_stats() for _ in range(n_clusters)]
+        for row, label in zip(rows, labels):
+            _accumulate(stats[label], row)
+    else:
+        mean = np.array(state.scaler_mean, dtype=float)
+        scale = np.array(state.scaler_scale, dtype=float)
+        centroids = np.array(state.centroids, dtype=float)
+        stats = state.cluster_stats
+        labels = []
+        
+        for row, point in zip(rows, (features - mean) / scale):
+            label = int(((centroids - point) ** 2).sum(axis=1).argmin())
+            labels.append(label)
+            # Per-centre learning rate 1/count, as in MiniBatchKMeans
+            centroids[label] += (point - centroids[label]) / (stats[label]['n'] + 1)
+            _accumulate(stats[label], row)
+    
+    with transaction.atomic():
+        if state is None:
+            state = SignalClusterModel(name=CLUSTER_MODEL_NAME)
+        state.feature_names = CLUSTER_FEATURES
+        state.scaler_mean = mean.tolist()
+        state.scaler_scale = scale.tolist()
+        state.centroids = centroids.tolist()
+        state.cluster_stats = stats
+        state.n_samples_seen = (0 if full else state.n_samples_seen) + len(rows)
+        if full:
+            state.fitted_at = timezone.now()
+        state.save()
+        
+        if full:
+            state.folded_signals.all().delete()
+        ClusteredSignal.objects.bulk_create(
+            [ClusteredSignal(model=state, signal_id=row['id'], cluster_id=label) for row, label in zip(rows, labels)],
+            batch_size=1000,
+        )
+        
+        if full:
+            SignalCluster.objects.filter(cluster_id__gte=n_clusters).delete()
+        
+        for cluster_id, cluster_stats in enumerate(stats):
+            metrics = _cluster_metrics(cluster_stats)
+            metrics['feature_centroid'] = dict(zip(CLUSTER_FEATURES, (centroids[cluster_id] * scale + mean).tolist()))
+            
+            cluster = SignalCluster.objects.filter(cluster_id=cluster_id).first()
+            if cluster is None or full:
+                metrics['cluster_name'] = f"{metrics['strategy_pattern']} {metrics['typical_timeframe']} #{cluster_id}"[:50]
+            if cluster is None:
+                cluster = SignalCluster(cluster_id=cluster_id)
+            for field, value in metrics.items():
+                setattr(cluster, field, value)
+            cluster.save()
+    
+    logger.info(f"Signal clusters refit ({summary['mode']}): {len(rows)} signals, {n_clusters} clusters")
+    return summary
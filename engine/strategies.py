@@ -784,6 +784,9 @@ class MultiTimeframeDetector:
     - Confluence scoring
     """
     
+    # marketdata rollup labels -> timeframe labels used by get_higher_timeframe
+    PYRAMID_TIMEFRAMES = {'1m': '1', '5m': '5', '15m': '15', '1h': '1H', '4h': '4H', '1d': 'D'}
+    
     def __init__(self, htf_multiplier=4):
         self.htf_multiplier = htf_multiplier
     
@@ -795,11 +798,33 @@ class MultiTimeframeDetector:
         }
         return tf_map.get(timeframe, 'D')
     
+    def load_htf_frame(self, symbol: str, timeframe: str, end: datetime) -> Optional[pd.DataFrame]:
+        """
+        Load completed higher-timeframe bars from the marketdata rollup pyramid
+        
+        Returns None when no rollups exist (or outside Django), so callers
+        fall back to the long-lookback approximation.
+        """
+        try:
+            from marketdata.rollups import load_frame, normalize_timeframe
+            
+            ltf = self.PYRAMID_TIMEFRAMES.get(normalize_timeframe(timeframe), timeframe)
+            htf = self.get_higher_timeframe(ltf)
+            htf_df = load_frame(symbol, htf, end=pd.Timestamp(end).to_pydatetime(), bars=100)
+            
+            if htf_df is None or len(htf_df) < 20:
+                return None
+            return htf_df
+        
+        except Exception:
+            return None
+    
     def detect(self, df: pd.DataFrame, symbol: str, timeframe: str, htf_df: Optional[pd.DataFrame] = None) -> List[StrategySignal]:
         """
         Detect MTF signals
         
-        Note: htf_df should be pre-fetched higher timeframe data
+        Note: htf_df may be pre-fetched higher timeframe data; otherwise it
+        is read from the marketdata rollup pyramid when available
         """
         signals = []
         
@@ -810,7 +835,10 @@ class MultiTimeframeDetector:
         current_bar = df.iloc[-1]
         current_time = df.index[-1]
         
-        # If no HTF data provided, resample current df
+        # If no HTF data provided, read real HTF bars from the rollup store
+        if htf_df is None and isinstance(current_time, (datetime, pd.Timestamp)):
+            htf_df = self.load_htf_frame(symbol, timeframe, current_time)
+        
         if htf_df is None:
             # Simple approach: use trend from longer lookback
             htf_structure = market_structure(df.tail(200), swing_period=20)
@@ -2,32 +2,32 @@
 Embedding & Semantic Search System for Knowledge Base
 Uses sentence-transformers + FAISS for fast vector search
 """
+from __future__ import annotations
+
 import os
 import logging
 import pickle
 import hashlib
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-import numpy as np
 
-try:
-    from sentence_transformers import SentenceTransformer
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+from django.conf import settings
+from django.utils import timezone as dj_timezone
+from zenithedge.lazy_imports import is_available, lazy_import
+from .models import KnowledgeEntry, QueryCache, ConceptRelationship, QUERY_CACHE_HITS
+
+# sentence-transformers (and torch) load with the first EmbeddingEngine
+np = lazy_import('numpy')
+faiss = lazy_import('faiss')
+
+TRANSFORMERS_AVAILABLE = is_available('sentence_transformers')
+if not TRANSFORMERS_AVAILABLE:
     logging.warning("sentence-transformers not installed - embeddings disabled")
 
-try:
-    import faiss
-    FAISS_AVAILABLE = True
-except ImportError:
-    FAISS_AVAILABLE = False
+FAISS_AVAILABLE = is_available('faiss')
+if not FAISS_AVAILABLE:
     logging.warning("faiss not installed - using fallback search")
 
-from django.conf import settings
-from django.utils import timezone as dj_timezone
-from .models import KnowledgeEntry, QueryCache, ConceptRelationship
-
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +50,7 @@ class EmbeddingEngine:
         
         if TRANSFORMERS_AVAILABLE:
             try:
+                from sentence_transformers import SentenceTransformer
                 device = 'cuda' if use_cuda else 'cpu'
                 self.model = SentenceTransformer(model_name, device=device)
                 # Get embedding dimension
@@ -346,8 +347,7 @@ class KnowledgeBaseSearch:
             ).first()
             
             if cached:
-                cached.hit_count += 1
-                cached.save(update_fields=['hit_count', 'last_accessed'])
+                QUERY_CACHE_HITS.incr(cached.pk)
                 
                 # Fetch entries from cached IDs
                 entry_ids = [r['id'] for r in cached.results]
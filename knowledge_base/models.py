@@ -7,6 +7,8 @@ from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
 import json
 
+from zenithedge.write_behind import CounterBuffer
+
 
 class Source(models.Model):
     """
@@ -150,10 +152,10 @@ class KnowledgeEntry(models.Model):
         return f"{self.term} ({self.category})"
     
     def increment_usage(self):
-        """Track KB entry usage for analytics"""
+        """Track KB entry usage for analytics (written behind, see ENTRY_USAGE)"""
         self.view_count += 1
         self.last_used = timezone.now()
-        self.save(update_fields=['view_count', 'last_used'])
+        ENTRY_USAGE.incr(self.pk)
     
     def get_aliases_display(self):
         """Return comma-separated aliases"""
@@ -316,3 +318,9 @@ class QueryCache(models.Model):
     
     def is_expired(self):
         return timezone.now() > self.expires_at
+
+
+# Usage counters bumped on every search/lookup, written in bulk instead of
+# one save per hit
+ENTRY_USAGE = CounterBuffer('knowledge_base.KnowledgeEntry', 'view_count', touch_field='last_used')
+QUERY_CACHE_HITS = CounterBuffer('knowledge_base.QueryCache', 'hit_count', touch_field='last_accessed')
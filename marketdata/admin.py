@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import OHLCVCandle, DataSource
+from .models import OHLCVCandle, DataSource, RollupCoverage
 
 
 @admin.register(OHLCVCandle)
@@ -130,3 +130,12 @@ class DataSourceAdmin(admin.ModelAdmin):
         )
     colored_status.short_description = 'Last Sync'
     colored_status.admin_order_field = 'last_sync_status'
+
+
+@admin.register(RollupCoverage)
+class RollupCoverageAdmin(admin.ModelAdmin):
+    list_display = ('symbol', 'covered_from', 'covered_until', 'updated_at')
+    
+    search_fields = ('symbol',)
+    
+    readonly_fields = ('updated_at',)
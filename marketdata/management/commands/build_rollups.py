@@ -0,0 +1,67 @@
+"""
+Management command to build the 5m/15m/1h/4h/1d rollup pyramid from 1m candles.
+
+Usage:
+    python manage.py build_rollups                          # all symbols, full history
+    python manage.py build_rollups --symbol EURUSD
+    python manage.py build_rollups --symbol EURUSD --days 3 # only recent buckets
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from marketdata.models import OHLCVCandle
+from marketdata.rollups import BASE_TIMEFRAME, refresh_all_rollups, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Build or refresh OHLCV rollups (5m, 15m, 1h, 4h, 1d) from 1m candles'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--symbol',
+            help='Trading symbol (default: every symbol with 1m data)'
+        )
+        
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Only rebuild buckets from the last N days (default: full history)'
+        )
+    
+    def handle(self, *args, **options):
+        symbol = options['symbol'].upper() if options['symbol'] else None
+        days = options['days']
+        
+        self.stdout.write("\n🧱 Building OHLCV Rollups")
+        self.stdout.write(f"{'=' * 50}")
+        
+        if days is None:
+            results = refresh_all_rollups(symbol)
+        else:
+            if days <= 0:
+                raise CommandError("--days must be positive")
+            
+            base = OHLCVCandle.objects.filter(
+                timeframe=BASE_TIMEFRAME,
+                timestamp__gte=timezone.now() - timedelta(days=days)
+            )
+            if symbol:
+                base = base.filter(symbol=symbol)
+            
+            results = {}
+            for row in base.values('symbol').annotate(first=Min('timestamp'), last=Max('timestamp')):
+                results[row['symbol']] = refresh_rollups(row['symbol'], row['first'], row['last'])
+        
+        if not results:
+            self.stdout.write(self.style.WARNING("⚠️  No 1m candles found"))
+            return
+        
+        for sym, count in results.items():
+            self.stdout.write(f"   {sym}: {count} rollup bars")
+        
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Rollups built for {len(results)} symbol(s)"))
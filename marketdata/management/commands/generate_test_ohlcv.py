@@ -13,6 +13,7 @@ from datetime import timedelta
 from decimal import Decimal
 import random
 from marketdata.models import OHLCVCandle, DataSource
+from marketdata.rollups import BASE_TIMEFRAME, refresh_rollups
 
 
 class Command(BaseCommand):
@@ -184,5 +185,10 @@ class Command(BaseCommand):
             # Update data source
             data_source.mark_sync_success(candles_synced=created_count)
             
+            # Keep the 5m..1d pyramid in step with new 1m bars
+            if timeframe == BASE_TIMEFRAME and created_count > 0:
+                rollup_count = refresh_rollups(symbol, first.timestamp, last.timestamp)
+                self.stdout.write(f"   Rollups refreshed: {rollup_count} bars")
+            
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"\n❌ Failed to save: {e}"))
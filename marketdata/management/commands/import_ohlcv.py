@@ -10,6 +10,7 @@ from django.core.management.base import BaseCommand, CommandError
 import pandas as pd
 from datetime import datetime
 from marketdata.models import OHLCVCandle, DataSource
+from marketdata.rollups import BASE_TIMEFRAME, refresh_rollups
 
 
 class Command(BaseCommand):
@@ -169,6 +170,15 @@ class Command(BaseCommand):
             # Update data source stats
             data_source.mark_sync_success(candles_synced=created_count)
             
+            # Keep the 5m..1d pyramid in step with new 1m bars
+            if timeframe == BASE_TIMEFRAME and created_count > 0:
+                rollup_count = refresh_rollups(
+                    symbol,
+                    df[date_column].min().to_pydatetime(),
+                    df[date_column].max().to_pydatetime()
+                )
+                self.stdout.write(f"   Rollups refreshed: {rollup_count} bars")
+            
             self.stdout.write(f"\n📈 Database Stats:")
             total = OHLCVCandle.objects.filter(symbol=symbol, timeframe=timeframe).count()
             self.stdout.write(f"   Total {symbol} {timeframe} candles: {total}")
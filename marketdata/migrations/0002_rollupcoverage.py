@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketdata', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCoverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20, unique=True)),
+                ('covered_from', models.DateTimeField(help_text='Start of rolled-up range (UTC day boundary)')),
+                ('covered_until', models.DateTimeField(help_text='End of rolled-up range, exclusive (UTC day boundary)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Coverage',
+                'verbose_name_plural': 'Rollup Coverage',
+                'db_table': 'marketdata_rollup_coverage',
+            },
+        ),
+    ]
@@ -167,3 +167,27 @@ class DataSource(models.Model):
         self.last_sync_status = 'failed'
         self.last_sync_message = error_message
         self.save()
+
+
+class RollupCoverage(models.Model):
+    """
+    Time range over which the rollup pyramid (5m..1d) has been built for a symbol.
+    
+    Readers only trust rollup bars inside [covered_from, covered_until);
+    outside it they fall back to raw 1m candles.
+    """
+    
+    symbol = models.CharField(max_length=20, unique=True)
+    
+    covered_from = models.DateTimeField(help_text="Start of rolled-up range (UTC day boundary)")
+    covered_until = models.DateTimeField(help_text="End of rolled-up range, exclusive (UTC day boundary)")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'marketdata_rollup_coverage'
+        verbose_name = 'Rollup Coverage'
+        verbose_name_plural = 'Rollup Coverage'
+    
+    def __str__(self):
+        return f"{self.symbol} rollups {self.covered_from:%Y-%m-%d} to {self.covered_until:%Y-%m-%d}"
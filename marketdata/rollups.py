@@ -0,0 +1,412 @@
+"""
+Timeframe Pyramid (OHLCV Rollups)
+
+Builds and incrementally maintains 5m/15m/1h/4h/1d aggregates from the
+1-minute OHLCVCandle store. Rollup bars live in the same table as the raw
+candles (distinguished by ``timeframe`` and ``source='rollup'``) so every
+existing consumer can read them with the indexes it already uses. Bars
+imported at a rollup timeframe are never overwritten: the pyramid only
+fills the buckets they leave empty.
+
+Each level is cascaded from the one below it (1m -> 5m -> 15m -> 1h -> 4h
+-> 1d) and all buckets are aligned to the UNIX epoch in UTC, so a 1h bar
+always spans exactly four 15m bars.
+
+Usage:
+    from marketdata.rollups import refresh_rollups, load_candles
+
+    refresh_rollups('EURUSD', start, end)           # after importing 1m bars
+    candles = load_candles('EURUSD', start, end)    # coarsest covering bars
+"""
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from .models import OHLCVCandle, RollupCoverage
+
+logger = logging.getLogger(__name__)
+
+
+BASE_TIMEFRAME = '1m'
+
+# Rollup levels, finest first. Each level must be a multiple of the previous one.
+ROLLUP_TIMEFRAMES = ['5m', '15m', '1h', '4h', '1d']
+
+TIMEFRAME_MINUTES = {
+    '1m': 1,
+    '5m': 5,
+    '15m': 15,
+    '1h': 60,
+    '4h': 240,
+    '1d': 1440,
+}
+
+# Aliases used by the engine, TradingView payloads and autopsy horizons
+TIMEFRAME_ALIASES = {
+    '1': '1m', '1M': '1m', '1m': '1m',
+    '5': '5m', '5M': '5m', '5m': '5m',
+    '15': '15m', '15M': '15m', '15m': '15m',
+    '60': '1h', '1H': '1h', '1h': '1h', 'H1': '1h',
+    '240': '4h', '4H': '4h', '4h': '4h', 'H4': '4h',
+    'D': '1d', '1D': '1d', '1d': '1d', 'D1': '1d',
+}
+
+ROLLUP_SOURCE = 'rollup'
+
+# Days of 1m data aggregated per refresh chunk (bounds memory on backfills)
+CHUNK_DAYS = 7
+
+# Minimum bars a window should contain when auto-selecting a resolution
+DEFAULT_MIN_BARS = 12
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def normalize_timeframe(timeframe: str) -> Optional[str]:
+    """Map a timeframe alias (e.g. '1H', 'D', '15') to its pyramid label"""
+    if not timeframe:
+        return None
+    return TIMEFRAME_ALIASES.get(str(timeframe).strip())
+
+
+def timeframe_delta(timeframe: str) -> timedelta:
+    """Bucket length of a pyramid timeframe"""
+    return timedelta(minutes=TIMEFRAME_MINUTES[timeframe])
+
+
+def floor_timestamp(ts: datetime, delta: timedelta) -> datetime:
+    """Floor a timestamp to the start of its epoch-aligned bucket"""
+    if timezone.is_naive(ts):
+        ts = timezone.make_aware(ts, dt_timezone.utc)
+    return EPOCH + ((ts - EPOCH) // delta) * delta
+
+
+def ceil_timestamp(ts: datetime, delta: timedelta) -> datetime:
+    """Ceil a timestamp to the next bucket boundary (identity if aligned)"""
+    floored = floor_timestamp(ts, delta)
+    return floored if floored == ts else floored + delta
+
+
+def aggregate_bars(bars: Iterable[Dict], timeframe: str) -> List[Dict]:
+    """
+    Aggregate time-ordered bars into ``timeframe`` buckets.
+
+    Args:
+        bars: Dicts with timestamp/open_price/high/low/close/volume, sorted
+              by timestamp and finer than ``timeframe``
+        timeframe: Target pyramid timeframe
+
+    Returns:
+        List of aggregated bar dicts (same keys), one per non-empty bucket
+    """
+    delta = timeframe_delta(timeframe)
+    aggregated = []
+    current = None
+
+    for bar in bars:
+        bucket = floor_timestamp(bar['timestamp'], delta)
+
+        if current is None or current['timestamp'] != bucket:
+            current = {
+                'timestamp': bucket,
+                'open_price': bar['open_price'],
+                'high': bar['high'],
+                'low': bar['low'],
+                'close': bar['close'],
+                'volume': bar['volume'],
+            }
+            aggregated.append(current)
+            continue
+
+        if bar['high'] > current['high']:
+            current['high'] = bar['high']
+        if bar['low'] < current['low']:
+            current['low'] = bar['low']
+        current['close'] = bar['close']
+
+        if bar['volume'] is not None:
+            current['volume'] = bar['volume'] if current['volume'] is None else current['volume'] + bar['volume']
+
+    return aggregated
+
+
+def build_pyramid(base_bars: List[Dict]) -> Dict[str, List[Dict]]:
+    """Cascade 1m bars through every rollup level"""
+    levels = {}
+    previous = base_bars
+    for tf in ROLLUP_TIMEFRAMES:
+        previous = aggregate_bars(previous, tf)
+        levels[tf] = previous
+    return levels
+
+
+def refresh_rollups(symbol: str, start: datetime, end: datetime) -> int:
+    """
+    Rebuild every rollup bucket touched by 1m bars in [start, end].
+
+    The range is widened to whole UTC days so the coarsest (1d) bucket is
+    always recomputed from complete data. Call this after new 1m candles
+    arrive; repeated calls over the same range are idempotent.
+
+    Args:
+        symbol: Trading symbol
+        start: Earliest new/changed 1m candle timestamp
+        end: Latest new/changed 1m candle timestamp
+
+    Returns:
+        Number of rollup bars written
+    """
+    day = timeframe_delta('1d')
+    lo = floor_timestamp(start, day)
+    hi = floor_timestamp(end, day) + day
+
+    # Bridge any gap to the existing coverage so it stays one contiguous range
+    coverage = RollupCoverage.objects.filter(symbol=symbol).first()
+    if coverage:
+        if lo > coverage.covered_until:
+            lo = coverage.covered_until
+        if hi < coverage.covered_from:
+            hi = coverage.covered_from
+
+    written = 0
+    chunk = timedelta(days=CHUNK_DAYS)
+    chunk_lo = lo
+
+    while chunk_lo < hi:
+        chunk_hi = min(chunk_lo + chunk, hi)
+        written += _refresh_chunk(symbol, chunk_lo, chunk_hi)
+        chunk_lo = chunk_hi
+
+    if coverage:
+        coverage.covered_from = min(coverage.covered_from, lo)
+        coverage.covered_until = max(coverage.covered_until, hi)
+        coverage.save(update_fields=['covered_from', 'covered_until', 'updated_at'])
+    else:
+        RollupCoverage.objects.create(symbol=symbol, covered_from=lo, covered_until=hi)
+
+    logger.info(f"Refreshed {written} rollup bars for {symbol} ({lo} to {hi})")
+    return written
+
+
+def _refresh_chunk(symbol: str, lo: datetime, hi: datetime) -> int:
+    """Recompute rollups for a day-aligned [lo, hi) chunk"""
+    base_bars = list(
+        OHLCVCandle.objects.filter(
+            symbol=symbol,
+            timeframe=BASE_TIMEFRAME,
+            timestamp__gte=lo,
+            timestamp__lt=hi
+        ).order_by('timestamp').values(
+            'timestamp', 'open_price', 'high', 'low', 'close', 'volume'
+        )
+    )
+
+    rows = []
+    for tf, bars in build_pyramid(base_bars).items():
+        rows.extend(
+            OHLCVCandle(
+                symbol=symbol,
+                timeframe=tf,
+                source=ROLLUP_SOURCE,
+                **bar
+            )
+            for bar in bars
+        )
+
+    with transaction.atomic():
+        # Only pyramid-built bars are replaced; buckets already holding an
+        # imported bar (broker/CSV data at that timeframe) are left alone
+        OHLCVCandle.objects.filter(
+            symbol=symbol,
+            timeframe__in=ROLLUP_TIMEFRAMES,
+            source=ROLLUP_SOURCE,
+            timestamp__gte=lo,
+            timestamp__lt=hi
+        ).delete()
+
+        imported = set(
+            OHLCVCandle.objects.filter(
+                symbol=symbol,
+                timeframe__in=ROLLUP_TIMEFRAMES,
+                timestamp__gte=lo,
+                timestamp__lt=hi
+            ).values_list('timeframe', 'timestamp')
+        )
+        if imported:
+            rows = [row for row in rows if (row.timeframe, row.timestamp) not in imported]
+
+        OHLCVCandle.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
+
+
+def refresh_all_rollups(symbol: Optional[str] = None) -> Dict[str, int]:
+    """Rebuild rollups over the full 1m history of one or all symbols"""
+    base = OHLCVCandle.objects.filter(timeframe=BASE_TIMEFRAME)
+    if symbol:
+        base = base.filter(symbol=symbol)
+
+    results = {}
+    ranges = base.values('symbol').annotate(first=Min('timestamp'), last=Max('timestamp'))
+    for row in ranges:
+        results[row['symbol']] = refresh_rollups(row['symbol'], row['first'], row['last'])
+    return results
+
+
+def select_timeframe(start: datetime, end: datetime, min_bars: int = DEFAULT_MIN_BARS) -> str:
+    """
+    Pick the coarsest pyramid level that still yields ``min_bars`` bars.
+
+    A 24h window resolves to 1h (24 bars), a 4h window to 15m (16 bars).
+    """
+    span = end - start
+    for tf in reversed(ROLLUP_TIMEFRAMES):
+        if span // timeframe_delta(tf) >= min_bars:
+            return tf
+    return BASE_TIMEFRAME
+
+
+def _plan_segments(lo: datetime, hi: datetime, levels: List[str],
+                   covered: Optional[Tuple[datetime, datetime]]) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Split [lo, hi) into (timeframe, from, to) segments.
+
+    Whole buckets of the first level are used in the middle; the partial
+    edges recurse into the finer levels, bottoming out at 1m.
+    """
+    if lo >= hi:
+        return []
+    if not levels:
+        return [(BASE_TIMEFRAME, lo, hi)]
+
+    delta = timeframe_delta(levels[0])
+    inner_lo = ceil_timestamp(lo, delta)
+    inner_hi = floor_timestamp(hi, delta)
+
+    usable = (
+        covered is not None
+        and inner_lo < inner_hi
+        and covered[0] <= inner_lo
+        and inner_hi <= covered[1]
+    )
+    if not usable:
+        return _plan_segments(lo, hi, levels[1:], covered)
+
+    return (
+        _plan_segments(lo, inner_lo, levels[1:], covered)
+        + [(levels[0], inner_lo, inner_hi)]
+        + _plan_segments(inner_hi, hi, levels[1:], covered)
+    )
+
+
+def load_candles(symbol: str, start: datetime, end: datetime,
+                 timeframe: Optional[str] = None,
+                 min_bars: int = DEFAULT_MIN_BARS) -> List[Dict]:
+    """
+    Read candles for [start, end] at the coarsest available resolution.
+
+    Fully covered buckets come from the rollup level; partial buckets at
+    the window edges are filled from finer levels so the aggregate
+    open/high/low/close matches the raw 1m data exactly. Falls back to raw
+    1m candles wherever rollups have not been built. One query.
+
+    Args:
+        symbol: Trading symbol
+        start: Window start (inclusive)
+        end: Window end (inclusive)
+        timeframe: Target resolution (default: auto via select_timeframe)
+        min_bars: Minimum bars when auto-selecting the resolution
+
+    Returns:
+        List of candle dicts (timestamp, open, high, low, close, volume,
+        timeframe) ordered by timestamp
+    """
+    target = normalize_timeframe(timeframe) if timeframe else select_timeframe(start, end, min_bars)
+    if target is None:
+        target = BASE_TIMEFRAME
+
+    levels = [tf for tf in reversed(ROLLUP_TIMEFRAMES)
+              if TIMEFRAME_MINUTES[tf] <= TIMEFRAME_MINUTES[target]]
+
+    covered = None
+    if levels:
+        coverage = RollupCoverage.objects.filter(symbol=symbol).first()
+        if coverage:
+            covered = (coverage.covered_from, coverage.covered_until)
+
+    # Half-open window so an inclusive ``end`` keeps the candle opened at it
+    segments = _plan_segments(start, end + timedelta(microseconds=1), levels, covered)
+
+    query = Q()
+    for tf, seg_lo, seg_hi in segments:
+        query |= Q(timeframe=tf, timestamp__gte=seg_lo, timestamp__lt=seg_hi)
+
+    rows = OHLCVCandle.objects.filter(symbol=symbol).filter(query).order_by('timestamp').values(
+        'timestamp', 'timeframe', 'open_price', 'high', 'low', 'close', 'volume'
+    )
+
+    return [
+        {
+            'timestamp': row['timestamp'],
+            'timeframe': row['timeframe'],
+            'open': float(row['open_price']),
+            'high': float(row['high']),
+            'low': float(row['low']),
+            'close': float(row['close']),
+            'volume': float(row['volume']) if row['volume'] else 0
+        }
+        for row in rows
+    ]
+
+
+def load_frame(symbol: str, timeframe: str, end: Optional[datetime] = None, bars: int = 200):
+    """
+    Load the last ``bars`` completed bars of a pyramid level as a DataFrame.
+
+    Only bars that closed at or before ``end`` are returned, so backtests
+    never see a partially formed higher-timeframe bar.
+
+    Returns:
+        DataFrame indexed by timestamp (open/high/low/close/volume), or None
+        if the level has no data
+    """
+    import pandas as pd
+
+    tf = normalize_timeframe(timeframe)
+    if tf is None:
+        return None
+
+    end = end or timezone.now()
+    if timezone.is_naive(end):
+        end = timezone.make_aware(end, dt_timezone.utc)
+
+    rows = list(
+        OHLCVCandle.objects.filter(
+            symbol=symbol,
+            timeframe=tf,
+            timestamp__lte=end - timeframe_delta(tf)
+        ).order_by('-timestamp').values(
+            'timestamp', 'open_price', 'high', 'low', 'close', 'volume'
+        )[:bars]
+    )
+
+    if not rows:
+        return None
+
+    df = pd.DataFrame([
+        {
+            'timestamp': row['timestamp'],
+            'open': float(row['open_price']),
+            'high': float(row['high']),
+            'low': float(row['low']),
+            'close': float(row['close']),
+            'volume': float(row['volume']) if row['volume'] else 0.0,
+        }
+        for row in reversed(rows)
+    ])
+    df.set_index('timestamp', inplace=True)
+    return df
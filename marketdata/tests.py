@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase
+
+from .models import OHLCVCandle, RollupCoverage
+from .rollups import load_candles, load_frame, refresh_rollups, select_timeframe
+
+
+class RollupPyramidTestCase(TestCase):
+    """Test cases for the 1m -> 5m/15m/1h/4h/1d rollup pyramid"""
+
+    def setUp(self):
+        self.start = datetime(2025, 1, 6, 0, 0, tzinfo=dt_timezone.utc)
+        candles = []
+        for i in range(2 * 1440):
+            price = Decimal('1.08000') + Decimal(i % 97) / Decimal('100000')
+            candles.append(OHLCVCandle(
+                symbol='EURUSD',
+                timeframe='1m',
+                timestamp=self.start + timedelta(minutes=i),
+                open_price=price,
+                high=price + Decimal('0.00020'),
+                low=price - Decimal('0.00010') - Decimal(i % 13) / Decimal('100000'),
+                close=price + Decimal('0.00005'),
+                volume=Decimal('10'),
+            ))
+        OHLCVCandle.objects.bulk_create(candles)
+        self.last = self.start + timedelta(minutes=2 * 1440 - 1)
+
+    def _raw(self, start, end):
+        return list(OHLCVCandle.objects.filter(
+            symbol='EURUSD', timeframe='1m', timestamp__gte=start, timestamp__lte=end
+        ).order_by('timestamp'))
+
+    def test_refresh_builds_every_level(self):
+        """Every rollup level is built with the expected bucket counts"""
+        refresh_rollups('EURUSD', self.start, self.last)
+
+        expected = {'5m': 576, '15m': 192, '1h': 48, '4h': 12, '1d': 2}
+        for tf, count in expected.items():
+            self.assertEqual(
+                OHLCVCandle.objects.filter(symbol='EURUSD', timeframe=tf).count(), count, tf
+            )
+
+        coverage = RollupCoverage.objects.get(symbol='EURUSD')
+        self.assertEqual(coverage.covered_from, self.start)
+        self.assertEqual(coverage.covered_until, self.start + timedelta(days=2))
+
+    def test_hourly_bar_matches_raw_minutes(self):
+        """A 1h rollup bar aggregates its 60 minute bars exactly"""
+        refresh_rollups('EURUSD', self.start, self.last)
+
+        hour = self.start + timedelta(hours=5)
+        raw = self._raw(hour, hour + timedelta(minutes=59))
+        bar = OHLCVCandle.objects.get(symbol='EURUSD', timeframe='1h', timestamp=hour)
+
+        self.assertEqual(bar.open_price, raw[0].open_price)
+        self.assertEqual(bar.close, raw[-1].close)
+        self.assertEqual(bar.high, max(c.high for c in raw))
+        self.assertEqual(bar.low, min(c.low for c in raw))
+        self.assertEqual(bar.volume, Decimal('600'))
+
+    def test_refresh_is_idempotent(self):
+        """Refreshing the same range twice does not duplicate buckets"""
+        refresh_rollups('EURUSD', self.start, self.last)
+        refresh_rollups('EURUSD', self.start + timedelta(hours=3), self.start + timedelta(hours=4))
+
+        self.assertEqual(OHLCVCandle.objects.filter(symbol='EURUSD', timeframe='1h').count(), 48)
+
+    def test_imported_bars_are_not_replaced(self):
+        """Bars imported at a rollup timeframe survive a refresh and fill their bucket"""
+        hour = self.start + timedelta(hours=5)
+        OHLCVCandle.objects.create(
+            symbol='EURUSD', timeframe='1h', timestamp=hour, source='Oanda API',
+            open_price=Decimal('1.1'), high=Decimal('1.2'), low=Decimal('1.0'), close=Decimal('1.15'),
+        )
+
+        refresh_rollups('EURUSD', self.start, self.last)
+        refresh_rollups('EURUSD', hour, hour + timedelta(minutes=30))
+
+        bars = OHLCVCandle.objects.filter(symbol='EURUSD', timeframe='1h')
+        self.assertEqual(bars.count(), 48)
+        self.assertEqual(bars.get(timestamp=hour).source, 'Oanda API')
+        self.assertEqual(bars.filter(source='rollup').count(), 47)
+
+    def test_load_candles_uses_coarsest_level_with_exact_edges(self):
+        """An unaligned 24h window reads hourly bars plus finer edge bars"""
+        refresh_rollups('EURUSD', self.start, self.last)
+
+        start = self.start + timedelta(hours=6, minutes=7, seconds=30)
+        end = start + timedelta(hours=24)
+        candles = load_candles('EURUSD', start, end)
+        raw = self._raw(start, end)
+
+        self.assertLess(len(candles), 60)
+        self.assertEqual(sum(1 for c in candles if c['timeframe'] == '1h'), 23)
+        self.assertAlmostEqual(candles[0]['open'], float(raw[0].open_price))
+        self.assertAlmostEqual(candles[-1]['close'], float(raw[-1].close))
+        self.assertAlmostEqual(max(c['high'] for c in candles), float(max(c.high for c in raw)))
+        self.assertAlmostEqual(min(c['low'] for c in candles), float(min(c.low for c in raw)))
+
+    def test_load_candles_falls_back_to_minutes_without_rollups(self):
+        """Without coverage the reader returns raw 1m candles"""
+        start = self.start + timedelta(hours=1)
+        end = start + timedelta(hours=4)
+        candles = load_candles('EURUSD', start, end)
+
+        self.assertEqual(len(candles), 241)
+        self.assertTrue(all(c['timeframe'] == '1m' for c in candles))
+
+    def test_select_timeframe(self):
+        """Resolution auto-selection keeps a usable bar count"""
+        self.assertEqual(select_timeframe(self.start, self.start + timedelta(hours=24)), '1h')
+        self.assertEqual(select_timeframe(self.start, self.start + timedelta(hours=4)), '15m')
+        self.assertEqual(select_timeframe(self.start, self.start + timedelta(minutes=30)), '1m')
+
+    def test_load_frame_excludes_unfinished_bar(self):
+        """HTF frames only contain bars that closed before the cutoff"""
+        refresh_rollups('EURUSD', self.start, self.last)
+
+        df = load_frame('EURUSD', '4H', end=self.start + timedelta(hours=10), bars=50)
+
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df.index[-1], self.start + timedelta(hours=4))
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import InsightNotification, NotificationPreference, NotificationDeliveryLog
+from .models import InsightNotification, NotificationPreference, NotificationDeliveryLog, NotificationOutbox
 
 
 @admin.register(InsightNotification)
@@ -57,3 +57,11 @@ class NotificationDeliveryLogAdmin(admin.ModelAdmin):
     search_fields = ['notification__title', 'error_message']
     readonly_fields = ['attempted_at']
     date_hierarchy = 'attempted_at'
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'signal', 'user', 'status', 'created_at', 'processed_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['signal__symbol', 'user__email', 'error_message']
+    readonly_fields = ['created_at', 'claimed_at', 'processed_at', 'claim_token', 'notification']
@@ -122,6 +122,20 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         
         logger.info(f"Sent notification #{notification['id']} to user {self.user_id}")
     
+    async def notification_digest(self, event):
+        """
+        Handle a coalesced burst of notifications from the outbox dispatcher
+        
+        ``notifications`` holds the newest items; ``count`` is the total
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'notification_digest',
+            'count': event['count'],
+            'notifications': event['notifications']
+        }))
+        
+        logger.info(f"Sent digest of {event['count']} notifications to user {self.user_id}")
+    
     # Database operations (must be wrapped in database_sync_to_async)
     
     @database_sync_to_async
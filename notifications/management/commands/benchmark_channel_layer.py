@@ -0,0 +1,152 @@
+"""
+Management command to measure cross-process channel layer throughput.
+
+Usage:
+    python manage.py benchmark_channel_layer
+    python manage.py benchmark_channel_layer --senders 8 --messages 1000 --receivers 20
+    python manage.py benchmark_channel_layer --rate 50      # latency at 4 x 50 sends/s
+
+Sender processes call group_send on one group while this process receives
+on every channel of the group (like WebSocket consumers in one worker) and
+records delivery latency. Unpaced runs measure saturation throughput
+(channels at capacity drop messages, as with any layer); use --rate to
+measure latency at a sustainable load. A unique group is used, so it is
+safe to run against the live store.
+"""
+import asyncio
+import multiprocessing
+import time
+import uuid
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _send_messages(group, count, rate, start_event):
+    """Sender process body: ``count`` group_sends, paced to ``rate``/s (0 = flat out)"""
+    layer = get_channel_layer()
+    start_event.wait()
+
+    async def run():
+        started = time.perf_counter()
+        for i in range(count):
+            if rate:
+                delay = started + i / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await layer.group_send(group, {'type': 'benchmark.message', 'seq': i, 'sent_at': time.time()})
+        await layer.close()
+
+    async_to_sync(run)()
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark group_send throughput and latency of the configured channel layer across processes'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--senders', type=int, default=4, help='Sender processes (default: 4)')
+        parser.add_argument('--messages', type=int, default=500, help='group_send calls per sender (default: 500)')
+        parser.add_argument('--receivers', type=int, default=10, help='Channels in the group (default: 10)')
+        parser.add_argument('--rate', type=float, default=0,
+                            help='group_sends per second per sender (default: 0 = as fast as possible)')
+        parser.add_argument('--timeout', type=float, default=60.0, help='Give up after N seconds (default: 60)')
+    
+    def handle(self, *args, **options):
+        senders = options['senders']
+        messages = options['messages']
+        receivers = options['receivers']
+        if min(senders, messages, receivers) < 1:
+            raise CommandError("--senders, --messages and --receivers must be positive")
+        
+        layer = get_channel_layer()
+        if layer is None:
+            raise CommandError("No channel layer configured")
+        
+        self.stdout.write(f"\n📡 Channel Layer Benchmark ({type(layer).__name__})")
+        self.stdout.write(f"{'=' * 50}")
+        self.stdout.write(f"  {senders} senders x {messages} group_sends -> {receivers} channels")
+        
+        if options['rate']:
+            self.stdout.write(f"  Paced at {options['rate']:.0f} group_sends/s per sender")
+        
+        result = asyncio.run(self._run(layer, senders, messages, receivers, options['rate'], options['timeout']))
+        
+        expected = senders * messages * receivers
+        self.stdout.write(f"\n  group_send calls:  {senders * messages} in {result['send_seconds']:.2f}s "
+                          f"({senders * messages / result['send_seconds']:.0f}/s)")
+        self.stdout.write(f"  Deliveries:        {result['delivered']}/{expected} in {result['total_seconds']:.2f}s "
+                          f"({result['delivered'] / result['total_seconds']:.0f}/s)")
+        self.stdout.write(f"  Latency p50/p95/max: {_percentile(result['latencies'], 50) * 1000:.1f} / "
+                          f"{_percentile(result['latencies'], 95) * 1000:.1f} / "
+                          f"{max(result['latencies'] or [0]) * 1000:.1f} ms")
+        
+        if result['delivered'] < expected:
+            self.stdout.write(self.style.WARNING(
+                f"\n⚠️  {expected - result['delivered']} deliveries missing "
+                f"(channel capacity reached or timeout)"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("\n✅ All messages delivered"))
+    
+    async def _run(self, layer, senders, messages, receivers, rate, timeout):
+        group = f"benchmark_{uuid.uuid4().hex[:12]}"
+        channels = [await layer.new_channel() for _ in range(receivers)]
+        for channel in channels:
+            await layer.group_add(group, channel)
+        
+        expected = senders * messages
+        latencies = []
+        
+        async def receive(channel):
+            for _ in range(expected):
+                message = await layer.receive(channel)
+                latencies.append(time.time() - message['sent_at'])
+        
+        context = multiprocessing.get_context('fork')
+        start_event = context.Event()
+        processes = [
+            context.Process(target=_send_messages, args=(group, messages, rate, start_event))
+            for _ in range(senders)
+        ]
+        for process in processes:
+            process.start()
+        
+        tasks = [asyncio.ensure_future(receive(channel)) for channel in channels]
+        started = time.perf_counter()
+        start_event.set()
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: [process.join() for process in processes])
+        send_seconds = time.perf_counter() - started
+        
+        # Wait for the stragglers; stop once deliveries stall (dropped messages never arrive)
+        deadline = time.perf_counter() + timeout
+        last_count, last_change = -1, time.perf_counter()
+        while time.perf_counter() < deadline and not all(task.done() for task in tasks):
+            if len(latencies) != last_count:
+                last_count, last_change = len(latencies), time.perf_counter()
+            elif time.perf_counter() - last_change > 2.0:
+                break
+            await asyncio.sleep(0.05)
+        total_seconds = (last_change if len(latencies) < expected * receivers else time.perf_counter()) - started
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        
+        for channel in channels:
+            await layer.group_discard(group, channel)
+        
+        return {
+            'delivered': len(latencies),
+            'latencies': latencies,
+            'send_seconds': send_seconds,
+            'total_seconds': total_seconds,
+        }
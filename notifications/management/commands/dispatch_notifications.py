@@ -0,0 +1,76 @@
+"""
+Dispatch Notifications Management Command
+
+Delivers notifications queued in the NotificationOutbox by new AI
+Insights (TradeValidation saves).
+
+Usage:
+    python manage.py dispatch_notifications                 # drain once (cron)
+    python manage.py dispatch_notifications --loop          # long-running worker
+
+Cron Setup (every minute):
+    * * * * * cd /home/username/zenithedge_trading_hub && python manage.py dispatch_notifications >> logs/cron.log 2>&1
+
+Each pass sends every user at most one WebSocket message, so with --loop
+the --interval also bounds how often a user is pushed to.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import DEFAULT_BATCH_SIZE, dispatch_all
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued AI Insight notifications in coalesced batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Outbox entries per batch (default: {DEFAULT_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and dispatch every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds between passes with --loop (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if not options['loop']:
+            self._report(dispatch_all(batch_size))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🔔 Dispatching notifications every {options['interval']}s (Ctrl+C to stop)"
+        ))
+        try:
+            while True:
+                stats = dispatch_all(batch_size)
+                if stats['claimed']:
+                    self._report(stats)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("\n👋 Dispatcher stopped")
+
+    def _report(self, stats):
+        if not stats['claimed']:
+            self.stdout.write("📭 No queued notifications")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"📨 {stats['claimed']} queued → {stats['created']} notifications in "
+            f"{stats['messages']} messages ({stats['digests']} digests)"
+        ))
+        if stats['skipped']:
+            self.stdout.write(f"   ⏭️  Skipped by preferences: {stats['skipped']}")
+        if stats['failed']:
+            self.stdout.write(self.style.ERROR(f"   ❌ Failed: {stats['failed']}"))
@@ -19,7 +19,7 @@ class NotificationManager:
     """
     
     @staticmethod
-    def calculate_priority(signal):
+    def calculate_priority(signal, recent_same_strategy=None):
         """
         Calculate notification priority based on signal attributes
         
@@ -30,6 +30,8 @@ class NotificationManager:
         
         Args:
             signal: Signal object
+            recent_same_strategy: Signals from the same user and strategy in
+                the last 10 minutes, if already counted (batched dispatch)
             
         Returns:
             str: 'high', 'medium', or 'low'
@@ -46,12 +48,13 @@ class NotificationManager:
                 return 'high'
         
         # Check for recent duplicates (same strategy within 10 minutes)
-        ten_minutes_ago = timezone.now() - timedelta(minutes=10)
-        recent_same_strategy = signal.__class__.objects.filter(
-            user=signal.user,
-            strategy=signal.strategy,
-            received_at__gte=ten_minutes_ago
-        ).count()
+        if recent_same_strategy is None:
+            ten_minutes_ago = timezone.now() - timedelta(minutes=10)
+            recent_same_strategy = signal.__class__.objects.filter(
+                user=signal.user,
+                strategy=signal.strategy,
+                received_at__gte=ten_minutes_ago
+            ).count()
         
         if recent_same_strategy > 3:  # Too many recent signals
             return 'low'
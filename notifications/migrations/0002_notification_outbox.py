@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('signals', '0017_add_webhook_tracking_fields'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('sent', 'Sent'), ('skipped', 'Skipped by preferences'), ('failed', 'Failed')], default='pending', help_text='Dispatch status', max_length=12)),
+                ('claim_token', models.CharField(blank=True, default='', help_text='Dispatcher run that claimed this entry', max_length=32)),
+                ('claimed_at', models.DateTimeField(blank=True, help_text='When a dispatcher claimed this entry', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, help_text='When the entry was dispatched', null=True)),
+                ('error_message', models.TextField(blank=True, help_text='Error message if dispatch failed', null=True)),
+                ('signal', models.ForeignKey(help_text='Signal/Insight to notify about', on_delete=django.db.models.deletion.CASCADE, related_name='notification_outbox', to='signals.signal')),
+                ('user', models.ForeignKey(blank=True, help_text='Recipient (empty = signal owner)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notification_outbox', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='notificatio_status_ea8ecc_idx'), models.Index(fields=['claim_token'], name='notificatio_claim_t_89de9e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='notification',
+            field=models.ForeignKey(blank=True, help_text='Notification created for this entry (never created twice)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='notifications.insightnotification'),
+        ),
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('dispatched', 'Notification created, delivery pending'), ('sent', 'Sent'), ('skipped', 'Skipped by preferences'), ('failed', 'Failed')], default='pending', help_text='Dispatch status', max_length=12),
+        ),
+    ]
@@ -236,3 +236,81 @@ class NotificationDeliveryLog(models.Model):
     def __str__(self):
         status = 'Success' if self.success else 'Failed'
         return f"{self.channel} delivery: {status} at {self.attempted_at}"
+
+
+class NotificationOutbox(models.Model):
+    """
+    Pending notification work queued by the TradeValidation post_save.
+
+    The webhook only inserts a row here; ``notifications.outbox`` turns
+    batches of rows into notifications and WebSocket messages.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('dispatched', 'Notification created, delivery pending'),
+        ('sent', 'Sent'),
+        ('skipped', 'Skipped by preferences'),
+        ('failed', 'Failed'),
+    ]
+    
+    signal = models.ForeignKey(
+        'signals.Signal',
+        on_delete=models.CASCADE,
+        related_name='notification_outbox',
+        help_text="Signal/Insight to notify about"
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notification_outbox',
+        help_text="Recipient (empty = signal owner)"
+    )
+    status = models.CharField(
+        max_length=12,
+        choices=STATUS_CHOICES,
+        default='pending',
+        help_text="Dispatch status"
+    )
+    notification = models.ForeignKey(
+        InsightNotification,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Notification created for this entry (never created twice)"
+    )
+    claim_token = models.CharField(
+        max_length=32,
+        blank=True,
+        default='',
+        help_text="Dispatcher run that claimed this entry"
+    )
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a dispatcher claimed this entry"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the entry was dispatched"
+    )
+    error_message = models.TextField(
+        blank=True,
+        null=True,
+        help_text="Error message if dispatch failed"
+    )
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+            models.Index(fields=['claim_token']),
+        ]
+    
+    def __str__(self):
+        return f"Outbox #{self.id} signal #{self.signal_id} ({self.status})"
@@ -0,0 +1,293 @@
+"""
+Notification Outbox - Batched, coalesced delivery of AI Insight notifications
+
+Saving a TradeValidation only enqueues a NotificationOutbox row. A
+dispatcher (``manage.py dispatch_notifications``) then works through the
+outbox in batches:
+
+    1. claim up to ``batch_size`` pending entries
+    2. load recipients' preferences and recent-strategy counts in one query each
+    3. create the InsightNotification rows that pass preferences
+    4. send each user ONE channel message per batch (a digest when a burst
+       of insights arrived for the same user)
+    5. bulk-write delivery logs and outbox status (failed entries keep
+       the error)
+
+Because every user gets at most one WebSocket message per dispatch pass,
+the pass interval also shapes the per-user message rate.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .manager import NotificationManager
+from .models import (
+    InsightNotification, NotificationDeliveryLog, NotificationOutbox, NotificationPreference,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+
+# Most notifications included in one digest message (the rest are counted)
+MAX_DIGEST_ITEMS = 10
+
+# Entries left 'processing' longer than this (crashed dispatcher) are re-claimed
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+def enqueue(signal, user=None) -> NotificationOutbox:
+    """
+    Queue a notification for ``signal``
+
+    Args:
+        signal: Signal object
+        user: Recipient (if None, the signal owner at dispatch time)
+
+    Returns:
+        NotificationOutbox entry
+    """
+    return NotificationOutbox.objects.create(signal=signal, user=user)
+
+
+def build_user_message(payloads: List[Dict]) -> Dict:
+    """
+    Channel message for one user's notifications in a batch
+
+    Args:
+        payloads: ``InsightNotification.to_dict()`` results, oldest first
+
+    Returns:
+        'notification_message' for a single notification, otherwise a
+        'notification_digest' with the newest MAX_DIGEST_ITEMS and the total
+    """
+    if len(payloads) == 1:
+        return {'type': 'notification_message', 'notification': payloads[0]}
+    return {
+        'type': 'notification_digest',
+        'count': len(payloads),
+        'notifications': payloads[::-1][:MAX_DIGEST_ITEMS],
+    }
+
+
+def _claim(batch_size: int) -> List[NotificationOutbox]:
+    """
+    Mark up to ``batch_size`` pending entries as ours and load them
+
+    The candidate ids are read first (MySQL rejects LIMIT inside IN) and
+    the UPDATE re-checks the claimable condition, so an entry another
+    dispatcher claimed in between is not taken twice.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    claimable = Q(status='pending') | Q(
+        status__in=('processing', 'dispatched'), claimed_at__lt=now - CLAIM_TIMEOUT
+    )
+
+    candidate_ids = list(
+        NotificationOutbox.objects.filter(claimable).order_by('id').values_list('id', flat=True)[:batch_size]
+    )
+    if not candidate_ids:
+        return []
+
+    claimed = NotificationOutbox.objects.filter(claimable, id__in=candidate_ids).update(
+        status='processing', claim_token=token, claimed_at=now
+    )
+    if not claimed:
+        return []
+
+    return list(
+        NotificationOutbox.objects.filter(claim_token=token, status='processing')
+        .select_related('signal', 'signal__user', 'signal__validation', 'user')
+        .order_by('id')
+    )
+
+
+def _load_preferences(user_ids) -> Dict[int, NotificationPreference]:
+    """Preferences for every recipient, creating defaults for new users"""
+    prefs = {p.user_id: p for p in NotificationPreference.objects.filter(user_id__in=user_ids)}
+    missing = [user_id for user_id in user_ids if user_id not in prefs]
+    if missing:
+        NotificationPreference.objects.bulk_create(
+            [NotificationPreference(user_id=user_id) for user_id in missing],
+            ignore_conflicts=True
+        )
+        prefs.update(
+            (p.user_id, p) for p in NotificationPreference.objects.filter(user_id__in=missing)
+        )
+    return prefs
+
+
+def _recent_strategy_counts(signals) -> Dict[tuple, int]:
+    """(user_id, strategy) -> signals received in the last 10 minutes"""
+    if not signals:
+        return {}
+    signal_model = signals[0].__class__
+    rows = signal_model.objects.filter(
+        user_id__in={s.user_id for s in signals},
+        strategy__in={s.strategy for s in signals},
+        received_at__gte=timezone.now() - timedelta(minutes=10)
+    ).values('user_id', 'strategy').annotate(n=Count('id'))
+    return {(row['user_id'], row['strategy']): row['n'] for row in rows}
+
+
+def _send(channel_layer, user_id: int, message: Dict) -> Optional[str]:
+    """group_send to the user's group; returns an error message on failure"""
+    if not channel_layer:
+        return "Channel layer not available"
+    try:
+        async_to_sync(channel_layer.group_send)(f"user_{user_id}_notifications", message)
+    except Exception as e:
+        logger.error(f"WebSocket delivery failed for user {user_id}: {e}")
+        return str(e)
+    return None
+
+
+def dispatch_pending(batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Dispatch one batch of queued notifications
+
+    The notifications are created in the same transaction that links them
+    to their outbox entries (status 'dispatched'). An entry re-claimed
+    after a crash that already has its notification is finished without
+    creating or sending it again; the user still sees it in the list.
+
+    Args:
+        batch_size: Maximum outbox entries to process
+
+    Returns:
+        Dict with counts: claimed, created, skipped, failed, messages,
+        digests, recovered
+    """
+    stats = {
+        'claimed': 0, 'created': 0, 'skipped': 0, 'failed': 0,
+        'messages': 0, 'digests': 0, 'recovered': 0,
+    }
+
+    entries = _claim(batch_size)
+    if not entries:
+        return stats
+    stats['claimed'] = len(entries)
+
+    status = {}
+    errors = {}
+    recipients = []
+    for entry in entries:
+        if entry.notification_id is not None:
+            # Created by a dispatcher that died before finishing the entry
+            status[entry.id] = 'sent'
+            stats['recovered'] += 1
+            continue
+        user = entry.user or entry.signal.user
+        if user is None:
+            logger.warning(f"Cannot create notification for signal #{entry.signal_id} - no user")
+            status[entry.id] = 'skipped'
+            continue
+        recipients.append((entry, user))
+
+    prefs = _load_preferences({user.id for _, user in recipients})
+    strategy_counts = _recent_strategy_counts([entry.signal for entry, _ in recipients])
+
+    created = []
+    for entry, user in recipients:
+        signal = entry.signal
+        try:
+            priority = NotificationManager.calculate_priority(
+                signal, strategy_counts.get((signal.user_id, signal.strategy), 0)
+            )
+            if not prefs[user.id].should_notify(signal, priority):
+                status[entry.id] = 'skipped'
+                continue
+            message_data = NotificationManager.format_message(signal)
+        except Exception as e:
+            logger.error(f"Error preparing notification for signal #{signal.id}: {e}")
+            status[entry.id] = 'failed'
+            errors[entry.id] = str(e)
+            continue
+
+        created.append((entry, InsightNotification(
+            user=user,
+            signal=signal,
+            title=message_data['title'],
+            snippet=message_data['snippet'],
+            confidence=signal.confidence,
+            priority=priority,
+            news_headline=message_data['news_headline']
+        )))
+
+    # Saved one by one: bulk_create does not return primary keys on MySQL,
+    # and the outbox links, payloads and delivery logs all need them
+    now = timezone.now()
+    with transaction.atomic():
+        for entry, notification in created:
+            notification.save()
+            NotificationOutbox.objects.filter(id=entry.id).update(
+                notification=notification, status='dispatched', claimed_at=now
+            )
+    stats['created'] = len(created)
+
+    by_user = defaultdict(list)
+    for entry, notification in created:
+        by_user[notification.user_id].append((entry, notification))
+
+    channel_layer = get_channel_layer()
+    delivered_ids = []
+    logs = []
+    for user_id, user_items in by_user.items():
+        message = build_user_message([notification.to_dict() for _, notification in user_items])
+        error = _send(channel_layer, user_id, message)
+        if error is None:
+            delivered_ids.extend(notification.id for _, notification in user_items)
+            stats['messages'] += 1
+            stats['digests'] += message['type'] == 'notification_digest'
+        for entry, notification in user_items:
+            status[entry.id] = 'sent' if error is None else 'failed'
+            if error is not None:
+                errors[entry.id] = error
+            logs.append(NotificationDeliveryLog(
+                notification=notification, channel='websocket', success=error is None, error_message=error
+            ))
+
+    now = timezone.now()
+    by_status = defaultdict(list)
+    for entry_id, entry_status in status.items():
+        if entry_id not in errors:
+            by_status[entry_status].append(entry_id)
+
+    with transaction.atomic():
+        if delivered_ids:
+            InsightNotification.objects.filter(id__in=delivered_ids).update(delivered=True)
+        NotificationDeliveryLog.objects.bulk_create(logs)
+        for entry_status, ids in by_status.items():
+            NotificationOutbox.objects.filter(id__in=ids).update(status=entry_status, processed_at=now)
+        for entry_id, error in errors.items():
+            NotificationOutbox.objects.filter(id=entry_id).update(
+                status='failed', error_message=error, processed_at=now
+            )
+
+    stats['skipped'] = sum(1 for entry_status in status.values() if entry_status == 'skipped')
+    stats['failed'] = len(errors)
+    logger.info(
+        f"Dispatched {stats['created']} notifications from {stats['claimed']} outbox entries "
+        f"in {stats['messages']} messages ({stats['digests']} digests)"
+    )
+    return stats
+
+
+def dispatch_all(batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Dispatch batches until the outbox is drained; returns summed stats"""
+    totals = defaultdict(int)
+    while True:
+        stats = dispatch_pending(batch_size)
+        for key, value in stats.items():
+            totals[key] += value
+        if stats['claimed'] < batch_size:
+            return dict(totals)
@@ -11,19 +11,22 @@ logger = logging.getLogger(__name__)
 @receiver(post_save, sender='signals.TradeValidation')
 def notify_new_validation(sender, instance, created, **kwargs):
     """
-    Trigger notification when a TradeValidation (AI Insight) is created
+    Queue a notification when a TradeValidation (AI Insight) is created
     
-    This fires after validation is saved, ensuring we have full context
+    This fires after validation is saved, ensuring we have full context.
+    Only an outbox row is written here; delivery happens in the
+    dispatch_notifications command so the webhook doesn't wait on it.
     """
     if created:
         # Lazy import to avoid circular dependency
-        from .manager import NotificationManager
+        from .outbox import enqueue
         
-        signal = instance.signal
-        logger.info(f"New validation created for signal #{signal.id} - triggering notification")
+        logger.info(f"New validation created for signal #{instance.signal_id} - queueing notification")
         
-        # Push notification to user
-        NotificationManager.push(signal)
+        try:
+            enqueue(instance.signal)
+        except Exception as e:
+            logger.error(f"Error queueing notification for signal #{instance.signal_id}: {e}")
 
 
 @receiver(post_save, sender='signals.Signal')
@@ -1,3 +1,269 @@
-from django.test import TestCase
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.exceptions import ChannelFull
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from signals.testing import insert_signal
+from zenithedge.channel_layer import SQLiteChannelLayer
+
+
+class SQLiteChannelLayerTestCase(SimpleTestCase):
+    """Test cases for the cross-process SQLite channel layer"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'channels.sqlite3')
+        self.layers = []
+
+    def tearDown(self):
+        for layer in self.layers:
+            async_to_sync(layer.close)()
+        shutil.rmtree(self.tmpdir)
+
+    def _layer(self, **config):
+        layer = SQLiteChannelLayer(path=self.path, poll_interval=0.005, max_poll_interval=0.02, **config)
+        self.layers.append(layer)
+        return layer
+
+    def test_group_send_reaches_other_instances(self):
+        """A group_send from one layer (process) is received through another"""
+        worker, cron = self._layer(), self._layer()
+
+        async def run():
+            channels = [await worker.new_channel() for _ in range(3)]
+            for channel in channels:
+                await worker.group_add('user_1_notifications', channel)
+            await worker.group_discard('user_1_notifications', channels[2])
+
+            await cron.group_send('user_1_notifications', {'type': 'notification_message', 'raw': b'\x00\xff'})
+
+            received = await asyncio.wait_for(
+                asyncio.gather(*(worker.receive(channel) for channel in channels[:2])), timeout=2
+            )
+            leftover = await cron._run(lambda: cron._pending_counts(cron._conn(), [channels[2]], 0))
+            return received, leftover
+
+        received, leftover = async_to_sync(run)()
+
+        self.assertEqual(received, [{'type': 'notification_message', 'raw': b'\x00\xff'}] * 2)
+        self.assertEqual(leftover, {})
+
+    def test_messages_are_received_in_order_and_capacity_is_enforced(self):
+        """Sends beyond capacity raise ChannelFull; pending ones arrive in order"""
+        sender, receiver = self._layer(capacity=5), self._layer(capacity=5)
+
+        async def run():
+            channel = await receiver.new_channel()
+            for i in range(5):
+                await sender.send(channel, {'type': 'test', 'i': i})
+            with self.assertRaises(ChannelFull):
+                await sender.send(channel, {'type': 'test', 'i': 5})
+            return [(await asyncio.wait_for(receiver.receive(channel), timeout=2))['i'] for _ in range(5)]
+
+        self.assertEqual(async_to_sync(run)(), [0, 1, 2, 3, 4])
+
+    def test_expired_messages_drop_channel_from_groups(self):
+        """Unread expired messages are purged and their channel leaves its groups"""
+        layer = self._layer(expiry=1)
+
+        async def run():
+            channel = await layer.new_channel()
+            await layer.group_add('group', channel)
+            await layer.group_send('group', {'type': 'stale'})
+
+            later = time.time() + 10
+            with mock.patch('zenithedge.channel_layer.time.time', return_value=later):
+                await layer._run(layer._claim_sync, [], {})
+
+            def counts():
+                conn = layer._conn()
+                return tuple(
+                    conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                    for table in ('channel_messages', 'channel_groups')
+                )
+
+            return await layer._run(counts)
+
+        self.assertEqual(async_to_sync(run)(), (0, 0))
+
+
+class OutboxMessageTestCase(SimpleTestCase):
+    """Test per-user coalescing of outbox batches"""
+
+    def test_single_notification_is_sent_as_is(self):
+        from notifications.outbox import build_user_message
+
+        self.assertEqual(
+            build_user_message([{'id': 1}]),
+            {'type': 'notification_message', 'notification': {'id': 1}}
+        )
+
+    def test_burst_is_coalesced_into_digest(self):
+        from notifications.outbox import MAX_DIGEST_ITEMS, build_user_message
+
+        message = build_user_message([{'id': i} for i in range(MAX_DIGEST_ITEMS + 5)])
+
+        self.assertEqual(message['type'], 'notification_digest')
+        self.assertEqual(message['count'], MAX_DIGEST_ITEMS + 5)
+        self.assertEqual(len(message['notifications']), MAX_DIGEST_ITEMS)
+        self.assertEqual(message['notifications'][0]['id'], MAX_DIGEST_ITEMS + 4)
+
+
+class RecordingChannelLayer:
+    """Channel layer stand-in that records group sends"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def group_send(self, group, message):
+        self.sent.append((group, message))
+
+
+class DispatchPendingTestCase(TestCase):
+    """Test batched dispatch of the notification outbox"""
+
+    def setUp(self):
+        from accounts.models import CustomUser
+
+        self.alice = CustomUser.objects.create_user(email='alice@example.com', password='x')
+        self.bob = CustomUser.objects.create_user(email='bob@example.com', password='x')
+        self.layer = RecordingChannelLayer()
+        patcher = mock.patch('notifications.outbox.get_channel_layer', return_value=self.layer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _enqueue(self, user, confidence=70, strategy='smc', symbol='EURUSD'):
+        from notifications.models import NotificationOutbox
+
+        signal = insert_signal(
+            user=user, symbol=symbol, timeframe='1h', side='buy', sl=1.09, tp=1.12, price=1.1,
+            confidence=confidence, strategy=strategy, regime='trend',
+        )
+        return NotificationOutbox.objects.create(signal_id=signal.pk)
+
+    def test_claim_takes_each_entry_once(self):
+        """Claims are disjoint; fresh claims are kept, stale ones are re-claimed"""
+        from notifications.models import NotificationOutbox
+        from notifications.outbox import CLAIM_TIMEOUT, _claim
+
+        entries = [self._enqueue(self.alice) for _ in range(3)]
+
+        first = _claim(2)
+        second = _claim(2)
+
+        self.assertEqual([e.id for e in first], [entries[0].id, entries[1].id])
+        self.assertEqual([e.id for e in second], [entries[2].id])
+        self.assertEqual(_claim(2), [])
+        self.assertNotEqual(first[0].claim_token, second[0].claim_token)
+
+        NotificationOutbox.objects.filter(id=entries[0].id).update(
+            claimed_at=timezone.now() - CLAIM_TIMEOUT - timedelta(seconds=1)
+        )
+        self.assertEqual([e.id for e in _claim(2)], [entries[0].id])
+
+    def test_burst_is_sent_as_one_digest_per_user(self):
+        """Each user gets one message; notifications, logs and outbox are updated"""
+        from notifications.models import InsightNotification, NotificationDeliveryLog, NotificationOutbox
+        from notifications.outbox import dispatch_pending
+
+        for _ in range(3):
+            self._enqueue(self.alice)
+        self._enqueue(self.bob)
+
+        stats = dispatch_pending()
+
+        self.assertEqual(stats, {
+            'claimed': 4, 'created': 4, 'skipped': 0, 'failed': 0, 'messages': 2, 'digests': 1, 'recovered': 0,
+        })
+        messages = dict(self.layer.sent)
+        digest = messages[f'user_{self.alice.id}_notifications']
+        self.assertEqual(digest['type'], 'notification_digest')
+        self.assertEqual(digest['count'], 3)
+        alice_ids = list(
+            InsightNotification.objects.filter(user=self.alice).order_by('-id').values_list('id', flat=True)
+        )
+        self.assertEqual([n['id'] for n in digest['notifications']], alice_ids)
+        self.assertEqual(messages[f'user_{self.bob.id}_notifications']['type'], 'notification_message')
+
+        self.assertEqual(InsightNotification.objects.filter(delivered=True).count(), 4)
+        self.assertEqual(NotificationDeliveryLog.objects.filter(success=True).count(), 4)
+        self.assertEqual(set(NotificationOutbox.objects.values_list('status', flat=True)), {'sent'})
+        self.assertEqual(
+            set(NotificationOutbox.objects.values_list('notification_id', flat=True)),
+            set(InsightNotification.objects.values_list('id', flat=True)),
+        )
+        self.assertEqual(dispatch_pending()['claimed'], 0)
+
+    def test_preferences_and_missing_users_skip(self):
+        """Entries filtered by preferences or without a recipient are skipped"""
+        from notifications.models import InsightNotification, NotificationOutbox, NotificationPreference
+        from notifications.outbox import dispatch_pending
+
+        NotificationPreference.objects.create(user=self.bob, min_confidence=90)
+        low = self._enqueue(self.bob, confidence=70)
+        high = self._enqueue(self.bob, confidence=95)
+        orphan = self._enqueue(None)
+
+        stats = dispatch_pending()
+
+        self.assertEqual((stats['created'], stats['skipped']), (1, 2))
+        self.assertTrue(NotificationPreference.objects.filter(user=self.bob).exists())
+        self.assertEqual(InsightNotification.objects.get().signal_id, high.signal_id)
+        statuses = dict(NotificationOutbox.objects.values_list('id', 'status'))
+        self.assertEqual(statuses, {low.id: 'skipped', high.id: 'sent', orphan.id: 'skipped'})
+
+    def test_failed_send_is_logged_and_not_delivered(self):
+        """A failing group_send leaves notifications undelivered with error logs"""
+        from notifications.models import InsightNotification, NotificationDeliveryLog, NotificationOutbox
+        from notifications.outbox import dispatch_pending
+
+        self._enqueue(self.alice)
+        self._enqueue(self.alice)
+
+        with mock.patch('notifications.outbox.get_channel_layer', return_value=None):
+            stats = dispatch_pending()
+
+        self.assertEqual((stats['created'], stats['messages']), (2, 0))
+        self.assertFalse(InsightNotification.objects.filter(delivered=True).exists())
+        logs = NotificationDeliveryLog.objects.all()
+        self.assertEqual(len(logs), 2)
+        self.assertTrue(all(not log.success and log.error_message for log in logs))
+        self.assertEqual(stats['failed'], 2)
+        self.assertEqual(
+            set(NotificationOutbox.objects.values_list('status', 'error_message')),
+            {('failed', 'Channel layer not available')},
+        )
+
+    def test_reclaimed_entry_is_not_created_or_sent_twice(self):
+        """A crash after the notifications were created does not duplicate them"""
+        from notifications.models import InsightNotification, NotificationOutbox
+        from notifications.outbox import CLAIM_TIMEOUT, dispatch_pending
+
+        entry = self._enqueue(self.alice)
+        with mock.patch('notifications.outbox._send', side_effect=SystemExit):
+            with self.assertRaises(SystemExit):
+                dispatch_pending()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'dispatched')
+        self.assertEqual(entry.notification_id, InsightNotification.objects.get().id)
+        self.assertEqual(dispatch_pending()['claimed'], 0)
+
+        NotificationOutbox.objects.filter(id=entry.id).update(
+            claimed_at=timezone.now() - CLAIM_TIMEOUT - timedelta(seconds=1)
+        )
+        stats = dispatch_pending()
+
+        self.assertEqual((stats['claimed'], stats['recovered'], stats['created']), (1, 1, 0))
+        self.assertEqual(InsightNotification.objects.count(), 1)
+        self.assertEqual(self.layer.sent, [])
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, 'sent')
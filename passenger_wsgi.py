@@ -58,6 +58,10 @@ try:
     from django.core.wsgi import get_wsgi_application
     application = get_wsgi_application()
     
+    # Passenger stops workers with SIGTERM; flush write-behind counters first
+    from zenithedge.write_behind import install_exit_flush
+    install_exit_flush()
+    
     # Log successful startup (optional)
     import logging
     logging.basicConfig(
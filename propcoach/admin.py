@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
-    FirmTemplate, PropChallenge, TradeRecord,
+    FirmTemplate, PropChallenge, TradeRecord, ChallengeEvent,
     PropRuleViolation, CoachingFeedback, PropTrainingSession
 )
 
@@ -66,7 +66,8 @@ class PropChallengeAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'user__email']
     readonly_fields = [
         'start_date', 'created_at', 'updated_at',
-        'profit_progress', 'win_rate_display', 'days_info'
+        'profit_progress', 'win_rate_display', 'days_info',
+        'ledger_sequence', 'daily_pnl', 'daily_loss_breached', 'total_loss_breached'
     ]
     inlines = [TradeRecordInline]
     
@@ -98,6 +99,13 @@ class PropChallengeAdmin(admin.ModelAdmin):
                 'trading_days_count', 'last_trade_date'
             )
         }),
+        ('Ledger', {
+            'fields': (
+                'ledger_sequence', 'daily_pnl',
+                'daily_loss_breached', 'total_loss_breached'
+            ),
+            'classes': ('collapse',)
+        }),
         ('AI Scores', {
             'fields': ('funding_readiness_score', 'pass_probability')
         }),
@@ -194,6 +202,21 @@ class TradeRecordAdmin(admin.ModelAdmin):
     profit_loss_display.short_description = 'P/L'
 
 
+@admin.register(ChallengeEvent)
+class ChallengeEventAdmin(admin.ModelAdmin):
+    list_display = ['challenge', 'sequence', 'event_type', 'amount', 'occurred_at', 'trade']
+    list_filter = ['event_type']
+    search_fields = ['challenge__user__username']
+    readonly_fields = ['challenge', 'sequence', 'event_type', 'trade', 'amount', 'occurred_at', 'created_at']
+    
+    def has_add_permission(self, request):
+        # The ledger is append-only through propcoach.ledger
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(PropRuleViolation)
 class PropRuleViolationAdmin(admin.ModelAdmin):
     list_display = [
@@ -11,11 +11,14 @@ from typing import Dict, List, Optional
 from decimal import Decimal
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.db.models import Avg, Sum, Count, Q
+from django.db.models import Sum, Count, Q
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Closed trades needed before the Monte Carlo simulation is meaningful
+MIN_SIMULATION_TRADES = 20
+
 
 def correlate_with_backtests(user) -> Dict:
     """
@@ -172,121 +175,78 @@ def calculate_correlation_score(challenge_perf: Dict, backtest_data: Dict) -> fl
     return round(score, 2)
 
 
-def simulate_multi_challenge(user, strategy: Optional[str] = None, n_simulations: int = 10) -> Dict:
+def simulate_multi_challenge(user, strategy: Optional[str] = None,
+                             n_simulations: Optional[int] = None, template=None,
+                             seed: Optional[int] = None) -> Dict:
     """
     Run Monte Carlo simulation to predict multi-challenge outcomes.
     
+    Trade-by-trade equity paths are drawn from the user's closed trades and
+    checked against the firm's rules (see propcoach.monte_carlo).
+    
     Args:
         user: User object
         strategy: Optional strategy name to focus on
-        n_simulations: Number of simulations to run
+        n_simulations: Number of simulated challenge attempts (default 100k)
+        template: FirmTemplate to simulate (default: the user's latest
+            challenge's template)
+        seed: Random seed for reproducible runs
         
     Returns:
         Dict with simulation results
     """
-    from propcoach.models import PropChallenge, TradeRecord
-    import random
+    from propcoach.models import FirmTemplate, PropChallenge, TradeRecord
+    from propcoach.monte_carlo import DEFAULT_PATHS, ChallengeRules, simulate_challenges
     
     try:
-        # Get historical challenge data
-        historical_challenges = PropChallenge.objects.filter(
-            user=user,
-            status__in=['passed', 'failed']
-        )
-        
-        if historical_challenges.count() < 3:
+        # One query for the whole trade history
+        trades = TradeRecord.objects.filter(challenge__user=user, status='closed')
+        if strategy:
+            trades = trades.filter(strategy_used=strategy)
+        history = list(trades.values_list('profit_loss_percent', 'entry_time', 'challenge_id'))
+        
+        challenge_ids = {challenge_id for _, _, challenge_id in history}
+        if len(history) < MIN_SIMULATION_TRADES or len(challenge_ids) < 3:
             return {
                 'status': 'insufficient_data',
-                'message': 'Need at least 3 completed challenges for simulation'
+                'message': (
+                    f'Need at least {MIN_SIMULATION_TRADES} closed trades across 3 challenges '
+                    f'for {strategy or "all strategies"}'
+                )
             }
         
-        # Extract historical metrics
-        historical_metrics = []
+        if template is None:
+            latest = PropChallenge.objects.filter(user=user).select_related('template').first()
+            template = latest.template if latest else FirmTemplate()
         
-        for challenge in historical_challenges:
-            trades = TradeRecord.objects.filter(challenge=challenge)
-            
-            if strategy:
-                trades = trades.filter(strategy_used=strategy)
-            
-            if trades.exists():
-                historical_metrics.append({
-                    'win_rate': challenge.win_rate / 100.0,
-                    'avg_trade_return': float(trades.aggregate(Avg('profit_loss_percent'))['profit_loss_percent__avg'] or 0),
-                    'max_drawdown': float(challenge.max_total_drawdown_reached),
-                    'passed': challenge.status == 'passed',
-                    'violations': challenge.violation_count
-                })
+        trade_returns = [float(pnl_percent) / 100 for pnl_percent, _, _ in history]
+        trading_days = {(challenge_id, entry_time.date()) for _, entry_time, challenge_id in history}
+        trades_per_day = len(history) / len(trading_days)
         
-        if len(historical_metrics) < 3:
-            return {
-                'status': 'insufficient_data',
-                'message': f'Not enough historical data for {strategy or "all strategies"}'
-            }
-        
-        # Run simulations
-        simulation_results = []
-        
-        for i in range(n_simulations):
-            # Sample from historical metrics with random variation
-            base_metrics = random.choice(historical_metrics)
-            
-            # Add randomness
-            win_rate = max(0.1, min(0.9, base_metrics['win_rate'] + random.gauss(0, 0.1)))
-            avg_return = base_metrics['avg_trade_return'] * (1 + random.gauss(0, 0.3))
-            max_dd = abs(base_metrics['max_drawdown'] * (1 + random.gauss(0, 0.2)))
-            violations = max(0, int(base_metrics['violations'] + random.gauss(0, 1)))
-            
-            # Simulate challenge outcome
-            simulated_trades = random.randint(15, 40)
-            wins = int(simulated_trades * win_rate)
-            losses = simulated_trades - wins
-            
-            # Calculate profit
-            total_return = (wins * avg_return * 1.5) + (losses * avg_return * 0.8)
-            
-            # Determine pass/fail
-            passed = (
-                total_return >= 8.0 and  # At least 8% profit
-                max_dd <= 10.0 and  # Within drawdown limit
-                violations == 0 and  # No violations
-                simulated_trades >= 20  # Minimum trades
-            )
-            
-            simulation_results.append({
-                'simulation_id': i + 1,
-                'trades': simulated_trades,
-                'wins': wins,
-                'losses': losses,
-                'win_rate': win_rate * 100,
-                'total_return': total_return,
-                'max_drawdown': max_dd,
-                'violations': violations,
-                'passed': passed
-            })
-        
-        # Aggregate results
-        passed_count = sum(1 for r in simulation_results if r['passed'])
-        pass_probability = (passed_count / n_simulations) * 100
-        
-        avg_return = sum(r['total_return'] for r in simulation_results) / n_simulations
-        avg_dd = sum(r['max_drawdown'] for r in simulation_results) / n_simulations
-        avg_wr = sum(r['win_rate'] for r in simulation_results) / n_simulations
+        n_simulations = n_simulations or DEFAULT_PATHS
+        outcomes = simulate_challenges(
+            trade_returns, ChallengeRules.from_template(template),
+            trades_per_day=trades_per_day, n_paths=n_simulations, seed=seed
+        )
+        summary = outcomes.summary()
         
         return {
             'status': 'success',
             'simulations_run': n_simulations,
             'strategy': strategy or 'All strategies',
-            'pass_probability': round(pass_probability, 2),
-            'passed_simulations': passed_count,
-            'failed_simulations': n_simulations - passed_count,
-            'expected_performance': {
-                'avg_return': round(avg_return, 2),
-                'avg_drawdown': round(avg_dd, 2),
-                'avg_win_rate': round(avg_wr, 2)
-            },
-            'confidence_level': calculate_confidence_level(historical_metrics),
-            'simulations': simulation_results[:5]  # Return first 5 for display
+            'template': str(template),
+            'trades_sampled': len(history),
+            'trades_per_day': outcomes.trades_per_day,
+            'pass_probability': summary['pass_probability'],
+            'pass_probability_ci': summary['confidence_interval'],
+            'standard_error': summary['standard_error'],
+            'passed_simulations': summary['outcomes']['passed'],
+            'failed_simulations': n_simulations - summary['outcomes']['passed'],
+            'outcomes': summary['outcomes'],
+            'time_to_pass': summary['time_to_pass'],
+            'expected_performance': summary['expected_performance'],
+            'confidence_level': calculate_confidence_level(sorted(challenge_ids)),
+            'simulations': summary['examples']
         }
         
     except Exception as e:
@@ -297,7 +257,7 @@ def simulate_multi_challenge(user, strategy: Optional[str] = None, n_simulations
         }
 
 
-def calculate_confidence_level(historical_metrics: List[Dict]) -> str:
+def calculate_confidence_level(historical_metrics: List) -> str:
     """Calculate confidence level for simulation based on historical data quality."""
     if len(historical_metrics) >= 10:
         return 'High (10+ challenges)'
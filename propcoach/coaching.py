@@ -105,6 +105,7 @@ def generate_daily_feedback(challenge) -> Optional[Dict]:
 def analyze_performance(challenge, today_trades) -> Dict:
     """Analyze trading performance metrics."""
     template = challenge.template
+    usage = challenge.risk_usage()
     
     analysis = {
         'trades_today': today_trades.count(),
@@ -114,14 +115,8 @@ def analyze_performance(challenge, today_trades) -> Dict:
         'profit_progress_percent': challenge.profit_progress_percent,
         'win_rate': challenge.win_rate,
         'total_trades': challenge.total_trades,
-        'daily_drawdown_percent': (
-            challenge.current_daily_drawdown / template.get_max_daily_loss() * 100
-            if template.get_max_daily_loss() > 0 else 0
-        ),
-        'total_drawdown_percent': (
-            challenge.current_total_drawdown / template.get_max_total_loss() * 100
-            if template.get_max_total_loss() > 0 else 0
-        ),
+        'daily_drawdown_percent': usage['daily_drawdown_percent'],
+        'total_drawdown_percent': usage['total_drawdown_percent'],
         'days_remaining': challenge.days_remaining,
         'funding_readiness': float(challenge.funding_readiness_score)
     }
@@ -0,0 +1,233 @@
+"""
+Event-sourced ledger for PropCoach challenges
+
+Each closed TradeRecord appends one ChallengeEvent to its challenge's ledger.
+The event is applied at once to the running state kept on PropChallenge:
+balance, high-water mark, drawdowns, P/L by trading day, trade counts and
+breach flags. Applying an event is O(1), so pre-trade checks read a single
+up-to-date row instead of aggregating trades.
+
+The ledger is the source of truth. rebuild_challenge_state replays it to
+recompute the state from scratch, and backfill_ledger creates the events of
+challenges whose trades closed before the ledger existed.
+
+The state functions only use model fields (no model methods), so the
+propcoach 0002 migration replays existing trades with them too.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Attempts at allocating a free sequence number before giving up
+SEQUENCE_RETRIES = 3
+
+# PropChallenge fields owned by the ledger (saved after each event)
+LEDGER_STATE_FIELDS = [
+    'current_balance', 'peak_balance', 'total_profit_loss',
+    'total_trades', 'winning_trades', 'losing_trades',
+    'current_daily_drawdown', 'max_daily_drawdown_reached',
+    'current_total_drawdown', 'max_total_drawdown_reached',
+    'trading_days_count', 'last_trade_date', 'daily_pnl',
+    'daily_loss_breached', 'total_loss_breached', 'ledger_sequence',
+    'updated_at',
+]
+
+
+def trading_day(moment):
+    """Trading day (local date) a timestamp falls on"""
+    if timezone.is_aware(moment):
+        return timezone.localdate(moment)
+    return moment.date()
+
+
+def reset_state(challenge):
+    """Reset the ledger-maintained state to the challenge start (no save)"""
+    challenge.current_balance = challenge.initial_balance
+    challenge.peak_balance = challenge.initial_balance
+    challenge.total_profit_loss = Decimal('0.00')
+    challenge.total_trades = 0
+    challenge.winning_trades = 0
+    challenge.losing_trades = 0
+    challenge.current_daily_drawdown = Decimal('0.00')
+    challenge.max_daily_drawdown_reached = Decimal('0.00')
+    challenge.current_total_drawdown = Decimal('0.00')
+    challenge.max_total_drawdown_reached = Decimal('0.00')
+    challenge.trading_days_count = 0
+    challenge.last_trade_date = None
+    challenge.daily_pnl = {}
+    challenge.daily_loss_breached = False
+    challenge.total_loss_breached = False
+    challenge.ledger_sequence = 0
+
+
+def apply_closed_trade(challenge, trade_pnl, day):
+    """
+    Apply one closed trade to the running state in O(1) (no save)
+
+    Args:
+        challenge: PropChallenge (with its template loaded)
+        trade_pnl: Realized P/L of the trade
+        day: Trading day the trade closed on
+    """
+    trade_pnl = Decimal(trade_pnl)
+    challenge.current_balance += trade_pnl
+    challenge.total_profit_loss += trade_pnl
+    challenge.total_trades += 1
+    if trade_pnl > 0:
+        challenge.winning_trades += 1
+    else:
+        challenge.losing_trades += 1
+
+    # High-water mark and drawdown from it
+    if challenge.current_balance > challenge.peak_balance:
+        challenge.peak_balance = challenge.current_balance
+    challenge.current_total_drawdown = challenge.peak_balance - challenge.current_balance
+    if challenge.current_total_drawdown > challenge.max_total_drawdown_reached:
+        challenge.max_total_drawdown_reached = challenge.current_total_drawdown
+
+    # P/L of the trading day; its loss is the daily drawdown
+    key = day.isoformat()
+    if key not in challenge.daily_pnl:
+        challenge.trading_days_count += 1
+    day_pnl = Decimal(challenge.daily_pnl.get(key, '0')) + trade_pnl
+    challenge.daily_pnl[key] = str(day_pnl.quantize(Decimal('0.01')))
+    day_loss = max(Decimal('0.00'), -day_pnl)
+    if challenge.last_trade_date is None or day >= challenge.last_trade_date:
+        challenge.last_trade_date = day
+        challenge.current_daily_drawdown = day_loss
+    if day_loss > challenge.max_daily_drawdown_reached:
+        challenge.max_daily_drawdown_reached = day_loss
+
+    # Same limits as FirmTemplate.get_max_daily_loss / get_max_total_loss
+    template = challenge.template
+    if day_loss > template.account_size * (template.max_daily_drawdown_percent / 100):
+        challenge.daily_loss_breached = True
+    if challenge.current_total_drawdown > template.account_size * (template.max_total_drawdown_percent / 100):
+        challenge.total_loss_breached = True
+
+
+def apply_event(challenge, event):
+    """Apply one ledger event to the challenge's in-memory state"""
+    if event.event_type == 'trade_closed':
+        apply_closed_trade(challenge, event.amount, trading_day(event.occurred_at))
+    challenge.ledger_sequence = event.sequence
+
+
+def record_trade_close(trade) -> Tuple[Optional[object], Optional[object]]:
+    """
+    Append a closed trade to its challenge's ledger and apply it
+
+    Recording is idempotent: a trade that is already on the ledger is
+    ignored, so saving a closed trade again never double-counts it. If the
+    next sequence number is taken (events appended by a backfill that was
+    not replayed yet), the event goes after the last one on the ledger.
+
+    Args:
+        trade: Closed TradeRecord
+
+    Returns:
+        Tuple of (updated PropChallenge, ChallengeEvent), or (None, None)
+        if the trade was already recorded
+    """
+    from propcoach.models import ChallengeEvent, PropChallenge
+
+    with transaction.atomic():
+        challenge = (
+            PropChallenge.objects.select_for_update()
+            .select_related('template')
+            .get(pk=trade.challenge_id)
+        )
+        sequence = challenge.ledger_sequence + 1
+        for attempt in range(SEQUENCE_RETRIES):
+            try:
+                with transaction.atomic():
+                    event = ChallengeEvent.objects.create(
+                        challenge=challenge,
+                        sequence=sequence,
+                        event_type='trade_closed',
+                        trade=trade,
+                        amount=trade.profit_loss,
+                        occurred_at=trade.exit_time or timezone.now(),
+                    )
+                break
+            except IntegrityError:
+                if ChallengeEvent.objects.filter(trade=trade).exists():
+                    return None, None
+                if attempt == SEQUENCE_RETRIES - 1:
+                    raise
+                last = challenge.events.aggregate(last=Max('sequence'))['last'] or 0
+                logger.warning(
+                    f"Ledger sequence {sequence} of challenge {challenge.pk} is taken, appending after {last}"
+                )
+                sequence = last + 1
+
+        apply_event(challenge, event)
+        challenge.save(update_fields=LEDGER_STATE_FIELDS)
+
+    return challenge, event
+
+
+def rebuild_challenge_state(challenge):
+    """
+    Recompute a challenge's state by replaying its ledger
+
+    Args:
+        challenge: PropChallenge instance
+
+    Returns:
+        The challenge, saved with the replayed state
+    """
+    reset_state(challenge)
+    events = challenge.events.order_by('sequence').only('sequence', 'event_type', 'amount', 'occurred_at')
+    for event in events.iterator(chunk_size=1000):
+        apply_event(challenge, event)
+    challenge.save(update_fields=LEDGER_STATE_FIELDS)
+    return challenge
+
+
+def backfill_ledger(challenge) -> int:
+    """
+    Append events for closed trades that are not on the ledger yet
+
+    Trades are appended in closing order after the existing events. Call
+    rebuild_challenge_state afterwards to apply them. The models are taken
+    from the challenge, so migrations can pass historical instances.
+
+    Args:
+        challenge: PropChallenge instance
+
+    Returns:
+        Number of events created
+    """
+    ChallengeEvent = challenge.events.model
+
+    with transaction.atomic():
+        last = challenge.events.order_by('-sequence').values_list('sequence', flat=True).first() or 0
+        trades = (
+            challenge.trades.filter(status='closed', ledger_event__isnull=True)
+            .order_by('exit_time', 'entry_time')
+            .only('id', 'profit_loss', 'exit_time', 'entry_time')
+        )
+        events = [
+            ChallengeEvent(
+                challenge=challenge,
+                sequence=last + position,
+                event_type='trade_closed',
+                trade=trade,
+                amount=trade.profit_loss,
+                occurred_at=trade.exit_time or trade.entry_time,
+            )
+            for position, trade in enumerate(trades, start=1)
+        ]
+        ChallengeEvent.objects.bulk_create(events, batch_size=500)
+
+    if events:
+        logger.info(f"Backfilled {len(events)} ledger events for challenge {challenge.pk}")
+    return len(events)
@@ -0,0 +1,59 @@
+"""
+Management command to backfill and replay prop challenge ledgers
+"""
+from django.core.management.base import BaseCommand
+from propcoach.ledger import backfill_ledger, rebuild_challenge_state
+from propcoach.models import PropChallenge
+
+
+class Command(BaseCommand):
+    help = 'Backfill ledger events for closed trades and rebuild challenge state by replaying the ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--challenge-id',
+            type=str,
+            help='Rebuild a single challenge only'
+        )
+        parser.add_argument(
+            '--status',
+            type=str,
+            help='Only challenges with this status (e.g. active)'
+        )
+        parser.add_argument(
+            '--no-backfill',
+            action='store_true',
+            help='Replay existing events only, without appending missing trades'
+        )
+
+    def handle(self, *args, **options):
+        challenges = PropChallenge.objects.select_related('template').order_by('created_at')
+        if options.get('challenge_id'):
+            challenges = challenges.filter(pk=options['challenge_id'])
+        if options.get('status'):
+            challenges = challenges.filter(status=options['status'])
+        
+        rebuilt = 0
+        backfilled = 0
+        for challenge in challenges.iterator(chunk_size=100):
+            if not options['no_backfill']:
+                backfilled += backfill_ledger(challenge)
+            rebuild_challenge_state(challenge)
+            rebuilt += 1
+            
+            flags = []
+            if challenge.daily_loss_breached:
+                flags.append('daily loss breached')
+            if challenge.total_loss_breached:
+                flags.append('max drawdown breached')
+            self.stdout.write(
+                f"  {challenge.pk}: {challenge.ledger_sequence} events, "
+                f"balance ${challenge.current_balance}"
+                + (f" ⚠️ {', '.join(flags)}" if flags else "")
+            )
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✅ Rebuilt {rebuilt} challenge(s), backfilled {backfilled} event(s)"
+            )
+        )
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def backfill_ledgers(apps, schema_editor):
+    """Put the trades closed so far on the ledger and replay every challenge"""
+    from propcoach.ledger import backfill_ledger, rebuild_challenge_state
+
+    PropChallenge = apps.get_model('propcoach', 'PropChallenge')
+    for challenge in PropChallenge.objects.select_related('template').order_by('created_at').iterator(chunk_size=100):
+        backfill_ledger(challenge)
+        rebuild_challenge_state(challenge)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('propcoach', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propchallenge',
+            name='daily_loss_breached',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='propchallenge',
+            name='daily_pnl',
+            field=models.JSONField(blank=True, default=dict, help_text='Closed P/L by trading day (ISO date -> amount)'),
+        ),
+        migrations.AddField(
+            model_name='propchallenge',
+            name='ledger_sequence',
+            field=models.IntegerField(default=0, help_text='Sequence number of the last ledger event applied'),
+        ),
+        migrations.AddField(
+            model_name='propchallenge',
+            name='total_loss_breached',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='ChallengeEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('sequence', models.IntegerField(help_text="Position in the challenge's ledger (1-based)")),
+                ('event_type', models.CharField(choices=[('trade_closed', 'Trade Closed')], default='trade_closed', max_length=30)),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Realized P/L', max_digits=12)),
+                ('occurred_at', models.DateTimeField(help_text='When the trade closed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='propcoach.propchallenge')),
+                ('trade', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_event', to='propcoach.traderecord')),
+            ],
+            options={
+                'verbose_name': 'Challenge Event',
+                'verbose_name_plural': 'Challenge Events',
+                'ordering': ['challenge', 'sequence'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='challengeevent',
+            constraint=models.UniqueConstraint(fields=('challenge', 'sequence'), name='propcoach_event_sequence_unique'),
+        ),
+        migrations.RunPython(backfill_ledgers, migrations.RunPython.noop),
+    ]
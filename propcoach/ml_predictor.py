@@ -425,14 +425,10 @@ def get_prediction_confidence_interval(challenge, n_bootstrap: int = 100) -> Tup
     feature_vector = np.array([list(features.values())])
     feature_vector_scaled = scaler.transform(feature_vector)
     
-    predictions = []
-    for _ in range(n_bootstrap):
-        # Add small random noise to simulate uncertainty
-        noisy_features = feature_vector_scaled + np.random.normal(0, 0.05, feature_vector_scaled.shape)
-        prob = model.predict_proba(noisy_features)[0][1]
-        predictions.append(prob * 100)
-    
-    predictions = np.array(predictions)
+    # Add small random noise to simulate uncertainty; all samples in one batch
+    noise = np.random.normal(0, 0.05, (n_bootstrap, feature_vector_scaled.shape[1]))
+    predictions = model.predict_proba(feature_vector_scaled + noise)[:, 1] * 100
+    
     lower = np.percentile(predictions, 5)  # 5th percentile
     upper = np.percentile(predictions, 95)  # 95th percentile
     
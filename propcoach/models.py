@@ -198,6 +198,19 @@ class PropChallenge(models.Model):
     trading_days_count = models.IntegerField(default=0)
     last_trade_date = models.DateField(null=True, blank=True)
     
+    # Ledger state (maintained by propcoach.ledger from ChallengeEvent rows)
+    daily_pnl = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Closed P/L by trading day (ISO date -> amount)"
+    )
+    daily_loss_breached = models.BooleanField(default=False)
+    total_loss_breached = models.BooleanField(default=False)
+    ledger_sequence = models.IntegerField(
+        default=0,
+        help_text="Sequence number of the last ledger event applied"
+    )
+    
     # Rule violations
     violation_count = models.IntegerField(default=0)
     
@@ -283,28 +296,50 @@ class PropChallenge(models.Model):
         
         return profit_met and days_met and no_violations
     
-    def update_balance(self, trade_pnl: Decimal):
-        """Update balance after trade"""
-        self.current_balance += trade_pnl
-        self.total_profit_loss += trade_pnl
-        
-        # Update peak
-        if self.current_balance > self.peak_balance:
-            self.peak_balance = self.current_balance
+    @property
+    def daily_drawdown_today(self):
+        """Loss from today's opening balance (zero until a trade closes today)"""
+        if self.last_trade_date != timezone.localdate():
+            return Decimal('0.00')
+        return self.current_daily_drawdown
+    
+    def risk_usage(self):
+        """
+        Share of the loss limits used and of the profit target reached
         
-        # Update drawdown
-        drawdown_from_peak = self.peak_balance - self.current_balance
-        self.current_total_drawdown = drawdown_from_peak
+        Returns:
+            Dict with daily/total drawdown and profit progress percentages
+            (floats) and the remaining daily/total loss allowance (Decimal)
+        """
+        template = self.template
+        max_daily_loss = template.get_max_daily_loss()
+        max_total_loss = template.get_max_total_loss()
+        profit_target = template.get_profit_target_amount()
+        daily_drawdown = self.daily_drawdown_today
         
-        if drawdown_from_peak > self.max_total_drawdown_reached:
-            self.max_total_drawdown_reached = drawdown_from_peak
+        return {
+            'daily_drawdown_percent': float(daily_drawdown / max_daily_loss * 100) if max_daily_loss > 0 else 0.0,
+            'total_drawdown_percent': float(self.current_total_drawdown / max_total_loss * 100) if max_total_loss > 0 else 0.0,
+            'profit_progress_percent': float(self.total_profit_loss / profit_target * 100) if profit_target > 0 else 0.0,
+            'daily_loss_remaining': max_daily_loss - daily_drawdown,
+            'total_loss_remaining': max_total_loss - self.current_total_drawdown,
+        }
+    
+    def reset_ledger_state(self):
+        """Reset the ledger-maintained state to the challenge start (no save)"""
+        from propcoach.ledger import reset_state
+        reset_state(self)
+    
+    def apply_closed_trade(self, trade_pnl: Decimal, day):
+        """
+        Apply one closed trade to the running state in O(1) (no save)
         
-        self.save()
-    
-    def reset_daily_drawdown(self):
-        """Reset daily drawdown (call at start of new trading day)"""
-        self.current_daily_drawdown = Decimal('0.00')
-        self.save()
+        Args:
+            trade_pnl: Realized P/L of the trade
+            day: Trading day the trade closed on
+        """
+        from propcoach.ledger import apply_closed_trade
+        apply_closed_trade(self, trade_pnl, day)
     
     def check_violations(self):
         """Check if any rules are violated"""
@@ -312,10 +347,10 @@ class PropChallenge(models.Model):
         
         # Check daily drawdown
         max_daily_loss = self.template.get_max_daily_loss()
-        if self.current_daily_drawdown > max_daily_loss:
+        if self.daily_drawdown_today > max_daily_loss:
             violations.append({
                 'type': 'daily_drawdown',
-                'message': f'Daily drawdown {self.current_daily_drawdown} exceeds limit {max_daily_loss}',
+                'message': f'Daily drawdown {self.daily_drawdown_today} exceeds limit {max_daily_loss}',
                 'severity': 'critical'
             })
         
@@ -453,20 +488,51 @@ class TradeRecord(models.Model):
         self.profit_loss = pnl
         self.profit_loss_percent = (pnl / self.challenge.initial_balance) * 100
         
+        # Saving a closed trade appends it to the challenge ledger
+        # (propcoach.signals), which updates the challenge state
         self.save()
-        
-        # Update challenge
-        self.challenge.update_balance(pnl)
-        self.challenge.total_trades += 1
-        if pnl > 0:
-            self.challenge.winning_trades += 1
-        else:
-            self.challenge.losing_trades += 1
-        self.challenge.save()
+        self.challenge.refresh_from_db()
         
         return pnl
 
 
+class ChallengeEvent(models.Model):
+    """
+    Append-only ledger entry of a prop challenge
+    
+    PropChallenge's balance, drawdown and day P/L fields are a running
+    projection of these events; replaying them rebuilds it.
+    """
+    EVENT_TYPES = [
+        ('trade_closed', 'Trade Closed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    challenge = models.ForeignKey(PropChallenge, on_delete=models.CASCADE, related_name='events')
+    sequence = models.IntegerField(help_text="Position in the challenge's ledger (1-based)")
+    event_type = models.CharField(max_length=30, choices=EVENT_TYPES, default='trade_closed')
+    
+    # One event per trade, so a trade is never applied twice
+    trade = models.OneToOneField(
+        TradeRecord, on_delete=models.SET_NULL, null=True, blank=True, related_name='ledger_event'
+    )
+    amount = models.DecimalField(max_digits=12, decimal_places=2, help_text="Realized P/L")
+    occurred_at = models.DateTimeField(help_text="When the trade closed")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['challenge', 'sequence']
+        verbose_name = 'Challenge Event'
+        verbose_name_plural = 'Challenge Events'
+        constraints = [
+            models.UniqueConstraint(fields=['challenge', 'sequence'], name='propcoach_event_sequence_unique'),
+        ]
+    
+    def __str__(self):
+        return f"#{self.sequence} {self.get_event_type_display()} {self.amount}"
+
+
 class PropRuleViolation(models.Model):
     """
     Log of rule violations during challenges
@@ -0,0 +1,249 @@
+"""
+Monte Carlo Challenge Simulator for PropCoach
+
+Simulates many trade-by-trade equity paths at once against a firm's
+challenge rules (daily loss, max drawdown, profit target, minimum trading
+days, duration). Trade returns are drawn from the trader's own closed
+trades, so the simulated edge is the one they actually have.
+
+Paths are simulated as NumPy arrays in chunks: one row per path, one column
+per trade. Returns are fractions of the initial balance (as
+``TradeRecord.profit_loss_percent`` / 100), so equity is a cumulative sum.
+
+Uncertainty comes from two places. The Monte Carlo error is small at 100k
+paths. The bigger one is that the trade history is a small sample of the
+trader's edge, so paths are split into groups and each group draws from
+its own bootstrap resample of the history. The spread of the group pass
+rates is the reported confidence interval.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from zenithedge.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+DEFAULT_PATHS = 100_000
+
+# Bootstrap resamples of the trade history (paths are split evenly across them)
+HISTORY_BOOTSTRAPS = 50
+
+# Trades simulated per chunk (paths x trades per path); bounds peak memory
+CHUNK_TRADES = 1_000_000
+
+OUTCOMES = ('passed', 'daily_loss', 'max_drawdown', 'time_expired')
+
+
+@dataclass(frozen=True)
+class ChallengeRules:
+    """
+    Pass/fail rules of a challenge, as fractions of the initial balance
+
+    Drawdown is measured from the equity peak (as the challenge ledger
+    does) and daily loss from the equity at the start of the day.
+    """
+    profit_target: float
+    max_daily_loss: float
+    max_total_loss: float
+    min_trading_days: int
+    duration_days: int
+
+    @classmethod
+    def from_template(cls, template) -> 'ChallengeRules':
+        """Rules of a FirmTemplate"""
+        return cls(
+            profit_target=float(template.profit_target_percent) / 100,
+            max_daily_loss=float(template.max_daily_drawdown_percent) / 100,
+            max_total_loss=float(template.max_total_drawdown_percent) / 100,
+            min_trading_days=int(template.min_trading_days),
+            duration_days=max(1, int(template.challenge_duration_days)),
+        )
+
+
+@dataclass
+class PathOutcomes:
+    """Per-path results of a simulation (NumPy arrays, one entry per path)"""
+    outcome: object          # index into OUTCOMES
+    pass_day: object         # 1-based day the target was met, 0 if not passed
+    trades: object           # trades taken before the path stopped
+    wins: object
+    final_return: object     # fraction of the initial balance
+    max_drawdown: object     # fraction of the initial balance, from peak
+    group: object            # history bootstrap the path drew from
+    rules: ChallengeRules
+    trades_per_day: int
+
+    def __len__(self):
+        return len(self.outcome)
+
+    @property
+    def passed(self):
+        return self.outcome == OUTCOMES.index('passed')
+
+    def summary(self, n_examples: int = 5) -> Dict:
+        """
+        JSON-ready summary
+
+        Returns:
+            Dict with pass probability (%), its 95% confidence interval,
+            failure breakdown, time-to-pass distribution and averages
+        """
+        n = len(self)
+        passed = self.passed
+        probability = float(passed.mean()) if n else 0.0
+
+        groups = np.bincount(self.group, minlength=1)
+        group_passes = np.bincount(self.group, weights=passed.astype(float), minlength=len(groups))
+        group_rates = group_passes[groups > 0] / groups[groups > 0]
+        low, high = np.percentile(group_rates, [2.5, 97.5]) if len(group_rates) else (0.0, 0.0)
+
+        outcome_counts = np.bincount(self.outcome, minlength=len(OUTCOMES))
+        win_rate = np.divide(self.wins, self.trades, out=np.zeros(n), where=self.trades > 0)
+
+        return {
+            'paths': n,
+            'pass_probability': round(probability * 100, 2),
+            'confidence_interval': (round(float(low) * 100, 2), round(float(high) * 100, 2)),
+            'standard_error': round(math.sqrt(probability * (1 - probability) / n) * 100, 3) if n else 0.0,
+            'outcomes': {name: int(count) for name, count in zip(OUTCOMES, outcome_counts)},
+            'time_to_pass': time_to_pass_distribution(self.pass_day[passed]),
+            'expected_performance': {
+                'avg_return': round(float(self.final_return.mean()) * 100, 2) if n else 0.0,
+                'avg_drawdown': round(float(self.max_drawdown.mean()) * 100, 2) if n else 0.0,
+                'avg_win_rate': round(float(win_rate.mean()) * 100, 2) if n else 0.0,
+            },
+            'examples': [
+                {
+                    'simulation_id': i + 1,
+                    'trades': int(self.trades[i]),
+                    'wins': int(self.wins[i]),
+                    'losses': int(self.trades[i] - self.wins[i]),
+                    'win_rate': round(float(win_rate[i]) * 100, 2),
+                    'total_return': round(float(self.final_return[i]) * 100, 2),
+                    'max_drawdown': round(float(self.max_drawdown[i]) * 100, 2),
+                    'outcome': OUTCOMES[self.outcome[i]],
+                    'days': int(self.pass_day[i]) or None,
+                    'passed': bool(passed[i]),
+                }
+                for i in range(min(n_examples, n))
+            ],
+        }
+
+
+def time_to_pass_distribution(pass_days) -> Dict:
+    """Percentiles and per-day counts of the days passed paths needed"""
+    if not len(pass_days):
+        return {'passed_paths': 0, 'mean': None, 'p10': None, 'median': None, 'p90': None, 'by_day': {}}
+    p10, median, p90 = np.percentile(pass_days, [10, 50, 90])
+    counts = np.bincount(pass_days)
+    return {
+        'passed_paths': int(len(pass_days)),
+        'mean': round(float(pass_days.mean()), 2),
+        'p10': float(p10),
+        'median': float(median),
+        'p90': float(p90),
+        'by_day': {int(day): int(count) for day, count in enumerate(counts) if count},
+    }
+
+
+def _simulate_chunk(rng, histories, group, rules: ChallengeRules, trades_per_day: int) -> Dict:
+    """Simulate the paths of one chunk; ``group[i]`` picks path i's history"""
+    n = len(group)
+    days, k = rules.duration_days, trades_per_day
+    total = days * k
+
+    draws = rng.integers(0, histories.shape[1], size=(n, total))
+    returns = histories[group[:, None], draws]
+    equity = 1.0 + np.cumsum(returns, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+    drawdown = peak - equity
+
+    by_day = equity.reshape(n, days, k)
+    day_open = np.concatenate((np.ones((n, 1)), by_day[:, :-1, -1]), axis=1)
+    daily_breach = ((day_open[:, :, None] - by_day) > rules.max_daily_loss).reshape(n, total)
+    total_breach = drawdown > rules.max_total_loss
+    breached = daily_breach | total_breach
+
+    rows = np.arange(n)
+    any_breach = breached.any(axis=1)
+    first_breach = np.where(any_breach, breached.argmax(axis=1), total)
+    breach_day = first_breach // k
+
+    # The target is checked at the close of each day once enough days have traded
+    day_numbers = np.arange(1, days + 1)
+    target_met = ((by_day[:, :, -1] - 1.0) >= rules.profit_target) & (day_numbers >= rules.min_trading_days)
+    any_target = target_met.any(axis=1)
+    first_target_day = np.where(any_target, target_met.argmax(axis=1), days)
+
+    passed = any_target & (first_target_day < breach_day)
+    failed = any_breach & ~passed
+
+    outcome = np.full(n, OUTCOMES.index('time_expired'), dtype=np.int8)
+    outcome[passed] = OUTCOMES.index('passed')
+    daily_first = daily_breach[rows, np.minimum(first_breach, total - 1)]
+    outcome[failed & daily_first] = OUTCOMES.index('daily_loss')
+    outcome[failed & ~daily_first] = OUTCOMES.index('max_drawdown')
+
+    stop = np.full(n, total)
+    stop[passed] = (first_target_day[passed] + 1) * k
+    stop[failed] = first_breach[failed] + 1
+    taken = np.arange(total) < stop[:, None]
+
+    return {
+        'outcome': outcome,
+        'pass_day': np.where(passed, first_target_day + 1, 0),
+        'trades': stop,
+        'wins': ((returns > 0) & taken).sum(axis=1),
+        'final_return': equity[rows, stop - 1] - 1.0,
+        'max_drawdown': np.where(taken, drawdown, 0.0).max(axis=1),
+    }
+
+
+def simulate_challenges(trade_returns: Sequence[float], rules: ChallengeRules,
+                        trades_per_day: float = 3, n_paths: int = DEFAULT_PATHS,
+                        n_bootstraps: int = HISTORY_BOOTSTRAPS,
+                        seed: Optional[int] = None) -> PathOutcomes:
+    """
+    Simulate ``n_paths`` challenge attempts
+
+    Args:
+        trade_returns: Historical trade returns as fractions of the initial
+            balance (0.005 = +0.5%)
+        rules: Challenge rules
+        trades_per_day: Average trades per trading day (rounded, at least 1);
+            every simulated day is a trading day
+        n_paths: Number of paths
+        n_bootstraps: History resamples the paths are split across (1 = draw
+            straight from the history, no confidence interval)
+        seed: Random seed for reproducible runs
+
+    Returns:
+        PathOutcomes
+    """
+    history = np.asarray(trade_returns, dtype=float)
+    history = history[np.isfinite(history)]
+    if not len(history):
+        raise ValueError("No trade returns to simulate from")
+    if n_paths < 1:
+        raise ValueError("n_paths must be at least 1")
+
+    rng = np.random.default_rng(seed)
+    k = max(1, int(round(trades_per_day)))
+    n_bootstraps = max(1, min(n_bootstraps, n_paths))
+
+    if n_bootstraps == 1:
+        histories = history[None, :]
+    else:
+        histories = history[rng.integers(0, len(history), size=(n_bootstraps, len(history)))]
+    groups = np.arange(n_paths) % n_bootstraps
+
+    chunk = max(1, CHUNK_TRADES // (rules.duration_days * k))
+    parts: List[Dict] = [
+        _simulate_chunk(rng, histories, groups[start:start + chunk], rules, k)
+        for start in range(0, n_paths, chunk)
+    ]
+    merged = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    return PathOutcomes(group=groups, rules=rules, trades_per_day=k, **merged)
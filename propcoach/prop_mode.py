@@ -12,6 +12,21 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def get_active_challenge(user):
+    """
+    The user's active challenge with its template (one query), or None
+    
+    Balance, drawdown and progress on the row are maintained by the
+    challenge ledger (propcoach.ledger), so callers read them as-is.
+    """
+    from propcoach.models import PropChallenge
+    
+    return PropChallenge.objects.filter(
+        user=user,
+        status='active'
+    ).select_related('template').first()
+
+
 def apply_prop_mode(signal_object, ai_score: int, breakdown: Dict) -> Tuple[int, Dict]:
     """
     Apply prop firm challenge mode adjustments to AI score and signal parameters.
@@ -27,9 +42,6 @@ def apply_prop_mode(signal_object, ai_score: int, breakdown: Dict) -> Tuple[int,
     Returns:
         Tuple of (adjusted_score, prop_breakdown)
     """
-    from propcoach.models import PropChallenge
-    from django.utils import timezone
-    
     prop_breakdown = {
         'prop_mode_enabled': False,
         'has_active_challenge': False,
@@ -38,10 +50,7 @@ def apply_prop_mode(signal_object, ai_score: int, breakdown: Dict) -> Tuple[int,
     
     try:
         # Check if user has active prop challenge
-        active_challenge = PropChallenge.objects.filter(
-            user=signal_object.user,
-            status='active'
-        ).select_related('template').first()
+        active_challenge = get_active_challenge(signal_object.user)
         
         if not active_challenge:
             prop_breakdown['message'] = 'No active prop challenge'
@@ -54,26 +63,15 @@ def apply_prop_mode(signal_object, ai_score: int, breakdown: Dict) -> Tuple[int,
         prop_breakdown['firm_name'] = active_challenge.template.get_firm_name_display()
         prop_breakdown['phase'] = active_challenge.template.phase
         
-        # Calculate current challenge metrics
-        template = active_challenge.template
-        current_balance = active_challenge.current_balance
-        initial_balance = active_challenge.initial_balance
-        current_daily_dd = active_challenge.current_daily_drawdown
-        current_total_dd = active_challenge.current_total_drawdown
-        
-        # Get limits
-        max_daily_loss = template.get_max_daily_loss()
-        max_total_loss = template.get_max_total_loss()
-        profit_target = template.get_profit_target_amount()
-        
-        # Calculate percentages
-        daily_dd_percent = (current_daily_dd / max_daily_loss * 100) if max_daily_loss > 0 else 0
-        total_dd_percent = (current_total_dd / max_total_loss * 100) if max_total_loss > 0 else 0
-        profit_progress = (active_challenge.total_profit_loss / profit_target * 100) if profit_target > 0 else 0
+        # Current challenge metrics (kept up to date by the challenge ledger)
+        usage = active_challenge.risk_usage()
+        daily_dd_percent = usage['daily_drawdown_percent']
+        total_dd_percent = usage['total_drawdown_percent']
+        profit_progress = usage['profit_progress_percent']
         
         # Add metrics to breakdown
         prop_breakdown['metrics'] = {
-            'current_balance': float(current_balance),
+            'current_balance': float(active_challenge.current_balance),
             'profit_loss': float(active_challenge.total_profit_loss),
             'profit_progress_percent': round(profit_progress, 2),
             'daily_drawdown_used_percent': round(daily_dd_percent, 2),
@@ -414,18 +412,14 @@ def get_prop_challenge_summary(user) -> Optional[Dict]:
     Returns:
         Dict with challenge summary or None if no active challenge
     """
-    from propcoach.models import PropChallenge
-    
     try:
-        active_challenge = PropChallenge.objects.filter(
-            user=user,
-            status='active'
-        ).select_related('template').first()
+        active_challenge = get_active_challenge(user)
         
         if not active_challenge:
             return None
         
         template = active_challenge.template
+        usage = active_challenge.risk_usage()
         
         return {
             'challenge_id': str(active_challenge.id),
@@ -435,17 +429,9 @@ def get_prop_challenge_summary(user) -> Optional[Dict]:
             'current_balance': float(active_challenge.current_balance),
             'profit_loss': float(active_challenge.total_profit_loss),
             'profit_target': float(template.get_profit_target_amount()),
-            'profit_progress_percent': active_challenge.profit_progress_percent,
-            'daily_drawdown_percent': (
-                active_challenge.current_daily_drawdown / 
-                template.get_max_daily_loss() * 100
-                if template.get_max_daily_loss() > 0 else 0
-            ),
-            'total_drawdown_percent': (
-                active_challenge.current_total_drawdown / 
-                template.get_max_total_loss() * 100
-                if template.get_max_total_loss() > 0 else 0
-            ),
+            'profit_progress_percent': usage['profit_progress_percent'],
+            'daily_drawdown_percent': usage['daily_drawdown_percent'],
+            'total_drawdown_percent': usage['total_drawdown_percent'],
             'violation_count': active_challenge.violation_count,
             'days_elapsed': active_challenge.days_elapsed,
             'days_remaining': active_challenge.days_remaining,
@@ -472,33 +458,22 @@ def check_trade_allowed(user, symbol: str, proposed_risk_percent: float = 1.0) -
     Returns:
         Tuple of (is_allowed, reason_message)
     """
-    from propcoach.models import PropChallenge
-    
     try:
-        active_challenge = PropChallenge.objects.filter(
-            user=user,
-            status='active'
-        ).select_related('template').first()
+        active_challenge = get_active_challenge(user)
         
         if not active_challenge:
             return True, "No active prop challenge"
         
         template = active_challenge.template
+        usage = active_challenge.risk_usage()
         
         # Check 1: Daily drawdown
-        max_daily_loss = template.get_max_daily_loss()
-        remaining_daily = max_daily_loss - active_challenge.current_daily_drawdown
-        daily_dd_percent = (active_challenge.current_daily_drawdown / max_daily_loss * 100) if max_daily_loss > 0 else 0
-        
-        if daily_dd_percent >= 95:
+        remaining_daily = usage['daily_loss_remaining']
+        if usage['daily_drawdown_percent'] >= 95:
             return False, "Daily drawdown limit reached - trading blocked for today"
         
         # Check 2: Total drawdown
-        max_total_loss = template.get_max_total_loss()
-        remaining_total = max_total_loss - active_challenge.current_total_drawdown
-        total_dd_percent = (active_challenge.current_total_drawdown / max_total_loss * 100) if max_total_loss > 0 else 0
-        
-        if total_dd_percent >= 95:
+        if usage['total_drawdown_percent'] >= 95:
             return False, "Total drawdown limit reached - challenge failed"
         
         # Check 3: Position size
@@ -2,22 +2,28 @@
 PropCoach Signals
 Automatic rule checking and violation detection
 """
+from django.db.models import F
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from decimal import Decimal
+from .ledger import record_trade_close
 from .models import TradeRecord, PropChallenge, PropRuleViolation
 
 
 @receiver(post_save, sender=TradeRecord)
 def check_trade_violations(sender, instance, created, **kwargs):
     """
-    Automatically check for rule violations when a trade is closed
+    Record a closed trade on the challenge ledger and check it for rule violations
     """
     if instance.status != 'closed':
         return
     
-    challenge = instance.challenge
+    challenge, event = record_trade_close(instance)
+    if event is None:
+        # Already on the ledger; its rules were checked when it was recorded
+        return
+    
     template = challenge.template
     violations_found = []
     
@@ -92,8 +98,12 @@ def check_trade_violations(sender, instance, created, **kwargs):
     # Update challenge violation count and send alerts
     if violations_found:
         challenge.violation_count += len(violations_found)
-        challenge.save()
-        instance.save()
+        PropChallenge.objects.filter(pk=challenge.pk).update(
+            violation_count=F('violation_count') + len(violations_found)
+        )
+        TradeRecord.objects.filter(pk=instance.pk).update(
+            has_violations=True, violation_notes=instance.violation_notes
+        )
         
         # Send alert for each violation
         from propcoach.notifications import send_violation_alert
@@ -104,22 +114,31 @@ def check_trade_violations(sender, instance, created, **kwargs):
     check_challenge_violations(challenge)
 
 
+COMPLETION_FIELDS = ['status', 'completion_date', 'completion_notes', 'updated_at']
+
+
 def check_challenge_violations(challenge):
     """
-    Check challenge-level violations (drawdown, time limits)
+    Check challenge-level violations (drawdown, profit target)
+    
+    Reads the breach flags and totals the ledger keeps on the challenge, so
+    no trades are aggregated here.
     """
+    if challenge.status != 'active':
+        return []
+    
     template = challenge.template
     critical_violations = []
     
     # Check daily drawdown
     max_daily_loss = template.get_max_daily_loss()
-    if challenge.current_daily_drawdown > max_daily_loss:
+    if challenge.daily_loss_breached:
         violation = PropRuleViolation.objects.create(
             challenge=challenge,
             violation_type='daily_drawdown',
             severity='critical',
-            description=f'Daily drawdown ${challenge.current_daily_drawdown} exceeds limit ${max_daily_loss}',
-            value_breached=challenge.current_daily_drawdown,
+            description=f'Daily drawdown ${challenge.max_daily_drawdown_reached} exceeds limit ${max_daily_loss}',
+            value_breached=challenge.max_daily_drawdown_reached,
             limit_value=max_daily_loss,
             auto_detected=True,
             challenge_failed=True
@@ -129,8 +148,8 @@ def check_challenge_violations(challenge):
         # Fail the challenge
         challenge.status = 'failed'
         challenge.completion_date = timezone.now()
-        challenge.completion_notes = f"Challenge failed due to daily drawdown violation: ${challenge.current_daily_drawdown}"
-        challenge.save()
+        challenge.completion_notes = f"Challenge failed due to daily drawdown violation: ${challenge.max_daily_drawdown_reached}"
+        challenge.save(update_fields=COMPLETION_FIELDS)
         
         # Send critical violation alert and completion notification
         from propcoach.notifications import send_violation_alert, send_challenge_complete_alert
@@ -139,13 +158,13 @@ def check_challenge_violations(challenge):
     
     # Check total drawdown
     max_total_loss = template.get_max_total_loss()
-    if challenge.current_total_drawdown > max_total_loss:
+    if challenge.total_loss_breached:
         violation = PropRuleViolation.objects.create(
             challenge=challenge,
             violation_type='total_drawdown',
             severity='critical',
-            description=f'Total drawdown ${challenge.current_total_drawdown} exceeds limit ${max_total_loss}',
-            value_breached=challenge.current_total_drawdown,
+            description=f'Total drawdown ${challenge.max_total_drawdown_reached} exceeds limit ${max_total_loss}',
+            value_breached=challenge.max_total_drawdown_reached,
             limit_value=max_total_loss,
             auto_detected=True,
             challenge_failed=True
@@ -155,8 +174,8 @@ def check_challenge_violations(challenge):
         # Fail the challenge
         challenge.status = 'failed'
         challenge.completion_date = timezone.now()
-        challenge.completion_notes = f"Challenge failed due to total drawdown violation: ${challenge.current_total_drawdown}"
-        challenge.save()
+        challenge.completion_notes = f"Challenge failed due to total drawdown violation: ${challenge.max_total_drawdown_reached}"
+        challenge.save(update_fields=COMPLETION_FIELDS)
         
         # Send critical violation alert and completion notification
         from propcoach.notifications import send_violation_alert, send_challenge_complete_alert
@@ -164,14 +183,14 @@ def check_challenge_violations(challenge):
         send_challenge_complete_alert(challenge)
     
     # Check if profit target met
-    if challenge.total_profit_loss >= challenge.profit_target:
+    if challenge.status == 'active' and challenge.total_profit_loss >= challenge.profit_target:
         if challenge.trading_days_count >= template.min_trading_days:
             if challenge.violation_count == 0:
                 # Challenge passed!
                 challenge.status = 'passed'
                 challenge.completion_date = timezone.now()
                 challenge.completion_notes = f"Challenge passed! Profit: ${challenge.total_profit_loss}"
-                challenge.save()
+                challenge.save(update_fields=COMPLETION_FIELDS)
                 
                 # Send completion notification
                 from propcoach.notifications import send_challenge_complete_alert
@@ -1,3 +1,130 @@
+import importlib
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
 from django.test import TestCase
+from django.utils import timezone
+
+from .ledger import backfill_ledger, rebuild_challenge_state
+from .models import ChallengeEvent, FirmTemplate, PropChallenge, PropRuleViolation, TradeRecord
+from .prop_mode import check_trade_allowed
+
+LEDGER_FIELDS = [
+    'current_balance', 'peak_balance', 'total_profit_loss', 'total_trades',
+    'winning_trades', 'losing_trades', 'current_daily_drawdown',
+    'max_daily_drawdown_reached', 'current_total_drawdown',
+    'max_total_drawdown_reached', 'trading_days_count', 'last_trade_date',
+    'daily_pnl', 'daily_loss_breached', 'total_loss_breached', 'ledger_sequence',
+]
+
+
+class ChallengeLedgerTestCase(TestCase):
+    """Test the event-sourced challenge ledger"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='trader@example.com', password='x')
+        # $100k account: 5% ($5k) daily loss, 10% ($10k) total loss, 10% target
+        self.template = FirmTemplate.objects.create(template_name='Test', min_trade_duration_minutes=0)
+        self.challenge = PropChallenge.objects.create(
+            user=self.user, template=self.template,
+            initial_balance=Decimal('100000'), current_balance=Decimal('100000'),
+            peak_balance=Decimal('100000'),
+        )
+
+    def close(self, pnl, days_ago=0, **fields):
+        """Save a closed trade with the given P/L"""
+        exit_time = timezone.now() - timedelta(days=days_ago)
+        return TradeRecord.objects.create(
+            challenge=self.challenge, symbol='EURUSD', side='buy',
+            entry_price=Decimal('1.1'), exit_price=Decimal('1.1'), lot_size=Decimal('1'),
+            position_size_percent=Decimal('1'), status='closed',
+            profit_loss=Decimal(pnl), entry_time=exit_time - timedelta(hours=1), exit_time=exit_time,
+            **fields
+        )
+
+    def test_closed_trades_update_state_once(self):
+        """Each closed trade is one event; saving it again changes nothing"""
+        self.close('1500', days_ago=1)
+        trade = self.close('-500')
+        trade.save()
+
+        challenge = PropChallenge.objects.get(pk=self.challenge.pk)
+        self.assertEqual(ChallengeEvent.objects.filter(challenge=challenge).count(), 2)
+        self.assertEqual(challenge.ledger_sequence, 2)
+        self.assertEqual(challenge.current_balance, Decimal('101000'))
+        self.assertEqual(challenge.peak_balance, Decimal('101500'))
+        self.assertEqual(challenge.current_total_drawdown, Decimal('500'))
+        self.assertEqual(challenge.daily_drawdown_today, Decimal('500'))
+        self.assertEqual(challenge.trading_days_count, 2)
+        self.assertEqual((challenge.winning_trades, challenge.losing_trades), (1, 1))
+        self.assertEqual(challenge.daily_pnl[timezone.localdate().isoformat()], '-500.00')
+
+    def test_replay_matches_incremental_state(self):
+        """Replaying the ledger (and backfilling legacy trades) rebuilds the same state"""
+        for pnl, days_ago in (('800', 3), ('-1200', 2), ('300', 2), ('-100', 0)):
+            self.close(pnl, days_ago=days_ago)
+        incremental = PropChallenge.objects.values(*LEDGER_FIELDS).get(pk=self.challenge.pk)
+
+        # A trade closed before the ledger existed has no event yet
+        legacy = self.close('250', days_ago=1)
+        ChallengeEvent.objects.filter(trade=legacy).delete()
+        challenge = PropChallenge.objects.select_related('template').get(pk=self.challenge.pk)
+        self.assertEqual(backfill_ledger(challenge), 1)
+        self.assertEqual(backfill_ledger(challenge), 0)
+        ChallengeEvent.objects.filter(trade=legacy).delete()
+
+        rebuild_challenge_state(challenge)
+        replayed = PropChallenge.objects.values(*LEDGER_FIELDS).get(pk=self.challenge.pk)
+        self.assertEqual(replayed, incremental)
+
+    def test_daily_loss_breach_fails_challenge(self):
+        """Crossing the daily limit fails the challenge and blocks trading in one read"""
+        self.close('-3000')
+        allowed, _ = check_trade_allowed(self.user, 'EURUSD', 1.0)
+        self.assertTrue(allowed)
+        with self.assertNumQueries(1):
+            allowed, reason = check_trade_allowed(self.user, 'EURUSD', 2.5)
+        self.assertFalse(allowed)
+        self.assertIn('daily allowance', reason)
+
+        self.close('-2500')
+        challenge = PropChallenge.objects.get(pk=self.challenge.pk)
+        self.assertTrue(challenge.daily_loss_breached)
+        self.assertEqual(challenge.status, 'failed')
+        self.assertEqual(
+            PropRuleViolation.objects.filter(challenge=challenge, violation_type='daily_drawdown').count(), 1
+        )
+
+    def test_taken_sequence_is_retried_after_the_last_event(self):
+        """Unreplayed backfilled events do not make a new trade look recorded"""
+        self.close('400', days_ago=1)
+        legacy = self.close('-100', days_ago=1)
+        ChallengeEvent.objects.filter(trade=legacy).delete()
+        backfill_ledger(PropChallenge.objects.get(pk=self.challenge.pk))
+
+        trade = self.close('200')
+
+        event = ChallengeEvent.objects.get(trade=trade)
+        self.assertEqual(event.sequence, 3)
+        self.assertEqual(PropChallenge.objects.get(pk=self.challenge.pk).ledger_sequence, 3)
+
+    def test_migration_backfills_existing_trades(self):
+        """The ledger migration records and replays trades closed before it"""
+        for pnl, days_ago in (('800', 3), ('-1200', 2), ('300', 2)):
+            self.close(pnl, days_ago=days_ago)
+        expected = PropChallenge.objects.values(*LEDGER_FIELDS).get(pk=self.challenge.pk)
+        ChallengeEvent.objects.all().delete()
+        PropChallenge.objects.filter(pk=self.challenge.pk).update(ledger_sequence=0, current_balance=0)
+
+        migration = importlib.import_module('propcoach.migrations.0002_challenge_ledger')
+        state = MigrationExecutor(connection).loader.project_state(('propcoach', '0002_challenge_ledger'))
+        migration.backfill_ledgers(state.apps, None)
 
-# Create your tests here.
+        self.assertEqual(PropChallenge.objects.values(*LEDGER_FIELDS).get(pk=self.challenge.pk), expected)
+        self.assertEqual(
+            list(ChallengeEvent.objects.order_by('sequence').values_list('sequence', 'amount')),
+            [(1, Decimal('800')), (2, Decimal('-1200')), (3, Decimal('300'))],
+        )
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
-    Signal, PropRules, StrategyPerformance, SessionRule, RiskControl, 
+    Signal, PropRules, StrategyPerformance, SessionRule, RiskControl, RiskState,
     TradeJournalEntry, WebhookConfig, SignalEvaluation, SignalOverrideLog,
     MarketInsight  # NEW: AI Decision Intelligence Console model
 )
@@ -76,6 +76,41 @@ class RiskControlAdmin(admin.ModelAdmin):
         return qs
 
 
+@admin.register(RiskState)
+class RiskStateAdmin(admin.ModelAdmin):
+    """Read-only view of the intraday counters risk controls evaluate"""
+    
+    list_display = [
+        'user',
+        'trading_day',
+        'signal_count',
+        'red_signal_count',
+        'consecutive_losses',
+        'win_count',
+        'loss_count',
+        'daily_r',
+        'updated_at'
+    ]
+    
+    list_filter = ['trading_day']
+    search_fields = ['user__email']
+    readonly_fields = [field.name for field in RiskState._meta.fields]
+    actions = ['rebuild_action']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def rebuild_action(self, request, queryset):
+        """Admin action to recompute the counters from today's signals"""
+        from .risk_state import rebuild_risk_state
+        count = 0
+        for state in queryset:
+            rebuild_risk_state(state.user_id)
+            count += 1
+        self.message_user(request, f'Rebuilt risk state for {count} user(s).')
+    rebuild_action.short_description = "Rebuild from today's signals"
+
+
 @admin.register(SessionRule)
 class SessionRuleAdmin(admin.ModelAdmin):
     """Admin interface for SessionRule model"""
@@ -5,3 +5,7 @@ class SignalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'signals'
     verbose_name = 'Trade Insights & Signals'
+    
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import signals.signals  # noqa
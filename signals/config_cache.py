@@ -0,0 +1,77 @@
+"""
+Per-process cache of the config rows read by every webhook
+
+Each incoming signal used to load its WebhookConfig (or CustomUser by API
+key), the user's RiskControl and SessionRule, the active PropRules and
+the active ScoringWeights. These rows change a few times a day, so they
+are cached per worker (``zenithedge.local_store.VersionedCache``) and
+invalidated by the save/delete receivers in ``signals.signals``.
+
+Cached instances are shared across requests: read them, but copy before
+changing and saving (see ``evaluate_risk_controls``).
+"""
+from zenithedge.local_store import VersionedCache
+from zenithedge.write_behind import CounterBuffer
+
+WEBHOOK_CONFIGS = VersionedCache('signals.webhook_configs')
+API_KEY_USERS = VersionedCache('signals.api_key_users')
+RISK_CONTROLS = VersionedCache('signals.risk_controls')
+SESSION_RULES = VersionedCache('signals.session_rules')
+PROP_RULES = VersionedCache('signals.prop_rules', max_entries=1)
+SCORING_WEIGHTS = VersionedCache('signals.scoring_weights', max_entries=1)
+
+# Signals received per webhook, written in bulk instead of one save per signal
+WEBHOOK_SIGNAL_COUNTS = CounterBuffer('signals.WebhookConfig', 'signal_count', touch_field='last_signal_at')
+
+
+def get_webhook_config(webhook_uuid):
+    """WebhookConfig (with its user) for a webhook UUID, or None"""
+    from .models import WebhookConfig
+
+    def load():
+        return WebhookConfig.objects.select_related('user').filter(webhook_uuid=webhook_uuid).first()
+    return WEBHOOK_CONFIGS.get(str(webhook_uuid), load)
+
+
+def get_api_key_user(api_key):
+    """Active CustomUser owning ``api_key``, or None"""
+    from accounts.models import CustomUser
+
+    def load():
+        return CustomUser.objects.filter(api_key=api_key, is_active=True).first()
+    return API_KEY_USERS.get(api_key, load)
+
+
+def get_risk_control(user_id):
+    """Active RiskControl of a user, or None"""
+    from .models import RiskControl
+
+    def load():
+        return RiskControl.objects.filter(user_id=user_id, is_active=True).first()
+    return RISK_CONTROLS.get(user_id, load)
+
+
+def get_session_rule(user_id, session):
+    """SessionRule of a user for a trading session, or None"""
+    from .models import SessionRule
+
+    def load():
+        return SessionRule.objects.filter(user_id=user_id, session=session).first()
+    return SESSION_RULES.get((user_id, session), load)
+
+
+def get_active_prop_rules():
+    """Active PropRules, or None"""
+    from .models import PropRules
+    return PROP_RULES.get('active', lambda: PropRules.objects.filter(is_active=True).first())
+
+
+def get_active_scoring_weights():
+    """Active ScoringWeights (``ScoringWeights.get_active_weights``, cached)"""
+    from .models import ScoringWeights
+    return SCORING_WEIGHTS.get('active', ScoringWeights.get_active_weights)
+
+
+def record_webhook_signal(webhook_config_id):
+    """Count one received signal for a webhook (written behind)"""
+    WEBHOOK_SIGNAL_COUNTS.incr(webhook_config_id)
@@ -0,0 +1,225 @@
+"""
+Dashboard Statistics for Signals Views
+
+Counters for DashboardView and ValidationTrackRecordView, built with a few
+conditional aggregates and served from stats snapshots
+(see zenithedge.stats_snapshot). The receivers in signals.signals mark
+them stale when signals, evaluations or validations change.
+"""
+from datetime import timedelta
+
+from django.db.models import Avg, Count, FloatField, Q, Sum
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from zenithedge.stats_snapshot import get_snapshot
+
+SIGNAL_DASHBOARD = 'signal_dashboard'
+TRACK_RECORD = 'track_record'
+
+# Upper bound for the ?months= parameter of the track record page
+MAX_TRACK_RECORD_MONTHS = 36
+
+BREAKDOWN_KEYS = (
+    'technical_integrity',
+    'volatility_filter',
+    'regime_alignment',
+    'sentiment_coherence',
+    'historical_reliability',
+    'psychological_safety',
+)
+
+# Truth Index bands: name -> (lower bound inclusive, upper bound exclusive)
+TRUTH_BANDS = {
+    'excellent': (85, None),
+    'good': (75, 85),
+    'moderate': (65, 75),
+    'conditional': (60, 65),
+    'rejected': (None, 60),
+}
+
+
+def build_signal_dashboard():
+    """
+    Global counters shown on the signals dashboard
+
+    Returns:
+        Dict with total/allowed/rejected/passed/blocked signals,
+        avg_confidence and all_strategies
+    """
+    from .models import Signal, SignalEvaluation
+
+    signals = Signal.objects.aggregate(
+        total=Count('id'),
+        allowed=Count('id', filter=Q(is_allowed=True)),
+        rejected=Count('id', filter=Q(is_allowed=False)),
+        avg_confidence=Avg('confidence'),
+    )
+    evaluations = SignalEvaluation.objects.aggregate(
+        passed_count=Count('id', filter=Q(passed=True)),
+        blocked_count=Count('id', filter=Q(passed=False)),
+    )
+
+    return {
+        'total_signals': signals['total'],
+        'allowed_signals': signals['allowed'],
+        'rejected_signals': signals['rejected'],
+        'passed_signals': evaluations['passed_count'],
+        'blocked_signals': evaluations['blocked_count'],
+        'avg_confidence': signals['avg_confidence'] if signals['avg_confidence'] is not None else 0,
+        # All unique strategies for the filter dropdown
+        'all_strategies': list(
+            Signal.objects.values_list('strategy', flat=True).distinct().order_by('strategy')
+        ),
+    }
+
+
+def signal_dashboard_snapshot():
+    """Cached build_signal_dashboard() result"""
+    return get_snapshot(SIGNAL_DASHBOARD, build_signal_dashboard)
+
+
+def _band_filter(lower, upper) -> Q:
+    condition = Q()
+    if lower is not None:
+        condition &= Q(truth_index__gte=lower)
+    if upper is not None:
+        condition &= Q(truth_index__lt=upper)
+    return condition
+
+
+def build_track_record(months_back: int):
+    """
+    Validation track record for the last ``months_back`` 30-day months
+
+    Overall counts, the Truth Index distribution, breakdown averages and
+    the monthly series come from a single aggregate; strategy stats take
+    two more queries.
+
+    Args:
+        months_back: Number of 30-day periods to cover
+
+    Returns:
+        Dict of template values (JSON-serializable)
+    """
+    from .models import Signal, TradeValidation
+
+    now = timezone.now()
+    start_date = now - timedelta(days=months_back * 30)
+    validations = TradeValidation.objects.filter(validated_at__gte=start_date)
+
+    aggregates = {
+        'total': Count('id'),
+        'approved': Count('id', filter=Q(status='approved')),
+        'conditional': Count('id', filter=Q(status='conditional')),
+        'rejected': Count('id', filter=Q(status='rejected')),
+        'avg_truth_index': Avg('truth_index'),
+    }
+    for band, (lower, upper) in TRUTH_BANDS.items():
+        aggregates[f'band_{band}'] = Count('id', filter=_band_filter(lower, upper))
+    for key in BREAKDOWN_KEYS:
+        aggregates[f'breakdown_{key}'] = Sum(Cast(KeyTextTransform(key, 'breakdown'), FloatField()))
+
+    months = []
+    for i in range(months_back):
+        month_start = now - timedelta(days=(months_back - i) * 30)
+        month_end = month_start + timedelta(days=30)
+        in_month = Q(validated_at__gte=month_start, validated_at__lt=month_end)
+        aggregates[f'month_{i}_total'] = Count('id', filter=in_month)
+        aggregates[f'month_{i}_approved'] = Count('id', filter=in_month & Q(status='approved'))
+        aggregates[f'month_{i}_avg'] = Avg('truth_index', filter=in_month)
+        months.append(month_start.strftime('%b %Y'))
+
+    totals = validations.aggregate(**aggregates)
+
+    total_validations = totals['total']
+    approved_count = totals['approved']
+    avg_truth_index = float(totals['avg_truth_index'] or 0)
+
+    # Approval rate
+    approval_rate = (approved_count / total_validations * 100) if total_validations > 0 else 0
+
+    monthly_stats = []
+    for i, label in enumerate(months):
+        month_total = totals[f'month_{i}_total']
+        month_approved = totals[f'month_{i}_approved']
+        monthly_stats.append({
+            'month': label,
+            'total': month_total,
+            'approved': month_approved,
+            'approval_rate': (month_approved / month_total * 100) if month_total > 0 else 0,
+            'avg_truth_index': float(totals[f'month_{i}_avg'] or 0)
+        })
+
+    # Strategy-specific performance (strategies with more than 5 signals)
+    strategies = list(
+        Signal.objects.values('strategy').annotate(count=Count('id'))
+        .filter(count__gt=5).order_by('-count').values_list('strategy', flat=True)
+    )
+    per_strategy = {
+        row['signal__strategy']: row
+        for row in validations.filter(signal__strategy__in=strategies)
+        .values('signal__strategy')
+        .annotate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(status='approved')),
+            avg_truth=Avg('truth_index')
+        )
+    }
+    strategy_stats = []
+    for strategy_name in strategies:
+        row = per_strategy.get(strategy_name)
+        if not row or not row['total']:
+            continue
+        strategy_stats.append({
+            'name': strategy_name,
+            'total': row['total'],
+            'approved': row['approved'],
+            'approval_rate': (row['approved'] / row['total'] * 100),
+            'avg_truth_index': float(row['avg_truth'] or 0)
+        })
+
+    # Sort by approval rate
+    strategy_stats.sort(key=lambda x: x['approval_rate'], reverse=True)
+
+    breakdown_averages = {
+        key: ((totals[f'breakdown_{key}'] or 0) / total_validations) * 100 if total_validations > 0 else 0
+        for key in BREAKDOWN_KEYS
+    }
+
+    # System health grade
+    if approval_rate >= 70 and avg_truth_index >= 75:
+        system_grade = 'A'
+        system_health = 'Excellent'
+    elif approval_rate >= 60 and avg_truth_index >= 70:
+        system_grade = 'B'
+        system_health = 'Good'
+    elif approval_rate >= 50 and avg_truth_index >= 65:
+        system_grade = 'C'
+        system_health = 'Fair'
+    else:
+        system_grade = 'D'
+        system_health = 'Needs Improvement'
+
+    return {
+        'total_validations': total_validations,
+        'approved_count': approved_count,
+        'conditional_count': totals['conditional'],
+        'rejected_count': totals['rejected'],
+        'approval_rate': approval_rate,
+        'avg_truth_index': avg_truth_index,
+        'monthly_stats': monthly_stats,
+        'strategy_stats': strategy_stats,
+        'truth_distribution': {band: totals[f'band_{band}'] for band in TRUTH_BANDS},
+        'breakdown_averages': breakdown_averages,
+        'system_grade': system_grade,
+        'system_health': system_health,
+        'months_back': months_back,
+    }
+
+
+def track_record_snapshot(months_back: int):
+    """Cached build_track_record() result for ``months_back`` (clamped)"""
+    months_back = max(1, min(months_back, MAX_TRACK_RECORD_MONTHS))
+    return get_snapshot(f'{TRACK_RECORD}:{months_back}', lambda: build_track_record(months_back))
@@ -0,0 +1,41 @@
+"""
+Management command to rebuild users' intraday risk state from today's signals
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from signals.models import Signal
+from signals.risk_state import rebuild_risk_state, trading_day
+
+
+class Command(BaseCommand):
+    help = "Recompute RiskState counters from today's signals (after bulk imports or manual fixes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            help='Rebuild a single user only'
+        )
+
+    def handle(self, *args, **options):
+        if options.get('user_id'):
+            user_ids = [options['user_id']]
+        else:
+            day_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            user_ids = (
+                Signal.objects.filter(received_at__gte=day_start, user__isnull=False)
+                .order_by().values_list('user_id', flat=True).distinct()
+            )
+
+        rebuilt = 0
+        for user_id in user_ids:
+            state = rebuild_risk_state(user_id)
+            rebuilt += 1
+            self.stdout.write(
+                f"  user {user_id}: {state.signal_count} signals, {state.red_signal_count} rejected, "
+                f"{state.consecutive_losses} losses in a row, {state.daily_r:+.2f}R"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\n✅ Rebuilt risk state for {rebuilt} user(s) on {trading_day()}")
+        )
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('signals', '0017_add_webhook_tracking_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiskState',
+            fields=[
+                ('user', models.OneToOneField(help_text='User these counters belong to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='risk_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('trading_day', models.DateField(help_text='Trading day (UTC) the counters cover')),
+                ('signal_count', models.IntegerField(default=0, help_text='Signals received today')),
+                ('red_signal_count', models.IntegerField(default=0, help_text='Rejected/blocked signals today')),
+                ('win_count', models.IntegerField(default=0, help_text="Today's signals resolved as wins")),
+                ('loss_count', models.IntegerField(default=0, help_text="Today's signals resolved as losses")),
+                ('consecutive_losses', models.IntegerField(default=0, help_text="Losses since the last win among today's resolved signals (by received time)")),
+                ('daily_r', models.FloatField(default=0.0, help_text="Net R multiple of today's resolved signals")),
+                ('last_resolved_at', models.DateTimeField(blank=True, help_text='Received time of the latest resolved signal in the streak', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Risk State',
+                'verbose_name_plural': 'Risk States',
+            },
+        ),
+    ]
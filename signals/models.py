@@ -4,6 +4,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
+import copy
 import uuid
 
 
@@ -283,6 +284,49 @@ class RiskControl(models.Model):
         return False
 
 
+class RiskState(models.Model):
+    """
+    Intraday risk counters of a user for the current trading day (UTC)
+
+    Maintained incrementally by ``signals.risk_state`` as signals are
+    received and their outcomes set, so risk controls read one row by
+    primary key instead of scanning today's signals. Counters reset when
+    the first signal of a new day arrives.
+    """
+    user = models.OneToOneField(
+        'accounts.CustomUser',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='risk_state',
+        help_text="User these counters belong to"
+    )
+    trading_day = models.DateField(help_text="Trading day (UTC) the counters cover")
+
+    signal_count = models.IntegerField(default=0, help_text="Signals received today")
+    red_signal_count = models.IntegerField(default=0, help_text="Rejected/blocked signals today")
+    win_count = models.IntegerField(default=0, help_text="Today's signals resolved as wins")
+    loss_count = models.IntegerField(default=0, help_text="Today's signals resolved as losses")
+    consecutive_losses = models.IntegerField(
+        default=0,
+        help_text="Losses since the last win among today's resolved signals (by received time)"
+    )
+    daily_r = models.FloatField(default=0.0, help_text="Net R multiple of today's resolved signals")
+    last_resolved_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Received time of the latest resolved signal in the streak"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Risk State'
+        verbose_name_plural = 'Risk States'
+
+    def __str__(self):
+        return f"{self.user_id} - {self.trading_day}: {self.signal_count} signals, {self.consecutive_losses} losses in a row"
+
+
 class StrategyPerformance(models.Model):
     """
     Model to track and analyze strategy performance metrics
@@ -452,7 +496,12 @@ class StrategyPerformance(models.Model):
         return f"{' - '.join(parts)} (WR: {self.win_rate:.1f}%)"
     
     def update_metrics(self):
-        """Recalculate all performance metrics"""
+        """
+        Recalculate win rate and profit factor from this row's counts and averages
+        
+        For manual edits only; analyze_performance computes every metric in
+        bulk (see signals.performance).
+        """
         if self.total_trades > 0:
             self.win_rate = (self.winning_trades / self.total_trades) * 100
         else:
@@ -467,7 +516,7 @@ class StrategyPerformance(models.Model):
         else:
             self.profit_factor = gross_profit if gross_profit > 0 else 0.0
         
-        self.save()
+        self.save(update_fields=['win_rate', 'profit_factor', 'last_updated'])
     
     @property
     def is_profitable(self):
@@ -689,7 +738,16 @@ class Signal(models.Model):
             return 'London'
         else:  # 16 <= hour < 24
             return 'New York'
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded allowed flag and outcome so risk state can apply changes"""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if 'is_allowed' in loaded and 'outcome' in loaded:
+            instance._risk_snapshot = (loaded['is_allowed'], loaded['outcome'])
+        return instance
+
     def save(self, *args, **kwargs):
         """Override save to auto-detect session"""
         # Auto-detect session if not set
@@ -951,6 +1009,10 @@ def evaluate_risk_controls(user):
     """
     Evaluate if user has exceeded risk control thresholds
     
+    Checks read the user's RiskState (see ``signals.risk_state``) and count
+    the signal being evaluated. When 'counted' is True, pass the saved
+    Signal to ``risk_state.mark_counted`` so it is not counted twice.
+    
     Args:
         user: CustomUser instance
     
@@ -958,12 +1020,14 @@ def evaluate_risk_controls(user):
         dict: {
             'blocked': bool,
             'reason': str,
-            'risk_control': RiskControl instance or None
+            'risk_control': RiskControl instance or None,
+            'counted': bool (only when the signal was counted)
         }
     """
     # Get active risk control for user
     try:
-        risk_control = RiskControl.objects.filter(user=user, is_active=True).first()
+        from .config_cache import get_risk_control
+        risk_control = get_risk_control(user.pk)
     except Exception:
         return {
             'blocked': False,
@@ -978,6 +1042,9 @@ def evaluate_risk_controls(user):
             'risk_control': None
         }
     
+    # The cached row is shared by the worker; halts modify and save a copy
+    risk_control = copy.copy(risk_control)
+    
     # Check if already halted
     if risk_control.is_halted:
         # Check if should auto-reset
@@ -990,58 +1057,49 @@ def evaluate_risk_controls(user):
                 'risk_control': risk_control
             }
     
-    # Get today's signals for this user
-    today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    today_signals = Signal.objects.filter(
-        user=user,
-        received_at__gte=today_start
-    ).order_by('received_at')
-    
+    # Count this signal and read today's counters (one locked row by primary key)
+    from .risk_state import reserve_signal
+    state = reserve_signal(user.pk)
+
     # Check 1: Max daily trades
-    total_today = today_signals.count()
-    if total_today >= risk_control.max_daily_trades:
-        reason = f'Daily trade limit reached ({total_today}/{risk_control.max_daily_trades})'
+    if state.signal_count >= risk_control.max_daily_trades:
+        reason = f'Daily trade limit reached ({state.signal_count}/{risk_control.max_daily_trades})'
         risk_control.trigger_halt(reason)
         return {
             'blocked': True,
             'reason': reason,
-            'risk_control': risk_control
+            'risk_control': risk_control,
+            'counted': True
         }
-    
+
     # Check 2: Max red signals per day
-    red_signals_today = today_signals.filter(is_allowed=False).count()
-    if red_signals_today >= risk_control.max_red_signals_per_day:
-        reason = f'Too many rejected signals today ({red_signals_today}/{risk_control.max_red_signals_per_day})'
+    if state.red_signal_count >= risk_control.max_red_signals_per_day:
+        reason = f'Too many rejected signals today ({state.red_signal_count}/{risk_control.max_red_signals_per_day})'
         risk_control.trigger_halt(reason)
         return {
             'blocked': True,
             'reason': reason,
-            'risk_control': risk_control
+            'risk_control': risk_control,
+            'counted': True
         }
-    
-    # Check 3: Consecutive losers (only count signals with outcomes)
-    consecutive_losses = 0
-    for signal in today_signals.filter(outcome__in=['win', 'loss']).order_by('-received_at'):
-        if signal.outcome == 'loss':
-            consecutive_losses += 1
-        else:
-            # Win breaks the streak
-            break
-    
-    if consecutive_losses >= risk_control.max_consecutive_losers:
-        reason = f'Consecutive loss limit reached ({consecutive_losses}/{risk_control.max_consecutive_losers})'
+
+    # Check 3: Consecutive losers (only signals with outcomes)
+    if state.consecutive_losses >= risk_control.max_consecutive_losers:
+        reason = f'Consecutive loss limit reached ({state.consecutive_losses}/{risk_control.max_consecutive_losers})'
         risk_control.trigger_halt(reason)
         return {
             'blocked': True,
             'reason': reason,
-            'risk_control': risk_control
+            'risk_control': risk_control,
+            'counted': True
         }
-    
+
     # All checks passed
     return {
         'blocked': False,
         'reason': 'Risk controls passed',
-        'risk_control': risk_control
+        'risk_control': risk_control,
+        'counted': True
     }
 
 
@@ -1063,7 +1121,8 @@ def check_signal_against_prop(signal_data, prop_rules=None):
     # Get active prop rules if not provided
     if prop_rules is None:
         try:
-            prop_rules = PropRules.objects.filter(is_active=True).first()
+            from .config_cache import get_active_prop_rules
+            prop_rules = get_active_prop_rules()
         except Exception:
             # If no prop rules exist or DB error, allow signal
             return {
@@ -2194,11 +2253,14 @@ class WebhookConfig(models.Model):
         return self.webhook_url
     
     def increment_signal_count(self):
-        """Increment signal count and update timestamp"""
-        from django.utils import timezone
-        self.signal_count += 1
-        self.last_signal_at = timezone.now()
-        self.save(update_fields=['signal_count', 'last_signal_at'])
+        """
+        Increment signal count and update timestamp
+
+        Counts are buffered and written in bulk every few seconds, so
+        this instance (possibly a shared cached one) is not modified.
+        """
+        from .config_cache import record_webhook_signal
+        record_webhook_signal(self.pk)
     
     def regenerate_uuid(self):
         """Generate new UUID (useful if webhook is compromised)"""
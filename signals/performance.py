@@ -0,0 +1,347 @@
+"""
+Set-based StrategyPerformance recomputation
+
+All signals in scope are fetched with one ``values()`` query into a
+DataFrame. The frame is stacked once per grouping level (strategy,
++regime, +symbol, +timeframe, +regime+symbol, full granularity), with the
+unused key columns blanked, and every level is aggregated in a single
+``groupby``. The per-trade equity curve (1% of equity risked per trade)
+is a grouped cumulative product, so drawdowns and P/L still follow trade
+order without a Python loop per group.
+
+Rows are written with a keyed bulk upsert: one query for the existing
+keys, then ``bulk_update`` and ``bulk_create``. A database ON CONFLICT
+upsert would not work here, because regime/symbol/timeframe are NULL on
+the coarser levels and NULLs never conflict in a unique constraint.
+
+Incremental runs only recompute the (user, strategy) partitions with a
+signal updated (e.g. its outcome set) since that partition was last
+analyzed. Rows of a recomputed partition whose group was not computed
+again (fewer than MIN_GROUP_TRADES trades now) are deleted.
+
+Bulk writes send no model signals, so ``performance_recomputed`` is sent
+once a run changed rows; dashboards subscribe to it for invalidation.
+"""
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.db.models import Max, Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from zenithedge.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+logger = logging.getLogger(__name__)
+
+# Sent after a recomputation created, updated or deleted rows
+performance_recomputed = Signal()
+
+KEY_FIELDS = ('strategy', 'regime', 'symbol', 'timeframe')
+
+# Key columns each grouping level keeps (the others are blanked)
+GROUPING_LEVELS = (
+    ('strategy',),
+    ('strategy', 'regime'),
+    ('strategy', 'symbol'),
+    ('strategy', 'timeframe'),
+    ('strategy', 'regime', 'symbol'),
+    ('strategy', 'regime', 'symbol', 'timeframe'),
+)
+
+# Groups with fewer trades are not written
+MIN_GROUP_TRADES = 3
+
+STARTING_EQUITY = 10000.0
+RISK_PER_TRADE = 0.01
+
+SIGNAL_FIELDS = (
+    'user_id', 'strategy', 'regime', 'symbol', 'timeframe',
+    'price', 'sl', 'tp', 'confidence', 'outcome',
+)
+
+METRIC_FIELDS = [
+    'total_trades', 'winning_trades', 'losing_trades', 'win_rate',
+    'avg_rr', 'total_rr', 'max_drawdown', 'current_drawdown',
+    'total_pnl', 'avg_win', 'avg_loss', 'profit_factor', 'avg_confidence',
+    'analysis_period_start', 'analysis_period_end', 'last_updated',
+]
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(round(float(value), 2)))
+
+
+def load_trades(signals, simulate: bool = False, seed: Optional[int] = None):
+    """
+    Evaluated trades of a Signal queryset, one row per signal, in time order
+
+    Args:
+        signals: Signal queryset
+        simulate: Draw outcomes from confidence instead of using ``outcome``
+            (pending signals are then included)
+        seed: Random seed for simulated outcomes
+
+    Returns:
+        DataFrame with the key columns, ``user_id``, ``confidence``,
+        ``r_multiple`` and ``is_win``
+    """
+    rows = list(signals.order_by('received_at', 'id').values_list(*SIGNAL_FIELDS))
+    frame = pd.DataFrame.from_records(rows, columns=SIGNAL_FIELDS)
+    if frame.empty:
+        return frame.assign(r_multiple=pd.Series(dtype=float), is_win=pd.Series(dtype=bool))
+
+    entry, sl, tp = (pd.to_numeric(frame[column], errors='coerce').fillna(0.0).astype(float)
+                     for column in ('price', 'sl', 'tp'))
+    risk = (entry - sl).abs()
+    reward = (tp - entry).abs()
+    valid = (entry != 0) & (sl != 0) & (tp != 0) & (risk > 0)
+
+    if simulate:
+        # Higher confidence = higher win probability, capped for realism
+        win_probability = np.minimum(frame['confidence'].to_numpy(dtype=float) / 100.0 * 0.85, 0.90)
+        is_win = np.random.default_rng(seed).random(len(frame)) < win_probability
+    else:
+        valid &= frame['outcome'].isin(['win', 'loss'])
+        is_win = (frame['outcome'] == 'win').to_numpy()
+
+    frame['is_win'] = is_win
+    frame['r_multiple'] = np.where(is_win, reward / risk.where(risk > 0, 1.0), -1.0)
+    return frame.loc[valid.to_numpy(), ['user_id', *KEY_FIELDS, 'confidence', 'r_multiple', 'is_win']]
+
+
+def compute_performance(trades) -> 'pd.DataFrame':
+    """
+    Metrics of every grouping level of ``trades`` in one groupby
+
+    Args:
+        trades: Frame from load_trades (rows in trade order)
+
+    Returns:
+        DataFrame with one row per (user, level key) and the
+        StrategyPerformance metric columns
+    """
+    group_keys = ['user_id', *KEY_FIELDS]
+    if trades.empty:
+        return pd.DataFrame(columns=group_keys + METRIC_FIELDS[:13])
+
+    levels = []
+    for kept in GROUPING_LEVELS:
+        level = trades.copy()
+        for column in KEY_FIELDS:
+            if column not in kept:
+                level[column] = None
+        levels.append(level)
+    stacked = pd.concat(levels, ignore_index=True)
+
+    for column in group_keys:
+        stacked[column] = stacked[column].astype(object)
+
+    # Equity after each trade when RISK_PER_TRADE of equity is risked
+    stacked['growth'] = 1.0 + RISK_PER_TRADE * stacked['r_multiple']
+    groups = stacked.groupby(group_keys, dropna=False, sort=False)
+    stacked['equity'] = STARTING_EQUITY * groups['growth'].cumprod()
+    stacked['pnl'] = stacked['equity'] / stacked['growth'] * RISK_PER_TRADE * stacked['r_multiple']
+    peak = groups['equity'].cummax().clip(lower=STARTING_EQUITY)
+    stacked['drawdown'] = (peak - stacked['equity']) / peak * 100
+    stacked['win_pnl'] = stacked['pnl'].where(stacked['is_win'], 0.0)
+    stacked['loss_pnl'] = (-stacked['pnl']).where(~stacked['is_win'], 0.0)
+
+    result = stacked.groupby(group_keys, dropna=False, sort=False).agg(
+        total_trades=('r_multiple', 'size'),
+        winning_trades=('is_win', 'sum'),
+        avg_rr=('r_multiple', 'mean'),
+        total_rr=('r_multiple', 'sum'),
+        max_drawdown=('drawdown', 'max'),
+        current_drawdown=('drawdown', 'last'),
+        total_pnl=('pnl', 'sum'),
+        gross_win=('win_pnl', 'sum'),
+        gross_loss=('loss_pnl', 'sum'),
+        avg_confidence=('confidence', 'mean'),
+    ).reset_index()
+
+    result['winning_trades'] = result['winning_trades'].astype(int)
+    result['losing_trades'] = result['total_trades'] - result['winning_trades']
+    result['win_rate'] = result['winning_trades'] / result['total_trades'] * 100
+    result['avg_win'] = (result['gross_win'] / result['winning_trades'].where(result['winning_trades'] > 0)).fillna(0.0)
+    result['avg_loss'] = (result['gross_loss'] / result['losing_trades'].where(result['losing_trades'] > 0)).fillna(0.0)
+    result['profit_factor'] = (result['gross_win'] / result['gross_loss'].where(result['gross_loss'] > 0)).fillna(0.0)
+    result['max_drawdown'] = result['max_drawdown'].clip(lower=0.0)
+    return result.drop(columns=['gross_win', 'gross_loss'])
+
+
+def changed_partitions(signals) -> Set[Tuple[Optional[int], str]]:
+    """
+    (user_id, strategy) partitions of ``signals`` updated since their last analysis
+
+    A partition's last analysis is the ``analysis_period_end`` of its
+    strategy-level StrategyPerformance row; partitions without one always
+    count as changed. One grouped query returns each partition's latest
+    ``updated_at``.
+    """
+    from signals.models import StrategyPerformance
+
+    analyzed = {
+        (user_id, strategy): analyzed_at
+        for user_id, strategy, analyzed_at in StrategyPerformance.objects.filter(
+            regime__isnull=True, symbol__isnull=True, timeframe__isnull=True
+        ).values_list('user_id', 'strategy_name', 'analysis_period_end')
+    }
+    latest = signals.order_by().values_list('user_id', 'strategy').annotate(last_update=Max('updated_at'))
+
+    changed = set()
+    for user_id, strategy, last_update in latest:
+        analyzed_at = analyzed.get((user_id, strategy))
+        if analyzed_at is None or last_update > analyzed_at:
+            changed.add((user_id, strategy))
+    return changed
+
+
+def recompute_strategy_performance(signals, start, end, simulate: bool = False,
+                                   incremental: bool = False, seed: Optional[int] = None,
+                                   prune: bool = True) -> Dict:
+    """
+    Recompute and upsert StrategyPerformance rows for a Signal queryset
+
+    Args:
+        signals: Signal queryset already limited to the analysis window
+        start: Start of the analysis window (stored on the rows)
+        end: End of the analysis window; also the watermark incremental
+            runs compare ``Signal.updated_at`` against
+        simulate: Use simulated outcomes (demo/testing)
+        incremental: Only recompute partitions with changed signals
+        seed: Random seed for simulated outcomes
+        prune: Delete rows of the recomputed partitions that were not
+            computed again (pass False when ``signals`` is filtered below
+            the partition, e.g. by regime or symbol)
+
+    Returns:
+        Dict with 'rows' (the computed frame), 'created', 'updated',
+        'deleted', 'signals' and 'partitions' counts
+    """
+    partitions = None
+    if incremental:
+        partitions = changed_partitions(signals)
+        if not partitions:
+            return {'rows': compute_performance(pd.DataFrame()), 'created': 0, 'updated': 0,
+                    'deleted': 0, 'signals': 0, 'partitions': 0}
+        user_ids = {user_id for user_id, _ in partitions}
+        scope = Q(strategy__in={strategy for _, strategy in partitions})
+        user_scope = Q(user_id__in=[u for u in user_ids if u is not None])
+        if None in user_ids:
+            user_scope |= Q(user__isnull=True)
+        signals = signals.filter(scope & user_scope)
+
+    trades = load_trades(signals, simulate=simulate, seed=seed)
+    if partitions is not None and not trades.empty:
+        in_scope = [
+            (_none(user_id), strategy) in partitions
+            for user_id, strategy in zip(trades['user_id'].astype(object), trades['strategy'])
+        ]
+        trades = trades[in_scope]
+
+    rows = compute_performance(trades)
+    rows = rows[rows['total_trades'] >= MIN_GROUP_TRADES].reset_index(drop=True)
+    created, updated = _upsert(rows, start, end)
+    deleted = 0
+    if prune:
+        scope = partitions if partitions is not None else set(
+            signals.order_by().values_list('user_id', 'strategy').distinct()
+        )
+        deleted = _prune(rows, scope)
+
+    if created or updated or deleted:
+        performance_recomputed.send(sender=recompute_strategy_performance)
+
+    return {
+        'rows': rows,
+        'created': created,
+        'updated': updated,
+        'deleted': deleted,
+        'signals': len(trades),
+        'partitions': len(partitions) if partitions is not None else None,
+    }
+
+
+def _none(value):
+    return None if value is None or (isinstance(value, float) and np.isnan(value)) else value
+
+
+def _row_key(row) -> Tuple:
+    """(user_id, strategy, regime, symbol, timeframe) of a computed row"""
+    user_id = _none(row.user_id)
+    return (int(user_id) if user_id is not None else None, row.strategy,
+            _none(row.regime), _none(row.symbol), _none(row.timeframe))
+
+
+def _upsert(rows, start, end) -> Tuple[int, int]:
+    """Write computed rows: bulk_update existing keys, bulk_create the rest"""
+    from signals.models import StrategyPerformance
+
+    if rows.empty:
+        return 0, 0
+
+    strategies = set(rows['strategy'])
+    existing = {
+        (user_id, strategy, regime, symbol, timeframe): pk
+        for pk, user_id, strategy, regime, symbol, timeframe in StrategyPerformance.objects.filter(
+            strategy_name__in=strategies
+        ).values_list('pk', 'user_id', 'strategy_name', 'regime', 'symbol', 'timeframe')
+    }
+
+    now = timezone.now()
+    to_create: List = []
+    to_update: List = []
+    for row in rows.itertuples(index=False):
+        key = _row_key(row)
+        perf = StrategyPerformance(
+            pk=existing.get(key),
+            user_id=key[0], strategy_name=key[1], regime=key[2], symbol=key[3], timeframe=key[4],
+            total_trades=int(row.total_trades),
+            winning_trades=int(row.winning_trades),
+            losing_trades=int(row.losing_trades),
+            win_rate=float(row.win_rate),
+            avg_rr=float(row.avg_rr),
+            total_rr=float(row.total_rr),
+            max_drawdown=float(row.max_drawdown),
+            current_drawdown=float(row.current_drawdown),
+            total_pnl=_money(row.total_pnl),
+            avg_win=_money(row.avg_win),
+            avg_loss=_money(row.avg_loss),
+            profit_factor=float(row.profit_factor),
+            avg_confidence=float(row.avg_confidence),
+            analysis_period_start=start,
+            analysis_period_end=end,
+            last_updated=now,
+        )
+        (to_update if perf.pk else to_create).append(perf)
+
+    if to_update:
+        StrategyPerformance.objects.bulk_update(to_update, METRIC_FIELDS, batch_size=500)
+    if to_create:
+        StrategyPerformance.objects.bulk_create(to_create, batch_size=500)
+    return len(to_create), len(to_update)
+
+
+def _prune(rows, partitions) -> int:
+    """Delete rows of ``partitions`` whose group is not in ``rows``"""
+    from signals.models import StrategyPerformance
+
+    if not partitions:
+        return 0
+    computed = {_row_key(row) for row in rows.itertuples(index=False)}
+    stale = [
+        pk
+        for pk, *key in StrategyPerformance.objects.filter(
+            strategy_name__in={strategy for _, strategy in partitions}
+        ).values_list('pk', 'user_id', 'strategy_name', 'regime', 'symbol', 'timeframe')
+        if (key[0], key[1]) in partitions and tuple(key) not in computed
+    ]
+    if not stale:
+        return 0
+    return StrategyPerformance.objects.filter(pk__in=stale).delete()[0]
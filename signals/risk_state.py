@@ -0,0 +1,240 @@
+"""
+Per-user intraday risk state for risk controls
+
+``evaluate_risk_controls`` runs on every webhook. It used to count the
+user's signals received today, count the rejected ones, and walk today's
+resolved signals to find the current losing streak. Those numbers now
+live on one RiskState row per user (primary key = user). The row is
+updated as signals are saved:
+
+- the webhook counts the incoming signal while it evaluates it
+  (``reserve_signal``) with one atomic increment, so concurrent webhooks
+  of one user see each other's signals, and gives the count back
+  (``release_signal``) if the Signal cannot be saved
+- other new signals, rejections and outcome changes are applied by the
+  Signal post_save receiver (``apply_signal_save``)
+
+Counters cover the current UTC day. A row from an earlier day, or a user
+without a row yet, is rebuilt from today's signals on first use. A
+corrected outcome, or one set on a signal older than the latest resolved
+one, also rebuilds, because the streak cannot be unwound incrementally.
+"""
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+RESOLVED_OUTCOMES = ('win', 'loss')
+
+COUNTER_FIELDS = [
+    'signal_count', 'red_signal_count', 'win_count', 'loss_count',
+    'consecutive_losses', 'daily_r', 'last_resolved_at',
+]
+STATE_FIELDS = ['trading_day', *COUNTER_FIELDS, 'updated_at']
+
+
+def trading_day(moment=None):
+    """UTC trading day of a timestamp (now by default)"""
+    moment = moment or timezone.now()
+    if timezone.is_naive(moment):
+        return moment.date()
+    return moment.astimezone(dt_timezone.utc).date()
+
+
+def r_multiple(price, sl, tp, outcome) -> float:
+    """R multiple of a resolved signal; 0 without a usable stop"""
+    entry, stop, target = (float(value or 0) for value in (price, sl, tp))
+    risk = abs(entry - stop)
+    if not (entry and stop and target and risk):
+        return 0.0
+    return abs(target - entry) / risk if outcome == 'win' else -1.0
+
+
+def _apply_outcome(state, received_at, outcome, r):
+    """Apply one newly resolved signal, newest in the streak, to ``state``"""
+    if outcome == 'win':
+        state.win_count += 1
+        state.consecutive_losses = 0
+    else:
+        state.loss_count += 1
+        state.consecutive_losses += 1
+    state.daily_r += r
+    state.last_resolved_at = received_at
+
+
+def _rebuild(state, day):
+    """Recompute ``state`` counters from the user's signals received on ``day``"""
+    from .models import Signal
+
+    for field in COUNTER_FIELDS:
+        setattr(state, field, state._meta.get_field(field).get_default())
+    state.trading_day = day
+
+    today = Signal.objects.filter(
+        user_id=state.user_id,
+        received_at__gte=datetime.combine(day, time.min, tzinfo=dt_timezone.utc),
+    )
+    counts = today.aggregate(signals=Count('id'), red=Count('id', filter=Q(is_allowed=False)))
+    state.signal_count = counts['signals']
+    state.red_signal_count = counts['red']
+
+    resolved = today.filter(outcome__in=RESOLVED_OUTCOMES).order_by('received_at', 'id').values_list(
+        'received_at', 'outcome', 'price', 'sl', 'tp'
+    )
+    for received_at, outcome, price, sl, tp in resolved:
+        _apply_outcome(state, received_at, outcome, r_multiple(price, sl, tp, outcome))
+
+
+def _locked_state(user_id, day):
+    """
+    Lock and return the user's RiskState for ``day`` (call inside atomic)
+
+    The lock is taken by writing first. An UPDATE locks the row on MySQL
+    and takes the database write lock on SQLite, where select_for_update
+    is a no-op and a transaction that reads before it writes fails with
+    "database is locked" once another writer got in between.
+
+    Returns:
+        Tuple of (RiskState, rebuilt). A new row or one from an earlier day
+        is rebuilt from the database, so it already reflects saved signals.
+    """
+    from .models import RiskState
+
+    RiskState.objects.filter(user_id=user_id).update(updated_at=timezone.now())
+    state, created = RiskState.objects.select_for_update().get_or_create(
+        user_id=user_id, defaults={'trading_day': day}
+    )
+    if created or state.trading_day != day:
+        _rebuild(state, day)
+        return state, True
+    return state, False
+
+
+def reserve_signal(user_id):
+    """
+    Count an incoming signal and return the state it is evaluated against
+
+    The count is a single ``signal_count = signal_count + 1`` UPDATE and
+    the row is read back in the same transaction, so a burst of webhooks
+    for the same user is counted one by one. Only the first signal of a
+    day (or of a user) takes the rebuild path. Mark the saved Signal with
+    ``mark_counted`` so the post_save receiver does not count it again,
+    and call ``release_signal`` if it is never saved.
+
+    Args:
+        user_id: Primary key of the signal's user
+
+    Returns:
+        RiskState as it was before this signal was counted
+    """
+    from .models import RiskState
+
+    day = trading_day()
+    with transaction.atomic():
+        counted = RiskState.objects.filter(user_id=user_id, trading_day=day).update(
+            signal_count=F('signal_count') + 1, updated_at=timezone.now()
+        )
+        if counted:
+            state = RiskState.objects.get(user_id=user_id)
+        else:
+            state, _ = _locked_state(user_id, day)
+            state.signal_count += 1
+            state.save(update_fields=STATE_FIELDS)
+
+    state.signal_count -= 1
+    return state
+
+
+def release_signal(user_id):
+    """
+    Give back a ``reserve_signal`` count whose Signal was never saved
+
+    A row that has since moved to another day is left alone; it is
+    rebuilt from the saved signals on its next use anyway.
+    """
+    from .models import RiskState
+
+    RiskState.objects.filter(user_id=user_id, trading_day=trading_day(), signal_count__gt=0).update(
+        signal_count=F('signal_count') - 1, updated_at=timezone.now()
+    )
+
+
+def mark_counted(signal):
+    """Flag a Signal whose arrival ``reserve_signal`` already counted"""
+    signal._risk_state_counted = True
+
+
+def apply_signal_save(signal, created: bool):
+    """
+    Apply a saved Signal to its user's risk state
+
+    New signals are counted (unless reserved), rejections counted, and an
+    outcome change applied. Signals received before today are ignored.
+
+    Args:
+        signal: Saved Signal instance
+        created: Whether the save inserted it
+    """
+    previous = None if created else getattr(signal, '_risk_snapshot', None)
+    current = (signal.is_allowed, signal.outcome)
+    signal._risk_snapshot = current
+
+    if signal.user_id is None or (not created and previous in (None, current)):
+        return
+    day = trading_day()
+    if signal.received_at is None or trading_day(signal.received_at) != day:
+        return
+
+    was_red = previous is not None and not previous[0]
+    old_outcome = previous[1] if previous is not None else 'pending'
+
+    with transaction.atomic():
+        state, rebuilt = _locked_state(signal.user_id, day)
+        if not rebuilt:
+            if created and not getattr(signal, '_risk_state_counted', False):
+                state.signal_count += 1
+            state.red_signal_count = max(0, state.red_signal_count + int(not signal.is_allowed) - int(was_red))
+
+            if old_outcome != signal.outcome:
+                out_of_order = (
+                    state.last_resolved_at is not None and signal.received_at < state.last_resolved_at
+                )
+                if old_outcome in RESOLVED_OUTCOMES or (signal.outcome in RESOLVED_OUTCOMES and out_of_order):
+                    _rebuild(state, day)
+                elif signal.outcome in RESOLVED_OUTCOMES:
+                    _apply_outcome(
+                        state, signal.received_at, signal.outcome,
+                        r_multiple(signal.price, signal.sl, signal.tp, signal.outcome),
+                    )
+        state.save(update_fields=STATE_FIELDS)
+
+
+def discard_signal(signal):
+    """Rebuild the user's state after one of today's signals was deleted"""
+    if signal.user_id is None or signal.received_at is None:
+        return
+    if trading_day(signal.received_at) == trading_day():
+        rebuild_risk_state(signal.user_id)
+
+
+def rebuild_risk_state(user_id):
+    """
+    Recompute a user's risk state from today's signals
+
+    Needed after bulk writes that skip model signals (``update()``,
+    ``bulk_create``).
+
+    Args:
+        user_id: Primary key of the user
+
+    Returns:
+        The saved RiskState
+    """
+    day = trading_day()
+    with transaction.atomic():
+        state, rebuilt = _locked_state(user_id, day)
+        if not rebuilt:
+            _rebuild(state, day)
+        state.save(update_fields=STATE_FIELDS)
+    return state
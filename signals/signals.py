@@ -0,0 +1,94 @@
+"""
+Signal handlers that keep the signals dashboard statistics, the
+webhook config cache and the users' intraday risk state fresh
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .config_cache import (
+    API_KEY_USERS, PROP_RULES, RISK_CONTROLS, SCORING_WEIGHTS, SESSION_RULES, WEBHOOK_CONFIGS,
+)
+from .dashboard_stats import SIGNAL_DASHBOARD, TRACK_RECORD
+from zenithedge.stats_snapshot import mark_stale_on_commit
+
+
+@receiver(post_save, sender='signals.Signal')
+@receiver(post_delete, sender='signals.Signal')
+@receiver(post_save, sender='signals.SignalEvaluation')
+@receiver(post_delete, sender='signals.SignalEvaluation')
+def invalidate_signal_dashboard(sender, **kwargs):
+    """Counters on the signals dashboard changed"""
+    mark_stale_on_commit(SIGNAL_DASHBOARD, TRACK_RECORD)
+
+
+@receiver(post_save, sender='signals.Signal')
+def update_risk_state(sender, instance, created, raw=False, **kwargs):
+    """Count a new or rejected signal, or apply its outcome, to the user's risk state"""
+    if raw:
+        return
+    from .risk_state import apply_signal_save
+    apply_signal_save(instance, created)
+
+
+@receiver(post_delete, sender='signals.Signal')
+def rebuild_risk_state_on_delete(sender, instance, **kwargs):
+    """One of today's signals was removed"""
+    from .risk_state import discard_signal
+    discard_signal(instance)
+
+
+@receiver(post_save, sender='signals.TradeValidation')
+@receiver(post_delete, sender='signals.TradeValidation')
+def invalidate_track_record(sender, **kwargs):
+    """A validation was added, changed or removed"""
+    mark_stale_on_commit(TRACK_RECORD)
+
+
+@receiver(post_save, sender='signals.WebhookConfig')
+@receiver(post_delete, sender='signals.WebhookConfig')
+def invalidate_webhook_configs(sender, **kwargs):
+    """A webhook was enabled, disabled, rotated or removed"""
+    WEBHOOK_CONFIGS.invalidate()
+
+
+@receiver(post_save, sender='accounts.CustomUser')
+@receiver(post_delete, sender='accounts.CustomUser')
+def invalidate_user_config(sender, update_fields=None, **kwargs):
+    """
+    API key, active flag or role of a user changed
+
+    User-scoped rows are dropped too (a deleted user's primary key can be
+    reused). Logins only touch ``last_login`` and are ignored.
+    """
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    for cache in (API_KEY_USERS, WEBHOOK_CONFIGS, RISK_CONTROLS, SESSION_RULES):
+        cache.invalidate()
+
+
+@receiver(post_save, sender='signals.RiskControl')
+@receiver(post_delete, sender='signals.RiskControl')
+def invalidate_risk_controls(sender, **kwargs):
+    """Thresholds changed or a halt was triggered/reset"""
+    RISK_CONTROLS.invalidate()
+
+
+@receiver(post_save, sender='signals.SessionRule')
+@receiver(post_delete, sender='signals.SessionRule')
+def invalidate_session_rules(sender, **kwargs):
+    """A session was blocked, unblocked or reweighted"""
+    SESSION_RULES.invalidate()
+
+
+@receiver(post_save, sender='signals.PropRules')
+@receiver(post_delete, sender='signals.PropRules')
+def invalidate_prop_rules(sender, **kwargs):
+    """Prop rules edited or another rule set activated"""
+    PROP_RULES.invalidate()
+
+
+@receiver(post_save, sender='signals.ScoringWeights')
+@receiver(post_delete, sender='signals.ScoringWeights')
+def invalidate_scoring_weights(sender, **kwargs):
+    """New scoring weights activated"""
+    SCORING_WEIGHTS.invalidate()
@@ -0,0 +1,46 @@
+"""
+Test helpers for code that reads Signal rows
+
+The test database carries the NOT NULL webhook columns added by
+signals.0017 (raw_data, user_agent, status, error_message), which the
+Signal model does not declare, so ORM inserts fail there. ``insert_signal``
+writes the row with raw SQL instead.
+"""
+from django.db import connection
+
+# Columns from signals.0017 missing on the model, with the migration defaults
+WEBHOOK_COLUMNS = (('raw_data', '{}'), ('user_agent', ''), ('status', 'processed'), ('error_message', ''))
+
+
+def insert_signal(**fields):
+    """
+    Insert a Signal row and return the (unsaved-looking) instance with its pk
+
+    Values passed for auto_now/auto_now_add fields (e.g. ``received_at``)
+    are kept; other fields fall back to their defaults.
+    """
+    from .models import Signal
+
+    signal = Signal(**{'rejection_reason': '', **fields})
+    columns, params = [], []
+    for field in Signal._meta.concrete_fields:
+        if field.primary_key:
+            continue
+        if field.name in fields or field.attname in fields:
+            value = getattr(signal, field.attname)
+        else:
+            value = field.pre_save(signal, True)
+        columns.append(connection.ops.quote_name(field.column))
+        params.append(field.get_db_prep_save(value, connection))
+    for column, value in WEBHOOK_COLUMNS:
+        columns.append(connection.ops.quote_name(column))
+        params.append(value)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {Signal._meta.db_table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(params))})",
+            params
+        )
+        signal.pk = cursor.lastrowid
+    return signal
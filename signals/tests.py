@@ -1,9 +1,15 @@
-from django.test import TestCase, Client
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, Client, override_settings
 from django.urls import reverse
 from decimal import Decimal
+from unittest import mock
 import json
+import shutil
+import tempfile
 
 from .models import Signal
+from . import config_cache
+from zenithedge.local_store import VersionedCache, bump_version, clear_versioned, close_connections
+from zenithedge.stats_snapshot import get_snapshot, mark_stale, refresh_snapshot
 
 
 class SignalWebhookTestCase(TestCase):
@@ -158,3 +164,385 @@ class SignalWebhookTestCase(TestCase):
         signal = Signal.objects.get(id=data['signal_id'])
         self.assertIsNone(signal.price)
         self.assertIsNone(signal.timestamp)
+
+
+class StatsSnapshotTestCase(SimpleTestCase):
+    """Test cases for the shared dashboard stats snapshots"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(LOCAL_STORE_DIR=self.tmpdir)
+        self.settings_override.enable()
+        self.builds = 0
+
+    def tearDown(self):
+        close_connections()
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir)
+
+    def _build(self):
+        self.builds += 1
+        return {'builds': self.builds, 'pnl': Decimal('1.50')}
+
+    def test_snapshot_is_reused_until_ttl(self):
+        """Reads within the TTL share one build; expired snapshots are rebuilt"""
+        first = get_snapshot('overview', self._build)
+        second = get_snapshot('overview', self._build)
+
+        self.assertEqual(first.value, {'builds': 1, 'pnl': '1.50'})
+        self.assertEqual(second.value['builds'], 1)
+        self.assertEqual(get_snapshot('overview', self._build, ttl=0).value['builds'], 2)
+
+    def test_mark_stale_covers_keyed_snapshots(self):
+        """Stale snapshots are served until the refresh interval, then rebuilt"""
+        get_snapshot('track_record:6', self._build)
+        mark_stale('track_record')
+
+        stale = get_snapshot('track_record:6', self._build)
+        self.assertTrue(stale.stale)
+        self.assertEqual(stale.value['builds'], 1)
+
+        with mock.patch('zenithedge.stats_snapshot.STALE_REFRESH_INTERVAL', 0):
+            fresh = get_snapshot('track_record:6', self._build)
+        self.assertFalse(fresh.stale)
+        self.assertEqual(fresh.value['builds'], 2)
+
+    def test_mark_during_rebuild_is_kept(self):
+        """A change marked while the builder runs leaves the new snapshot stale"""
+        get_snapshot('overview', self._build)
+
+        def build_with_concurrent_change():
+            mark_stale('overview')
+            return self._build()
+
+        rebuilt = refresh_snapshot('overview', build_with_concurrent_change)
+        self.assertTrue(rebuilt.stale)
+        self.assertTrue(get_snapshot('overview', self._build).stale)
+
+        with mock.patch('zenithedge.stats_snapshot.STALE_REFRESH_INTERVAL', 0):
+            fresh = get_snapshot('overview', self._build)
+        self.assertFalse(fresh.stale)
+        self.assertEqual(fresh.value['builds'], 3)
+
+
+class ConfigCacheTestCase(TestCase):
+    """Test cases for the webhook config cache and buffered counters"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(LOCAL_STORE_DIR=self.tmpdir)
+        self.settings_override.enable()
+        clear_versioned()
+
+        from accounts.models import CustomUser
+        from .models import WebhookConfig
+        self.user = CustomUser.objects.create_user(email='webhook@example.com', password='x')
+        self.webhook = WebhookConfig.objects.create(user=self.user)
+
+    def tearDown(self):
+        clear_versioned()
+        close_connections()
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir)
+
+    def test_lookups_cached_until_saved(self):
+        """Repeat lookups hit no queries; a save invalidates"""
+        config_cache.get_webhook_config(self.webhook.webhook_uuid)
+        config_cache.get_risk_control(self.user.pk)
+        with self.assertNumQueries(0):
+            cached = config_cache.get_webhook_config(self.webhook.webhook_uuid)
+            self.assertEqual(cached.user.email, 'webhook@example.com')
+            # Missing rows are cached too
+            self.assertIsNone(config_cache.get_risk_control(self.user.pk))
+
+        self.webhook.is_active = False
+        self.webhook.save()
+        self.assertFalse(config_cache.get_webhook_config(self.webhook.webhook_uuid).is_active)
+
+    def test_shared_version_bumped_on_commit(self):
+        """Other workers are invalidated only once the write commits"""
+        from zenithedge.local_store import get_version
+
+        before = get_version(config_cache.WEBHOOK_CONFIGS.version_key)
+        config_cache.get_webhook_config(self.webhook.webhook_uuid)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.webhook.is_active = False
+            self.webhook.save()
+            self.assertEqual(get_version(config_cache.WEBHOOK_CONFIGS.version_key), before)
+            # This worker sees its own write right away
+            self.assertFalse(config_cache.get_webhook_config(self.webhook.webhook_uuid).is_active)
+        self.assertEqual(get_version(config_cache.WEBHOOK_CONFIGS.version_key), before + 1)
+
+    def test_version_bump_from_other_process(self):
+        """Entries are dropped once the shared counter moves"""
+        cache = VersionedCache('test.cache', max_entries=2)
+        loads = []
+        load = lambda key: lambda: loads.append(key) or key
+
+        for key in ('a', 'b', 'a', 'c', 'b'):
+            cache.get(key, load(key))
+        # 'b' was evicted as least recently used when 'c' came in
+        self.assertEqual(loads, ['a', 'b', 'c', 'b'])
+
+        bump_version('test.cache')
+        with mock.patch('zenithedge.local_store.VERSION_CHECK_INTERVAL', 0):
+            cache.get('c', load('c'))
+        self.assertEqual(loads[-1], 'c')
+
+    def test_signal_counts_flushed_in_bulk(self):
+        """Increments are buffered and written with one UPDATE"""
+        buffer = config_cache.WEBHOOK_SIGNAL_COUNTS
+        buffer.flush()
+        for _ in range(3):
+            self.webhook.increment_signal_count()
+        self.assertEqual(buffer.pending(self.webhook.pk), 3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 1)
+        self.webhook.refresh_from_db()
+        self.assertEqual(self.webhook.signal_count, 3)
+        self.assertIsNotNone(self.webhook.last_signal_at)
+        self.assertEqual(buffer.pending(self.webhook.pk), 0)
+
+
+class StrategyPerformanceRecomputeTestCase(TestCase):
+    """Test the set-based StrategyPerformance recomputation"""
+
+    def trades(self, user_id):
+        import pandas as pd
+        return pd.DataFrame({
+            'user_id': [user_id] * 3,
+            'strategy': ['S'] * 3,
+            'regime': ['Trend'] * 3,
+            'symbol': ['EURUSD', 'GBPUSD', 'EURUSD'],
+            'timeframe': ['1h'] * 3,
+            'confidence': [80.0, 70.0, 90.0],
+            'r_multiple': [2.0, -1.0, 1.5],
+            'is_win': [True, False, True],
+        })
+
+    def test_levels_and_equity_curve(self):
+        """Every grouping level is aggregated, drawdowns follow trade order"""
+        from .performance import compute_performance
+
+        rows = compute_performance(self.trades(1))
+        # strategy, +regime, +symbol (2), +timeframe, +regime+symbol (2), full (2)
+        self.assertEqual(len(rows), 9)
+
+        overall = rows[rows['regime'].isna() & rows['symbol'].isna() & rows['timeframe'].isna()].iloc[0]
+        self.assertEqual(overall['total_trades'], 3)
+        self.assertEqual(overall['winning_trades'], 2)
+        self.assertAlmostEqual(overall['total_rr'], 2.5)
+        # 10000 -> 10200 -> 10098 -> 10249.47
+        self.assertAlmostEqual(overall['total_pnl'], 249.47, places=2)
+        self.assertAlmostEqual(overall['max_drawdown'], 1.0)
+        self.assertAlmostEqual(overall['current_drawdown'], 0.0)
+        self.assertAlmostEqual(overall['profit_factor'], 351.47 / 102, places=4)
+        self.assertAlmostEqual(overall['avg_win'], 175.735, places=3)
+
+    def test_upsert_updates_rows_with_null_keys(self):
+        """A second run updates the same rows instead of duplicating them"""
+        from django.contrib.auth import get_user_model
+        from django.utils import timezone
+        from .models import StrategyPerformance
+        from .performance import _upsert, compute_performance
+
+        user = get_user_model().objects.create_user(email='perf@example.com', password='x')
+        rows = compute_performance(self.trades(user.pk))
+        now = timezone.now()
+
+        self.assertEqual(_upsert(rows, now, now), (9, 0))
+        with self.assertNumQueries(2):
+            self.assertEqual(_upsert(rows, now, now), (0, 9))
+        self.assertEqual(StrategyPerformance.objects.filter(user=user).count(), 9)
+        overall = StrategyPerformance.objects.get(
+            user=user, strategy_name='S', regime=None, symbol=None, timeframe=None
+        )
+        self.assertEqual(overall.total_pnl, Decimal('249.47'))
+
+    def test_groups_no_longer_computed_are_pruned(self):
+        """Rows of a recomputed partition that fell below the minimum are deleted"""
+        from django.contrib.auth import get_user_model
+        from django.utils import timezone
+        from .models import StrategyPerformance
+        from .performance import recompute_strategy_performance
+        from .testing import insert_signal
+
+        user = get_user_model().objects.create_user(email='prune@example.com', password='x')
+        gbp = []
+        for symbol, strategy in [('EURUSD', 'S')] * 3 + [('GBPUSD', 'S')] * 3 + [('EURUSD', 'T')] * 3:
+            signal = insert_signal(
+                user=user, symbol=symbol, timeframe='1h', side='buy', price=1.1, sl=1.09, tp=1.12,
+                confidence=80, strategy=strategy, regime='Trend', outcome='win',
+            )
+            if symbol == 'GBPUSD':
+                gbp.append(signal.pk)
+        now = timezone.now()
+        signals = Signal.objects.filter(user=user)
+        recompute_strategy_performance(signals, now, now)
+        self.assertTrue(StrategyPerformance.objects.filter(symbol='GBPUSD').exists())
+
+        Signal.objects.filter(pk__in=gbp[:2]).update(outcome='pending')
+        with mock.patch('admin_dashboard.signals.mark_stale_on_commit') as mark:
+            result = recompute_strategy_performance(signals.filter(strategy='S'), now, now)
+
+        # GBPUSD at +symbol, +regime+symbol and full granularity
+        self.assertEqual(result['deleted'], 3)
+        self.assertFalse(StrategyPerformance.objects.filter(symbol='GBPUSD').exists())
+        self.assertEqual(StrategyPerformance.objects.filter(strategy_name='T').count(), 6)
+        mark.assert_called_with('admin_overview')
+
+
+class RiskStateTestCase(TestCase):
+    """Test the per-user intraday risk state behind evaluate_risk_controls"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_override = override_settings(LOCAL_STORE_DIR=self.tmpdir)
+        self.settings_override.enable()
+        clear_versioned()
+
+        from accounts.models import CustomUser
+        from .models import RiskControl
+        self.user = CustomUser.objects.create_user(email='risk@example.com', password='x')
+        self.risk_control = RiskControl.objects.create(
+            user=self.user, max_daily_trades=5, max_consecutive_losers=2, max_red_signals_per_day=2,
+        )
+
+    def tearDown(self):
+        clear_versioned()
+        close_connections()
+        self.settings_override.disable()
+        shutil.rmtree(self.tmpdir)
+
+    def resolve(self, outcome, **fields):
+        """Apply a saved change of a pending signal received now"""
+        from django.utils import timezone
+        from .risk_state import apply_signal_save
+        signal = Signal(
+            user=self.user, symbol='EURUSD', side='buy', price=Decimal('1.1000'),
+            sl=Decimal('1.0950'), tp=Decimal('1.1100'), received_at=timezone.now(), outcome=outcome, **fields
+        )
+        signal._risk_snapshot = (True, 'pending')
+        apply_signal_save(signal, created=False)
+
+    def test_evaluation_counts_signals_with_one_locked_read(self):
+        """Each evaluation counts its signal; the limit halts the user"""
+        from .models import RiskState, evaluate_risk_controls
+
+        self.assertFalse(evaluate_risk_controls(self.user)['blocked'])
+        with self.assertNumQueries(4):  # savepoint, UPDATE signal_count + 1, SELECT, release
+            result = evaluate_risk_controls(self.user)
+        self.assertFalse(result['blocked'])
+        self.assertTrue(result['counted'])
+
+        for _ in range(3):
+            evaluate_risk_controls(self.user)
+        result = evaluate_risk_controls(self.user)
+        self.assertTrue(result['blocked'])
+        self.assertIn('Daily trade limit reached (5/5)', result['reason'])
+        self.assertEqual(RiskState.objects.get(pk=self.user.pk).signal_count, 6)
+
+        self.risk_control.refresh_from_db()
+        self.assertTrue(self.risk_control.is_halted)
+
+    def test_release_gives_back_an_unsaved_reservation(self):
+        """A reservation whose Signal is never saved does not inflate the count"""
+        from .models import RiskState, evaluate_risk_controls
+        from .risk_state import release_signal
+
+        evaluate_risk_controls(self.user)
+        evaluate_risk_controls(self.user)
+        release_signal(self.user.pk)
+
+        self.assertEqual(RiskState.objects.get(pk=self.user.pk).signal_count, 1)
+
+    def test_outcomes_and_rejections_update_counters(self):
+        """Losses build the streak, a win resets it; rejected signals are counted once"""
+        from .models import RiskState, evaluate_risk_controls
+        from .risk_state import apply_signal_save, mark_counted
+
+        evaluate_risk_controls(self.user)
+        self.resolve('loss')
+        self.resolve('win')
+        self.resolve('loss')
+        state = RiskState.objects.get(pk=self.user.pk)
+        self.assertEqual((state.win_count, state.loss_count, state.consecutive_losses), (1, 2, 1))
+        self.assertAlmostEqual(state.daily_r, 0.0)
+
+        rejected = Signal(user=self.user, symbol='EURUSD', side='buy', is_allowed=False)
+        rejected.received_at = state.updated_at
+        mark_counted(rejected)
+        apply_signal_save(rejected, created=True)
+        state.refresh_from_db()
+        self.assertEqual((state.signal_count, state.red_signal_count), (1, 1))
+
+        self.resolve('loss')
+        result = evaluate_risk_controls(self.user)
+        self.assertTrue(result['blocked'])
+        self.assertIn('Consecutive loss limit reached (2/2)', result['reason'])
+
+
+def _reserve_in_process(db_path, user_id, count, errors):
+    """Child process body: count ``count`` signals against a file database"""
+    from django.db import connection
+    from .risk_state import reserve_signal
+
+    # Switch first: close() keeps in-memory test databases open
+    connection.settings_dict['NAME'] = db_path
+    connection.close()
+    failed = 0
+    for _ in range(count):
+        try:
+            reserve_signal(user_id)
+        except Exception:
+            failed += 1
+    connection.close()
+    errors.put(failed)
+
+
+class RiskStateConcurrencyTestCase(TransactionTestCase):
+    """Concurrent reservations from several processes on one SQLite file"""
+
+    PROCESSES = 4
+    RESERVATIONS = 50
+
+    def test_parallel_reservations_are_all_counted(self):
+        """Every reservation succeeds and is counted exactly once"""
+        import multiprocessing
+        import os
+        import sqlite3
+        from django.db import connection
+        from accounts.models import CustomUser
+
+        if connection.vendor != 'sqlite':
+            self.skipTest('exercises SQLite locking')
+
+        user = CustomUser.objects.create_user(email='burst@example.com', password='x')
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        db_path = os.path.join(tmpdir, 'risk.sqlite3')
+
+        connection.ensure_connection()
+        target = sqlite3.connect(db_path)
+        connection.connection.backup(target)
+        target.close()
+
+        context = multiprocessing.get_context('fork')
+        errors = context.Queue()
+        workers = [
+            context.Process(target=_reserve_in_process, args=(db_path, user.pk, self.RESERVATIONS, errors))
+            for _ in range(self.PROCESSES)
+        ]
+        for worker in workers:
+            worker.start()
+        failed = [errors.get(timeout=60) for _ in workers]
+        for worker in workers:
+            worker.join()
+
+        with sqlite3.connect(db_path) as db:
+            (signal_count,) = db.execute(
+                'SELECT signal_count FROM signals_riskstate WHERE user_id = ?', (user.pk,)
+            ).fetchone()
+        self.assertEqual(failed, [0] * self.PROCESSES)
+        self.assertEqual(signal_count, self.PROCESSES * self.RESERVATIONS)
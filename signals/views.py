@@ -82,16 +82,15 @@ def signal_webhook(request):
         # Authenticate user via API key
         user = None
         if api_key:
-            try:
-                from accounts.models import CustomUser
-                user = CustomUser.objects.get(api_key=api_key, is_active=True)
-                logger.info(f"Signal authenticated for user: {user.email}")
-            except CustomUser.DoesNotExist:
+            from .config_cache import get_api_key_user
+            user = get_api_key_user(api_key)
+            if user is None:
                 logger.warning(f"Invalid API key provided: {api_key[:10]}...")
                 return JsonResponse({
                     "status": "error",
                     "message": "Invalid or inactive API key"
                 }, status=401)
+            logger.info(f"Signal authenticated for user: {user.email}")
         
         # Define required fields
         required_fields = ['symbol', 'timeframe', 'side', 'sl', 'tp', 'confidence', 'strategy', 'regime']
@@ -249,8 +248,10 @@ def signal_webhook(request):
         # Check risk controls first (if user authenticated)
         risk_control = None
         is_risk_blocked = False
+        risk_counted = False
         if user:
             risk_check_result = evaluate_risk_controls(user)
+            risk_counted = risk_check_result.get('counted', False)
             if risk_check_result['blocked']:
                 is_risk_blocked = True
                 is_allowed = False
@@ -294,20 +295,28 @@ def signal_webhook(request):
                 is_risk_blocked=is_risk_blocked,
                 risk_control_checked=risk_control
             )
+            if risk_counted:
+                # Already counted in the user's risk state by evaluate_risk_controls
+                from .risk_state import mark_counted
+                mark_counted(signal)
             # Save to trigger session auto-detection
-            signal.save()
+            try:
+                signal.save()
+            except Exception:
+                if risk_counted:
+                    # The count was committed by evaluate_risk_controls; give it back
+                    from .risk_state import release_signal
+                    release_signal(user.pk)
+                raise
             
             # Fetch recent news for this symbol to add to quality_metrics
             news_context = None
             try:
-                from zennews.models import NewsEvent
+                from zennews.utils.symbol_index import related_news
                 cutoff_time = timezone.now() - timedelta(hours=12)
-                recent_news = NewsEvent.objects.filter(
-                    symbol__iexact=signal.symbol,
-                    timestamp__gte=cutoff_time
-                ).order_by('-timestamp')[:3]
+                recent_news = related_news(signal.symbol, since=cutoff_time, limit=3)
                 
-                if recent_news.exists():
+                if recent_news:
                     news_items = []
                     for news in recent_news:
                         news_items.append(f"{news.get_time_ago()}: {news.headline}")
@@ -347,22 +356,18 @@ def signal_webhook(request):
             
             # Check session rules if user is authenticated
             if user and signal.session:
-                from .models import SessionRule
-                try:
-                    session_rule = SessionRule.objects.get(user=user, session=signal.session)
-                    
-                    # Check if session is blocked
-                    if session_rule.is_blocked:
-                        signal.is_allowed = False
-                        signal.rejection_reason = f"session_block: {signal.session} session is blocked by user settings"
-                        signal.save()
-                        is_allowed = False
-                        rejection_reason = signal.rejection_reason
-                        logger.warning(f"Signal blocked by session rule: {signal} - {rejection_reason}")
-                    
-                except SessionRule.DoesNotExist:
-                    # No session rule defined for this session, keep original allowed status
-                    pass
+                from .config_cache import get_session_rule
+                # No session rule defined for this session keeps the original allowed status
+                session_rule = get_session_rule(user.pk, signal.session)
+                
+                # Check if session is blocked
+                if session_rule and session_rule.is_blocked:
+                    signal.is_allowed = False
+                    signal.rejection_reason = f"session_block: {signal.session} session is blocked by user settings"
+                    signal.save()
+                    is_allowed = False
+                    rejection_reason = signal.rejection_reason
+                    logger.warning(f"Signal blocked by session rule: {signal} - {rejection_reason}")
             
             if is_allowed:
                 logger.info(f"Signal received and ALLOWED: {signal}")
@@ -492,16 +497,11 @@ class DashboardView(LoginRequiredMixin, ListView):
         """Add statistics to context"""
         context = super().get_context_data(**kwargs)
         
-        # Calculate statistics
-        all_signals = Signal.objects.all()
-        context['total_signals'] = all_signals.count()
-        context['allowed_signals'] = all_signals.filter(is_allowed=True).count()
-        context['rejected_signals'] = all_signals.filter(is_allowed=False).count()
-        
-        # Evaluation statistics
-        from .models import SignalEvaluation
-        context['passed_signals'] = SignalEvaluation.objects.filter(passed=True).count()
-        context['blocked_signals'] = SignalEvaluation.objects.filter(passed=False).count()
+        # Global statistics come from a shared stats snapshot
+        from .dashboard_stats import signal_dashboard_snapshot
+        snapshot = signal_dashboard_snapshot()
+        context.update(snapshot.value)
+        context.update(snapshot.context())
         
         # Current view mode
         context['view_mode'] = self.request.GET.get('view', 'live')
@@ -519,14 +519,6 @@ class DashboardView(LoginRequiredMixin, ListView):
             context['prop_progress'] = None
 
         
-        # Calculate average confidence
-        avg_conf = all_signals.aggregate(avg_conf=Avg('confidence'))['avg_conf']
-        context['avg_confidence'] = avg_conf if avg_conf is not None else 0
-        
-        # Get all unique strategies for filter dropdown
-        all_strategies = Signal.objects.values_list('strategy', flat=True).distinct().order_by('strategy')
-        context['all_strategies'] = list(all_strategies)
-        
         # Check risk control status
         from .models import RiskControl
         try:
@@ -1269,12 +1261,12 @@ def uuid_webhook(request, webhook_uuid):
         return JsonResponse({'error': 'Only POST requests allowed'}, status=405)
     
     try:
-        from .models import WebhookConfig, Signal
+        from .models import Signal
+        from .config_cache import get_webhook_config, record_webhook_signal
         
-        # Find webhook config by UUID
-        try:
-            webhook_config = WebhookConfig.objects.get(webhook_uuid=webhook_uuid)
-        except WebhookConfig.DoesNotExist:
+        # Find webhook config by UUID (cached per worker; do not modify it)
+        webhook_config = get_webhook_config(webhook_uuid)
+        if webhook_config is None:
             return JsonResponse({'error': 'Invalid webhook UUID'}, status=404)
         
         # Check if webhook is active
@@ -1315,8 +1307,8 @@ def uuid_webhook(request, webhook_uuid):
         from .validation import SignalValidationPipeline
         evaluation = SignalValidationPipeline.process_signal(signal)
         
-        # Increment webhook counter
-        webhook_config.increment_signal_count()
+        # Increment webhook counter (written to the DB in bulk)
+        record_webhook_signal(webhook_config.pk)
         
         # Return response with evaluation info
         response_data = {
@@ -1418,180 +1410,15 @@ class ValidationTrackRecordView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        from .models import TradeValidation, ValidationScore, Signal
-        from django.db.models import Avg, Count, Q
-        from datetime import datetime, timedelta
-        from decimal import Decimal
+        from .dashboard_stats import track_record_snapshot
         
         # Get time period from query params (default: last 6 months)
         months_back = int(self.request.GET.get('months', 6))
-        start_date = timezone.now() - timedelta(days=months_back * 30)
-        
-        # Overall Statistics
-        total_validations = TradeValidation.objects.filter(
-            validated_at__gte=start_date
-        ).count()
-        
-        approved_count = TradeValidation.objects.filter(
-            validated_at__gte=start_date,
-            status='approved'
-        ).count()
-        
-        conditional_count = TradeValidation.objects.filter(
-            validated_at__gte=start_date,
-            status='conditional'
-        ).count()
-        
-        rejected_count = TradeValidation.objects.filter(
-            validated_at__gte=start_date,
-            status='rejected'
-        ).count()
-        
-        avg_truth_index = TradeValidation.objects.filter(
-            validated_at__gte=start_date
-        ).aggregate(Avg('truth_index'))['truth_index__avg'] or 0
-        
-        # Approval rate
-        approval_rate = (approved_count / total_validations * 100) if total_validations > 0 else 0
-        
-        # Monthly trends (last 6 months)
-        monthly_stats = []
-        for i in range(months_back):
-            month_start = timezone.now() - timedelta(days=(months_back - i) * 30)
-            month_end = month_start + timedelta(days=30)
-            
-            month_validations = TradeValidation.objects.filter(
-                validated_at__gte=month_start,
-                validated_at__lt=month_end
-            )
-            
-            month_approved = month_validations.filter(status='approved').count()
-            month_total = month_validations.count()
-            month_avg_truth = month_validations.aggregate(Avg('truth_index'))['truth_index__avg'] or 0
-            
-            monthly_stats.append({
-                'month': month_start.strftime('%b %Y'),
-                'total': month_total,
-                'approved': month_approved,
-                'approval_rate': (month_approved / month_total * 100) if month_total > 0 else 0,
-                'avg_truth_index': float(month_avg_truth)
-            })
-        
-        # Strategy-specific performance
-        strategy_stats = []
-        strategies = Signal.objects.values('strategy').annotate(
-            count=Count('id')
-        ).filter(count__gt=5).order_by('-count')
-        
-        for strat in strategies:
-            strategy_name = strat['strategy']
-            
-            # Get validations for this strategy
-            strategy_validations = TradeValidation.objects.filter(
-                signal__strategy=strategy_name,
-                validated_at__gte=start_date
-            )
-            
-            strat_total = strategy_validations.count()
-            if strat_total == 0:
-                continue
-            
-            strat_approved = strategy_validations.filter(status='approved').count()
-            strat_avg_truth = strategy_validations.aggregate(Avg('truth_index'))['truth_index__avg'] or 0
-            
-            strategy_stats.append({
-                'name': strategy_name,
-                'total': strat_total,
-                'approved': strat_approved,
-                'approval_rate': (strat_approved / strat_total * 100),
-                'avg_truth_index': float(strat_avg_truth)
-            })
-        
-        # Sort by approval rate
-        strategy_stats.sort(key=lambda x: x['approval_rate'], reverse=True)
-        
-        # Truth Index distribution
-        truth_distribution = {
-            'excellent': TradeValidation.objects.filter(
-                validated_at__gte=start_date,
-                truth_index__gte=85
-            ).count(),
-            'good': TradeValidation.objects.filter(
-                validated_at__gte=start_date,
-                truth_index__gte=75,
-                truth_index__lt=85
-            ).count(),
-            'moderate': TradeValidation.objects.filter(
-                validated_at__gte=start_date,
-                truth_index__gte=65,
-                truth_index__lt=75
-            ).count(),
-            'conditional': TradeValidation.objects.filter(
-                validated_at__gte=start_date,
-                truth_index__gte=60,
-                truth_index__lt=65
-            ).count(),
-            'rejected': TradeValidation.objects.filter(
-                validated_at__gte=start_date,
-                truth_index__lt=60
-            ).count(),
-        }
         
-        # Breakdown scores averages
-        all_validations = TradeValidation.objects.filter(
-            validated_at__gte=start_date
-        )
-        
-        breakdown_averages = {
-            'technical_integrity': 0,
-            'volatility_filter': 0,
-            'regime_alignment': 0,
-            'sentiment_coherence': 0,
-            'historical_reliability': 0,
-            'psychological_safety': 0
-        }
-        
-        if all_validations.exists():
-            for validation in all_validations:
-                if validation.breakdown:
-                    for key in breakdown_averages.keys():
-                        if key in validation.breakdown:
-                            breakdown_averages[key] += float(validation.breakdown[key])
-            
-            # Calculate averages
-            count = all_validations.count()
-            for key in breakdown_averages.keys():
-                breakdown_averages[key] = (breakdown_averages[key] / count) * 100 if count > 0 else 0
-        
-        # System health grade
-        if approval_rate >= 70 and avg_truth_index >= 75:
-            system_grade = 'A'
-            system_health = 'Excellent'
-        elif approval_rate >= 60 and avg_truth_index >= 70:
-            system_grade = 'B'
-            system_health = 'Good'
-        elif approval_rate >= 50 and avg_truth_index >= 65:
-            system_grade = 'C'
-            system_health = 'Fair'
-        else:
-            system_grade = 'D'
-            system_health = 'Needs Improvement'
-        
-        context.update({
-            'total_validations': total_validations,
-            'approved_count': approved_count,
-            'conditional_count': conditional_count,
-            'rejected_count': rejected_count,
-            'approval_rate': approval_rate,
-            'avg_truth_index': float(avg_truth_index),
-            'monthly_stats': monthly_stats,
-            'strategy_stats': strategy_stats,
-            'truth_distribution': truth_distribution,
-            'breakdown_averages': breakdown_averages,
-            'system_grade': system_grade,
-            'system_health': system_health,
-            'months_back': months_back,
-        })
+        # Computed by a few aggregate queries and cached as a stats snapshot
+        snapshot = track_record_snapshot(months_back)
+        context.update(snapshot.value)
+        context.update(snapshot.context())
         
         return context
 
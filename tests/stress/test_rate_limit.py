@@ -0,0 +1,123 @@
+"""
+Stress Tests - Cross-Process Webhook Rate Limiting
+
+Checks the GCRA limiter (zenithedge.rate_limit) alone and under
+concurrent load from several worker processes sharing one store: the
+limit must hold for the whole host, not per process.
+
+Author: ZenithEdge Team
+"""
+
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Django setup
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithedge.settings')
+import django
+django.setup()
+
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from zenithedge import rate_limit
+from zenithedge.local_store import close_connections
+from zenithedge.middleware import WebhookRateLimitMiddleware
+
+
+def _hammer(key, rate, duration):
+    """Worker process: hit ``key`` as fast as possible for ``duration`` seconds"""
+    allowed = attempts = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        attempts += 1
+        if rate_limit.hit(key, rate).allowed:
+            allowed += 1
+    return allowed, attempts
+
+
+class RateLimitStoreMixin:
+    """Run each test against a fresh store directory"""
+
+    def setup_method(self):
+        self.store_dir = tempfile.mkdtemp()
+        self.settings = override_settings(LOCAL_STORE_DIR=self.store_dir)
+        self.settings.enable()
+        close_connections()
+
+    def teardown_method(self):
+        close_connections()
+        self.settings.disable()
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+
+class TestGCRA(RateLimitStoreMixin):
+    """Test limiter semantics in one process"""
+
+    @pytest.mark.stress
+    def test_burst_then_reject(self):
+        """A full burst passes, the next request waits one emission interval"""
+        results = [rate_limit.hit('k', rate=5) for _ in range(6)]
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert 0 < results[-1].retry_after <= 0.2 + 0.05
+
+        # Other keys are independent
+        assert rate_limit.hit('other', rate=5).allowed
+
+    @pytest.mark.stress
+    def test_expired_keys_purged(self, monkeypatch):
+        """Keys whose TAT has passed are removed, bounding the table"""
+        monkeypatch.setattr(rate_limit, 'PURGE_INTERVAL', 0.0)
+        for i in range(50):
+            rate_limit.hit(f'client-{i}', rate=100)
+        time.sleep(0.05)
+        rate_limit.hit('trigger', rate=100)
+
+        count = rate_limit._connection().execute('SELECT COUNT(*) FROM gcra').fetchone()[0]
+        assert count == 1
+
+    @pytest.mark.stress
+    @override_settings(WEBHOOK_RATE_LIMIT=2)
+    def test_middleware_returns_429(self):
+        """Webhook paths get 429 with Retry-After; other paths are untouched"""
+        middleware = WebhookRateLimitMiddleware(lambda request: HttpResponse('ok'))
+        factory = RequestFactory()
+        url = '/api/v1/signal/0f8fad5b-d9cb-469f-a165-70867728950e/'
+
+        statuses = [middleware(factory.post(url)).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+        assert middleware(factory.post(url))['Retry-After'] == '1'
+
+        tv_url = '/api/signals/webhook/?token=abc'
+        statuses = [middleware(factory.post(tv_url)).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+
+        assert all(middleware(factory.get('/dashboard/')).status_code == 200 for _ in range(5))
+
+
+class TestConcurrentRateLimit(RateLimitStoreMixin):
+    """Test the limit across worker processes"""
+
+    @pytest.mark.stress
+    @pytest.mark.slow
+    def test_limit_holds_across_workers(self):
+        """4 workers hammering one key get ~rate x duration in total, not 4x"""
+        rate, duration, workers = 20, 2.0, 4
+        close_connections()
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('fork')) as pool:
+            results = list(pool.map(_hammer, ['shared'] * workers, [rate] * workers, [duration] * workers))
+
+        allowed = sum(r[0] for r in results)
+        attempts = sum(r[1] for r in results)
+        expected = rate * duration + rate  # steady rate plus the initial burst
+
+        assert attempts > expected * 5, "workers did not generate enough load"
+        assert expected * 0.8 <= allowed <= expected + rate * 0.25
@@ -0,0 +1,99 @@
+"""
+Unit Tests for the PropCoach Monte Carlo Simulator
+
+Covers:
+1. Pass, daily loss and max drawdown outcomes on deterministic histories
+2. Reproducible runs, confidence intervals and time-to-pass distribution
+3. Batched predict_proba in the ML confidence interval
+
+Author: ZenithEdge Team
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Django setup
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithedge.settings')
+import django
+django.setup()
+
+import numpy as np
+
+from propcoach import ml_predictor
+from propcoach.models import FirmTemplate
+from propcoach.monte_carlo import ChallengeRules, simulate_challenges
+
+
+RULES = ChallengeRules.from_template(FirmTemplate())  # 10% target, 5% daily, 10% total, 5 days min
+
+
+class TestChallengeSimulation:
+    """Test propcoach.monte_carlo"""
+
+    @pytest.mark.unit
+    def test_deterministic_outcomes(self):
+        """Constant winners pass at the first allowed day; constant losers breach"""
+        winners = simulate_challenges([0.01], RULES, trades_per_day=2, n_paths=100, seed=1)
+        summary = winners.summary()
+        assert summary['pass_probability'] == 100.0
+        # +2% a day reaches 10% on day 5, which is also the minimum trading days
+        assert summary['time_to_pass']['by_day'] == {5: 100}
+        assert winners.trades[0] == 10
+
+        losers = simulate_challenges([-0.03], RULES, trades_per_day=2, n_paths=100, seed=1)
+        assert losers.summary()['outcomes']['daily_loss'] == 100
+        assert losers.trades[0] == 2
+
+        slow_bleed = simulate_challenges([-0.02], RULES, trades_per_day=1, n_paths=100, seed=1)
+        assert slow_bleed.summary()['outcomes']['max_drawdown'] == 100
+        assert slow_bleed.trades[0] == 6
+
+    @pytest.mark.unit
+    def test_mixed_history(self):
+        """Seeded runs repeat; the interval brackets the pass probability"""
+        history = np.random.default_rng(3).normal(0.003, 0.01, 60)
+        first = simulate_challenges(history, RULES, trades_per_day=3, n_paths=20_000, seed=42)
+        second = simulate_challenges(history, RULES, trades_per_day=3, n_paths=20_000, seed=42)
+        assert np.array_equal(first.outcome, second.outcome)
+
+        summary = first.summary()
+        low, high = summary['confidence_interval']
+        assert 0 < summary['pass_probability'] < 100
+        assert low <= summary['pass_probability'] <= high
+        assert sum(summary['outcomes'].values()) == 20_000
+        assert summary['time_to_pass']['p10'] <= summary['time_to_pass']['median'] <= summary['time_to_pass']['p90']
+        assert summary['time_to_pass']['p10'] >= RULES.min_trading_days
+        assert len(summary['examples']) == 5
+
+        with pytest.raises(ValueError):
+            simulate_challenges([], RULES)
+
+
+class TestPredictionInterval:
+    """Test ml_predictor.get_prediction_confidence_interval"""
+
+    @pytest.mark.unit
+    def test_single_batched_predict_proba(self, monkeypatch):
+        """All bootstrap samples go through one predict_proba call"""
+        calls = []
+
+        class Model:
+            def predict_proba(self, X):
+                calls.append(X.shape)
+                p = 1 / (1 + np.exp(-X.sum(axis=1)))
+                return np.column_stack([1 - p, p])
+
+        class Scaler:
+            def transform(self, X):
+                return X
+
+        monkeypatch.setattr(ml_predictor, 'load_predictor_model', lambda: (Model(), Scaler()))
+        monkeypatch.setattr(ml_predictor, 'extract_challenge_features', lambda challenge: {'a': 0.0, 'b': 0.0})
+
+        lower, upper = ml_predictor.get_prediction_confidence_interval(None, n_bootstrap=200)
+        assert calls == [(200, 2)]
+        assert lower < 50 < upper
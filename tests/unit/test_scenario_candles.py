@@ -0,0 +1,69 @@
+"""
+Unit Tests for Packed Scenario Candles
+
+Covers:
+1. Round trip of candle dicts through the packed float64 blob
+2. Fixed-size rows (chunks can be cut from the blob by offset)
+3. Missing values and the NumPy view
+
+Author: ZenithEdge Team
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Django setup
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithedge.settings')
+import django
+django.setup()
+
+from zenithmentor.candles import (
+    ROW_SIZE, candle_array, candle_count, pack_candles, unpack_candles, unpack_rows,
+)
+
+
+CANDLES = [
+    {'timestamp': '2025-01-01T00:00:00+00:00', 'open': 1.10231, 'high': 1.10402,
+     'low': 1.10105, 'close': 1.10388, 'volume': 1520.0},
+    {'timestamp': '2025-01-01T00:15:00+00:00', 'open': 1.10388, 'high': 1.10511,
+     'low': 1.10301, 'close': 1.10342, 'volume': 980.0},
+    {'timestamp': '2025-01-01T00:30:00+00:00', 'open': 51234.56, 'high': 51300.01,
+     'low': 51100.99, 'close': 51250.5, 'volume': 12.5},
+]
+
+
+class TestCandlePacking:
+    """Test zenithmentor.candles"""
+
+    @pytest.mark.unit
+    def test_round_trip_is_exact(self):
+        """float64 keeps FX and crypto prices exactly"""
+        blob = pack_candles(CANDLES)
+        assert len(blob) == len(CANDLES) * ROW_SIZE
+        assert candle_count(blob) == 3
+        assert unpack_candles(blob) == CANDLES
+
+    @pytest.mark.unit
+    def test_chunks_are_row_slices(self):
+        """A byte range of whole rows decodes on its own"""
+        blob = pack_candles(CANDLES)
+        rows = unpack_rows(blob[ROW_SIZE:3 * ROW_SIZE])
+        assert [row[1] for row in rows] == [1.10388, 51234.56]
+
+    @pytest.mark.unit
+    def test_missing_values_and_array_view(self):
+        """Naive timestamps are UTC; missing fields come back as None"""
+        blob = pack_candles([{'timestamp': '2025-01-01T00:00:00', 'open': 1.0, 'close': 'n/a'}])
+        candle = unpack_candles(blob)[0]
+        assert candle['timestamp'] == '2025-01-01T00:00:00+00:00'
+        assert candle['open'] == 1.0
+        assert candle['close'] is None and candle['volume'] is None
+
+        array = candle_array(pack_candles(CANDLES))
+        assert array.shape == (3, 6)
+        assert array[2, 4] == 51250.5
+        assert candle_count(b'') == 0 and unpack_candles(None) == []
@@ -0,0 +1,102 @@
+"""
+Unit Tests for Lazy Imports and the Startup Audit
+
+Covers:
+1. zenithedge.lazy_imports deferring imports until first use
+2. -X importtime parsing and budget checks in zenithedge.startup_audit
+3. The cold start of passenger_wsgi staying free of heavy libraries
+
+Author: ZenithEdge Team
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Django setup
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithedge.settings')
+import django
+django.setup()
+
+from zenithedge.lazy_imports import is_available, lazy_import
+from zenithedge.startup_audit import check_budget, import_chain, measure_startup, parse_importtime
+
+
+IMPORTTIME_SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     numpy._globals
+import time:      9000 |       9120 |   numpy
+import time:       300 |       9420 | zennews.utils.nlp_analyzer
+import time:        50 |         50 | zennews.signals
+"""
+
+
+class TestLazyImports:
+    """Test zenithedge.lazy_imports"""
+
+    @pytest.mark.unit
+    def test_import_deferred_until_attribute_access(self, tmp_path, monkeypatch):
+        """The module body runs on first attribute access, once"""
+        (tmp_path / 'lazy_probe_module.py').write_text("LOADS = 1\nVALUE = 42\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, 'lazy_probe_module', raising=False)
+
+        module = lazy_import('lazy_probe_module')
+        assert 'lazy_probe_module' not in sys.modules
+        assert not module.is_loaded
+
+        assert module.VALUE == 42
+        assert module.is_loaded
+        assert module.LOADS == 1
+        assert sys.modules['lazy_probe_module'].VALUE == 42
+
+    @pytest.mark.unit
+    def test_missing_module_fails_on_use(self):
+        """A missing package raises ImportError at first use, not at lazy_import"""
+        module = lazy_import('zenithedge_missing_module')
+        assert not is_available('zenithedge_missing_module')
+        with pytest.raises(ImportError):
+            module.anything
+
+    @pytest.mark.unit
+    def test_is_available_does_not_import(self):
+        """is_available checks the import spec only"""
+        assert is_available('json')
+        assert not is_available('')
+
+
+class TestStartupAudit:
+    """Test zenithedge.startup_audit"""
+
+    @pytest.mark.unit
+    def test_parse_importtime_and_chain(self):
+        """Records keep depth; the importer is the next less-indented line"""
+        records = parse_importtime(IMPORTTIME_SAMPLE)
+        assert [record.module for record in records] == [
+            'numpy._globals', 'numpy', 'zennews.utils.nlp_analyzer', 'zennews.signals'
+        ]
+        assert records[1].self_us == 9000
+        assert records[0].depth == 2
+        assert import_chain(records, 'numpy') == ['zennews.utils.nlp_analyzer']
+        assert import_chain(records, 'pandas') == []
+
+    @pytest.mark.unit
+    def test_check_budget(self):
+        """Time, memory and heavy modules are all budgeted"""
+        result = {'import_ms': 800.0, 'rss_mb': 60.0, 'heavy_modules': [], 'error': None}
+        assert check_budget(result, 1000, 100) == []
+
+        result.update(import_ms=1200.0, heavy_modules=['pandas'])
+        violations = check_budget(result, 1000, 100)
+        assert len(violations) == 2
+        assert 'pandas' in violations[1]
+
+    @pytest.mark.slow
+    def test_cold_start_within_budget(self):
+        """passenger_wsgi imports no heavy libraries and stays within budget"""
+        result = measure_startup('passenger_wsgi')
+        assert result['error'] is None
+        assert result['heavy_modules'] == []
+        assert check_budget(result) == []
@@ -0,0 +1,110 @@
+"""
+Unit Tests for the Scenario Window Index
+
+Covers:
+1. Regime, volatility and session labels of candidate windows
+2. Windows never spanning gaps in the data (but spanning weekend closes)
+3. ScenarioGenerator.sample_historical_window drawing from the index
+
+Author: ZenithEdge Team
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Django setup
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithedge.settings')
+import django
+django.setup()
+
+import numpy as np
+import pandas as pd
+
+from zenithmentor.scenario_engine import ScenarioGenerator
+from zenithmentor.window_index import WindowIndex
+
+
+def make_frame(closes, start='2025-01-06 00:00', freq='15min', gap_at=None):
+    """OHLCV frame; with ``gap_at`` the timestamps jump two days at that row"""
+    timestamps = pd.date_range(start, periods=len(closes), freq=freq, tz='UTC')
+    if gap_at is not None:
+        timestamps = timestamps.where(np.arange(len(closes)) < gap_at, timestamps + pd.Timedelta(days=2))
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': closes, 'high': closes * 1.001, 'low': closes * 0.999,
+        'close': closes, 'volume': 1000.0,
+    })
+
+
+class TestWindowIndex:
+    """Test zenithmentor.window_index"""
+
+    @pytest.mark.unit
+    def test_regime_labels(self):
+        """Steady rises are bullish, steady falls bearish, zig-zags ranging"""
+        up = np.linspace(1.0, 1.1, 40)
+        down = np.linspace(1.1, 1.0, 40)
+        chop = 1.0 + 0.002 * (np.arange(40) % 2)
+        index = WindowIndex(make_frame(np.concatenate([up, down, chop])), window_size=20)
+
+        assert len(index) == 120 - 20 + 1
+        assert index.labels(0)['regime'] == 'trending_bull'
+        assert index.labels(45)['regime'] == 'trending_bear'
+        assert index.labels(95)['regime'] == 'ranging'
+        assert index.labels(0)['session'] == 'asian'
+
+        bull = index.candidates('trending_bull')
+        assert 0 in bull and 45 not in bull
+        assert index.candidates('trending_bull') is bull  # cached
+        assert len(index.candidates('high_volatility')) + len(index.candidates('low_volatility')) <= len(index)
+        assert len(index.candidates('news_driven')) == len(index)
+
+    @pytest.mark.unit
+    def test_windows_never_span_gaps(self):
+        """Only starts whose window has no jump in the timestamps are candidates"""
+        index = WindowIndex(make_frame(np.linspace(1.0, 1.2, 100), gap_at=50), window_size=20)
+
+        starts = index.candidates()
+        # Starts 31..49 would cross the gap between rows 49 and 50
+        assert set(starts) == set(range(0, 31)) | set(range(50, 81))
+        for start in starts:
+            steps = index.window(start)['timestamp'].diff().dropna().unique()
+            assert list(steps) == [pd.Timedelta(minutes=15)]
+
+    @pytest.mark.unit
+    def test_weekend_close_is_not_a_gap(self):
+        """4h FX bars keep windows across the weekend close, unless disabled"""
+        timestamps = pd.date_range('2025-01-01', '2025-12-31', freq='4h', tz='UTC')
+        timestamps = timestamps[
+            ~((timestamps.weekday == 5) | ((timestamps.weekday == 6) & (timestamps.hour < 20))
+              | ((timestamps.weekday == 4) & (timestamps.hour >= 20)))
+        ]
+        frame = make_frame(1.0 + np.linspace(0, 0.1, len(timestamps)))
+        frame['timestamp'] = timestamps
+
+        assert len(WindowIndex(frame, window_size=100)) == len(frame) - 100 + 1
+        assert len(WindowIndex(frame, window_size=100, skip_weekends=False)) == 0
+        # A weekday outage of the same length is still a gap
+        assert len(WindowIndex(make_frame(np.ones(200), freq='4h', gap_at=100), window_size=150)) == 0
+
+    @pytest.mark.unit
+    def test_sample_historical_window_uses_index(self):
+        """Samples are contiguous, sized and reuse the built index"""
+        random.seed(7)
+        generator = ScenarioGenerator()
+        frame = make_frame(1.0 + np.cumsum(np.random.default_rng(1).normal(0, 0.001, 500)), gap_at=250)
+
+        for regime in (None, 'trending_bull', 'high_volatility'):
+            window = generator.sample_historical_window(frame, 50, regime_filter=regime)
+            assert len(window) == 50
+            assert window['timestamp'].diff().dropna().max() == pd.Timedelta(minutes=15)
+
+        assert len(generator._window_indexes) == 1
+        assert generator.sample_historical_window(frame.iloc[:10], 50) is None
+        assert generator.sample_historical_window(make_frame(np.ones(60), gap_at=30), 50) is None
@@ -466,7 +466,6 @@ class EnhancedContextualIntelligenceEngine:
         """
         composer_stats = {
             'template_usage': dict(self.narrative_composer.template_usage),
-            'recent_narrative_count': len(self.narrative_composer.recent_narratives),
         }
         
         variation_stats = self.language_variation.get_variation_stats()
@@ -485,6 +484,17 @@ class EnhancedContextualIntelligenceEngine:
 # Public API Function (Drop-in Replacement for v1.0)
 # =============================================================================
 
+_shared_engine = None
+
+
+def _get_shared_engine() -> EnhancedContextualIntelligenceEngine:
+    """Per-process engine, so KB/composer setup is not repeated per webhook."""
+    global _shared_engine
+    if _shared_engine is None:
+        _shared_engine = EnhancedContextualIntelligenceEngine()
+    return _shared_engine
+
+
 def generate_narrative(
     signal_data: Dict, 
     validation_result: Dict,
@@ -534,7 +544,7 @@ def generate_narrative(
     """
     if use_kb:
         try:
-            engine = EnhancedContextualIntelligenceEngine()
+            engine = _get_shared_engine()
             result = engine.generate_narrative(
                 signal_data=signal_data,
                 validation_result=validation_result,
@@ -27,6 +27,8 @@ from datetime import timedelta
 from django.utils import timezone
 import re
 
+from autopsy.template_registry import compile_template, get_compiled
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,32 +45,29 @@ def fetch_recent_news(symbol: str, hours: int = 12, max_items: int = 2) -> List[
         List of news dicts with headline, sentiment, time_ago, extract
     """
     try:
-        from zennews.models import NewsEvent
+        from zennews.utils.symbol_index import related_news
         
         # Calculate time threshold
         time_threshold = timezone.now() - timedelta(hours=hours)
         
-        # Query news events
-        news_items = NewsEvent.objects.filter(
-            timestamp__gte=time_threshold
-        ).order_by('-relevance_rank', '-timestamp')
+        # Top-k relevant events from the symbol -> news index
+        news_items = related_news(
+            symbol, since=time_threshold, limit=max_items,
+            order_by=('-relevance_rank', '-timestamp')
+        )
         
-        # Filter by symbol relevance
-        relevant_news = []
-        for news in news_items:
-            if news.matches_symbol(symbol):
-                relevant_news.append({
-                    'headline': news.headline,
-                    'sentiment': news.sentiment_score or news.sentiment,
-                    'time_ago': news.get_time_ago(),
-                    'extract': news.get_short_extract(25),
-                    'source': news.source,
-                    'impact_level': news.impact_level,
-                    'relevance_rank': news.relevance_rank
-                })
-                
-                if len(relevant_news) >= max_items:
-                    break
+        relevant_news = [
+            {
+                'headline': news.headline,
+                'sentiment': news.sentiment_score or news.sentiment,
+                'time_ago': news.get_time_ago(),
+                'extract': news.get_short_extract(25),
+                'source': news.source,
+                'impact_level': news.impact_level,
+                'relevance_rank': news.relevance_rank
+            }
+            for news in news_items
+        ]
         
         logger.debug(f"Found {len(relevant_news)} recent news items for {symbol}")
         return relevant_news
@@ -203,11 +202,94 @@ class NarrativeComposer:
         'pattern': ['potential structure', 'possible formation', 'tentative setup', 'emerging configuration']
     }
     
+    # Comprehensive placeholder defaults (100+ mappings)
+    PLACEHOLDER_DEFAULTS = {
+        # Intensity & Strength
+        'intensity': ['pronounced', 'building', 'developing', 'emerging', 'solid'],
+        'degree': ['moderate', 'significant', 'notable', 'marked'],
+        'tightness': ['compressing', 'tightening', 'narrowing', 'coiling'],
+        
+        # Patterns & Structures
+        'pattern_type': ['pre-breakout compression', 'accumulation', 'distribution', 'continuation'],
+        'zone_type': ['demand', 'supply', 'imbalance', 'fair value gap'],
+        'structure_name': ['consolidation', 'range', 'triangle', 'wedge'],
+        'choch_type': ['bullish', 'bearish', 'structural'],
+        'ob_quality': ['fresh', 'tested', 'unmitigated'],
+        
+        # Directions & Movements
+        'direction': ['upward', 'downward', 'lateral', 'sideways'],
+        'movement_type': ['impulsive', 'corrective', 'gradual', 'swift'],
+        'breakout_type': ['decisive', 'sustained', 'confirmed'],
+        'price_action': ['compression', 'expansion', 'consolidation'],
+        
+        # Levels & Zones
+        'level': ['1.26500', 'key pivot', 'structural reference'],
+        'key_level': ['1.26500', 'critical zone', 'structural pivot'],
+        'pivot_level': ['current pivot', 'key level', 'reference point'],
+        'level_description': ['critical zone', 'key reference', 'structural pivot'],
+        'zone_identifier': ['demand area', 'supply zone', 'liquidity pool'],
+        'reference': ['key level', 'structural pivot', 'critical zone'],
+        'reference_point': ['pivot', 'key level', 'reference zone'],
+        
+        # Market Conditions
+        'regime': ['ranging', 'trending', 'volatile'],
+        'market_phase': ['accumulation', 'markup', 'distribution', 'markdown'],
+        'premium_discount': ['premium', 'discount', 'equilibrium'],
+        'structure_shift': ['CHoCH', 'BOS', 'sweep pattern'],
+        'condition': ['momentum confirms', 'structure holds', 'volume validates'],
+        
+        # Actions & Behaviors
+        'action': ['positioning', 'accumulation', 'distribution'],
+        'behavior': ['respects structure', 'maintains integrity', 'confirms pattern'],
+        'development': ['unfolding', 'materializing', 'forming'],
+        'phase': ['early', 'mature', 'late-stage'],
+        
+        # Outcomes & Expectations
+        'outcome': ['directional bias', 'structural shift', 'momentum continuation'],
+        'outcome_type': ['expansion', 'continuation', 'reversal'],
+        'expectation': ['continuation', 'reversal', 'consolidation'],
+        'significance': ['confirm bias', 'validate setup', 'trigger expansion'],
+        'implication': ['directional move', 'volatility expansion', 'trend continuation'],
+        
+        # Indicators & References
+        'indicator': ['momentum', 'volume', 'volatility'],
+        'factor': ['session liquidity', 'structural integrity', 'momentum alignment'],
+        'confluence_factors': ['multiple timeframe agreement', 'volume confirmation'],
+        'model_reference': ['ICT principles', 'SMC framework', 'institutional flow'],
+        
+        # Timing & Context
+        'timeframe': ['session', 'intraday period', 'trading window'],
+        'duration': ['compressed', 'extended', 'typical'],
+        'session': ['London', 'New York', 'session overlap'],
+        'timing': ['current session', 'upcoming window', 'near-term'],
+        
+        # Descriptive Terms
+        'location': ['this area', 'current zone', 'key region'],
+        'nature': ['typical', 'characteristic', 'common'],
+        'quality': ['clean', 'clear', 'defined'],
+        'status': ['present', 'evident', 'observable'],
+        'degree_assessment': ['approaching', 'testing', 'reaching'],
+        
+        # Confirmation & Validation
+        'confirmation': ['volume support', 'structure confirmation', 'momentum validation'],
+        'confirmation_type': ['structural', 'momentum-based', 'volume-confirmed'],
+        'validation_type': ['structural confirmation', 'momentum validation'],
+        'confirmation_signal': ['decisive break', 'volume surge', 'momentum shift'],
+        
+        # Additional Terms
+        'interpretation': ['positioning ahead of move', 'preparation for expansion'],
+        'context': ['structural context', 'session dynamics', 'liquidity conditions'],
+        'context_factor': ['key reference unfolds', 'structure validates'],
+        'reason': ['structural confirmation', 'momentum validation', 'volume support'],
+        'characteristic': ['typical pattern', 'common behavior', 'expected development'],
+    }
+    
     def __init__(self):
         """Initialize narrative composer with template bank."""
-        self.strategy_templates = self._load_strategy_templates()
+        # Template bank is built once per process and shared (read-only)
+        self.strategy_templates = get_compiled('narrative_strategy_templates',
+                                               self._load_strategy_templates)
         self.template_usage = defaultdict(int)  # Track template rotation
-        self.recent_narratives = []  # Last 50 for uniqueness checking
         logger.info("Narrative Composer initialized with %d strategy templates", 
                    sum(len(v) for v in self.strategy_templates.values()))
     
@@ -811,11 +893,6 @@ class NarrativeComposer:
             insight_index = self._score_insight_quality(narrative, knowledge_hits)
             linguistic_uniqueness = self._check_uniqueness(narrative)
             
-            # Track for uniqueness checking
-            self.recent_narratives.append(narrative)
-            if len(self.recent_narratives) > 50:
-                self.recent_narratives.pop(0)
-            
             generation_time = int((time.time() - start_time) * 1000)
             
             result = {
@@ -920,120 +997,24 @@ class NarrativeComposer:
     
     def _fill_template(self, template: Dict, variables: Dict, tone: str) -> Dict:
         """Fill template placeholders with context variables."""
-        filled = {}
-        
-        for key, template_str in template.items():
-            # Replace all {placeholder} with actual values
-            filled_str = template_str
-            
-            for var_name, var_value in variables.items():
-                placeholder = f"{{{var_name}}}"
-                if placeholder in filled_str:
-                    filled_str = filled_str.replace(placeholder, str(var_value))
-            
-            # Fill remaining placeholders with defaults
-            filled_str = self._fill_remaining_placeholders(filled_str, tone)
-            
-            filled[key] = filled_str
-        
-        return filled
+        # Placeholders are parsed once per template string (memoized);
+        # anything not in variables gets a default
+        return {
+            key: compile_template(template_str).render(variables, self._placeholder_default)
+            for key, template_str in template.items()
+        }
     
     def _fill_remaining_placeholders(self, text: str, tone: str) -> str:
         """Fill any remaining {placeholders} with appropriate defaults."""
-        # Find all remaining placeholders
-        placeholders = re.findall(r'\{([^}]+)\}', text)
-        
-        # Comprehensive placeholder defaults (100+ mappings)
-        defaults = {
-            # Intensity & Strength
-            'intensity': random.choice(['pronounced', 'building', 'developing', 'emerging', 'solid']),
-            'degree': random.choice(['moderate', 'significant', 'notable', 'marked']),
-            'tightness': random.choice(['compressing', 'tightening', 'narrowing', 'coiling']),
-            
-            # Patterns & Structures
-            'pattern_type': random.choice(['pre-breakout compression', 'accumulation', 'distribution', 'continuation']),
-            'zone_type': random.choice(['demand', 'supply', 'imbalance', 'fair value gap']),
-            'structure_name': random.choice(['consolidation', 'range', 'triangle', 'wedge']),
-            'choch_type': random.choice(['bullish', 'bearish', 'structural']),
-            'ob_quality': random.choice(['fresh', 'tested', 'unmitigated']),
-            
-            # Directions & Movements
-            'direction': random.choice(['upward', 'downward', 'lateral', 'sideways']),
-            'movement_type': random.choice(['impulsive', 'corrective', 'gradual', 'swift']),
-            'breakout_type': random.choice(['decisive', 'sustained', 'confirmed']),
-            'price_action': random.choice(['compression', 'expansion', 'consolidation']),
-            
-            # Levels & Zones
-            'level': random.choice(['1.26500', 'key pivot', 'structural reference']),
-            'key_level': random.choice(['1.26500', 'critical zone', 'structural pivot']),
-            'pivot_level': random.choice(['current pivot', 'key level', 'reference point']),
-            'level_description': random.choice(['critical zone', 'key reference', 'structural pivot']),
-            'zone_identifier': random.choice(['demand area', 'supply zone', 'liquidity pool']),
-            'reference': random.choice(['key level', 'structural pivot', 'critical zone']),
-            'reference_point': random.choice(['pivot', 'key level', 'reference zone']),
-            
-            # Market Conditions
-            'regime': random.choice(['ranging', 'trending', 'volatile']),
-            'market_phase': random.choice(['accumulation', 'markup', 'distribution', 'markdown']),
-            'premium_discount': random.choice(['premium', 'discount', 'equilibrium']),
-            'structure_shift': random.choice(['CHoCH', 'BOS', 'sweep pattern']),
-            'condition': random.choice(['momentum confirms', 'structure holds', 'volume validates']),
-            
-            # Actions & Behaviors
-            'action': random.choice(['positioning', 'accumulation', 'distribution']),
-            'behavior': random.choice(['respects structure', 'maintains integrity', 'confirms pattern']),
-            'development': random.choice(['unfolding', 'materializing', 'forming']),
-            'phase': random.choice(['early', 'mature', 'late-stage']),
-            
-            # Outcomes & Expectations
-            'outcome': random.choice(['directional bias', 'structural shift', 'momentum continuation']),
-            'outcome_type': random.choice(['expansion', 'continuation', 'reversal']),
-            'expectation': random.choice(['continuation', 'reversal', 'consolidation']),
-            'significance': random.choice(['confirm bias', 'validate setup', 'trigger expansion']),
-            'implication': random.choice(['directional move', 'volatility expansion', 'trend continuation']),
-            
-            # Indicators & References
-            'indicator': random.choice(['momentum', 'volume', 'volatility']),
-            'factor': random.choice(['session liquidity', 'structural integrity', 'momentum alignment']),
-            'confluence_factors': random.choice(['multiple timeframe agreement', 'volume confirmation']),
-            'model_reference': random.choice(['ICT principles', 'SMC framework', 'institutional flow']),
-            
-            # Timing & Context
-            'timeframe': random.choice(['session', 'intraday period', 'trading window']),
-            'duration': random.choice(['compressed', 'extended', 'typical']),
-            'session': random.choice(['London', 'New York', 'session overlap']),
-            'timing': random.choice(['current session', 'upcoming window', 'near-term']),
-            
-            # Descriptive Terms
-            'location': random.choice(['this area', 'current zone', 'key region']),
-            'nature': random.choice(['typical', 'characteristic', 'common']),
-            'quality': random.choice(['clean', 'clear', 'defined']),
-            'status': random.choice(['present', 'evident', 'observable']),
-            'degree_assessment': random.choice(['approaching', 'testing', 'reaching']),
-            
-            # Confirmation & Validation
-            'confirmation': random.choice(['volume support', 'structure confirmation', 'momentum validation']),
-            'confirmation_type': random.choice(['structural', 'momentum-based', 'volume-confirmed']),
-            'validation_type': random.choice(['structural confirmation', 'momentum validation']),
-            'confirmation_signal': random.choice(['decisive break', 'volume surge', 'momentum shift']),
-            
-            # Additional Terms
-            'interpretation': random.choice(['positioning ahead of move', 'preparation for expansion']),
-            'context': random.choice(['structural context', 'session dynamics', 'liquidity conditions']),
-            'context_factor': random.choice(['key reference unfolds', 'structure validates']),
-            'reason': random.choice(['structural confirmation', 'momentum validation', 'volume support']),
-            'characteristic': random.choice(['typical pattern', 'common behavior', 'expected development']),
-        }
-        
-        for placeholder in placeholders:
-            if placeholder in defaults:
-                text = text.replace(f"{{{placeholder}}}", defaults[placeholder])
-            else:
-                # Generic fill: convert placeholder to readable text
-                readable = placeholder.replace('_', ' ')
-                text = text.replace(f"{{{placeholder}}}", readable)
-        
-        return text
+        return compile_template(text).render({}, self._placeholder_default)
+    
+    def _placeholder_default(self, placeholder: str) -> str:
+        """Default value for a placeholder the context did not provide."""
+        options = self.PLACEHOLDER_DEFAULTS.get(placeholder)
+        if options:
+            return random.choice(options)
+        # Generic fill: convert placeholder to readable text
+        return placeholder.replace('_', ' ')
     
     def _apply_linguistic_variation(self, parts: Dict, tone: str) -> Dict:
         """
@@ -1071,28 +1052,31 @@ class NarrativeComposer:
         
         return varied
     
+    def _compile_banned_patterns(self) -> List[Tuple]:
+        """Case-insensitive (pattern, replacement) pairs, applied in order."""
+        replacements = {
+            'buy': 'observe upward bias',
+            'sell': 'observe downward bias',
+            'entry': 'key level',
+            'exit': 'target zone',
+            'stop': 'invalidation point',
+            'target': 'extension zone',
+            'take profit': 'objective area',
+            'tp': 'target',
+            'sl': 'stop',
+            'signal': 'indication',
+            'trade': 'setup',
+            'position': 'stance'
+        }
+        return [
+            (re.compile(re.escape(banned), re.IGNORECASE),
+             replacements.get(banned.lower(), 'key reference'))
+            for banned in self.BANNED_WORDS
+        ]
+    
     def _filter_banned_words(self, text: str) -> str:
         """Remove or replace banned trading signal words."""
-        for banned in self.BANNED_WORDS:
-            # Case-insensitive replacement
-            pattern = re.compile(re.escape(banned), re.IGNORECASE)
-            
-            replacements = {
-                'buy': 'observe upward bias',
-                'sell': 'observe downward bias',
-                'entry': 'key level',
-                'exit': 'target zone',
-                'stop': 'invalidation point',
-                'target': 'extension zone',
-                'take profit': 'objective area',
-                'tp': 'target',
-                'sl': 'stop',
-                'signal': 'indication',
-                'trade': 'setup',
-                'position': 'stance'
-            }
-            
-            replacement = replacements.get(banned.lower(), 'key reference')
+        for pattern, replacement in get_compiled('narrative_banned_patterns', self._compile_banned_patterns):
             text = pattern.sub(replacement, text)
         
         return text
@@ -1153,28 +1137,19 @@ class NarrativeComposer:
         """
         Check linguistic uniqueness against recent narratives.
         
-        Uses simple word overlap metric (cosine similarity would be better
-        but adds dependency overhead).
+        Uses the shared MinHash/LSH uniqueness store, so narratives are
+        compared against every worker's recent output (word-set Jaccard
+        estimate). Scores 1.0 if the store cannot be opened.
         
         Returns:
             Uniqueness score (1.0 = completely unique, 0.0 = identical)
         """
-        if not self.recent_narratives:
+        try:
+            from autopsy.uniqueness import get_uniqueness_store
+            return get_uniqueness_store('narrative').check_and_remember(narrative)
+        except Exception as e:
+            logger.warning(f"Uniqueness store unavailable: {e}")
             return 1.0
-        
-        narrative_words = set(narrative.lower().split())
-        
-        max_similarity = 0.0
-        for recent in self.recent_narratives[-10:]:  # Check last 10
-            recent_words = set(recent.lower().split())
-            
-            intersection = len(narrative_words & recent_words)
-            union = len(narrative_words | recent_words)
-            
-            similarity = intersection / max(union, 1)
-            max_similarity = max(max_similarity, similarity)
-        
-        return 1.0 - max_similarity
     
     def _fallback_narrative(self, signal_context: Dict) -> Dict:
         """Generate simple fallback narrative if main generation fails."""
@@ -7,10 +7,13 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, Optional, Tuple
 
-import pandas as pd
-from django.db.models import Avg, Count, Q
+from django.db.models import Count, Q
 from django.utils import timezone
 
+from zenithedge.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
 logger = logging.getLogger('zenbot')
 
 
@@ -242,7 +245,7 @@ class SignalValidator:
         score = 0.75  # Neutral if no sentiment data
         
         try:
-            from zennews.models import NewsEvent
+            from zennews.utils.sentiment_buckets import sentiment_window
             
             symbol = signal_data.get('symbol')
             side = signal_data.get('side', '').lower()
@@ -250,14 +253,11 @@ class SignalValidator:
             if not symbol:
                 return score
             
-            # Get recent news for this symbol
-            recent_news = NewsEvent.objects.filter(
-                symbol=symbol,
-                timestamp__gte=timezone.now() - timedelta(hours=12)
-            ).order_by('-timestamp')[:5]
+            # Average sentiment of the last 12 hours of news (sentiment buckets)
+            recent = sentiment_window(symbol, hours=12)
             
-            if recent_news.exists():
-                avg_sentiment = recent_news.aggregate(Avg('sentiment'))['sentiment__avg'] or 0
+            if recent['count']:
+                avg_sentiment = recent['avg_sentiment'] or 0
                 
                 # Check alignment
                 if side == 'buy' and avg_sentiment > 0.3:
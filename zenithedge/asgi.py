@@ -10,12 +10,15 @@ from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from notifications.routing import websocket_urlpatterns
+from zenithedge.write_behind import install_exit_flush
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithedge.settings')
 
 # Initialize Django ASGI application early to ensure AppRegistry is populated
 django_asgi_app = get_asgi_application()
 
+install_exit_flush()
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
@@ -0,0 +1,374 @@
+"""
+Channel layer backed by a local SQLite store.
+
+``InMemoryChannelLayer`` only reaches sockets held by the same process, so
+notifications created by cron commands or another worker never arrived,
+and our host cannot run Redis. This layer keeps messages and group
+memberships in a WAL-mode SQLite file under ``settings.LOCAL_STORE_DIR``
+(see zenithedge.local_store), which every process on the host shares.
+
+Receiving is done by one poller task per process that collects messages
+for every channel currently awaited in that process in a single query.
+While messages flow it polls back to back; when idle the interval starts
+at ``poll_interval`` and doubles up to ``max_poll_interval``, which bounds
+delivery latency. Messages expire
+after ``expiry`` seconds; a channel whose message expired unread is
+dropped from its groups (its consumer is gone), like the in-memory layer.
+
+Configuration::
+
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'zenithedge.channel_layer.SQLiteChannelLayer',
+            'CONFIG': {'expiry': 60, 'capacity': 100, 'max_poll_interval': 0.1},
+        },
+    }
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+from zenithedge.local_store import close_connections, get_connection, get_store_path
+
+logger = logging.getLogger(__name__)
+
+CHANNELS_FILENAME = 'channels.sqlite3'
+
+# How often (seconds) expired messages and memberships are purged per process
+PURGE_INTERVAL = 5.0
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS channel_messages ('
+    'id INTEGER PRIMARY KEY, channel TEXT NOT NULL, body TEXT NOT NULL, expires_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS channel_messages_channel ON channel_messages (channel, id)',
+    'CREATE INDEX IF NOT EXISTS channel_messages_expiry ON channel_messages (expires_at)',
+    'CREATE TABLE IF NOT EXISTS channel_groups ('
+    'group_name TEXT NOT NULL, channel TEXT NOT NULL, joined_at REAL NOT NULL, '
+    'PRIMARY KEY (group_name, channel))',
+    'CREATE INDEX IF NOT EXISTS channel_groups_channel ON channel_groups (channel)',
+)
+
+
+def _encode_default(value):
+    if isinstance(value, (bytes, bytearray)):
+        return {'__bytes__': base64.b64encode(bytes(value)).decode('ascii')}
+    raise TypeError(f"Channel message value of type {type(value).__name__} is not serializable")
+
+
+def _decode_hook(obj):
+    if len(obj) == 1 and '__bytes__' in obj:
+        return base64.b64decode(obj['__bytes__'])
+    return obj
+
+
+def encode_message(message: Dict) -> str:
+    """Serialize a channel message (JSON; bytes values are base64-wrapped)"""
+    return json.dumps(message, default=_encode_default, separators=(',', ':'))
+
+
+def decode_message(body: str) -> Dict:
+    return json.loads(body, object_hook=_decode_hook)
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    Cross-process channel layer on a shared SQLite WAL file
+    """
+
+    extensions = ['groups', 'flush']
+
+    def __init__(self, expiry=60, group_expiry=86400, capacity=100, channel_capacity=None,
+                 path=None, poll_interval=0.01, max_poll_interval=0.1, **kwargs):
+        super().__init__(expiry=expiry, capacity=capacity, **kwargs)
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.group_expiry = group_expiry
+        self.path = path
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+        self.client_prefix = uuid.uuid4().hex[:12]
+
+        self._pid = None
+        self._executor = None
+        self._ready = False
+        self._purged_at = 0.0
+
+        # Receive side (bound to the event loop that receives)
+        self._loop = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._waiters: Dict[str, int] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    # Database access (always on the layer's own thread)
+
+    async def _run(self, func, *args):
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            # Never reuse a parent's thread or SQLite handle after a fork
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='channel-layer')
+            self._pid = pid
+            self._ready = False
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _conn(self):
+        if self.path is None:
+            self.path = get_store_path(CHANNELS_FILENAME)
+        conn = get_connection(self.path)
+        if not self._ready:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._ready = True
+        return conn
+
+    def _maybe_purge(self, conn, now: float):
+        if now - self._purged_at < PURGE_INTERVAL:
+            return
+        self._purged_at = now
+        conn.execute(
+            'DELETE FROM channel_groups WHERE channel IN ('
+            'SELECT DISTINCT channel FROM channel_messages WHERE expires_at < ?)',
+            (now,)
+        )
+        conn.execute('DELETE FROM channel_messages WHERE expires_at < ?', (now,))
+        conn.execute('DELETE FROM channel_groups WHERE joined_at < ?', (now - self.group_expiry,))
+
+    def _pending_counts(self, conn, channels: List[str], now: float) -> Dict[str, int]:
+        placeholders = ','.join('?' * len(channels))
+        return dict(conn.execute(
+            f'SELECT channel, COUNT(*) FROM channel_messages '
+            f'WHERE channel IN ({placeholders}) AND expires_at >= ? GROUP BY channel',
+            (*channels, now)
+        ))
+
+    def _send_sync(self, channel: str, body: str):
+        conn = self._conn()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self._pending_counts(conn, [channel], now).get(channel, 0) >= self.get_capacity(channel):
+                raise ChannelFull(channel)
+            conn.execute(
+                'INSERT INTO channel_messages (channel, body, expires_at) VALUES (?, ?, ?)',
+                (channel, body, now + self.expiry)
+            )
+            self._maybe_purge(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _group_send_sync(self, group: str, body: str) -> int:
+        conn = self._conn()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            channels = [row[0] for row in conn.execute(
+                'SELECT channel FROM channel_groups WHERE group_name = ? AND joined_at >= ?',
+                (group, now - self.group_expiry)
+            )]
+            pending = self._pending_counts(conn, channels, now) if channels else {}
+            # Full channels are skipped, as with the other layers
+            rows = [
+                (channel, body, now + self.expiry)
+                for channel in channels
+                if pending.get(channel, 0) < self.get_capacity(channel)
+            ]
+            conn.executemany(
+                'INSERT INTO channel_messages (channel, body, expires_at) VALUES (?, ?, ?)', rows
+            )
+            self._maybe_purge(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return len(rows)
+
+    def _claim_sync(self, specific: List[str], shared: Dict[str, int]) -> List[Tuple[str, Dict]]:
+        """
+        Take pending messages off the store
+
+        Process-specific channels are drained completely; shared channels
+        (possibly received by other processes too) only give one message
+        per local waiter. The lookup is a plain WAL read, so idle polls
+        never wait for writers; the write lock is only taken to delete
+        what was found, and a shared-channel row another process deleted
+        first is skipped.
+        """
+        conn = self._conn()
+        now = time.time()
+
+        own = []
+        if specific:
+            placeholders = ','.join('?' * len(specific))
+            own = conn.execute(
+                f'SELECT id, channel, body, expires_at FROM channel_messages '
+                f'WHERE channel IN ({placeholders}) ORDER BY id',
+                specific
+            ).fetchall()
+        contended = []
+        for channel, limit in shared.items():
+            contended.extend(conn.execute(
+                'SELECT id, channel, body, expires_at FROM channel_messages '
+                'WHERE channel = ? AND expires_at >= ? ORDER BY id LIMIT ?',
+                (channel, now, limit)
+            ).fetchall())
+        if not own and not contended and now - self._purged_at < PURGE_INTERVAL:
+            return []
+
+        claimed = []
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if own:
+                # Only this process receives its specific channels, and rows
+                # committed after the read above have higher ids
+                conn.execute(
+                    f'DELETE FROM channel_messages WHERE channel IN ({placeholders}) AND id <= ?',
+                    (*specific, own[-1][0])
+                )
+                claimed.extend((channel, body) for _, channel, body, expires_at in own if expires_at >= now)
+            for row_id, channel, body, expires_at in contended:
+                if conn.execute('DELETE FROM channel_messages WHERE id = ?', (row_id,)).rowcount:
+                    claimed.append((channel, body))
+            self._maybe_purge(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return [(channel, decode_message(body)) for channel, body in claimed]
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        """Send a message onto a (general or specific) channel"""
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        assert "__asgi_channel__" not in message
+
+        await self._run(self._send_sync, channel, encode_message(message))
+
+    async def receive(self, channel):
+        """
+        Receive the first message that arrives on the channel
+
+        Waits until the process poller delivers one.
+        """
+        assert self.valid_channel_name(channel)
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Receive state (queues, poller) belongs to a single event loop
+            self._loop = loop
+            self._queues = {}
+            self._waiters = {}
+            self._poller = None
+
+        queue = self._queues.get(channel)
+        if queue is None:
+            queue = self._queues[channel] = asyncio.Queue()
+        self._waiters[channel] = self._waiters.get(channel, 0) + 1
+
+        if self._poller is None or self._poller.done():
+            self._poller = loop.create_task(self._poll())
+
+        try:
+            return await queue.get()
+        finally:
+            self._waiters[channel] -= 1
+            if not self._waiters[channel]:
+                del self._waiters[channel]
+                if queue.empty():
+                    self._queues.pop(channel, None)
+
+    async def _poll(self):
+        interval = self.poll_interval
+        while self._waiters:
+            specific = [channel for channel in self._waiters if '!' in channel]
+            shared = {channel: count for channel, count in self._waiters.items() if '!' not in channel}
+            try:
+                delivered = await self._run(self._claim_sync, specific, shared)
+            except Exception as e:
+                logger.warning(f"Channel layer poll failed: {e}")
+                delivered = []
+
+            for channel, message in delivered:
+                queue = self._queues.get(channel)
+                if queue is None:
+                    queue = self._queues[channel] = asyncio.Queue()
+                queue.put_nowait(message)
+
+            if delivered:
+                # Keep draining while messages flow; just let the receivers run
+                interval = self.poll_interval
+                await asyncio.sleep(0)
+            else:
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, self.max_poll_interval)
+
+    async def new_channel(self, prefix='specific'):
+        """Name for a new channel received by this process"""
+        return f"{prefix}.{self.client_prefix}!{uuid.uuid4().hex}"
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        """Add the channel to a group (membership refreshes on re-add)"""
+        assert self.valid_group_name(group), "Group name not valid"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+
+        def add():
+            self._conn().execute(
+                'INSERT INTO channel_groups (group_name, channel, joined_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(group_name, channel) DO UPDATE SET joined_at = excluded.joined_at',
+                (group, channel, time.time())
+            )
+
+        await self._run(add)
+
+    async def group_discard(self, group, channel):
+        """Remove the channel from a group"""
+        assert self.valid_channel_name(channel), "Invalid channel name"
+        assert self.valid_group_name(group), "Invalid group name"
+
+        def discard():
+            self._conn().execute(
+                'DELETE FROM channel_groups WHERE group_name = ? AND channel = ?', (group, channel)
+            )
+
+        await self._run(discard)
+
+    async def group_send(self, group, message):
+        """Send a message to every channel in a group (one transaction)"""
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+
+        await self._run(self._group_send_sync, group, encode_message(message))
+
+    # Flush extension
+
+    async def flush(self):
+        """Drop every message and group membership (all processes)"""
+        def flush():
+            conn = self._conn()
+            conn.execute('DELETE FROM channel_messages')
+            conn.execute('DELETE FROM channel_groups')
+
+        await self._run(flush)
+
+    async def close(self):
+        """Stop polling and release this process's SQLite handle"""
+        if self._poller is not None and not self._poller.done():
+            self._poller.cancel()
+        self._poller = None
+        if self._executor is not None and self._pid == os.getpid():
+            await self._run(close_connections)
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._ready = False
@@ -0,0 +1,124 @@
+"""
+Lazy imports for heavy optional dependencies
+
+Module-level ``import pandas`` / ``spacy.load`` in view-reachable modules
+made every Passenger cold start pay for NumPy, pandas, scikit-learn,
+spaCy, NLTK and TextBlob before serving a single request. Modules use
+``lazy_import`` instead; the real import happens on first attribute
+access, i.e. in the first request that actually needs the library.
+
+Usage:
+    from zenithedge.lazy_imports import is_available, lazy_import
+
+    np = lazy_import('numpy')
+    SKLEARN_AVAILABLE = is_available('sklearn')
+
+Modules that annotate with lazily imported types (``-> pd.DataFrame``)
+need ``from __future__ import annotations`` so the annotations are not
+evaluated - and the module not loaded - at import time.
+
+Use ``python manage.py startup_audit`` to see what startup still imports.
+"""
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+import types
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder for a module that is imported on first attribute access
+
+    After loading, the real module's namespace is copied onto the
+    placeholder so later lookups don't go through ``__getattr__``.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is not None:
+            return module
+        with self.__dict__['_lazy_lock']:
+            module = self.__dict__['_lazy_module']
+            if module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self.__dict__['_lazy_module'] = module
+                logger.debug(f"Lazy import of {self.__name__} took {(time.perf_counter() - started) * 1000:.0f}ms")
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__['_lazy_module'] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Module proxy that imports ``name`` when first used
+
+    An ImportError (missing package) is raised at first use, not here;
+    check ``is_available`` for optional dependencies.
+    """
+    return LazyModule(name)
+
+
+@lru_cache(maxsize=None)
+def is_available(name: str) -> bool:
+    """
+    Whether module ``name`` is installed, without importing it
+
+    For dotted names the parent packages are imported (that's how import
+    specs are resolved), so prefer top-level names for heavy packages.
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+_spacy_models = {}
+_spacy_lock = threading.Lock()
+
+
+def spacy_model(name: str = 'en_core_web_sm'):
+    """
+    Shared spaCy pipeline ``name``, loaded on first call
+
+    Loading en_core_web_sm takes several hundred milliseconds and ~100MB,
+    so it is loaded once per process, by the first caller that needs it.
+
+    Returns:
+        The pipeline, or None if spaCy or the model is not installed
+    """
+    if name not in _spacy_models:
+        with _spacy_lock:
+            if name not in _spacy_models:
+                model = None
+                if is_available('spacy'):
+                    import spacy
+                    try:
+                        model = spacy.load(name)
+                    except OSError:
+                        logger.warning(f"spaCy model not found - run: python -m spacy download {name}")
+                _spacy_models[name] = model
+    return _spacy_models[name]
@@ -0,0 +1,301 @@
+"""
+Local SQLite stores shared between worker processes.
+
+Our cPanel host cannot run Redis, so small pieces of state that must be
+shared between gunicorn/Passenger workers and cron commands live in
+SQLite files opened in WAL mode (many concurrent readers, one short
+writer at a time). Files are kept under ``settings.LOCAL_STORE_DIR``.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def get_store_path(filename: str) -> str:
+    """Absolute path of a store file, creating the store directory if needed"""
+    directory = Path(getattr(settings, 'LOCAL_STORE_DIR', Path(settings.BASE_DIR) / 'var'))
+    directory.mkdir(parents=True, exist_ok=True)
+    return str(directory / filename)
+
+
+def connect(path: str, timeout: float = 5.0) -> sqlite3.Connection:
+    """
+    Open a WAL-mode connection in autocommit mode.
+
+    Callers manage transactions explicitly (``BEGIN IMMEDIATE`` for
+    read-modify-write sections) so concurrent writers queue on the
+    busy timeout instead of failing.
+    """
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={int(timeout * 1000)}')
+    return conn
+
+
+def get_connection(path: str) -> sqlite3.Connection:
+    """
+    Per-thread cached connection for ``path``.
+
+    Connections are re-opened after a fork so pre-forked workers never
+    share a SQLite handle with their parent.
+    """
+    pid = os.getpid()
+    connections = getattr(_local, 'connections', None)
+    if connections is None or getattr(_local, 'pid', None) != pid:
+        connections = _local.connections = {}
+        _local.pid = pid
+
+    conn = connections.get(path)
+    if conn is None:
+        conn = connections[path] = connect(path)
+    return conn
+
+
+def close_connections():
+    """Close this thread's cached connections (used by tests)"""
+    for conn in getattr(_local, 'connections', {}).values():
+        conn.close()
+    _local.connections = {}
+    _versions_ready.clear()
+
+
+VERSIONS_FILENAME = 'versions.sqlite3'
+_versions_ready = set()
+
+
+def _versions_connection() -> sqlite3.Connection:
+    path = get_store_path(VERSIONS_FILENAME)
+    conn = get_connection(path)
+    if path not in _versions_ready:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS versions ('
+            'name TEXT PRIMARY KEY, version INTEGER NOT NULL)'
+        )
+        _versions_ready.add(path)
+    return conn
+
+
+def get_version(name: str) -> int:
+    """Current value of a shared version counter (0 if never bumped)"""
+    row = _versions_connection().execute(
+        'SELECT version FROM versions WHERE name = ?', (name,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def bump_version(name: str) -> int:
+    """
+    Increment a shared version counter and return the new value.
+
+    Workers compare the counter with the version their in-process
+    caches were built from and rebuild when it moves.
+    """
+    conn = _versions_connection()
+    conn.execute(
+        'INSERT INTO versions (name, version) VALUES (?, 1) '
+        'ON CONFLICT(name) DO UPDATE SET version = version + 1',
+        (name,)
+    )
+    return get_version(name)
+
+
+def bump_version_on_commit(name: str):
+    """
+    Bump a version counter once the current database transaction commits
+
+    Model receivers run inside the caller's transaction. Bumping there
+    lets another worker rebuild from the pre-commit rows and cache them
+    under the new version. Outside a transaction this bumps right away.
+    """
+    def bump():
+        try:
+            bump_version(name)
+        except Exception as e:
+            logger.warning(f"Could not bump {name}: {e}")
+    transaction.on_commit(bump)
+
+
+# How often (seconds) a versioned cache entry re-checks its counter
+VERSION_CHECK_INTERVAL = 2.0
+
+
+class _Entry:
+    __slots__ = ('value', 'version', 'checked_at')
+
+    def __init__(self, value, version, checked_at):
+        self.value = value
+        self.version = version
+        self.checked_at = checked_at
+
+
+_versioned: Dict[str, _Entry] = {}
+_versioned_lock = threading.Lock()
+
+
+def _current_version(version_key: str, fallback: int) -> int:
+    try:
+        return get_version(version_key)
+    except Exception as e:
+        # A broken store must not take the callers down with it
+        logger.warning(f"Version check for {version_key} failed: {e}")
+        return fallback
+
+
+def get_versioned(name: str, builder: Callable[[], Any], version_key: Optional[str] = None) -> Any:
+    """
+    Per-process cache of a value invalidated through a shared version counter.
+
+    The value is built on first use and reused until ``version_key`` is
+    bumped (by any process); the counter is re-read at most every
+    ``VERSION_CHECK_INTERVAL`` seconds. Without ``version_key`` the value
+    lives for the lifetime of the process.
+    """
+    entry = _versioned.get(name)
+    now = time.monotonic()
+
+    if entry is not None:
+        if version_key is None or now - entry.checked_at < VERSION_CHECK_INTERVAL:
+            return entry.value
+        version = _current_version(version_key, entry.version)
+        if version == entry.version:
+            entry.checked_at = now
+            return entry.value
+    else:
+        version = _current_version(version_key, 0) if version_key else 0
+
+    with _versioned_lock:
+        current = _versioned.get(name)
+        if current is not None and current.version == version and current is not entry:
+            # Another thread rebuilt it while we waited
+            return current.value
+        value = builder()
+        _versioned[name] = _Entry(value, version, now)
+
+    logger.debug(f"Built cached '{name}' (version {version})")
+    return value
+
+
+def clear_versioned():
+    """Drop every versioned cache entry in this process (used by tests)"""
+    with _versioned_lock:
+        _versioned.clear()
+    for cache in list(_keyed_caches):
+        cache.clear()
+
+
+_keyed_caches = weakref.WeakSet()
+
+
+class VersionedCache:
+    """
+    Per-process keyed cache of rarely changing rows.
+
+    Like ``get_versioned`` but for many small values (one config row per
+    webhook, user, ...): every entry is dropped when ``version_key`` is
+    bumped by any process, the counter is re-read at most every
+    ``VERSION_CHECK_INTERVAL`` seconds, and entries also expire after
+    ``ttl`` seconds as a safety net for writes that bypass ``save()``.
+    Missing rows (``None``) are cached too. At most ``max_entries`` keys
+    are kept, least recently used first out.
+
+    Cached values are shared by every request in the process; callers
+    must not modify them.
+    """
+
+    def __init__(self, version_key: str, ttl: float = 300.0, max_entries: int = 1024):
+        self.version_key = version_key
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Any, tuple]' = OrderedDict()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        _keyed_caches.add(self)
+
+    def _sync(self, now: float):
+        if self._version is not None and now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return
+        version = _current_version(self.version_key, self._version or 0)
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+
+    def get(self, key: Any, loader: Callable[[], Any]) -> Any:
+        """
+        Cached value for ``key``, calling ``loader()`` on a miss
+
+        Args:
+            key: Hashable cache key
+            loader: Zero-argument callable returning the value (or None)
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        now = time.monotonic()
+        self._sync(now)
+
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] < self.ttl:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return entry[0]
+
+        version = self._version
+        value = loader()
+        with self._lock:
+            # Don't store a value loaded before an invalidation
+            if version == self._version:
+                self._entries[key] = (value, now)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        """
+        Drop every entry in every process
+
+        This process is cleared right away (it sees its own uncommitted
+        writes). The shared counter is bumped, and this process cleared
+        again, once the current transaction commits, so no worker can
+        cache pre-commit rows under the new version.
+        """
+        self.clear()
+        transaction.on_commit(self._bump)
+
+    def _bump(self):
+        try:
+            version = bump_version(self.version_key)
+        except Exception as e:
+            logger.warning(f"Could not bump {self.version_key}: {e}")
+            version = None
+        with self._lock:
+            self._entries.clear()
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def clear(self):
+        """Drop this process's entries only"""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def __len__(self):
+        return len(self._entries)
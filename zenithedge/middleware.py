@@ -1,14 +1,14 @@
 """
 Custom middleware for ZenithEdge Trading Hub
 """
-import time
 import hashlib
-from collections import defaultdict
 from django.http import JsonResponse
 from django.conf import settings
 from django.utils import timezone
 from datetime import datetime, timedelta
 
+from zenithedge.rate_limit import check_rate_limit, retry_after_seconds
+
 
 class SecurityHeadersMiddleware:
     """
@@ -49,40 +49,58 @@ class SecurityHeadersMiddleware:
 class WebhookRateLimitMiddleware:
     """
     Middleware to implement rate limiting for webhook endpoints.
-    Uses in-memory sliding window counter per UUID/IP.
+    Uses a GCRA limiter shared by all workers (see zenithedge.rate_limit),
+    so WEBHOOK_RATE_LIMIT (per second) and INSIGHT_BATCH_RATE_LIMIT (per
+    minute, for the NDJSON batch ingest) hold per client no matter how many
+    processes serve the webhooks.
     """
+    INSIGHT_BATCH_PATH = '/autopsy/api/submit-insights/batch/'
+
     def __init__(self, get_response):
         self.get_response = get_response
-        # In-memory rate limit storage: {identifier: [(timestamp, count), ...]}
-        self.rate_limits = defaultdict(list)
-        self.cleanup_interval = 60  # Clean up old entries every 60 seconds
-        self.last_cleanup = time.time()
 
     def __call__(self, request):
-        # Only apply to webhook endpoints
+        identifier = self.get_identifier(request)
+        if identifier:
+            rate_limit, period, period_name = self.get_limit(request)
+            result = check_rate_limit(f"webhook:{identifier}", rate_limit, period)
+            if not result.allowed:
+                retry_after = retry_after_seconds(result)
+                response = JsonResponse({
+                    'error': 'Rate limit exceeded',
+                    'message': f'Maximum {rate_limit} requests per {period_name} allowed',
+                    'retry_after': retry_after
+                }, status=429)
+                response['Retry-After'] = str(retry_after)
+                return response
+
+        response = self.get_response(request)
+        return response
+
+    def get_limit(self, request):
+        """(requests, period in seconds, period name) for a webhook path"""
+        if request.path == self.INSIGHT_BATCH_PATH:
+            return getattr(settings, 'INSIGHT_BATCH_RATE_LIMIT', 6), 60.0, 'minute'
+        return getattr(settings, 'WEBHOOK_RATE_LIMIT', 10), 1.0, 'second'
+
+    def get_identifier(self, request):
+        """
+        Rate limit identity for webhook requests (None for other paths):
+        UUID webhook -> UUID + IP, TradingView webhook and insight batch
+        ingest -> token + IP
+        """
         if request.path.startswith('/api/v1/signal/'):
             # Extract UUID from path
             path_parts = request.path.strip('/').split('/')
             if len(path_parts) >= 4:
-                webhook_uuid = path_parts[3]
-                
-                # Get client identifier (UUID + IP for extra security)
-                client_ip = self.get_client_ip(request)
-                identifier = f"{webhook_uuid}:{client_ip}"
-                
-                # Check rate limit
-                if not self.check_rate_limit(identifier):
-                    return JsonResponse({
-                        'error': 'Rate limit exceeded',
-                        'message': f'Maximum {settings.WEBHOOK_RATE_LIMIT} requests per second allowed',
-                        'retry_after': 1
-                    }, status=429)
-        
-        # Periodic cleanup of old entries
-        self.cleanup_old_entries()
-        
-        response = self.get_response(request)
-        return response
+                return f"{path_parts[3]}:{self.get_client_ip(request)}"
+        elif request.path in ('/api/signals/webhook/', self.INSIGHT_BATCH_PATH):
+            # Hash the token so secrets are not written to the store
+            prefix = 'insights' if request.path == self.INSIGHT_BATCH_PATH else 'tv'
+            token = request.GET.get('token', '')
+            token_hash = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+            return f"{prefix}:{token_hash}:{self.get_client_ip(request)}"
+        return None
 
     def get_client_ip(self, request):
         """Extract client IP address from request"""
@@ -93,50 +111,6 @@ class WebhookRateLimitMiddleware:
             ip = request.META.get('REMOTE_ADDR')
         return ip
 
-    def check_rate_limit(self, identifier):
-        """
-        Check if request is within rate limit.
-        Uses sliding window algorithm.
-        """
-        now = time.time()
-        window_start = now - 1.0  # 1 second window
-        
-        # Get existing requests in current window
-        requests = self.rate_limits[identifier]
-        
-        # Filter to only requests in current window
-        recent_requests = [ts for ts in requests if ts > window_start]
-        
-        # Check if under limit
-        rate_limit = getattr(settings, 'WEBHOOK_RATE_LIMIT', 10)
-        if len(recent_requests) >= rate_limit:
-            return False
-        
-        # Add current request
-        recent_requests.append(now)
-        self.rate_limits[identifier] = recent_requests
-        
-        return True
-
-    def cleanup_old_entries(self):
-        """Remove old rate limit entries to prevent memory bloat"""
-        now = time.time()
-        if now - self.last_cleanup < self.cleanup_interval:
-            return
-        
-        self.last_cleanup = now
-        cutoff = now - 60  # Keep last 60 seconds
-        
-        # Clean up old entries
-        for identifier in list(self.rate_limits.keys()):
-            self.rate_limits[identifier] = [
-                ts for ts in self.rate_limits[identifier] 
-                if ts > cutoff
-            ]
-            # Remove empty lists
-            if not self.rate_limits[identifier]:
-                del self.rate_limits[identifier]
-
 
 class HMACSignatureMiddleware:
     """
@@ -179,8 +153,10 @@ class HMACSignatureMiddleware:
         
         # Get webhook config and secret
         try:
-            from signals.models import WebhookConfig
-            webhook_config = WebhookConfig.objects.get(webhook_uuid=webhook_uuid)
+            from signals.config_cache import get_webhook_config
+            webhook_config = get_webhook_config(webhook_uuid)
+            if webhook_config is None:
+                return False
             
             # Check if secret is configured
             secret = getattr(webhook_config, 'hmac_secret', None)
@@ -0,0 +1,115 @@
+"""
+Cross-process rate limiting (GCRA)
+
+Each key keeps one number, its theoretical arrival time (TAT), in a SQLite
+WAL store shared by every gunicorn/Passenger worker on the host (see
+zenithedge.local_store). A request is one conditional upsert:
+
+    allowed  if  max(tat, now) - now <= burst_tolerance
+    tat      =   max(tat, now) + emission_interval
+
+so limits hold across workers, each check is O(1), and rows whose TAT
+has passed (an idle key is indistinguishable from a missing one) are
+purged periodically, which keeps the table bounded by the keys active
+in the last period.
+"""
+import logging
+import math
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from zenithedge.local_store import get_connection, get_store_path
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_FILENAME = 'ratelimit.sqlite3'
+
+# Seconds between purges of expired keys (per process)
+PURGE_INTERVAL = 10.0
+
+_ready = set()
+_purge_lock = threading.Lock()
+_last_purge = 0.0
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    retry_after: float  # seconds until the next request would be allowed
+
+
+def _connection():
+    path = get_store_path(RATE_LIMIT_FILENAME)
+    conn = get_connection(path)
+    if path not in _ready:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS gcra ('
+            'key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS gcra_tat ON gcra (tat)')
+        _ready.add(path)
+    return conn
+
+
+def _maybe_purge(conn, now: float):
+    global _last_purge
+    if now - _last_purge < PURGE_INTERVAL or not _purge_lock.acquire(blocking=False):
+        return
+    try:
+        _last_purge = now
+        conn.execute('DELETE FROM gcra WHERE tat < ?', (now,))
+    finally:
+        _purge_lock.release()
+
+
+def hit(key: str, rate: float, period: float = 1.0, burst: Optional[int] = None) -> RateLimitResult:
+    """
+    Count one request for ``key`` against ``rate`` requests per ``period``
+
+    Args:
+        key: Rate limit key (e.g. ``webhook:<uuid>:<ip>``)
+        rate: Requests allowed per period
+        period: Period in seconds
+        burst: Requests allowed back-to-back (default: ``rate``)
+
+    Returns:
+        RateLimitResult; ``allowed`` is True when the request may proceed
+    """
+    emission_interval = period / rate
+    tolerance = emission_interval * ((burst or max(1, int(rate))) - 1)
+    now = time.time()
+
+    conn = _connection()
+    # One atomic statement: insert, or advance the TAT only if within tolerance
+    cursor = conn.execute(
+        'INSERT INTO gcra (key, tat) VALUES (?, ?) '
+        'ON CONFLICT(key) DO UPDATE SET tat = max(tat, ?) + ? '
+        'WHERE max(tat, ?) - ? <= ?',
+        (key, now + emission_interval, now, emission_interval, now, now, tolerance)
+    )
+    allowed = cursor.rowcount == 1
+    _maybe_purge(conn, now)
+
+    if allowed:
+        return RateLimitResult(True, 0.0)
+
+    row = conn.execute('SELECT tat FROM gcra WHERE key = ?', (key,)).fetchone()
+    retry_after = max(0.0, row[0] - tolerance - now) if row else 0.0
+    return RateLimitResult(False, retry_after)
+
+
+def check_rate_limit(key: str, rate: float, period: float = 1.0, burst: Optional[int] = None) -> RateLimitResult:
+    """
+    ``hit`` that fails open: a broken or locked store lets the request
+    through (and logs) instead of rejecting webhooks
+    """
+    try:
+        return hit(key, rate, period, burst)
+    except Exception as e:
+        logger.warning(f"Rate limit check for {key} failed: {e}")
+        return RateLimitResult(True, 0.0)
+
+
+def retry_after_seconds(result: RateLimitResult) -> int:
+    """Retry-After value (whole seconds, at least 1)"""
+    return max(1, math.ceil(result.retry_after))
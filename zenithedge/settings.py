@@ -158,7 +158,15 @@ if not DEBUG:
     X_FRAME_OPTIONS = 'DENY'
 
 # Webhook Rate Limiting
-WEBHOOK_RATE_LIMIT = int(os.environ.get('WEBHOOK_RATE_LIMIT', '10'))  # requests per second per UUID
+WEBHOOK_RATE_LIMIT = int(os.environ.get('WEBHOOK_RATE_LIMIT', '10'))  # requests per second per UUID/token + IP, across all workers
+INSIGHT_BATCH_RATE_LIMIT = int(os.environ.get('INSIGHT_BATCH_RATE_LIMIT', '6'))  # NDJSON batches per minute per token + IP
+
+# Local SQLite stores shared between workers (no Redis on shared hosting)
+LOCAL_STORE_DIR = Path(os.environ.get('LOCAL_STORE_DIR', BASE_DIR / 'var'))
+
+# Cold-start budget for passenger_wsgi.application (manage.py startup_audit --check)
+STARTUP_IMPORT_BUDGET_MS = int(os.environ.get('STARTUP_IMPORT_BUDGET_MS', '1500'))
+STARTUP_RSS_BUDGET_MB = int(os.environ.get('STARTUP_RSS_BUDGET_MB', '120'))
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = BASE_DIR / 'logs'
@@ -228,14 +236,17 @@ LOGGING = {
 # Django Channels Configuration
 ASGI_APPLICATION = 'zenithedge.asgi.application'
 
-# Channel layer configuration (using in-memory for development, Redis for production)
+# Channel layer configuration
+# SQLite WAL store under LOCAL_STORE_DIR: reaches sockets in every worker and
+# cron process on the host without Redis (settings_production switches to
+# Redis when REDIS_URL is set)
 CHANNEL_LAYERS = {
     'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',  # Dev: in-memory
-        # Production: Use Redis
-        # 'BACKEND': 'channels_redis.core.RedisChannelLayer',
-        # 'CONFIG': {
-        #     'hosts': [('127.0.0.1', 6379)],
-        # },
+        'BACKEND': 'zenithedge.channel_layer.SQLiteChannelLayer',
+        'CONFIG': {
+            'expiry': 60,
+            'capacity': 100,
+            'max_poll_interval': 0.1,  # Upper bound on delivery latency (seconds)
+        },
     },
 }
@@ -0,0 +1,205 @@
+"""
+Cold-start audit for the WSGI application
+
+Passenger recycles processes often, so import time and memory of
+``passenger_wsgi.application`` are paid many times a day. The audit
+imports the application in a fresh interpreter (as a new worker would),
+resolves the URLconf (as the first request does) and reports:
+
+- wall time and peak RSS of that startup, checked against
+  ``STARTUP_IMPORT_BUDGET_MS`` / ``STARTUP_RSS_BUDGET_MB``
+- an ``-X importtime`` breakdown by top-level package
+- heavy libraries (NumPy, pandas, spaCy, ...) imported at startup, which
+  should be deferred with ``zenithedge.lazy_imports``
+
+See ``python manage.py startup_audit``.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+
+# Libraries that should only be imported by the requests that need them
+HEAVY_MODULES = (
+    'numpy', 'pandas', 'scipy', 'sklearn', 'joblib', 'xgboost',
+    'spacy', 'thinc', 'nltk', 'textblob', 'vaderSentiment',
+    'sentence_transformers', 'transformers', 'torch', 'faiss',
+)
+
+DEFAULT_IMPORT_BUDGET_MS = 1500
+DEFAULT_RSS_BUDGET_MB = 120
+
+_RESULT_MARKER = '__STARTUP_AUDIT__'
+
+# Runs in the child interpreter; prints one JSON line after the marker
+_PROBE = '''
+import importlib, json, resource, sys, time
+started = time.perf_counter()
+module = importlib.import_module({target!r})
+application = getattr(module, 'application', None)
+error = None
+if not hasattr(application, 'get_response'):
+    error = 'application did not load (error fallback served)'
+elif {resolve_urls!r}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+elapsed = time.perf_counter() - started
+# VmHWM is per address space; ru_maxrss would include the parent's peak
+# from before exec
+try:
+    with open('/proc/self/status') as status:
+        rss = next(int(line.split()[1]) * 1024 for line in status if line.startswith('VmHWM:'))
+except (OSError, StopIteration):
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        rss *= 1024
+print({marker!r} + json.dumps({{
+    'import_ms': elapsed * 1000,
+    'rss_mb': rss / (1024 * 1024),
+    'modules': sorted(sys.modules),
+    'error': error,
+}}))
+'''
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+class ImportRecord(NamedTuple):
+    """One ``-X importtime`` line (times in microseconds)"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` stderr into records (in the order printed)"""
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def group_by_package(records: List[ImportRecord]) -> Dict[str, Dict]:
+    """
+    Self import time per top-level package
+
+    Returns:
+        package -> {'ms', 'modules', 'project'}, slowest first; ``project``
+        marks packages that live in this repository
+    """
+    base_dir = str(settings.BASE_DIR)
+    packages: Dict[str, Dict] = {}
+    for record in records:
+        package = record.module.split('.')[0]
+        entry = packages.setdefault(package, {'ms': 0.0, 'modules': 0, 'project': None})
+        entry['ms'] += record.self_us / 1000
+        entry['modules'] += 1
+
+    for package, entry in packages.items():
+        entry['project'] = (
+            os.path.isdir(os.path.join(base_dir, package))
+            or os.path.isfile(os.path.join(base_dir, f'{package}.py'))
+        )
+    return dict(sorted(packages.items(), key=lambda item: item[1]['ms'], reverse=True))
+
+
+def import_chain(records: List[ImportRecord], module: str) -> List[str]:
+    """
+    Modules through which ``module`` was first imported, innermost first
+
+    ``-X importtime`` prints a module after everything it imports, one
+    indentation level deeper, so the importer is the next less-indented line.
+    """
+    for index, record in enumerate(records):
+        if record.module != module:
+            continue
+        chain, depth = [], record.depth
+        for parent in records[index + 1:]:
+            if parent.depth < depth:
+                chain.append(parent.module)
+                depth = parent.depth
+                if depth == 0:
+                    break
+        return chain
+    return []
+
+
+def measure_startup(target: str = 'passenger_wsgi', importtime: bool = False,
+                    resolve_urls: bool = True, settings_module: Optional[str] = None,
+                    timeout: int = 300) -> Dict:
+    """
+    Import ``target.application`` in a fresh interpreter
+
+    Args:
+        target: Module defining the WSGI ``application``
+        importtime: Also collect ``-X importtime`` records (slows the run
+            down slightly, so budgets are checked on runs without it)
+        resolve_urls: Load the URLconf too, as the first request does
+        settings_module: DJANGO_SETTINGS_MODULE for the child
+            (default: the current one)
+        timeout: Seconds before the child is killed
+
+    Returns:
+        Dict with import_ms, rss_mb, heavy_modules, error and, with
+        ``importtime``, records
+    """
+    env = dict(os.environ)
+    env['DJANGO_SETTINGS_MODULE'] = settings_module or os.environ.get(
+        'DJANGO_SETTINGS_MODULE', 'zenithedge.settings'
+    )
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', _PROBE.format(target=target, resolve_urls=resolve_urls, marker=_RESULT_MARKER)]
+
+    completed = subprocess.run(
+        command, cwd=str(settings.BASE_DIR), env=env,
+        capture_output=True, text=True, timeout=timeout,
+    )
+
+    result = None
+    for line in completed.stdout.splitlines():
+        if line.startswith(_RESULT_MARKER):
+            result = json.loads(line[len(_RESULT_MARKER):])
+    if result is None:
+        tail = '\n'.join(completed.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"Startup probe failed (exit {completed.returncode}): {tail}")
+
+    loaded = set(result.pop('modules'))
+    result['heavy_modules'] = [name for name in HEAVY_MODULES if name in loaded]
+    if importtime:
+        result['records'] = parse_importtime(completed.stderr)
+    return result
+
+
+def check_budget(result: Dict, import_budget_ms: Optional[float] = None,
+                 rss_budget_mb: Optional[float] = None) -> List[str]:
+    """
+    Budget violations of a ``measure_startup`` result (empty list = pass)
+
+    Budgets default to the STARTUP_IMPORT_BUDGET_MS / STARTUP_RSS_BUDGET_MB
+    settings. Heavy modules imported at startup count as a violation.
+    """
+    if import_budget_ms is None:
+        import_budget_ms = getattr(settings, 'STARTUP_IMPORT_BUDGET_MS', DEFAULT_IMPORT_BUDGET_MS)
+    if rss_budget_mb is None:
+        rss_budget_mb = getattr(settings, 'STARTUP_RSS_BUDGET_MB', DEFAULT_RSS_BUDGET_MB)
+
+    violations = []
+    if result.get('error'):
+        violations.append(result['error'])
+    if result['import_ms'] > import_budget_ms:
+        violations.append(f"import time {result['import_ms']:.0f}ms > {import_budget_ms:.0f}ms")
+    if result['rss_mb'] > rss_budget_mb:
+        violations.append(f"peak RSS {result['rss_mb']:.1f}MB > {rss_budget_mb:.0f}MB")
+    if result['heavy_modules']:
+        violations.append(f"heavy modules imported at startup: {', '.join(result['heavy_modules'])}")
+    return violations
@@ -0,0 +1,177 @@
+"""
+Materialized dashboard statistics shared between worker processes.
+
+Dashboard pages used to run dozens of COUNT/aggregate queries on every
+load. Their numbers are now computed by builder functions (a few
+conditional-aggregate queries each) and stored as JSON snapshots in a
+local SQLite store (see zenithedge.local_store), so any worker can serve
+them without touching the database.
+
+A snapshot is rebuilt when it is older than its TTL, or when it has been
+marked stale (``mark_stale_on_commit``, called from post_save receivers)
+and was not already rebuilt in the last ``STALE_REFRESH_INTERVAL`` seconds.
+Every mark bumps the snapshot's generation; a rebuild only clears the
+stale flag if the generation it started from is still current, so changes
+committed while the builder ran are not lost. The
+``refresh_dashboard_stats`` command rebuilds them ahead of page loads.
+Pages show the snapshot age from ``Snapshot.context()``.
+"""
+import json
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Callable, Dict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from zenithedge.local_store import get_connection, get_store_path
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOTS_FILENAME = 'stats.sqlite3'
+
+# Seconds a snapshot is served before it is recomputed
+DEFAULT_TTL = 60
+
+# Minimum seconds between rebuilds of a snapshot marked stale, so a burst
+# of webhook saves does not turn every page load into a rebuild
+STALE_REFRESH_INTERVAL = 5
+
+_ready = set()
+
+
+class Snapshot:
+    """A built statistics payload and when it was computed"""
+
+    __slots__ = ('name', 'value', 'computed_at', 'stale')
+
+    def __init__(self, name: str, value: Any, computed_at: float, stale: bool = False):
+        self.name = name
+        self.value = value
+        self.computed_at = computed_at
+        self.stale = stale
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was computed"""
+        return max(0.0, time.time() - self.computed_at)
+
+    def context(self) -> Dict[str, Any]:
+        """Template variables for the staleness indicator"""
+        return {
+            'stats_computed_at': datetime.fromtimestamp(self.computed_at, tz=dt_timezone.utc),
+            'stats_age_seconds': int(self.age),
+            'stats_stale': self.stale,
+        }
+
+
+def _connection():
+    path = get_store_path(SNAPSHOTS_FILENAME)
+    conn = get_connection(path)
+    if path not in _ready:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS snapshots ('
+            'name TEXT PRIMARY KEY, payload TEXT NOT NULL, '
+            'computed_at REAL NOT NULL, stale INTEGER NOT NULL DEFAULT 0, '
+            'generation INTEGER NOT NULL DEFAULT 0)'
+        )
+        # Stores created before generations existed
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(snapshots)')}
+        if 'generation' not in columns:
+            conn.execute('ALTER TABLE snapshots ADD COLUMN generation INTEGER NOT NULL DEFAULT 0')
+        _ready.add(path)
+    return conn
+
+
+def refresh_snapshot(name: str, builder: Callable[[], Any]) -> Snapshot:
+    """
+    Build ``name`` now and store it
+
+    Args:
+        name: Snapshot key (e.g. 'admin_overview', 'track_record:6')
+        builder: Zero-argument callable returning JSON-serializable data
+
+    Returns:
+        The fresh Snapshot
+    """
+    conn = _connection()
+    row = conn.execute('SELECT generation FROM snapshots WHERE name = ?', (name,)).fetchone()
+    generation = row[0] if row else 0
+
+    started = time.time()
+    value = builder()
+    payload = json.dumps(value, cls=DjangoJSONEncoder)
+    # Marks that arrived while building bumped the generation: keep them
+    stale = conn.execute(
+        'INSERT INTO snapshots (name, payload, computed_at, stale, generation) VALUES (?, ?, ?, 0, ?) '
+        'ON CONFLICT (name) DO UPDATE SET payload = excluded.payload, computed_at = excluded.computed_at, '
+        'stale = CASE WHEN generation = excluded.generation THEN 0 ELSE 1 END '
+        'RETURNING stale',
+        (name, payload, started, generation)
+    ).fetchone()[0]
+    logger.debug(f"Rebuilt stats snapshot '{name}' in {time.time() - started:.3f}s")
+    # Round-trip through JSON so fresh and stored snapshots look the same
+    return Snapshot(name, json.loads(payload), started, bool(stale))
+
+
+def get_snapshot(name: str, builder: Callable[[], Any], ttl: float = DEFAULT_TTL) -> Snapshot:
+    """
+    Stored snapshot ``name``, rebuilt first if it has expired or is stale
+
+    Args:
+        name: Snapshot key
+        builder: Zero-argument callable returning JSON-serializable data
+        ttl: Seconds a snapshot may be served
+
+    Returns:
+        Snapshot (``stale`` is True when changes are pending a rebuild)
+    """
+    try:
+        row = _connection().execute(
+            'SELECT payload, computed_at, stale FROM snapshots WHERE name = ?', (name,)
+        ).fetchone()
+    except Exception as e:
+        # A broken store must not take the dashboards down with it
+        logger.warning(f"Reading stats snapshot '{name}' failed: {e}")
+        value = builder()
+        return Snapshot(name, json.loads(json.dumps(value, cls=DjangoJSONEncoder)), time.time())
+
+    if row is not None:
+        payload, computed_at, stale = row
+        age = time.time() - computed_at
+        if age < ttl and (not stale or age < STALE_REFRESH_INTERVAL):
+            return Snapshot(name, json.loads(payload), computed_at, bool(stale))
+
+    return refresh_snapshot(name, builder)
+
+
+def mark_stale(*names: str):
+    """
+    Flag snapshots for rebuild on their next read
+
+    Each name also matches its keyed variants ('track_record' marks
+    'track_record:6', 'track_record:12', ...). Snapshots already stale
+    still get a new generation, so a rebuild in progress keeps the flag.
+    """
+    if not names:
+        return
+    clauses = ' OR '.join(['name = ? OR name LIKE ?'] * len(names))
+    params = []
+    for name in names:
+        params.extend((name, f'{name}:%'))
+    try:
+        _connection().execute(f'UPDATE snapshots SET stale = 1, generation = generation + 1 WHERE {clauses}', params)
+    except Exception as e:
+        logger.warning(f"Marking stats snapshots stale failed: {e}")
+
+
+def mark_stale_on_commit(*names: str):
+    """
+    ``mark_stale`` once the current database transaction commits
+
+    Model receivers run inside the caller's transaction; marking there lets
+    another worker rebuild from the pre-commit rows and clear the flag.
+    Outside a transaction this marks right away.
+    """
+    transaction.on_commit(lambda: mark_stale(*names))
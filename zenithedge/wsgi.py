@@ -6,6 +6,10 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from zenithedge.write_behind import install_exit_flush
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenithedge.settings')
 
 application = get_wsgi_application()
+
+install_exit_flush()
@@ -2,18 +2,21 @@
 Adaptive Coach - ML-powered personalized training
 Uses scikit-learn for apprentice profiling and adaptive difficulty
 """
-import numpy as np
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, mean_squared_error
-import joblib
+from __future__ import annotations
+
 import os
 from decimal import Decimal
+from functools import cached_property
 from typing import Dict, List, Tuple, Optional
 from django.conf import settings
 from django.utils import timezone
 
+from zenithedge.lazy_imports import lazy_import
+
+# NumPy/joblib are imported on first use; scikit-learn inside the methods
+np = lazy_import('numpy')
+joblib = lazy_import('joblib')
+
 
 class ApprenticeProfiler:
     """Classifies apprentices into learner types using ML."""
@@ -29,6 +32,9 @@ class ApprenticeProfiler:
     LEARNER_TYPES = ['analytical', 'intuitive', 'aggressive', 'conservative']
     
     def __init__(self, model_path: Optional[str] = None):
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+
         self.scaler = StandardScaler()
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.model_path = model_path or os.path.join(settings.BASE_DIR, 'ml_models', 'apprentice_classifier.pkl')
@@ -81,6 +87,9 @@ class ApprenticeProfiler:
             X.append(features)
             y.append(data['learner_type'])
         
+        from sklearn.metrics import accuracy_score
+        from sklearn.model_selection import train_test_split
+
         X = np.array(X)
         y = np.array(y)
         
@@ -142,6 +151,9 @@ class PassPredictor:
     ]
     
     def __init__(self, model_path: Optional[str] = None):
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
+
         self.scaler = StandardScaler()
         self.model = RandomForestRegressor(n_estimators=100, random_state=42)
         self.model_path = model_path or os.path.join(settings.BASE_DIR, 'ml_models', 'pass_predictor.pkl')
@@ -193,6 +205,9 @@ class PassPredictor:
             X.append(features)
             y.append(data['passed'] * 100)  # Convert to percentage
         
+        from sklearn.metrics import mean_squared_error
+        from sklearn.model_selection import train_test_split
+
         X = np.array(X)
         y = np.array(y)
         
@@ -314,10 +329,18 @@ class AdaptiveCoach:
     """Main adaptive coaching system integrating all ML components."""
     
     def __init__(self):
-        self.profiler = ApprenticeProfiler()
-        self.pass_predictor = PassPredictor()
         self.difficulty_adapter = DifficultyAdapter()
     
+    # The ML components load scikit-learn and their saved models, so they
+    # are created on first use rather than with the module-level instance
+    @cached_property
+    def profiler(self) -> ApprenticeProfiler:
+        return ApprenticeProfiler()
+    
+    @cached_property
+    def pass_predictor(self) -> PassPredictor:
+        return PassPredictor()
+    
     def update_apprentice_profile(self, apprentice):
         """Update apprentice classification and predictions."""
         # Update learner type
@@ -82,12 +82,12 @@ class ScenarioAdmin(admin.ModelAdmin):
                     'usage_count', 'avg_pass_rate', 'is_active']
     list_filter = ['regime', 'difficulty', 'session', 'strategy_focus', 'is_active']
     search_fields = ['name', 'description', 'tags']
-    readonly_fields = ['id', 'usage_count', 'avg_pass_rate', 'created_at', 'updated_at']
+    readonly_fields = ['id', 'candle_count', 'usage_count', 'avg_pass_rate', 'created_at', 'updated_at']
     
     fieldsets = [
         ('Basic Info', {'fields': ['id', 'name', 'description']}),
         ('Classification', {'fields': ['regime', 'session', 'strategy_focus', 'difficulty', 'tags']}),
-        ('Market Data', {'fields': ['symbol', 'timeframe', 'start_date', 'end_date', 'candle_data']}),
+        ('Market Data', {'fields': ['symbol', 'timeframe', 'start_date', 'end_date', 'candle_count']}),
         ('Synthetic Modifications', {'fields': ['has_synthetic_news', 'synthetic_news_events', 'volatility_multiplier']}),
         ('Optimal Solution', {'fields': ['optimal_direction', 'optimal_entry_price', 
                                          'optimal_stop_loss', 'optimal_take_profit']}),
@@ -98,6 +98,10 @@ class ScenarioAdmin(admin.ModelAdmin):
     
     actions = ['update_pass_rates']
     
+    def get_queryset(self, request):
+        # Candles are not edited here; don't load the blob
+        return super().get_queryset(request).defer('candle_blob')
+    
     def update_pass_rates(self, request, queryset):
         for scenario in queryset:
             scenario.update_pass_rate()
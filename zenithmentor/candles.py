@@ -0,0 +1,116 @@
+"""
+Packed candle storage for scenarios
+
+A scenario's OHLCV series is stored as one little-endian float64 array of
+``CANDLE_FIELDS`` per candle (48 bytes, against ~150 bytes per candle as
+a JSON object) in ``Scenario.candle_blob``. Timestamps are epoch seconds
+(UTC). Fixed-size rows let the replay endpoint fetch any range of candles
+with a ``SUBSTR`` on the blob instead of loading the whole series.
+
+Only the standard library is used, so packing costs no NumPy import on the
+request path; ``candle_array`` gives a NumPy view for analysis code.
+"""
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from zenithedge.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+CANDLE_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+FIELD_COUNT = len(CANDLE_FIELDS)
+ITEM_SIZE = 8
+ROW_SIZE = FIELD_COUNT * ITEM_SIZE
+
+_SWAP = sys.byteorder != 'little'
+
+
+def _epoch(value: Any) -> float:
+    """Timestamp (datetime, ISO string or number) -> epoch seconds; NaN if unknown"""
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if hasattr(value, 'to_pydatetime'):  # pandas Timestamp
+        value = value.to_pydatetime()
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return math.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=dt_timezone.utc)
+        return value.timestamp()
+    return math.nan
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def pack_candles(candles: Iterable[Dict[str, Any]]) -> bytes:
+    """
+    Pack candle dicts (``timestamp``, ``open``, ... keys) into blob bytes
+
+    Missing or non-numeric values are stored as NaN and come back as None.
+    """
+    values = array('d')
+    for candle in candles:
+        values.append(_epoch(candle.get('timestamp')))
+        for field in CANDLE_FIELDS[1:]:
+            values.append(_number(candle.get(field)))
+    if _SWAP:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _values(blob: Optional[bytes]) -> array:
+    values = array('d')
+    if blob:
+        values.frombytes(bytes(blob))
+        if _SWAP:
+            values.byteswap()
+    return values
+
+
+def candle_count(blob: Optional[bytes]) -> int:
+    """Number of candles in a blob"""
+    return len(blob) // ROW_SIZE if blob else 0
+
+
+def unpack_rows(blob: Optional[bytes]) -> List[List[Optional[float]]]:
+    """
+    Blob -> ``[[timestamp, open, high, low, close, volume], ...]``
+
+    The compact form sent to the replay UI (NaN becomes None/null).
+    """
+    values = [None if math.isnan(v) else v for v in _values(blob)]
+    return [values[i:i + FIELD_COUNT] for i in range(0, len(values), FIELD_COUNT)]
+
+
+def unpack_candles(blob: Optional[bytes]) -> List[Dict[str, Any]]:
+    """Blob -> candle dicts, timestamps as ISO 8601 strings (UTC)"""
+    candles = []
+    for row in unpack_rows(blob):
+        timestamp = row[0]
+        candle = dict(zip(CANDLE_FIELDS, row))
+        candle['timestamp'] = (
+            datetime.fromtimestamp(timestamp, tz=dt_timezone.utc).isoformat()
+            if timestamp is not None else None
+        )
+        candles.append(candle)
+    return candles
+
+
+def candle_array(blob: Optional[bytes]):
+    """Blob -> read-only NumPy array of shape (n, 6), columns as CANDLE_FIELDS"""
+    return np.frombuffer(bytes(blob or b''), dtype='<f8').reshape(-1, FIELD_COUNT)
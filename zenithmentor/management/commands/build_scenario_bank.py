@@ -9,6 +9,7 @@ import random
 
 from zenithmentor.models import Scenario
 from zenithmentor.scenario_engine import scenario_generator
+from zenithmentor.window_index import VOLATILITY_REGIMES
 
 User = get_user_model()
 
@@ -33,6 +34,28 @@ class Command(BaseCommand):
             action='store_true',
             help='Generate synthetic scenarios instead of using CSV',
         )
+        parser.add_argument(
+            '--symbol',
+            type=str,
+            help='Sample windows from the OHLCV store for this symbol',
+        )
+        parser.add_argument(
+            '--timeframe',
+            type=str,
+            default='15m',
+            help='OHLCV store timeframe (with --symbol)',
+        )
+        parser.add_argument(
+            '--regime',
+            type=str,
+            help='Only sample windows of this regime (e.g. trending_bull, high_volatility)',
+        )
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=100,
+            help='Candles per scenario',
+        )
     
     def handle(self, *args, **options):
         self.stdout.write("Building scenario bank...")
@@ -40,9 +63,12 @@ class Command(BaseCommand):
         if options['synthetic']:
             self._generate_synthetic_scenarios(options['count'])
         elif options['csv']:
-            self._build_from_csv(options['csv'], options['count'])
+            self._build_from_csv(options['csv'], options['count'], options['regime'], options['window'])
+        elif options['symbol']:
+            self._build_from_store(options['symbol'], options['timeframe'], options['count'],
+                                   options['regime'], options['window'])
         else:
-            self.stdout.write(self.style.ERROR("Provide --csv or --synthetic"))
+            self.stdout.write(self.style.ERROR("Provide --csv, --symbol or --synthetic"))
             return
         
         self.stdout.write(self.style.SUCCESS(f"Scenario bank built successfully!"))
@@ -110,7 +136,52 @@ class Command(BaseCommand):
         
         return candles
     
-    def _build_from_csv(self, csv_path, count):
+    def _build_from_index(self, index, count, regime_filter, symbol=None, timeframe=None, name_prefix="Historical"):
+        """Create scenarios from windows drawn from a WindowIndex."""
+        starts = index.candidates(regime_filter)
+        self.stdout.write(
+            f"Indexed {len(index)} contiguous {index.window_size}-candle windows "
+            f"({len(starts)} matching {regime_filter or 'any regime'})"
+        )
+        if not len(starts):
+            self.stdout.write(self.style.ERROR("No matching windows"))
+            return
+        
+        admin_user = User.objects.filter(is_staff=True).first()
+        strategies = ['trend', 'breakout', 'mean_reversion', 'smc', 'scalping']
+        
+        for i in range(count):
+            start = index.sample_start(regime_filter)
+            labels = index.labels(start)
+            
+            scenario_dict = scenario_generator.create_scenario_from_historical(
+                df=index.window(start),
+                name=f"{name_prefix} Scenario #{i+1}",
+                strategy_focus=random.choice(strategies),
+                # Volatility filters keep their name; otherwise use the window's label
+                regime=regime_filter if regime_filter in VOLATILITY_REGIMES else labels['regime'],
+                difficulty=random.randint(1, 10),
+            )
+            if symbol:
+                scenario_dict['symbol'] = symbol
+                scenario_dict['timeframe'] = timeframe
+            
+            scenario_dict['created_by'] = admin_user
+            
+            Scenario.objects.create(**scenario_dict)
+            
+            if (i + 1) % 10 == 0:
+                self.stdout.write(f"  Created {i+1}/{count} scenarios")
+    
+    def _build_from_store(self, symbol, timeframe, count, regime_filter, window):
+        """Build scenarios from marketdata.OHLCVCandle."""
+        self.stdout.write(f"Indexing {symbol} {timeframe} from the OHLCV store...")
+        index = scenario_generator.window_index(
+            window_size_candles=window, symbol=symbol, timeframe=timeframe
+        )
+        self._build_from_index(index, count, regime_filter, symbol, timeframe, name_prefix=symbol)
+    
+    def _build_from_csv(self, csv_path, count, regime_filter=None, window=100):
         """Build scenarios from CSV file."""
         self.stdout.write(f"Loading data from {csv_path}...")
         
@@ -127,33 +198,9 @@ class Command(BaseCommand):
             
             self.stdout.write(f"Loaded {len(df)} candles")
             
-            # Sample windows
-            admin_user = User.objects.filter(is_staff=True).first()
-            
-            strategies = ['trend', 'breakout', 'mean_reversion', 'smc', 'scalping']
-            
-            for i in range(count):
-                # Sample random window
-                window_df = scenario_generator.sample_historical_window(
-                    df, window_size_candles=100
-                )
-                
-                strategy = random.choice(strategies)
-                difficulty = random.randint(1, 10)
-                
-                scenario_dict = scenario_generator.create_scenario_from_historical(
-                    df=window_df,
-                    name=f"Historical Scenario #{i+1}",
-                    strategy_focus=strategy,
-                    difficulty=difficulty,
-                )
-                
-                scenario_dict['created_by'] = admin_user
-                
-                Scenario.objects.create(**scenario_dict)
-                
-                if (i + 1) % 10 == 0:
-                    self.stdout.write(f"  Created {i+1}/{count} scenarios")
+            # Label every candidate window once, then draw from the index
+            index = scenario_generator.window_index(df, window_size_candles=window)
+            self._build_from_index(index, count, regime_filter)
         
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Error: {e}"))
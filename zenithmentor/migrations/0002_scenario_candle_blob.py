@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:15
+
+from django.db import migrations, models
+
+
+def pack_candle_data(apps, schema_editor):
+    """Move JSON candle lists into the packed blob"""
+    from zenithmentor.candles import candle_count, pack_candles
+
+    Scenario = apps.get_model('zenithmentor', 'Scenario')
+    for scenario in Scenario.objects.only('pk', 'candle_data').iterator(chunk_size=100):
+        blob = pack_candles(scenario.candle_data or [])
+        Scenario.objects.filter(pk=scenario.pk).update(candle_blob=blob, candle_count=candle_count(blob))
+
+
+def unpack_candle_data(apps, schema_editor):
+    from zenithmentor.candles import unpack_candles
+
+    Scenario = apps.get_model('zenithmentor', 'Scenario')
+    for scenario in Scenario.objects.only('pk', 'candle_blob').iterator(chunk_size=100):
+        Scenario.objects.filter(pk=scenario.pk).update(candle_data=unpack_candles(scenario.candle_blob))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zenithmentor', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scenario',
+            name='candle_blob',
+            field=models.BinaryField(default=bytes, help_text='Packed OHLCV candles'),
+        ),
+        migrations.AddField(
+            model_name='scenario',
+            name='candle_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='scenario',
+            name='candle_data',
+            field=models.JSONField(default=list, help_text='Array of OHLCV candles'),
+        ),
+        migrations.RunPython(pack_candle_data, unpack_candle_data),
+        migrations.RemoveField(
+            model_name='scenario',
+            name='candle_data',
+        ),
+    ]
@@ -258,7 +258,11 @@ class Scenario(models.Model):
     timeframe = models.CharField(max_length=10, default='15m')
     start_date = models.DateTimeField(help_text="Historical window start")
     end_date = models.DateTimeField(help_text="Historical window end")
-    candle_data = models.JSONField(help_text="Array of OHLCV candles")
+    # OHLCV series packed as float64 rows (see zenithmentor.candles); read
+    # through ``candle_data`` or the replay candles endpoint. List views
+    # should ``defer('candle_blob')``.
+    candle_blob = models.BinaryField(default=bytes, editable=False, help_text="Packed OHLCV candles")
+    candle_count = models.IntegerField(default=0, editable=False)
     
     # Synthetic modifications
     has_synthetic_news = models.BooleanField(default=False)
@@ -297,6 +301,18 @@ class Scenario(models.Model):
     def __str__(self):
         return f"{self.name} ({self.regime}, Lvl {self.difficulty})"
     
+    @property
+    def candle_data(self):
+        """Array of OHLCV candle dicts (decoded from ``candle_blob``)."""
+        from .candles import unpack_candles
+        return unpack_candles(self.candle_blob)
+    
+    @candle_data.setter
+    def candle_data(self, candles):
+        from .candles import candle_count, pack_candles
+        self.candle_blob = pack_candles(candles or [])
+        self.candle_count = candle_count(self.candle_blob)
+    
     def increment_usage(self):
         """Track scenario usage."""
         self.usage_count += 1
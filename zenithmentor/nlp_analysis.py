@@ -3,30 +3,35 @@ NLP Analysis - Journal sentiment and bias detection
 Uses spaCy, TextBlob, and NLTK for psychological analysis
 """
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple
-from textblob import TextBlob
-import nltk
 from collections import Counter
 
-# Download required NLTK data (run once)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+from zenithedge.lazy_imports import lazy_import
 
-try:
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('vader_lexicon', quiet=True)
+# NLTK/TextBlob are imported on first analysis, not at startup
+nltk = lazy_import('nltk')
 
-from nltk.sentiment import SentimentIntensityAnalyzer
+
+@lru_cache(maxsize=None)
+def _ensure_nltk_data():
+    """Download required NLTK data (once per process, on first use)"""
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt', quiet=True)
+
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon', quiet=True)
 
 
 class JournalAnalyzer:
     """Analyzes trader journal entries for psychological patterns."""
     
     def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+        self._sia = None
         
         # Trading-specific bias indicators
         self.overconfidence_keywords = [
@@ -59,6 +64,15 @@ class JournalAnalyzer:
             'didn\'t follow', 'emotional', 'tilted', 'frustrated'
         ]
     
+    @property
+    def sia(self):
+        """NLTK VADER analyzer, created on first use"""
+        if self._sia is None:
+            _ensure_nltk_data()
+            from nltk.sentiment import SentimentIntensityAnalyzer
+            self._sia = SentimentIntensityAnalyzer()
+        return self._sia
+    
     def analyze_journal_entry(self, text: str) -> Dict:
         """
         Comprehensive analysis of a journal entry.
@@ -96,6 +110,7 @@ class JournalAnalyzer:
         
         # Quality metrics
         word_count = len(text.split())
+        _ensure_nltk_data()
         sentence_count = len(nltk.sent_tokenize(text))
         
         quality_score = self._calculate_quality_score(
@@ -136,6 +151,7 @@ class JournalAnalyzer:
         compound = vader_scores['compound']
         
         # TextBlob sentiment
+        from textblob import TextBlob
         blob = TextBlob(text)
         polarity = blob.sentiment.polarity
         
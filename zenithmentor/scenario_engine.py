@@ -7,9 +7,12 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 import random
 import json
+import logging
 from typing import Dict, List, Optional, Tuple
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 
 class ScenarioGenerator:
     """Builds training scenarios from historical data with optional synthetic modifications."""
@@ -25,6 +28,8 @@ class ScenarioGenerator:
             'reversal': {'atr_multiplier': (1.2, 2.0), 'win_rate_threshold': 0.5},
             'news_driven': {'atr_multiplier': (2.5, 4.0), 'win_rate_threshold': 0.5},
         }
+        # (key, WindowIndex); see window_index()
+        self._window_indexes = {}
     
     def create_scenario_from_historical(self, 
                                        df: pd.DataFrame,
@@ -250,47 +255,81 @@ class ScenarioGenerator:
         
         return base_criteria
     
+    def window_index(self,
+                     full_df: Optional[pd.DataFrame] = None,
+                     window_size_candles: int = 100,
+                     symbol: Optional[str] = None,
+                     timeframe: Optional[str] = None,
+                     **index_options):
+        """
+        Regime-labeled window index for a DataFrame or an OHLCV store series.
+        
+        Built once and reused while the same DataFrame (or symbol/timeframe)
+        and window size are requested.
+        
+        Args:
+            full_df: Full historical DataFrame (or None to use the store)
+            window_size_candles: Number of candles in scenario
+            symbol: Symbol in marketdata.OHLCVCandle (when no DataFrame)
+            timeframe: Timeframe in marketdata.OHLCVCandle (when no DataFrame)
+            **index_options: WindowIndex options (gap_tolerance, skip_weekends)
+        
+        Returns:
+            zenithmentor.window_index.WindowIndex
+        """
+        from .window_index import WindowIndex
+        
+        options = tuple(sorted(index_options.items()))
+        if full_df is not None:
+            key = ('frame', id(full_df), len(full_df), window_size_candles, options)
+        else:
+            key = ('store', symbol, timeframe, window_size_candles, options)
+        
+        cached = self._window_indexes.get(key)
+        if cached is not None and (full_df is None or cached[0] is full_df):
+            return cached[1]
+        
+        if full_df is not None:
+            index = WindowIndex(full_df, window_size_candles, **index_options)
+        else:
+            index = WindowIndex.from_store(symbol, timeframe, window_size_candles, **index_options)
+        if len(self._window_indexes) >= 8:
+            self._window_indexes.clear()
+        # Keep the frame referenced so its id() cannot be reused
+        self._window_indexes[key] = (full_df, index)
+        return index
+    
     def sample_historical_window(self, 
                                  full_df: pd.DataFrame, 
                                  window_size_candles: int = 100,
-                                 regime_filter: Optional[str] = None) -> pd.DataFrame:
+                                 regime_filter: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Sample a random window from historical data, optionally filtered by regime.
         
+        Windows come from the precomputed window_index(), so repeated calls
+        only pick a random start, and a window never spans a gap in the data.
+        
         Args:
             full_df: Full historical DataFrame
             window_size_candles: Number of candles in scenario
             regime_filter: Optional regime to filter for
         
         Returns:
-            Sampled DataFrame window
+            Sampled DataFrame window, or None if the data holds no
+            contiguous window of that size
         """
-        if regime_filter:
-            # Simple regime detection - would be more sophisticated in production
-            full_df = full_df.copy()
-            full_df['returns'] = full_df['close'].pct_change()
-            full_df['volatility'] = full_df['returns'].rolling(20).std()
-            
-            if regime_filter == 'trending_bull':
-                full_df = full_df[full_df['returns'].rolling(20).mean() > 0]
-            elif regime_filter == 'trending_bear':
-                full_df = full_df[full_df['returns'].rolling(20).mean() < 0]
-            elif regime_filter == 'high_volatility':
-                vol_threshold = full_df['volatility'].quantile(0.75)
-                full_df = full_df[full_df['volatility'] > vol_threshold]
-            elif regime_filter == 'low_volatility':
-                vol_threshold = full_df['volatility'].quantile(0.25)
-                full_df = full_df[full_df['volatility'] < vol_threshold]
-        
         # Ensure we have enough data
         if len(full_df) < window_size_candles:
-            return full_df
-        
-        # Random start index
-        max_start = len(full_df) - window_size_candles
-        start_idx = random.randint(0, max_start)
-        
-        return full_df.iloc[start_idx:start_idx + window_size_candles].reset_index(drop=True)
+            return None
+        
+        index = self.window_index(full_df, window_size_candles)
+        window = index.sample(regime=regime_filter)
+        if window is None and regime_filter:
+            logger.warning(f"No {regime_filter} windows of {window_size_candles} candles; sampling any regime")
+            window = index.sample()
+        if window is None:
+            logger.warning(f"No gap-free window of {window_size_candles} candles in {len(full_df)} rows")
+        return window
 
 
 class ScenarioBank:
@@ -339,9 +378,9 @@ class ScenarioBank:
             difficulty__gte=pack_info['difficulty_range'][0],
             difficulty__lte=pack_info['difficulty_range'][1],
             is_active=True
-        ).order_by('?')[:count]
+        ).order_by('?').values_list('id', flat=True)[:count]
         
-        return [str(s.id) for s in scenarios]
+        return [str(scenario_id) for scenario_id in scenarios]
 
 
 # Singleton instances
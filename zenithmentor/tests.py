@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from .candles import ROW_SIZE, pack_candles
+from .models import ApprenticeProfile, Scenario, SimulationRun
+
+
+class SimulationCandlesViewTestCase(TestCase):
+    """Test cases for the chunked replay candles endpoint"""
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email='apprentice@example.com', password='x')
+        self.other = User.objects.create_user(email='other@example.com', password='x')
+
+        start = datetime(2025, 1, 6, tzinfo=dt_timezone.utc)
+        self.candles = [
+            {
+                'timestamp': (start + timedelta(minutes=15 * i)).isoformat(),
+                'open': 1.1 + i / 1e4, 'high': 1.2 + i / 1e4, 'low': 1.0 + i / 1e4,
+                'close': 1.15 + i / 1e4, 'volume': float(i),
+            }
+            for i in range(1200)
+        ]
+        scenario = Scenario(
+            name='Trend', description='Trend day', regime='trending', strategy_focus='smc',
+            start_date=start, end_date=start + timedelta(minutes=15 * 1200),
+        )
+        scenario.candle_data = self.candles
+        scenario.save()
+        self.simulation = SimulationRun.objects.create(
+            apprentice=ApprenticeProfile.objects.create(user=self.user), scenario=scenario
+        )
+        self.url = reverse('zenithmentor:simulation_candles', args=[self.simulation.id])
+        self.client.force_login(self.user)
+
+    def test_chunks_cover_the_series_once(self):
+        """Following next_offset returns every candle exactly once"""
+        rows, offsets, offset = [], [], 0
+        while offset is not None:
+            data = self.client.get(self.url, {'offset': offset, 'limit': 500}).json()
+            self.assertEqual(data['total'], 1200)
+            offsets.append(offset)
+            rows.extend(data['candles'])
+            offset = data['next_offset']
+
+        self.assertEqual(offsets, [0, 500, 1000])
+        self.assertEqual(len(rows), 1200)
+        self.assertEqual(rows[500][1], self.candles[500]['open'])
+        self.assertEqual(rows[-1][5], self.candles[-1]['volume'])
+
+    def test_chunk_edges(self):
+        """Exact ends, ranges past the end and binary rows across a boundary"""
+        data = self.client.get(self.url, {'offset': 700, 'limit': 500}).json()
+        self.assertEqual((len(data['candles']), data['next_offset']), (500, None))
+
+        data = self.client.get(self.url, {'offset': 5000}).json()
+        self.assertEqual((data['candles'], data['next_offset']), ([], None))
+
+        response = self.client.get(self.url, {'offset': 499, 'limit': 2, 'format': 'binary'})
+        self.assertEqual(response.content, pack_candles(self.candles)[499 * ROW_SIZE:501 * ROW_SIZE])
+        self.assertEqual(response['X-Candle-Count'], '1200')
+        self.assertEqual(response['X-Next-Offset'], '501')
+
+        self.assertEqual(self.client.get(self.url, {'offset': 'x'}).status_code, 400)
+
+    def test_other_users_simulation_is_forbidden(self):
+        """Only the apprentice who owns the run can read its candles"""
+        self.client.force_login(self.other)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('candles', response.json())
@@ -21,6 +21,7 @@ urlpatterns = [
     path('simulation/launch/', views.launch_simulation, name='launch_simulation'),
     path('simulation/<uuid:simulation_id>/', views.simulation_replay, name='simulation_replay'),
     path('simulation/<uuid:simulation_id>/results/', views.simulation_results, name='simulation_results'),
+    path('simulation/<uuid:simulation_id>/candles/', views.simulation_candles, name='simulation_candles'),
     
     # Trading actions (API endpoints)
     path('api/trade/submit/', views.submit_trade, name='submit_trade'),
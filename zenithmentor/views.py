@@ -3,10 +3,12 @@ ZenithMentor Views
 """
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
-from django.db.models import Avg, Count, Q, Sum
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import Substr
 from decimal import Decimal
 import json
 
@@ -179,7 +181,8 @@ def scenario_list(request):
     regime_filter = request.GET.get('regime', '')
     strategy_filter = request.GET.get('strategy', '')
     
-    scenarios = Scenario.objects.filter(is_active=True)
+    # The candle blob is only needed by the replay
+    scenarios = Scenario.objects.filter(is_active=True).defer('candle_blob')
     
     if difficulty_filter:
         scenarios = scenarios.filter(difficulty=difficulty_filter)
@@ -214,7 +217,7 @@ def launch_simulation(request):
     else:
         scenario_id = request.POST.get('scenario_id')
     
-    scenario = get_object_or_404(Scenario, id=scenario_id, is_active=True)
+    scenario = get_object_or_404(Scenario.objects.defer('candle_blob'), id=scenario_id, is_active=True)
     
     # Create simulation run
     sim_run = SimulationRun.objects.create(
@@ -239,7 +242,9 @@ def launch_simulation(request):
             'simulation_id': str(sim_run.id),
             'scenario': {
                 'name': scenario.name,
-                'candle_data': scenario.candle_data,
+                # Candles are loaded in chunks from the candles endpoint
+                'candle_count': scenario.candle_count,
+                'candles_url': reverse('zenithmentor:simulation_candles', args=[sim_run.id]),
                 'has_news': scenario.has_synthetic_news,
                 'news_events': scenario.synthetic_news_events,
             }
@@ -252,13 +257,16 @@ def launch_simulation(request):
 @login_required
 def simulation_replay(request, simulation_id):
     """Replay/resume a simulation."""
-    sim_run = get_object_or_404(SimulationRun, id=simulation_id)
+    sim_run = get_object_or_404(
+        SimulationRun.objects.select_related('scenario').defer('scenario__candle_blob'),
+        id=simulation_id
+    )
     profile = ApprenticeProfile.objects.get(user=request.user)
     
     if sim_run.apprentice != profile:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    # Get scenario data
+    # Get scenario data (candles are streamed by simulation_candles)
     scenario = sim_run.scenario
     
     # Get existing trades
@@ -268,7 +276,8 @@ def simulation_replay(request, simulation_id):
         'simulation': sim_run,  # Use 'simulation' to match template
         'sim_run': sim_run,  # Keep for backward compatibility
         'scenario': scenario,
-        'candle_data': json.dumps(scenario.candle_data),
+        'candles_url': reverse('zenithmentor:simulation_candles', args=[sim_run.id]),
+        'candle_chunk_size': CANDLE_CHUNK_SIZE,
         'trades': trades,
         'current_balance': float(sim_run.final_balance),
         'profile': profile,
@@ -277,6 +286,67 @@ def simulation_replay(request, simulation_id):
     return render(request, 'zenithmentor/simulation_replay.html', context)
 
 
+CANDLE_CHUNK_SIZE = 500
+MAX_CANDLE_CHUNK_SIZE = 5000
+
+
+@login_required
+def simulation_candles(request, simulation_id):
+    """
+    A range of the scenario's candles, so the replay loads incrementally.
+    
+    Query params:
+        offset: First candle index (default 0)
+        limit: Number of candles (default 500, max 5000)
+        format: 'json' (default) or 'binary'
+    
+    JSON returns rows of [timestamp, open, high, low, close, volume] plus
+    ``next_offset`` (null on the last chunk). Binary returns the packed
+    little-endian float64 rows (see zenithmentor.candles) with the total in
+    the X-Candle-Count header.
+    """
+    from .candles import CANDLE_FIELDS, ROW_SIZE, unpack_rows
+    
+    sim_run = get_object_or_404(
+        SimulationRun.objects.select_related('apprentice'), id=simulation_id
+    )
+    if sim_run.apprentice.user_id != request.user.id:
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    
+    try:
+        offset = max(0, int(request.GET.get('offset', 0)))
+        limit = min(MAX_CANDLE_CHUNK_SIZE, max(1, int(request.GET.get('limit', CANDLE_CHUNK_SIZE))))
+    except ValueError:
+        return JsonResponse({'error': 'offset and limit must be integers'}, status=400)
+    
+    # Only the requested rows leave the database
+    scenario = Scenario.objects.filter(id=sim_run.scenario_id).annotate(
+        chunk=Substr(F('candle_blob'), offset * ROW_SIZE + 1, limit * ROW_SIZE)
+    ).values('candle_count', 'chunk').first()
+    if scenario is None:
+        return JsonResponse({'error': 'Scenario not found'}, status=404)
+    
+    total = scenario['candle_count']
+    chunk = bytes(scenario['chunk'] or b'')
+    end = offset + len(chunk) // ROW_SIZE
+    next_offset = end if end < total else None
+    
+    if request.GET.get('format') == 'binary':
+        response = HttpResponse(chunk, content_type='application/octet-stream')
+        response['X-Candle-Count'] = str(total)
+        response['X-Candle-Fields'] = ','.join(CANDLE_FIELDS)
+        response['X-Next-Offset'] = '' if next_offset is None else str(next_offset)
+        return response
+    
+    return JsonResponse({
+        'fields': CANDLE_FIELDS,
+        'offset': offset,
+        'total': total,
+        'next_offset': next_offset,
+        'candles': unpack_rows(chunk),
+    })
+
+
 @login_required
 @require_http_methods(["POST"])
 def submit_trade(request):
@@ -0,0 +1,236 @@
+"""
+Regime-labeled window index for scenario sampling
+
+Building a scenario bank samples many fixed-size windows from one long
+OHLCV series. Instead of re-deriving returns and volatility for every
+sample, ``WindowIndex`` labels every candidate window start once:
+
+- regime: ``trending_bull`` / ``trending_bear`` when the window's net move
+  is at least ``TREND_EFFICIENCY`` of its total movement, else ``ranging``
+- volatility quartile (0-3) of the window's return std across all windows
+- session of the window's first candle
+
+Windows that contain a gap in the timestamps (missing data, holidays) are
+never candidates, so sampled windows are always contiguous. The weekend
+close of FX and metals markets (Friday to Sunday/Monday) is not a gap:
+otherwise no window longer than a trading week of bars would exist.
+Filtered start arrays are computed on first use and cached, so drawing a
+window is a random pick from an array.
+"""
+from __future__ import annotations
+
+import random
+from typing import Dict, Optional, Tuple
+
+from zenithedge.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# |net log return| / sum |log returns| above which a window is trending
+TREND_EFFICIENCY = 0.3
+
+# A step longer than this multiple of the typical bar spacing is a gap
+GAP_TOLERANCE = 1.5
+
+# Longest Friday -> Sunday/Monday step that is a weekend close, not a gap
+WEEKEND_CLOSURE = 3 * 24 * 3600 * 10 ** 9  # nanoseconds
+
+REGIMES = ('trending_bull', 'trending_bear', 'ranging')
+SESSIONS = ('asian', 'london', 'newyork')
+
+# Scenario regimes that filter on the volatility quartile instead
+VOLATILITY_REGIMES = {'high_volatility': 3, 'low_volatility': 0}
+
+
+def session_for_hour(hour: int) -> str:
+    """Trading session of a UTC hour (same split as ScenarioGenerator._detect_session)"""
+    if 8 <= hour < 13:
+        return 'london'
+    if 13 <= hour < 20:
+        return 'newyork'
+    return 'asian'
+
+
+def _rolling_sum(values, width: int):
+    """Sums of ``values[i:i + width]`` for every i"""
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    return cumulative[width:] - cumulative[:-width]
+
+
+class WindowIndex:
+    """
+    Candidate windows of one OHLCV series, labeled once
+
+    Args:
+        frame: DataFrame with ``timestamp`` and ``close`` columns (and the
+            other OHLCV columns returned in windows), ordered by time
+        window_size: Candles per window
+        gap_tolerance: Steps longer than this multiple of the typical bar
+            spacing break a window
+        skip_weekends: Treat the weekend market close as contiguous
+            (disable for markets that trade through weekends, where a
+            weekend hole is missing data)
+    """
+
+    def __init__(self, frame, window_size: int = 100, gap_tolerance: float = GAP_TOLERANCE,
+                 skip_weekends: bool = True):
+        self.frame = frame.reset_index(drop=True)
+        self.window_size = window_size
+        self.gap_tolerance = gap_tolerance
+        self.skip_weekends = skip_weekends
+        self._candidates: Dict[Tuple, object] = {}
+        self._label()
+
+    @classmethod
+    def from_store(cls, symbol: str, timeframe: str, window_size: int = 100,
+                   start=None, end=None, **options) -> 'WindowIndex':
+        """Build the index from marketdata.OHLCVCandle (one query); ``options`` go to __init__"""
+        from marketdata.models import OHLCVCandle
+
+        rows = OHLCVCandle.objects.filter(symbol=symbol, timeframe=timeframe)
+        if start:
+            rows = rows.filter(timestamp__gte=start)
+        if end:
+            rows = rows.filter(timestamp__lte=end)
+        rows = rows.order_by('timestamp').values_list(
+            'timestamp', 'open_price', 'high', 'low', 'close', 'volume'
+        )
+        frame = pd.DataFrame.from_records(
+            list(rows), columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        )
+        for column in ('open', 'high', 'low', 'close', 'volume'):
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype(float)
+        frame['volume'] = frame['volume'].fillna(0.0)
+        return cls(frame, window_size, **options)
+
+    def _label(self):
+        n, width = len(self.frame), self.window_size
+        count = n - width + 1 if width > 1 else n
+        if count <= 0:
+            self.starts = np.empty(0, dtype=np.int64)
+            self.regime = np.empty(0, dtype=np.int8)
+            self.vol_quartile = np.empty(0, dtype=np.int8)
+            self.session = np.empty(0, dtype=np.int8)
+            return
+
+        timestamps = pd.to_datetime(self.frame['timestamp'], utc=True)
+        close = self.frame['close'].to_numpy(dtype=float)
+
+        # step[j] describes the move from candle j to j + 1; a window starting
+        # at i covers steps i .. i + width - 2
+        nanoseconds = timestamps.dt.tz_localize(None).to_numpy().astype('datetime64[ns]').astype(np.int64)
+        steps = np.diff(nanoseconds)
+        spacing = np.median(steps) if len(steps) else 0
+        gaps = (steps > spacing * self.gap_tolerance) | (steps <= 0)
+        if self.skip_weekends and len(steps):
+            weekdays = timestamps.dt.weekday.to_numpy()
+            weekend = (
+                (weekdays[:-1] == 4)
+                & np.isin(weekdays[1:], (5, 6, 0))
+                & (steps <= WEEKEND_CLOSURE + spacing * self.gap_tolerance)
+            )
+            gaps &= ~weekend
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_returns = np.diff(np.log(close))
+        invalid = ~np.isfinite(log_returns)
+        broken = gaps | invalid
+        log_returns = np.where(invalid, 0.0, log_returns)
+
+        if width > 1:
+            steps_in_window = width - 1
+            contiguous = _rolling_sum(broken, steps_in_window) == 0
+            net = _rolling_sum(log_returns, steps_in_window)
+            travel = _rolling_sum(np.abs(log_returns), steps_in_window)
+            mean = net / steps_in_window
+            variance = _rolling_sum(log_returns ** 2, steps_in_window) / steps_in_window - mean ** 2
+            volatility = np.sqrt(np.clip(variance, 0.0, None))
+        else:
+            contiguous = np.ones(count, dtype=bool)
+            net = travel = volatility = np.zeros(count)
+
+        starts = np.flatnonzero(contiguous)
+        net, travel, volatility = net[starts], travel[starts], volatility[starts]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            efficiency = np.where(travel > 0, np.abs(net) / travel, 0.0)
+        trending = efficiency >= TREND_EFFICIENCY
+        regime = np.full(len(starts), REGIMES.index('ranging'), dtype=np.int8)
+        regime[trending & (net > 0)] = REGIMES.index('trending_bull')
+        regime[trending & (net < 0)] = REGIMES.index('trending_bear')
+
+        if len(starts):
+            edges = np.quantile(volatility, [0.25, 0.5, 0.75])
+            vol_quartile = np.searchsorted(edges, volatility, side='right').astype(np.int8)
+        else:
+            vol_quartile = np.empty(0, dtype=np.int8)
+
+        hours = timestamps.dt.hour.to_numpy()[starts]
+        session = np.array([SESSIONS.index(session_for_hour(h)) for h in range(24)], dtype=np.int8)[hours]
+
+        self.starts = starts.astype(np.int64)
+        self.regime = regime
+        self.vol_quartile = vol_quartile
+        self.session = session
+
+    def __len__(self):
+        return len(self.starts)
+
+    def candidates(self, regime: Optional[str] = None, session: Optional[str] = None,
+                   vol_quartile: Optional[int] = None):
+        """
+        Start positions of contiguous windows matching the filters (cached)
+
+        Args:
+            regime: Scenario regime; ``high_volatility``/``low_volatility``
+                select the top/bottom volatility quartile, regimes the index
+                does not label (breakout, news_driven, ...) do not filter
+            session: 'asian', 'london' or 'newyork'
+            vol_quartile: 0 (calmest) to 3 (most volatile)
+        """
+        key = (regime, session, vol_quartile)
+        cached = self._candidates.get(key)
+        if cached is not None:
+            return cached
+
+        mask = np.ones(len(self.starts), dtype=bool)
+        if regime in REGIMES:
+            mask &= self.regime == REGIMES.index(regime)
+        elif regime in VOLATILITY_REGIMES:
+            mask &= self.vol_quartile == VOLATILITY_REGIMES[regime]
+        if session is not None:
+            mask &= self.session == SESSIONS.index(session)
+        if vol_quartile is not None:
+            mask &= self.vol_quartile == vol_quartile
+
+        cached = self._candidates[key] = self.starts[mask]
+        return cached
+
+    def sample_start(self, regime: Optional[str] = None, session: Optional[str] = None,
+                     vol_quartile: Optional[int] = None, rng=random) -> Optional[int]:
+        """Random start of a matching window, or None if there is none"""
+        starts = self.candidates(regime, session, vol_quartile)
+        if not len(starts):
+            return None
+        return int(starts[rng.randrange(len(starts))])
+
+    def labels(self, start: int) -> Dict:
+        """Regime, volatility quartile and session of the window at ``start``"""
+        position = int(np.searchsorted(self.starts, start))
+        if position >= len(self.starts) or self.starts[position] != start:
+            raise KeyError(start)
+        return {
+            'regime': REGIMES[self.regime[position]],
+            'vol_quartile': int(self.vol_quartile[position]),
+            'session': SESSIONS[self.session[position]],
+        }
+
+    def window(self, start: int):
+        """The candles of the window at ``start`` (a fresh, 0-indexed frame)"""
+        return self.frame.iloc[start:start + self.window_size].reset_index(drop=True)
+
+    def sample(self, regime: Optional[str] = None, session: Optional[str] = None,
+               vol_quartile: Optional[int] = None, rng=random):
+        """Random matching window as a DataFrame, or None if there is none"""
+        start = self.sample_start(regime, session, vol_quartile, rng)
+        return None if start is None else self.window(start)
@@ -3,7 +3,7 @@ ZenNews Admin Configuration
 """
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import NewsEvent, NewsTopic, NewsAlert
+from .models import NewsEvent, NewsTopic, NewsAlert, FeedState
 
 
 @admin.register(NewsEvent)
@@ -77,3 +77,13 @@ class NewsAlertAdmin(admin.ModelAdmin):
     def message_short(self, obj):
         return obj.message[:100] + '...' if len(obj.message) > 100 else obj.message
     message_short.short_description = 'Message'
+
+
+@admin.register(FeedState)
+class FeedStateAdmin(admin.ModelAdmin):
+    list_display = ['source', 'last_status', 'last_entry_count', 'last_bytes', 'last_duration_ms',
+                    'not_modified_count', 'fetch_count', 'last_fetched_at']
+    search_fields = ['source', 'url']
+    readonly_fields = ['last_status', 'last_fetched_at', 'last_duration_ms', 'last_bytes',
+                       'last_entry_count', 'last_error', 'fetch_count', 'not_modified_count', 'total_bytes']
+    ordering = ['source']
@@ -5,3 +5,7 @@ class ZennewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'zennews'
     verbose_name = 'ZenNews - Financial News'
+    
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import zennews.signals  # noqa
@@ -3,10 +3,7 @@ Management command to fetch and analyze financial news
 Usage: python manage.py fetch_news
 """
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from django.db import models
-from zennews.models import NewsEvent, NewsAlert
-from zennews.utils import fetch_latest_news, NewsAnalyzer
+from zennews.utils import fetch_latest_news, filter_new_items, store_news_items, sentiment_window, NewsAnalyzer, RSSFeedFetcher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,7 +22,13 @@ class Command(BaseCommand):
         parser.add_argument(
             '--force',
             action='store_true',
-            help='Force fetch even if duplicates exist'
+            help='Re-analyze items even if already stored (existing rows are still never duplicated)'
+        )
+        parser.add_argument(
+            '--nlp-processes',
+            type=int,
+            default=None,
+            help='spaCy worker processes for entity extraction (default: NewsAnalyzer.NLP_PROCESSES)'
         )
     
     def handle(self, *args, **options):
@@ -35,66 +38,35 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'Fetching news from the last {hours} hours...'))
         
         try:
-            # Fetch news from RSS feeds
-            news_items = fetch_latest_news(max_age_hours=hours)
+            # Fetch news from RSS feeds (validators are committed once stored)
+            fetcher = RSSFeedFetcher()
+            news_items = fetch_latest_news(max_age_hours=hours, fetcher=fetcher)
             self.stdout.write(f'Fetched {len(news_items)} news items')
             
             if not news_items:
+                fetcher.commit_validators()
                 self.stdout.write(self.style.WARNING('No news items found'))
                 return
             
-            # Get existing hashes to avoid duplicates
-            existing_hashes = set(
-                NewsEvent.objects.values_list('content_hash', flat=True)
-            )
+            # Skip items already stored (only this batch's hashes are looked up)
+            if not force:
+                news_items = filter_new_items(news_items)
+                self.stdout.write(f'{len(news_items)} new items after de-duplication')
+                
+                if not news_items:
+                    fetcher.commit_validators()
+                    self.stdout.write(self.style.SUCCESS('No new news items'))
+                    return
             
             # Analyze news items
             analyzer = NewsAnalyzer()
             self.stdout.write('Analyzing news sentiment and extracting entities...')
-            analyzed_items = analyzer.batch_analyze(news_items)
+            analyzed_items = analyzer.batch_analyze(news_items, n_process=options['nlp_processes'])
             
-            # Save to database
-            saved_count = 0
-            alert_count = 0
-            
-            for item in analyzed_items:
-                # Skip duplicates unless force is enabled
-                if not force and item['content_hash'] in existing_hashes:
-                    continue
-                
-                # Create news events for each detected symbol
-                symbols = item.get('symbols', ['GENERAL'])
-                
-                for symbol in symbols:
-                    try:
-                        news_event = NewsEvent.objects.create(
-                            symbol=symbol,
-                            headline=item['headline'],
-                            sentiment=item['sentiment'],
-                            impact_level=item['impact_level'],
-                            topic=', '.join(item.get('topics', [])[:3]),  # Store up to 3 topics
-                            source=item['source'],
-                            source_url=item.get('source_url', ''),
-                            content_hash=item['content_hash'],
-                            timestamp=item['timestamp'],
-                        )
-                        saved_count += 1
-                        
-                        # Create alert for high-impact news
-                        if item['impact_level'] == 'high' and abs(item['sentiment']) > 0.5:
-                            sentiment_label = 'bullish' if item['sentiment'] > 0 else 'bearish'
-                            alert_message = f"High impact {sentiment_label} news for {symbol}: {item['headline'][:100]}"
-                            
-                            NewsAlert.objects.create(
-                                news_event=news_event,
-                                alert_type='high_impact',
-                                message=alert_message
-                            )
-                            alert_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error saving news event: {str(e)}")
-                        continue
+            # Save to database (bulk; existing (hash, symbol) rows are skipped)
+            saved_events, alert_count = store_news_items(analyzed_items)
+            saved_count = len(saved_events)
+            fetcher.commit_validators()
             
             # Output summary
             self.stdout.write(self.style.SUCCESS(
@@ -106,21 +78,17 @@ class Command(BaseCommand):
                     f'✓ Created {alert_count} high-impact alerts'
                 ))
             
-            # Show some statistics
-            recent_news = NewsEvent.objects.filter(
-                timestamp__gte=timezone.now() - timezone.timedelta(hours=hours)
-            )
+            # Show some statistics (from the sentiment buckets)
+            stats = sentiment_window(hours=hours)
             
             self.stdout.write(f'\n📊 Statistics (last {hours} hours):')
-            self.stdout.write(f'  Total news events: {recent_news.count()}')
-            self.stdout.write(f'  High impact: {recent_news.filter(impact_level="high").count()}')
-            self.stdout.write(f'  Medium impact: {recent_news.filter(impact_level="medium").count()}')
-            self.stdout.write(f'  Low impact: {recent_news.filter(impact_level="low").count()}')
+            self.stdout.write(f'  Total news events: {stats["count"]}')
+            self.stdout.write(f'  High impact: {stats["impact"]["high"]}')
+            self.stdout.write(f'  Medium impact: {stats["impact"]["medium"]}')
+            self.stdout.write(f'  Low impact: {stats["impact"]["low"]}')
             
             # Show sentiment distribution
-            avg_sentiment = recent_news.aggregate(
-                avg=models.Avg('sentiment')
-            )['avg'] or 0
+            avg_sentiment = stats['avg_sentiment'] or 0
             
             self.stdout.write(f'  Average sentiment: {avg_sentiment:.3f}')
             
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zennews', '0002_newsevent_content_extract_newsevent_published_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text='News source name', max_length=100, unique=True)),
+                ('url', models.URLField(max_length=500)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=100)),
+                ('last_status', models.IntegerField(blank=True, help_text='HTTP status of the last fetch', null=True)),
+                ('last_fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('last_duration_ms', models.IntegerField(default=0)),
+                ('last_bytes', models.IntegerField(default=0, help_text='Response body size of the last fetch')),
+                ('last_entry_count', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('fetch_count', models.IntegerField(default=0)),
+                ('not_modified_count', models.IntegerField(default=0)),
+                ('total_bytes', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Feed State',
+                'verbose_name_plural': 'Feed States',
+                'ordering': ['source'],
+            },
+        ),
+    ]
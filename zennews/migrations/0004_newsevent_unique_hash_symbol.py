@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:12
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def remove_duplicate_events(apps, schema_editor):
+    """Keep the oldest row per (content_hash, symbol) so the constraint can be added"""
+    NewsEvent = apps.get_model('zennews', 'NewsEvent')
+
+    duplicates = (
+        NewsEvent.objects.values('content_hash', 'symbol')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for group in duplicates:
+        rows = NewsEvent.objects.filter(
+            content_hash=group['content_hash'], symbol=group['symbol']
+        ).order_by('created_at', 'id')
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zennews', '0003_feedstate'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_events, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='newsevent',
+            constraint=models.UniqueConstraint(fields=('content_hash', 'symbol'), name='zennews_unique_hash_symbol'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def index_existing_events(apps, schema_editor):
+    """Build NewsSymbol rows for events stored before the index existed"""
+    from zennews.utils.symbol_index import symbol_keys
+
+    NewsEvent = apps.get_model('zennews', 'NewsEvent')
+    NewsSymbol = apps.get_model('zennews', 'NewsSymbol')
+
+    links = []
+    for event in NewsEvent.objects.all().iterator(chunk_size=2000):
+        for key, is_direct in symbol_keys(event.symbol, event.symbol_tags):
+            links.append(NewsSymbol(
+                news_event_id=event.pk,
+                symbol=key,
+                is_direct=is_direct,
+                timestamp=event.published_at or event.timestamp,
+                impact_level=event.impact_level,
+                relevance_rank=event.relevance_rank,
+            ))
+        if len(links) >= 2000:
+            NewsSymbol.objects.bulk_create(links, ignore_conflicts=True)
+            links = []
+    NewsSymbol.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zennews', '0004_newsevent_unique_hash_symbol'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsSymbol',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(help_text='Symbol or currency key (upper case)', max_length=20)),
+                ('is_direct', models.BooleanField(default=True, help_text='Key is the event symbol or a tag, not a derived currency')),
+                ('timestamp', models.DateTimeField(help_text='Event publication time (published_at or timestamp)')),
+                ('impact_level', models.CharField(default='low', max_length=10)),
+                ('relevance_rank', models.IntegerField(default=50)),
+                ('news_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='symbol_links', to='zennews.newsevent')),
+            ],
+            options={
+                'verbose_name': 'News Symbol',
+                'verbose_name_plural': 'News Symbols',
+                'indexes': [models.Index(fields=['symbol', 'timestamp'], name='zennews_new_symbol_2964da_idx'), models.Index(fields=['symbol', '-relevance_rank', '-timestamp'], name='zennews_new_symbol_073d67_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='newssymbol',
+            constraint=models.UniqueConstraint(fields=('news_event', 'symbol'), name='zennews_unique_event_symbol'),
+        ),
+        migrations.RunPython(index_existing_events, migrations.RunPython.noop),
+    ]
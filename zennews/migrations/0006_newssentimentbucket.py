@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:23
+
+from django.db import migrations, models
+
+
+def build_buckets(apps, schema_editor):
+    """Aggregate the existing news history into sentiment buckets"""
+    from zennews.utils.sentiment_buckets import aggregate_events
+
+    NewsEvent = apps.get_model('zennews', 'NewsEvent')
+    NewsSentimentBucket = apps.get_model('zennews', 'NewsSentimentBucket')
+
+    rows = NewsEvent.objects.values_list('symbol', 'timestamp', 'sentiment', 'impact_level').iterator(chunk_size=2000)
+    NewsSentimentBucket.objects.bulk_create(
+        [
+            NewsSentimentBucket(symbol=symbol, bucket_start=start, **totals)
+            for (symbol, start), totals in aggregate_events(rows).items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('zennews', '0005_newssymbol'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsSentimentBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(help_text='Event symbol', max_length=20)),
+                ('bucket_start', models.DateTimeField(help_text='Start of the 15-minute bucket (UTC, epoch-aligned)')),
+                ('count', models.IntegerField(default=0)),
+                ('sentiment_sum', models.FloatField(default=0.0)),
+                ('high_count', models.IntegerField(default=0)),
+                ('medium_count', models.IntegerField(default=0)),
+                ('low_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'News Sentiment Bucket',
+                'verbose_name_plural': 'News Sentiment Buckets',
+                'ordering': ['symbol', 'bucket_start'],
+                'indexes': [models.Index(fields=['bucket_start'], name='zennews_new_bucket__f9d333_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='newssentimentbucket',
+            constraint=models.UniqueConstraint(fields=('symbol', 'bucket_start'), name='zennews_unique_sentiment_bucket'),
+        ),
+        migrations.RunPython(build_buckets, migrations.RunPython.noop),
+    ]
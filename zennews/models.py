@@ -46,11 +46,24 @@ class NewsEvent(models.Model):
             models.Index(fields=['impact_level', 'timestamp']),
             models.Index(fields=['content_hash']),
         ]
+        constraints = [
+            # One row per article per symbol; lets ingestion skip duplicates on insert
+            models.UniqueConstraint(fields=['content_hash', 'symbol'], name='zennews_unique_hash_symbol'),
+        ]
         verbose_name = "News Event"
         verbose_name_plural = "News Events"
     
     def __str__(self):
         return f"{self.symbol} - {self.headline[:50]}... ({self.timestamp})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded symbol and timestamp so a moved event refreshes its old bucket"""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if 'symbol' in loaded and 'timestamp' in loaded:
+            instance._bucket_key = (loaded['symbol'], loaded['timestamp'])
+        return instance
     
     def get_sentiment_label(self):
         """Get human-readable sentiment label"""
@@ -124,6 +137,69 @@ class NewsEvent(models.Model):
         return False
 
 
+class NewsSymbol(models.Model):
+    """
+    Symbol -> news association (inverted index filled at ingest time)
+    
+    One row per key an event is relevant to: its own symbol and symbol_tags
+    (``is_direct``) plus the currencies of any forex pair among them. The
+    event's time, impact and rank are copied so "top-k news for a symbol"
+    is answered from this table's indexes. See zennews.utils.symbol_index.
+    """
+    news_event = models.ForeignKey(NewsEvent, on_delete=models.CASCADE, related_name='symbol_links')
+    symbol = models.CharField(max_length=20, help_text="Symbol or currency key (upper case)")
+    is_direct = models.BooleanField(default=True, help_text="Key is the event symbol or a tag, not a derived currency")
+    timestamp = models.DateTimeField(help_text="Event publication time (published_at or timestamp)")
+    impact_level = models.CharField(max_length=10, default='low')
+    relevance_rank = models.IntegerField(default=50)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['symbol', 'timestamp']),
+            models.Index(fields=['symbol', '-relevance_rank', '-timestamp']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['news_event', 'symbol'], name='zennews_unique_event_symbol'),
+        ]
+        verbose_name = "News Symbol"
+        verbose_name_plural = "News Symbols"
+    
+    def __str__(self):
+        return f"{self.symbol} -> {self.news_event_id}"
+
+
+class NewsSentimentBucket(models.Model):
+    """
+    Per-symbol news sentiment aggregated into 15-minute buckets
+    
+    Maintained at ingest time (see zennews.utils.sentiment_buckets) so
+    windowed sentiment/impact questions read a few bucket rows instead of
+    re-aggregating NewsEvent on every call.
+    """
+    symbol = models.CharField(max_length=20, help_text="Event symbol")
+    bucket_start = models.DateTimeField(help_text="Start of the 15-minute bucket (UTC, epoch-aligned)")
+    count = models.IntegerField(default=0)
+    sentiment_sum = models.FloatField(default=0.0)
+    high_count = models.IntegerField(default=0)
+    medium_count = models.IntegerField(default=0)
+    low_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['symbol', 'bucket_start']
+        indexes = [
+            models.Index(fields=['bucket_start']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['symbol', 'bucket_start'], name='zennews_unique_sentiment_bucket'),
+        ]
+        verbose_name = "News Sentiment Bucket"
+        verbose_name_plural = "News Sentiment Buckets"
+    
+    def __str__(self):
+        return f"{self.symbol} @ {self.bucket_start:%Y-%m-%d %H:%M} ({self.count} events)"
+
+
 class NewsTopic(models.Model):
     """
     Represents clustered topics extracted from news
@@ -161,3 +237,37 @@ class NewsAlert(models.Model):
     
     def __str__(self):
         return f"Alert: {self.news_event.symbol} - {self.alert_type}"
+
+
+class FeedState(models.Model):
+    """
+    HTTP cache validators and last-fetch metrics for one RSS feed
+    
+    ETag/Last-Modified are sent back on the next fetch so unchanged feeds
+    answer 304 and are not downloaded or parsed again.
+    """
+    source = models.CharField(max_length=100, unique=True, help_text="News source name")
+    url = models.URLField(max_length=500)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    
+    # Last fetch
+    last_status = models.IntegerField(null=True, blank=True, help_text="HTTP status of the last fetch")
+    last_fetched_at = models.DateTimeField(null=True, blank=True)
+    last_duration_ms = models.IntegerField(default=0)
+    last_bytes = models.IntegerField(default=0, help_text="Response body size of the last fetch")
+    last_entry_count = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    
+    # Running totals
+    fetch_count = models.IntegerField(default=0)
+    not_modified_count = models.IntegerField(default=0)
+    total_bytes = models.BigIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['source']
+        verbose_name = "Feed State"
+        verbose_name_plural = "Feed States"
+    
+    def __str__(self):
+        return f"{self.source} ({self.last_status or 'never fetched'})"
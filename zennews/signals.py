@@ -0,0 +1,41 @@
+"""
+Signal handlers that keep the symbol -> news index and sentiment buckets in sync
+
+Bulk ingestion maintains its own rows (bulk_create sends no signals); these
+cover events saved or deleted one at a time (admin, scripts, fixtures).
+"""
+import logging
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .utils.sentiment_buckets import refresh_sentiment_buckets
+from .utils.symbol_index import index_news_events
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender='zennews.NewsEvent')
+def index_news_event(sender, instance, created, raw=False, **kwargs):
+    """(Re)build the NewsSymbol rows of a saved event"""
+    if raw:
+        return
+    try:
+        index_news_events([instance], replace=not created)
+    except Exception as e:
+        logger.warning(f"Could not index news event {instance.pk}: {e}")
+
+
+@receiver([post_save, post_delete], sender='zennews.NewsEvent')
+def refresh_event_bucket(sender, instance, raw=False, **kwargs):
+    """Recompute the sentiment bucket the event falls into, and the one it left"""
+    if raw:
+        return
+    current = (instance.symbol, instance.timestamp)
+    previous = getattr(instance, '_bucket_key', None)
+    instance._bucket_key = current
+    try:
+        refresh_sentiment_buckets([current])
+        if previous and previous != current:
+            refresh_sentiment_buckets([previous])
+    except Exception as e:
+        logger.warning(f"Could not refresh sentiment bucket for {instance.pk}: {e}")
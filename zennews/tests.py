@@ -1,3 +1,383 @@
-from django.test import TestCase
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from .models import FeedState, NewsAlert, NewsEvent, NewsSentimentBucket, NewsSymbol
+from .utils.ingest import filter_new_items, store_news_items
+from .utils.nlp_analyzer import KeywordMatcher, NewsAnalyzer
+from .utils.rss_fetcher import RSSFeedFetcher
+from .utils.sentiment_buckets import sentiment_window
+from .utils.symbol_index import related_news, symbol_keys
+
+
+RSS_BODY = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Local</title>
+<item><title>ECB holds rates as euro slips</title><link>http://example.com/1</link>
+<pubDate>Mon, 03 Mar 2025 08:00:00 GMT</pubDate><description>EUR weaker</description></item>
+<item><title>Gold rallies on safe-haven demand</title><link>http://example.com/2</link>
+<pubDate>Mon, 03 Mar 2025 09:00:00 GMT</pubDate><description>XAU higher</description></item>
+</channel></rss>"""
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    """Serves RSS_BODY with an ETag and honours If-None-Match"""
+    etag = '"v1"'
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('ETag', self.etag)
+        self.send_header('Last-Modified', 'Mon, 03 Mar 2025 09:00:00 GMT')
+        self.send_header('Content-Length', str(len(RSS_BODY)))
+        self.end_headers()
+        self.wfile.write(RSS_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class RSSFeedFetcherTestCase(TestCase):
+    """Test cases for concurrent conditional-GET feed fetching against a local server"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _FeedHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+        self.fetcher = RSSFeedFetcher()
+        self.fetcher.FEED_SOURCES = {'Local A': f'{base}/a.rss', 'Local B': f'{base}/b.rss'}
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_first_fetch_parses_and_records_validators(self):
+        """A full fetch parses entries; ETag is stored once committed"""
+        entries = self.fetcher.fetch_all_feeds()
+
+        self.assertEqual(len(entries), 4)
+        state = FeedState.objects.get(source='Local A')
+        self.assertEqual(state.last_status, 200)
+        self.assertEqual(state.etag, '')
+        self.assertEqual(state.last_bytes, len(RSS_BODY))
+        self.assertEqual(state.last_entry_count, 2)
+
+        self.fetcher.commit_validators()
+        self.assertEqual(FeedState.objects.get(source='Local A').etag, '"v1"')
+
+    def test_uncommitted_fetch_is_downloaded_again(self):
+        """If the entries were never stored, the next run does not get 304"""
+        self.fetcher.fetch_all_feeds()
+
+        self.assertEqual(len(self.fetcher.fetch_all_feeds()), 4)
+        self.assertIsNone(self.server.requests[-1].get('If-None-Match'))
+
+    def test_second_fetch_is_conditional(self):
+        """Validators are sent back and a 304 skips parsing"""
+        self.fetcher.fetch_all_feeds()
+        self.fetcher.commit_validators()
+        entries = self.fetcher.fetch_all_feeds()
+
+        self.assertEqual(entries, [])
+        self.assertEqual(self.server.requests[-1].get('If-None-Match'), '"v1"')
+        state = FeedState.objects.get(source='Local B')
+        self.assertEqual(state.last_status, 304)
+        self.assertEqual(state.last_bytes, 0)
+        self.assertEqual(state.fetch_count, 2)
+        self.assertEqual(state.not_modified_count, 1)
+        self.assertEqual(state.total_bytes, len(RSS_BODY))
+
+    def test_unconditional_fetch_ignores_validators(self):
+        """conditional=False always downloads the full feed"""
+        self.fetcher.fetch_all_feeds()
+        self.fetcher.commit_validators()
+
+        self.assertEqual(len(self.fetcher.fetch_all_feeds(conditional=False)), 4)
+
+    def test_unreachable_feed_is_reported_not_raised(self):
+        """A failing feed does not stop the others"""
+        self.fetcher.FEED_SOURCES['Broken'] = 'http://127.0.0.1:9/none.rss'
+
+        entries = self.fetcher.fetch_all_feeds()
+
+        self.assertEqual(len(entries), 4)
+        self.assertTrue(FeedState.objects.get(source='Broken').last_error)
+
+
+class NewsIngestionTestCase(TestCase):
+    """Test cases for bounded de-duplication and bulk news storage"""
+
+    def _item(self, content_hash, symbols, impact='high', sentiment=0.8):
+        return {
+            'headline': f'Headline {content_hash}',
+            'source': 'Local',
+            'source_url': 'http://example.com/',
+            'timestamp': datetime(2025, 3, 3, 8, 0, tzinfo=dt_timezone.utc),
+            'content_hash': content_hash,
+            'sentiment': sentiment,
+            'impact_level': impact,
+            'topics': ['rates'],
+            'symbols': symbols,
+        }
+
+    def test_store_creates_event_per_symbol_and_alerts(self):
+        """Each symbol gets an event; high-impact strong sentiment gets an alert"""
+        saved, alerts = store_news_items([
+            self._item('a' * 64, ['EURUSD', 'GBPUSD']),
+            self._item('b' * 64, [], impact='low'),
+        ])
+
+        self.assertEqual(len(saved), 3)
+        self.assertEqual(alerts, 2)
+        self.assertEqual(NewsEvent.objects.filter(symbol='GENERAL').count(), 1)
+        self.assertEqual(NewsAlert.objects.count(), 2)
+
+    def test_store_skips_existing_rows(self):
+        """Re-storing the same article only inserts the new symbol"""
+        store_news_items([self._item('a' * 64, ['EURUSD'])])
+
+        saved, alerts = store_news_items([self._item('a' * 64, ['EURUSD', 'XAUUSD'])])
+
+        self.assertEqual([event.symbol for event in saved], ['XAUUSD'])
+        self.assertEqual(alerts, 1)
+        self.assertEqual(NewsEvent.objects.count(), 2)
+        self.assertEqual(NewsAlert.objects.count(), 2)
+
+    def test_filter_new_items_checks_only_batch_hashes(self):
+        """Stored and repeated hashes are filtered out"""
+        store_news_items([self._item('a' * 64, ['EURUSD'])])
+
+        new_items = filter_new_items([
+            self._item('a' * 64, ['EURUSD']),
+            self._item('c' * 64, ['EURUSD']),
+            self._item('c' * 64, ['EURUSD']),
+        ])
+
+        self.assertEqual([item['content_hash'] for item in new_items], ['c' * 64])
+
+
+class KeywordMatcherTestCase(SimpleTestCase):
+    """Test cases for the single-pass keyword matcher used by NewsAnalyzer"""
+
+    def test_overlapping_and_prefix_keywords_are_all_found(self):
+        """Keywords sharing a start or overlapping each other are all reported"""
+        matcher = KeywordMatcher([
+            ('rate', 'topic', 'Rates'),
+            ('rate hike', 'impact', 'high'),
+            ('interest rate', 'topic', 'Rates'),
+            ('hike', 'polarity', 'positive'),
+            ('fed', 'topic', 'Central Bank'),
+        ])
+
+        hits = matcher.scan('Federal Reserve signals an INTEREST RATE HIKE')
+
+        self.assertEqual(hits['topic']['Rates'], {'rate', 'interest rate'})
+        self.assertEqual(hits['topic']['Central Bank'], {'fed'})
+        self.assertEqual(hits['impact']['high'], {'rate hike'})
+        self.assertEqual(hits['polarity']['positive'], {'hike'})
+        self.assertEqual(matcher.scan('nothing relevant'), {})
+
+    def test_analysis_matches_per_keyword_scans(self):
+        """Symbols, impact, topics and fallback polarity keep their substring semantics"""
+        analyzer = NewsAnalyzer()
+        text = 'EURUSD and Gold rally as the Fed hints at a rate cut; oil supply concerns linger'
+
+        hits = analyzer.keyword_matcher().scan(text)
+
+        self.assertEqual(set(analyzer._symbols_from_hits(hits, [])), {'EURUSD', 'XAUUSD', 'USOIL'})
+        self.assertEqual(analyzer.determine_impact(text), 'high')
+        self.assertEqual(analyzer.extract_topics(text), ['Interest Rates', 'Central Bank', 'Oil & Energy'])
+        # rally, up (in "supply") vs concern
+        self.assertAlmostEqual(analyzer._keyword_sentiment(text), 1 / 3)
+        self.assertEqual(analyzer.determine_impact('Quiet session ahead'), 'low')
+        self.assertEqual(analyzer.extract_topics('Quiet session ahead'), ['General Market'])
+
+    def test_batch_analyze_matches_single_analysis(self):
+        """batch_analyze gives the same result as analyze for each item"""
+        analyzer = NewsAnalyzer()
+        items = [
+            {'headline': 'ECB holds rates as euro slips', 'description': 'EUR weaker after CPI'},
+            {'headline': 'Gold rallies on safe-haven demand'},
+            {'headline': 'Quiet session ahead', 'description': None},
+        ]
+
+        expected = [analyzer.analyze(i['headline'], i.get('description') or '') for i in items]
+        analyzed = analyzer.batch_analyze([dict(i) for i in items])
+
+        self.assertEqual(len(analyzed), 3)
+        for item, single in zip(analyzed, expected):
+            self.assertEqual(sorted(item['symbols']), sorted(single['symbols']))
+            self.assertEqual(item['impact_level'], single['impact_level'])
+            self.assertEqual(item['topics'], single['topics'])
+            self.assertAlmostEqual(item['sentiment'], single['sentiment'])
+        self.assertEqual(analyzed[2]['symbols'], ['GENERAL'])
+
+
+class SymbolIndexTestCase(TestCase):
+    """Test cases for the symbol -> news inverted index"""
+
+    def setUp(self):
+        self.now = datetime(2025, 3, 3, 12, 0, tzinfo=dt_timezone.utc)
+
+    def _event(self, symbol, minutes_ago, tags=None, rank=50, impact='medium'):
+        return NewsEvent.objects.create(
+            symbol=symbol,
+            symbol_tags=tags or [],
+            headline=f'{symbol} headline {minutes_ago}',
+            impact_level=impact,
+            relevance_rank=rank,
+            source='Test',
+            content_hash=f'{symbol}-{minutes_ago}',
+            timestamp=self.now - timedelta(minutes=minutes_ago),
+        )
+
+    def test_symbol_keys_expand_pairs_to_currencies(self):
+        """Pairs add their currencies as derived keys; direct keys win"""
+        self.assertEqual(
+            symbol_keys('EURUSD', ['eur', 'GOLD']),
+            [('EURUSD', True), ('EUR', True), ('GOLD', True), ('USD', False)]
+        )
+
+    def test_lookup_matches_pair_and_currency_news(self):
+        """A pair finds its own and its currencies' news, not other pairs sharing a currency"""
+        eurusd = self._event('EURUSD', 10)
+        eur = self._event('GENERAL', 20, tags=['EUR'])
+        gbpusd = self._event('GBPUSD', 30)
+        self._event('EURUSD', 60 * 24)
+
+        since = self.now - timedelta(hours=12)
+
+        self.assertEqual(related_news('eurusd', since=since), [eurusd, eur])
+        self.assertEqual(related_news('EURUSD', since=since, exact=True), [eurusd])
+        self.assertEqual(set(related_news('USD', since=since)), {eurusd, gbpusd})
+
+    def test_top_k_by_relevance(self):
+        """Ordering and limit are applied in the query"""
+        self._event('XAUUSD', 5, rank=40)
+        best = self._event('XAUUSD', 50, rank=90, impact='high')
+
+        result = related_news(
+            'XAUUSD', since=self.now - timedelta(hours=1), limit=1,
+            order_by=('-relevance_rank', '-timestamp')
+        )
+
+        self.assertEqual(result, [best])
+        self.assertEqual(
+            related_news('XAUUSD', since=self.now - timedelta(hours=1), impact_levels=['high']), [best]
+        )
+
+    def test_top_k_counts_events_not_links(self):
+        """An event matched through several keys fills one slot of the limit"""
+        both = self._event('EURUSD', 5, tags=['EUR', 'USD'])
+        older = self._event('GENERAL', 10, tags=['USD'])
+        self._event('GENERAL', 15, tags=['EUR'])
+
+        result = related_news('EURUSD', since=self.now - timedelta(hours=1), limit=2)
+
+        self.assertEqual(result, [both, older])
+        with self.assertRaises(ValueError):
+            related_news('EURUSD', since=self.now, order_by=('headline',))
+
+    def test_bulk_ingest_and_edits_are_indexed(self):
+        """store_news_items indexes inserted rows; saving an event re-indexes it"""
+        saved, _ = store_news_items([{
+            'headline': 'Yen slides', 'sentiment': -0.2, 'impact_level': 'low', 'topics': [],
+            'symbols': ['USDJPY'], 'source': 'Test', 'content_hash': 'h-yen', 'timestamp': self.now,
+        }])
+
+        self.assertEqual(
+            set(NewsSymbol.objects.filter(news_event=saved[0]).values_list('symbol', flat=True)),
+            {'USDJPY', 'USD', 'JPY'}
+        )
+
+        event = NewsEvent.objects.get(pk=saved[0].pk)
+        event.symbol_tags = ['BOJ']
+        event.save()
+
+        self.assertEqual(NewsSymbol.objects.filter(news_event=event).count(), 4)
+
+
+class SentimentBucketTestCase(TestCase):
+    """Test cases for the rolling 15-minute sentiment aggregates"""
+
+    def setUp(self):
+        self.start = datetime(2025, 3, 3, 8, 0, tzinfo=dt_timezone.utc)
+        items = []
+        for i in range(40):
+            items.append({
+                'headline': f'Item {i}', 'sentiment': ((i % 7) - 3) / 4, 'topics': [],
+                'impact_level': ['high', 'medium', 'low'][i % 3],
+                'symbols': ['EURUSD'] if i % 2 else ['EURUSD', 'XAUUSD'],
+                'source': 'Test', 'content_hash': f'h{i}',
+                'timestamp': self.start + timedelta(minutes=7 * i),
+            })
+        store_news_items(items)
+
+    def _raw(self, symbol, since, until):
+        events = NewsEvent.objects.filter(timestamp__gte=since, timestamp__lt=until)
+        if symbol:
+            events = events.filter(symbol=symbol)
+        return list(events)
+
+    def test_window_matches_raw_events(self):
+        """Unaligned windows give the same totals as aggregating the events"""
+        since = self.start + timedelta(minutes=23)
+        until = self.start + timedelta(hours=3, minutes=41)
+
+        for symbol in ['EURUSD', 'XAUUSD', None]:
+            window = sentiment_window(symbol, since=since, until=until)
+            raw = self._raw(symbol, since, until)
+
+            self.assertEqual(window['count'], len(raw))
+            self.assertAlmostEqual(window['sentiment_sum'], sum(e.sentiment for e in raw))
+            for level in ['high', 'medium', 'low']:
+                self.assertEqual(window['impact'][level], sum(1 for e in raw if e.impact_level == level))
+
+        inside = sentiment_window('EURUSD', since=self.start + timedelta(minutes=1),
+                                  until=self.start + timedelta(minutes=10))
+        self.assertEqual(inside['count'], 1)
+        self.assertIsNone(sentiment_window('GBPUSD', since=self.start)['avg_sentiment'])
+
+    def test_buckets_follow_single_saves_and_deletes(self):
+        """Saving or deleting an event recomputes its bucket"""
+        bucket_start = self.start + timedelta(minutes=15)
+        before = NewsSentimentBucket.objects.get(symbol='EURUSD', bucket_start=bucket_start).count
+
+        event = NewsEvent.objects.create(
+            symbol='EURUSD', headline='Extra', sentiment=0.5, impact_level='high',
+            source='Test', content_hash='extra', timestamp=bucket_start + timedelta(minutes=1),
+        )
+        self.assertEqual(NewsSentimentBucket.objects.get(symbol='EURUSD', bucket_start=bucket_start).count, before + 1)
+
+        event.delete()
+        self.assertEqual(NewsSentimentBucket.objects.get(symbol='EURUSD', bucket_start=bucket_start).count, before)
+
+    def test_moved_event_refreshes_old_bucket(self):
+        """Changing an event's timestamp or symbol takes it out of its old bucket"""
+        old_start = self.start + timedelta(minutes=15)
+        new_start = self.start + timedelta(hours=20)
+        counts = lambda symbol, start: NewsSentimentBucket.objects.filter(
+            symbol=symbol, bucket_start=start
+        ).values_list('count', flat=True).first() or 0
+        before = counts('EURUSD', old_start)
+
+        event = NewsEvent.objects.filter(symbol='EURUSD', timestamp__gte=old_start,
+                                         timestamp__lt=old_start + timedelta(minutes=15)).first()
+        event.timestamp = new_start + timedelta(minutes=2)
+        event.save()
+        self.assertEqual(counts('EURUSD', old_start), before - 1)
+        self.assertEqual(counts('EURUSD', new_start), 1)
+
+        event = NewsEvent.objects.get(pk=event.pk)
+        event.symbol = 'GBPUSD'
+        event.save()
+        self.assertEqual(counts('EURUSD', new_start), 0)
+        self.assertEqual(counts('GBPUSD', new_start), 1)
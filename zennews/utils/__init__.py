@@ -3,10 +3,19 @@ ZenNews Utilities Package
 """
 from .rss_fetcher import RSSFeedFetcher, fetch_latest_news
 from .nlp_analyzer import NewsAnalyzer, analyze_news_text
+from .ingest import filter_new_items, store_news_items
+from .symbol_index import index_news_events, related_news
+from .sentiment_buckets import refresh_sentiment_buckets, sentiment_window
 
 __all__ = [
     'RSSFeedFetcher',
     'fetch_latest_news',
     'NewsAnalyzer',
     'analyze_news_text',
+    'filter_new_items',
+    'store_news_items',
+    'index_news_events',
+    'related_news',
+    'refresh_sentiment_buckets',
+    'sentiment_window',
 ]
@@ -0,0 +1,128 @@
+"""
+News ingestion for ZenNews
+De-duplicates fetched items against the database and bulk-saves events, alerts,
+their symbol index rows and sentiment buckets
+"""
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .sentiment_buckets import refresh_sentiment_buckets
+from .symbol_index import index_news_events
+
+logger = logging.getLogger(__name__)
+
+# Hashes per `content_hash__in` lookup (keeps well under SQLite's parameter limit)
+HASH_LOOKUP_CHUNK = 500
+
+# Rows per INSERT for bulk_create
+BULK_BATCH_SIZE = 500
+
+
+def existing_hashes(content_hashes: Iterable[str]) -> Set[str]:
+    """
+    Which of the given content hashes are already stored
+    
+    Only the incoming batch is looked up (indexed ``content_hash__in``), so
+    the cost does not grow with the size of the news history.
+    """
+    from zennews.models import NewsEvent
+    
+    hashes = list(dict.fromkeys(content_hashes))
+    found = set()
+    for i in range(0, len(hashes), HASH_LOOKUP_CHUNK):
+        found.update(
+            NewsEvent.objects.filter(content_hash__in=hashes[i:i + HASH_LOOKUP_CHUNK])
+            .values_list('content_hash', flat=True)
+        )
+    return found
+
+
+def filter_new_items(news_items: List[Dict]) -> List[Dict]:
+    """Drop items whose content hash is already stored (or repeated in the batch)"""
+    known = existing_hashes(item['content_hash'] for item in news_items)
+    
+    new_items = []
+    for item in news_items:
+        if item['content_hash'] in known:
+            continue
+        known.add(item['content_hash'])
+        new_items.append(item)
+    
+    return new_items
+
+
+def store_news_items(analyzed_items: List[Dict]) -> Tuple[list, int]:
+    """
+    Bulk-save analyzed items as one NewsEvent per detected symbol
+    
+    Inserts skip rows that already exist for the same (content_hash, symbol)
+    thanks to the unique constraint, so overlapping runs are safe. High-impact
+    alerts are only created for events that were actually inserted.
+    
+    Args:
+        analyzed_items: Items from NewsAnalyzer.batch_analyze
+        
+    Returns:
+        (saved_events, alert_count)
+    """
+    from zennews.models import NewsEvent, NewsAlert
+    
+    events = []
+    alert_messages = {}
+    seen = set()
+    
+    for item in analyzed_items:
+        # Create news events for each detected symbol
+        for symbol in item.get('symbols') or ['GENERAL']:
+            key = (item['content_hash'], symbol)
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            event = NewsEvent(
+                symbol=symbol,
+                headline=item['headline'],
+                sentiment=item['sentiment'],
+                impact_level=item['impact_level'],
+                topic=', '.join(item.get('topics', [])[:3]),  # Store up to 3 topics
+                source=item['source'],
+                source_url=item.get('source_url', ''),
+                content_hash=item['content_hash'],
+                timestamp=item['timestamp'],
+            )
+            events.append(event)
+            
+            # Alert for high-impact news
+            if item['impact_level'] == 'high' and abs(item['sentiment']) > 0.5:
+                sentiment_label = 'bullish' if item['sentiment'] > 0 else 'bearish'
+                alert_messages[event.pk] = f"High impact {sentiment_label} news for {symbol}: {item['headline'][:100]}"
+    
+    if not events:
+        return [], 0
+    
+    NewsEvent.objects.bulk_create(events, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+    
+    # UUIDs are assigned client-side; keep only rows that were really inserted
+    inserted = set()
+    event_ids = [event.pk for event in events]
+    for i in range(0, len(event_ids), HASH_LOOKUP_CHUNK):
+        inserted.update(
+            NewsEvent.objects.filter(pk__in=event_ids[i:i + HASH_LOOKUP_CHUNK]).values_list('pk', flat=True)
+        )
+    saved = [event for event in events if event.pk in inserted]
+    
+    alerts = [
+        NewsAlert(news_event=event, alert_type='high_impact', message=alert_messages[event.pk])
+        for event in saved
+        if event.pk in alert_messages
+    ]
+    NewsAlert.objects.bulk_create(alerts, batch_size=BULK_BATCH_SIZE)
+    
+    # Symbol -> news index rows and sentiment buckets for the inserted events
+    index_news_events(saved)
+    refresh_sentiment_buckets((event.symbol, event.timestamp) for event in saved)
+    
+    logger.info(f"Stored {len(saved)} news events ({len(events) - len(saved)} duplicates skipped), "
+                f"{len(alerts)} alerts")
+    
+    return saved, len(alerts)
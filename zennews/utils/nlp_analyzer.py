@@ -1,41 +1,155 @@
 """
 NLP Sentiment & Entity Analyzer for ZenNews
 Performs sentiment analysis and entity extraction from news text
+
+Every keyword table (symbols, impact, topics, sentiment words) is compiled
+once per process into a single matcher, so each document is scanned once
+instead of once per keyword. ``batch_analyze`` runs spaCy through
+``nlp.pipe`` with only the NER components enabled. VADER, TextBlob and
+the spaCy model are loaded on first use rather than at import.
 """
 import re
 import logging
-from typing import Dict, List, Tuple, Optional
-import numpy as np
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from zenithedge.lazy_imports import is_available, spacy_model
 
-# Import NLP libraries with fallbacks
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
+# NLP libraries are imported on first use, not at startup
+TEXTBLOB_AVAILABLE = is_available('textblob')
+if not TEXTBLOB_AVAILABLE:
     logging.warning("TextBlob not available - install with: pip install textblob")
 
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    VADER_AVAILABLE = True
-except ImportError:
-    VADER_AVAILABLE = False
+VADER_AVAILABLE = is_available('vaderSentiment')
+if not VADER_AVAILABLE:
     logging.warning("VADER not available - install with: pip install vaderSentiment")
 
-try:
-    import spacy
-    try:
-        nlp_model = spacy.load("en_core_web_sm")
-        SPACY_AVAILABLE = True
-    except OSError:
-        SPACY_AVAILABLE = False
-        logging.warning("spaCy model not found - run: python -m spacy download en_core_web_sm")
-except ImportError:
-    SPACY_AVAILABLE = False
+SPACY_AVAILABLE = is_available('spacy')
+if not SPACY_AVAILABLE:
     logging.warning("spaCy not available - install with: pip install spacy")
 
 logger = logging.getLogger(__name__)
 
+# spaCy components needed for entity extraction; the rest are disabled
+SPACY_NER_PIPES = ('tok2vec', 'ner')
+
+_vader_analyzer = None
+_pattern_analyzer = None
+_analyzers_lock = threading.Lock()
+
+
+def get_vader_analyzer():
+    """Shared VADER analyzer (loading the lexicon is done once per process)"""
+    global _vader_analyzer
+    if _vader_analyzer is None and VADER_AVAILABLE:
+        with _analyzers_lock:
+            if _vader_analyzer is None:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                _vader_analyzer = SentimentIntensityAnalyzer()
+    return _vader_analyzer
+
+
+def get_pattern_analyzer():
+    """
+    Shared TextBlob sentiment analyzer.
+
+    ``TextBlob(text).sentiment`` is this analyzer applied to the raw text;
+    calling it directly skips building a blob per document.
+    """
+    global _pattern_analyzer
+    if _pattern_analyzer is None and TEXTBLOB_AVAILABLE:
+        with _analyzers_lock:
+            if _pattern_analyzer is None:
+                from textblob.en.sentiments import PatternAnalyzer
+                _pattern_analyzer = PatternAnalyzer()
+    return _pattern_analyzer
+
+
+class KeywordMatcher:
+    """
+    Several keyword tables compiled into one regex.
+
+    Keywords keep the original substring semantics (``'fed'`` also matches
+    ``'federal'``). The pattern is a trie-shaped lookahead tried at every
+    position, so overlapping keywords are all found: each position yields
+    its longest keyword and shorter keywords starting at the same position
+    are recovered from the precomputed prefix table.
+    """
+    
+    def __init__(self, entries: Iterable[Tuple[str, str, str]]):
+        """
+        Args:
+            entries: (keyword, category, label) tuples; matching is
+                case-insensitive
+        """
+        tags: Dict[str, Set[Tuple[str, str]]] = {}
+        for keyword, category, label in entries:
+            keyword = keyword.lower()
+            if keyword:
+                tags.setdefault(keyword, set()).add((category, label))
+        
+        self.tags = {keyword: tuple(sorted(values)) for keyword, values in tags.items()}
+        keywords = sorted(self.tags, key=lambda k: (-len(k), k))
+        
+        # keyword -> every keyword that is a prefix of it (itself included)
+        self.prefixes = {
+            keyword: tuple(other for other in keywords if keyword.startswith(other))
+            for keyword in keywords
+        }
+        self.pattern = re.compile('(?=(' + _trie_regex(keywords) + '))') if keywords else None
+    
+    def scan(self, text: str) -> Dict[str, Dict[str, Set[str]]]:
+        """
+        Find every keyword occurring in ``text``.
+        
+        Returns:
+            category -> label -> set of matched keywords
+        """
+        hits: Dict[str, Dict[str, Set[str]]] = {}
+        if self.pattern is None or not text:
+            return hits
+        
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            found.update(self.prefixes[match.group(1)])
+        
+        for keyword in found:
+            for category, label in self.tags[keyword]:
+                hits.setdefault(category, {}).setdefault(label, set()).add(keyword)
+        return hits
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """
+    Regex matching any of ``keywords``, shaped as a character trie.
+
+    Branching on one character at a time keeps the per-position cost
+    independent of the number of keywords; greedy optional groups make
+    the longest keyword win.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            return ('(?:' + body + ')?') if len(branches) == 1 else body + '?'
+        return body
+    
+    return build(trie)
+
+
+_matchers: Dict[type, KeywordMatcher] = {}
+_matchers_lock = threading.Lock()
+
 
 class NewsAnalyzer:
     """
@@ -90,10 +204,56 @@ class NewsAnalyzer:
         'Geopolitics': ['war', 'conflict', 'sanction', 'election', 'political'],
     }
     
+    # Fallback sentiment words (substring matches, so 'optimis' covers optimism/optimistic)
+    POSITIVE_WORDS = ['gain', 'rise', 'up', 'surge', 'rally', 'strong', 'boost',
+                      'improve', 'positive', 'optimis', 'confidence', 'growth']
+    NEGATIVE_WORDS = ['fall', 'drop', 'down', 'plunge', 'weak', 'decline', 'crisis',
+                      'concern', 'risk', 'negative', 'pessimis', 'fear', 'worry']
+    
+    # spaCy batch settings for batch_analyze (n_process > 1 forks worker processes)
+    NLP_PROCESSES = 1
+    NLP_BATCH_SIZE = 64
+    
+    # Entity labels whose text is matched against FOREX_SYMBOLS
+    ENTITY_LABELS = ('ORG', 'GPE', 'MONEY')
+    
     def __init__(self):
-        self.vader_analyzer = SentimentIntensityAnalyzer() if VADER_AVAILABLE else None
+        self.vader_analyzer = get_vader_analyzer()
+        self.pattern_analyzer = get_pattern_analyzer()
         self.logger = logging.getLogger(__name__)
     
+    @classmethod
+    def keyword_matcher(cls) -> KeywordMatcher:
+        """Matcher compiled from this class's keyword tables (once per process)"""
+        matcher = _matchers.get(cls)
+        if matcher is None:
+            with _matchers_lock:
+                matcher = _matchers.get(cls)
+                if matcher is None:
+                    matcher = _matchers[cls] = KeywordMatcher(cls._keyword_entries())
+        return matcher
+    
+    @classmethod
+    def _keyword_entries(cls):
+        for keyword, symbol in cls.FOREX_SYMBOLS.items():
+            yield keyword, 'symbol', symbol
+            yield keyword.replace('/', ''), 'symbol', symbol
+        for keyword in cls.HIGH_IMPACT_KEYWORDS:
+            yield keyword, 'impact', 'high'
+        for keyword in cls.MEDIUM_IMPACT_KEYWORDS:
+            yield keyword, 'impact', 'medium'
+        for topic, keywords in cls.TOPIC_KEYWORDS.items():
+            for keyword in keywords:
+                yield keyword, 'topic', topic
+        for keyword in cls.POSITIVE_WORDS:
+            yield keyword, 'polarity', 'positive'
+        for keyword in cls.NEGATIVE_WORDS:
+            yield keyword, 'polarity', 'negative'
+    
+    @staticmethod
+    def _compose_text(headline: str, description: str = "") -> str:
+        return f"{headline}. {description}".strip()
+    
     def analyze(self, headline: str, description: str = "") -> Dict:
         """
         Perform complete analysis on news text
@@ -105,33 +265,28 @@ class NewsAnalyzer:
         Returns:
             Dict with sentiment, symbols, impact, and topics
         """
-        text = f"{headline}. {description}".strip()
-        
-        # Get sentiment
-        sentiment = self.get_sentiment(text)
-        
-        # Extract symbols
-        symbols = self.extract_symbols(text)
-        
-        # Determine impact level
-        impact_level = self.determine_impact(text)
-        
-        # Extract topics
-        topics = self.extract_topics(text)
+        text = self._compose_text(headline, description)
+        return self._analyze_text(text, self._entity_texts(text))
+    
+    def _analyze_text(self, text: str, entity_texts: List[str]) -> Dict:
+        """Analyze ``text`` from a single keyword scan plus pre-extracted entities"""
+        hits = self.keyword_matcher().scan(text)
+        symbols = self._symbols_from_hits(hits, entity_texts)
         
         return {
-            'sentiment': sentiment,
+            'sentiment': self.get_sentiment(text, hits),
             'symbols': symbols if symbols else ['GENERAL'],
-            'impact_level': impact_level,
-            'topics': topics,
+            'impact_level': self._impact_from_hits(hits),
+            'topics': self._topics_from_hits(hits),
         }
     
-    def get_sentiment(self, text: str) -> float:
+    def get_sentiment(self, text: str, hits: Optional[Dict] = None) -> float:
         """
         Calculate sentiment score using available methods
         
         Args:
             text: Text to analyze
+            hits: Keyword scan of ``text`` if already computed
             
         Returns:
             Sentiment score from -1.0 to 1.0
@@ -144,19 +299,20 @@ class NewsAnalyzer:
             sentiments.append(vader_scores['compound'])
         
         # TextBlob sentiment
-        if TEXTBLOB_AVAILABLE:
+        if self.pattern_analyzer:
             try:
-                blob = TextBlob(text)
-                sentiments.append(blob.sentiment.polarity)
+                sentiments.append(self.pattern_analyzer.analyze(text).polarity)
             except Exception as e:
                 self.logger.debug(f"TextBlob error: {e}")
         
         # Simple keyword-based sentiment as fallback
         if not sentiments:
-            sentiments.append(self._keyword_sentiment(text))
+            if hits is None:
+                hits = self.keyword_matcher().scan(text)
+            sentiments.append(self._polarity_from_hits(hits))
         
         # Return average sentiment
-        return float(np.mean(sentiments))
+        return float(sum(sentiments) / len(sentiments))
     
     def _keyword_sentiment(self, text: str) -> float:
         """
@@ -168,15 +324,13 @@ class NewsAnalyzer:
         Returns:
             Sentiment score from -1.0 to 1.0
         """
-        text_lower = text.lower()
-        
-        positive_words = ['gain', 'rise', 'up', 'surge', 'rally', 'strong', 'boost', 
-                         'improve', 'positive', 'optimis', 'confidence', 'growth']
-        negative_words = ['fall', 'drop', 'down', 'plunge', 'weak', 'decline', 'crisis',
-                         'concern', 'risk', 'negative', 'pessimis', 'fear', 'worry']
-        
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
+        return self._polarity_from_hits(self.keyword_matcher().scan(text))
+    
+    @staticmethod
+    def _polarity_from_hits(hits: Dict) -> float:
+        polarity = hits.get('polarity', {})
+        pos_count = len(polarity.get('positive', ()))
+        neg_count = len(polarity.get('negative', ()))
         
         total = pos_count + neg_count
         if total == 0:
@@ -194,30 +348,54 @@ class NewsAnalyzer:
         Returns:
             List of detected symbols
         """
-        text_upper = text.upper()
-        detected_symbols = set()
-        
-        # Check for each known symbol/currency
-        for keyword, symbol in self.FOREX_SYMBOLS.items():
-            if keyword.upper() in text_upper or keyword.replace('/', '') in text_upper:
-                detected_symbols.add(symbol)
+        return self._symbols_from_hits(self.keyword_matcher().scan(text), self._entity_texts(text))
+    
+    def _symbols_from_hits(self, hits: Dict, entity_texts: List[str]) -> List[str]:
+        detected_symbols = set(hits.get('symbol', ()))
         
-        # Use spaCy for more sophisticated entity extraction if available
-        if SPACY_AVAILABLE:
-            try:
-                doc = nlp_model(text)
-                for ent in doc.ents:
-                    if ent.label_ in ['ORG', 'GPE', 'MONEY']:
-                        # Try to match entity to known symbols
-                        ent_upper = ent.text.upper()
-                        for keyword, symbol in self.FOREX_SYMBOLS.items():
-                            if keyword.upper() in ent_upper:
-                                detected_symbols.add(symbol)
-            except Exception as e:
-                self.logger.debug(f"spaCy extraction error: {e}")
+        # Match spaCy entities (ORG/GPE/MONEY) to known symbols
+        matcher = self.keyword_matcher()
+        for ent_text in entity_texts:
+            detected_symbols.update(matcher.scan(ent_text).get('symbol', ()))
         
         return list(detected_symbols)
     
+    def _entity_texts(self, text: str) -> List[str]:
+        """Texts of the relevant named entities in ``text`` (empty without spaCy)"""
+        nlp_model = spacy_model()
+        if nlp_model is None:
+            return []
+        try:
+            return self._doc_entities(nlp_model(text))
+        except Exception as e:
+            self.logger.debug(f"spaCy extraction error: {e}")
+            return []
+    
+    def _doc_entities(self, doc) -> List[str]:
+        return [ent.text for ent in doc.ents if ent.label_ in self.ENTITY_LABELS]
+    
+    def _batch_entity_texts(self, texts: List[str], n_process: int, batch_size: int) -> List[List[str]]:
+        """
+        Entity texts for many documents through ``nlp.pipe``
+        
+        Only the NER components run; the pipe failing as a whole falls back
+        to keyword-only symbol extraction for the batch.
+        """
+        nlp_model = spacy_model() if texts else None
+        if nlp_model is None:
+            return [[] for _ in texts]
+        
+        disabled = [name for name in nlp_model.pipe_names if name not in SPACY_NER_PIPES]
+        try:
+            with nlp_model.select_pipes(disable=disabled):
+                return [
+                    self._doc_entities(doc)
+                    for doc in nlp_model.pipe(texts, n_process=n_process, batch_size=batch_size)
+                ]
+        except Exception as e:
+            self.logger.debug(f"spaCy batch extraction error: {e}")
+            return [[] for _ in texts]
+    
     def determine_impact(self, text: str) -> str:
         """
         Determine impact level based on keywords
@@ -228,30 +406,15 @@ class NewsAnalyzer:
         Returns:
             Impact level: 'high', 'medium', or 'low'
         """
-        text_lower = text.lower()
-        
-        # Check for high-impact keywords
-        high_impact_count = sum(
-            1 for keyword in self.HIGH_IMPACT_KEYWORDS 
-            if keyword in text_lower
-        )
-        
-        if high_impact_count >= 2:
-            return 'high'
-        elif high_impact_count >= 1:
+        return self._impact_from_hits(self.keyword_matcher().scan(text))
+    
+    @staticmethod
+    def _impact_from_hits(hits: Dict) -> str:
+        impact = hits.get('impact', {})
+        if 'high' in impact:
             return 'high'
-        
-        # Check for medium-impact keywords
-        medium_impact_count = sum(
-            1 for keyword in self.MEDIUM_IMPACT_KEYWORDS 
-            if keyword in text_lower
-        )
-        
-        if medium_impact_count >= 2:
-            return 'medium'
-        elif medium_impact_count >= 1:
+        if 'medium' in impact:
             return 'medium'
-        
         return 'low'
     
     def extract_topics(self, text: str) -> List[str]:
@@ -264,33 +427,39 @@ class NewsAnalyzer:
         Returns:
             List of detected topics
         """
-        text_lower = text.lower()
-        detected_topics = []
-        
-        for topic, keywords in self.TOPIC_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                detected_topics.append(topic)
-        
+        return self._topics_from_hits(self.keyword_matcher().scan(text))
+    
+    def _topics_from_hits(self, hits: Dict) -> List[str]:
+        matched = hits.get('topic', {})
+        detected_topics = [topic for topic in self.TOPIC_KEYWORDS if topic in matched]
         return detected_topics if detected_topics else ['General Market']
     
-    def batch_analyze(self, news_items: List[Dict]) -> List[Dict]:
+    def batch_analyze(self, news_items: List[Dict], n_process: Optional[int] = None,
+                      batch_size: Optional[int] = None) -> List[Dict]:
         """
         Analyze multiple news items in batch
         
         Args:
             news_items: List of news dicts with 'headline' and optional 'description'
+            n_process: spaCy worker processes (default: NLP_PROCESSES)
+            batch_size: Documents per spaCy batch (default: NLP_BATCH_SIZE)
             
         Returns:
             List of analyzed news items with added analysis fields
         """
+        texts = [
+            self._compose_text(item.get('headline', '') or '', item.get('description', '') or '')
+            for item in news_items
+        ]
+        entity_texts = self._batch_entity_texts(
+            texts, n_process or self.NLP_PROCESSES, batch_size or self.NLP_BATCH_SIZE
+        )
+        
         analyzed_items = []
         
-        for item in news_items:
+        for item, text, entities in zip(news_items, texts, entity_texts):
             try:
-                headline = item.get('headline', '')
-                description = item.get('description', '')
-                
-                analysis = self.analyze(headline, description)
+                analysis = self._analyze_text(text, entities)
                 
                 # Merge analysis into item
                 item.update({
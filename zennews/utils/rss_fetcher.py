@@ -1,11 +1,21 @@
 """
 RSS Feed Fetcher for ZenNews
 Fetches financial news from multiple public RSS feeds
+
+Feeds are fetched concurrently (bounded per host) with conditional
+requests: validators from the previous run are sent back, and a 304
+response skips the download and the parse entirely. New validators are
+only stored by ``commit_validators`` once the caller has stored the
+entries, so a failed run downloads the same items again.
 """
 import hashlib
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone as dt_timezone
 from typing import List, Dict, Optional
+from urllib.parse import urlsplit
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -28,29 +38,81 @@ class RSSFeedFetcher:
         'Bloomberg Markets': 'https://feeds.bloomberg.com/markets/news.rss',
     }
     
+    # Concurrency and HTTP settings
+    MAX_WORKERS = 8
+    PER_HOST_LIMIT = 2
+    REQUEST_TIMEOUT = 15
+    USER_AGENT = 'ZenithEdge-ZenNews/1.0 (+RSS reader)'
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+        self.pending_validators = {}
     
-    def fetch_all_feeds(self) -> List[Dict]:
+    def fetch_all_feeds(self, conditional: bool = True, max_entries: int = 50) -> List[Dict]:
         """
         Fetch all configured RSS feeds
         
+        Args:
+            conditional: Send stored ETag/Last-Modified validators so
+                unchanged feeds answer 304. The new validators are kept in
+                ``pending_validators`` until ``commit_validators`` is called
+            max_entries: Maximum number of entries per feed
+        
         Returns:
             List of parsed feed entries
         """
+        states = self._load_feed_states() if conditional else {}
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, max(len(self.FEED_SOURCES), 1))) as pool:
+            futures = [
+                pool.submit(self._fetch_conditional, source_name, feed_url,
+                            states.get(source_name, {}), max_entries)
+                for source_name, feed_url in self.FEED_SOURCES.items()
+            ]
+            results = [future.result() for future in futures]
+        
         all_entries = []
+        for result in results:
+            if result['error']:
+                self.logger.error(f"Error fetching feed from {result['source']}: {result['error']}")
+            elif result['status'] == 304:
+                self.logger.info(f"{result['source']} not modified ({result['duration_ms']}ms)")
+            else:
+                self.logger.info(f"Fetched {len(result['entries'])} entries from {result['source']} "
+                                 f"({result['bytes']} bytes, {result['duration_ms']}ms)")
+            all_entries.extend(result['entries'])
         
-        for source_name, feed_url in self.FEED_SOURCES.items():
-            try:
-                entries = self.fetch_feed(source_name, feed_url)
-                all_entries.extend(entries)
-                self.logger.info(f"Fetched {len(entries)} entries from {source_name}")
-            except Exception as e:
-                self.logger.error(f"Error fetching feed from {source_name}: {str(e)}")
-                continue
+        if conditional:
+            self._save_feed_states(results)
+            self.pending_validators = {
+                result['source']: {'etag': result['etag'], 'last_modified': result['last_modified']}
+                for result in results
+                if result['status'] == 200 and not result['error']
+            }
         
         return all_entries
     
+    def commit_validators(self):
+        """
+        Store the validators of the last fetch_all_feeds run
+        
+        Call once its entries are stored: afterwards those feeds answer
+        304 until they change.
+        """
+        try:
+            from zennews.models import FeedState
+            
+            for source, validators in self.pending_validators.items():
+                FeedState.objects.filter(source=source).update(
+                    etag=validators['etag'][:255],
+                    last_modified=validators['last_modified'][:100],
+                )
+            self.pending_validators = {}
+        except Exception as e:
+            self.logger.warning(f"Could not save feed validators: {e}")
+    
     def fetch_feed(self, source_name: str, feed_url: str, max_entries: int = 50) -> List[Dict]:
         """
         Fetch and parse a single RSS feed
@@ -63,31 +125,130 @@ class RSSFeedFetcher:
         Returns:
             List of parsed entries with standardized format
         """
+        result = self._fetch_conditional(source_name, feed_url, {}, max_entries)
+        if result['error']:
+            self.logger.error(f"Error parsing feed {source_name}: {result['error']}")
+        return result['entries']
+    
+    def _host_limit(self, feed_url: str) -> threading.Semaphore:
+        host = urlsplit(feed_url).netloc
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.PER_HOST_LIMIT)
+            return self._host_limits[host]
+    
+    def _fetch_conditional(self, source_name: str, feed_url: str, validators: Dict,
+                           max_entries: int) -> Dict:
+        """
+        Fetch one feed, sending any stored validators
+        
+        Runs in a worker thread, so it never touches the database.
+        
+        Returns:
+            Result dict with status, validators, byte count, timing and entries
+        """
+        result = {
+            'source': source_name,
+            'url': feed_url,
+            'status': None,
+            'etag': validators.get('etag', ''),
+            'last_modified': validators.get('last_modified', ''),
+            'bytes': 0,
+            'duration_ms': 0,
+            'entries': [],
+            'error': '',
+        }
+        started = time.monotonic()
+        
         try:
             # Lazy import to avoid dependency issues on server startup
             try:
                 import feedparser
+                import requests
             except ImportError:
-                self.logger.error("feedparser not installed. Run: pip install feedparser")
-                return []
+                result['error'] = "feedparser/requests not installed. Run: pip install feedparser requests"
+                return result
+            
+            headers = {'User-Agent': self.USER_AGENT}
+            if result['etag']:
+                headers['If-None-Match'] = result['etag']
+            if result['last_modified']:
+                headers['If-Modified-Since'] = result['last_modified']
+            
+            with self._host_limit(feed_url):
+                response = requests.get(feed_url, headers=headers, timeout=self.REQUEST_TIMEOUT)
+            
+            result['status'] = response.status_code
+            result['bytes'] = len(response.content)
+            
+            if response.status_code == 304:
+                # Unchanged since the last run - nothing to parse
+                return result
+            
+            response.raise_for_status()
+            result['etag'] = response.headers.get('ETag', '')
+            result['last_modified'] = response.headers.get('Last-Modified', '')
             
             # Parse RSS feed
-            feed = feedparser.parse(feed_url)
+            feed = feedparser.parse(response.content)
             
             if feed.bozo:
                 self.logger.warning(f"Feed parsing warning for {source_name}: {feed.bozo_exception}")
             
-            entries = []
             for entry in feed.entries[:max_entries]:
                 parsed_entry = self._parse_entry(entry, source_name)
                 if parsed_entry:
-                    entries.append(parsed_entry)
+                    result['entries'].append(parsed_entry)
+            
+        except Exception as e:
+            result['error'] = str(e)
+        
+        finally:
+            result['duration_ms'] = int((time.monotonic() - started) * 1000)
+        
+        return result
+    
+    def _load_feed_states(self) -> Dict[str, Dict]:
+        """Stored validators per source (empty if the table is unavailable)"""
+        try:
+            from zennews.models import FeedState
             
-            return entries
+            return {
+                state.source: {'etag': state.etag, 'last_modified': state.last_modified}
+                for state in FeedState.objects.filter(source__in=list(self.FEED_SOURCES))
+                if state.url == self.FEED_SOURCES[state.source]
+            }
+        except Exception as e:
+            self.logger.warning(f"Could not load feed validators: {e}")
+            return {}
+    
+    def _save_feed_states(self, results: List[Dict]):
+        """Record status, timings and byte counts for each fetched feed (not validators)"""
+        try:
+            from django.db.models import F
+            from zennews.models import FeedState
             
+            now = timezone.now()
+            for result in results:
+                FeedState.objects.update_or_create(
+                    source=result['source'],
+                    defaults={
+                        'url': result['url'],
+                        'last_status': result['status'],
+                        'last_fetched_at': now,
+                        'last_duration_ms': result['duration_ms'],
+                        'last_bytes': result['bytes'],
+                        'last_entry_count': len(result['entries']),
+                        'last_error': result['error'],
+                    }
+                )
+                FeedState.objects.filter(source=result['source']).update(
+                    fetch_count=F('fetch_count') + 1,
+                    not_modified_count=F('not_modified_count') + int(result['status'] == 304),
+                    total_bytes=F('total_bytes') + result['bytes'],
+                )
         except Exception as e:
-            self.logger.error(f"Error parsing feed {source_name}: {str(e)}")
-            return []
+            self.logger.warning(f"Could not save feed states: {e}")
     
     def _parse_entry(self, entry: Dict, source_name: str) -> Optional[Dict]:
         """
@@ -164,17 +325,19 @@ class RSSFeedFetcher:
         return content_hash in existing_hashes
 
 
-def fetch_latest_news(max_age_hours: int = 24) -> List[Dict]:
+def fetch_latest_news(max_age_hours: int = 24, fetcher: Optional[RSSFeedFetcher] = None) -> List[Dict]:
     """
     Convenience function to fetch latest news
     
     Args:
         max_age_hours: Maximum age of news items in hours
+        fetcher: Fetcher to use; call its ``commit_validators`` after the
+            entries are stored (a throwaway fetcher never records them)
         
     Returns:
         List of parsed news entries
     """
-    fetcher = RSSFeedFetcher()
+    fetcher = fetcher or RSSFeedFetcher()
     all_entries = fetcher.fetch_all_feeds()
     
     # Filter by age
@@ -0,0 +1,172 @@
+"""
+Rolling Sentiment Aggregates for ZenNews
+
+News sentiment is aggregated per symbol into 15-minute NewsSentimentBucket
+rows (count, sentiment sum, impact counts). Buckets touched by an ingest
+run are recomputed from their NewsEvent rows, which keeps them exact
+under re-runs, edits and deletes. Window queries sum the bucket rows and
+only read raw events for the partial bucket at each edge of the window.
+"""
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BUCKET = timedelta(minutes=15)
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+IMPACT_LEVELS = ('high', 'medium', 'low')
+
+# Rows per INSERT for bulk_create
+BULK_BATCH_SIZE = 500
+
+
+def floor_bucket(ts: datetime) -> datetime:
+    """Start of the epoch-aligned 15-minute bucket containing ``ts``"""
+    if timezone.is_naive(ts):
+        ts = timezone.make_aware(ts, dt_timezone.utc)
+    return EPOCH + ((ts - EPOCH) // BUCKET) * BUCKET
+
+
+def _ceil_bucket(ts: datetime) -> datetime:
+    floored = floor_bucket(ts)
+    return floored if floored == ts else floored + BUCKET
+
+
+def aggregate_events(rows: Iterable[Tuple[str, datetime, float, str]]) -> Dict[Tuple[str, datetime], Dict]:
+    """
+    Fold (symbol, timestamp, sentiment, impact_level) rows into buckets
+
+    Returns:
+        (symbol, bucket_start) -> {count, sentiment_sum, high_count, medium_count, low_count}
+    """
+    buckets = {}
+    for symbol, ts, sentiment, impact_level in rows:
+        key = (symbol, floor_bucket(ts))
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                'count': 0, 'sentiment_sum': 0.0, 'high_count': 0, 'medium_count': 0, 'low_count': 0,
+            }
+        bucket['count'] += 1
+        bucket['sentiment_sum'] += sentiment or 0.0
+        if impact_level in IMPACT_LEVELS:
+            bucket[f'{impact_level}_count'] += 1
+    return buckets
+
+
+def refresh_sentiment_buckets(keys: Iterable[Tuple[str, datetime]]) -> int:
+    """
+    Recompute buckets from their NewsEvent rows
+
+    Every (symbol, bucket) combination of the given symbols and bucket
+    starts is rebuilt, so three queries cover a whole ingest batch.
+
+    Args:
+        keys: (symbol, timestamp) pairs that changed (timestamps are floored)
+
+    Returns:
+        Number of non-empty buckets written
+    """
+    from zennews.models import NewsEvent, NewsSentimentBucket
+
+    symbols = set()
+    starts = set()
+    for symbol, ts in keys:
+        if symbol and ts:
+            symbols.add(symbol)
+            starts.add(floor_bucket(ts))
+    if not symbols:
+        return 0
+
+    rows = NewsEvent.objects.filter(
+        symbol__in=symbols,
+        timestamp__gte=min(starts),
+        timestamp__lt=max(starts) + BUCKET
+    ).values_list('symbol', 'timestamp', 'sentiment', 'impact_level')
+
+    buckets = [
+        NewsSentimentBucket(symbol=symbol, bucket_start=start, **totals)
+        for (symbol, start), totals in aggregate_events(rows).items()
+        if start in starts
+    ]
+
+    with transaction.atomic():
+        NewsSentimentBucket.objects.filter(symbol__in=symbols, bucket_start__in=starts).delete()
+        NewsSentimentBucket.objects.bulk_create(buckets, batch_size=BULK_BATCH_SIZE)
+
+    logger.debug(f"Refreshed {len(buckets)} sentiment buckets for {len(symbols)} symbols")
+    return len(buckets)
+
+
+def _raw_totals(symbol: Optional[str], start: datetime, end: datetime) -> Dict:
+    """Totals straight from NewsEvent for a [start, end) edge of a window"""
+    from zennews.models import NewsEvent
+
+    if start >= end:
+        return {}
+    queryset = NewsEvent.objects.filter(timestamp__gte=start, timestamp__lt=end)
+    if symbol:
+        queryset = queryset.filter(symbol=symbol)
+    return queryset.aggregate(
+        count=Count('id'),
+        sentiment_sum=Sum('sentiment'),
+        **{f'{level}_count': Count('id', filter=Q(impact_level=level)) for level in IMPACT_LEVELS}
+    )
+
+
+def sentiment_window(symbol: Optional[str] = None, hours: float = 24,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None) -> Dict:
+    """
+    Sentiment and impact totals for a time window
+
+    Args:
+        symbol: Event symbol (exact, as stored); None for all symbols
+        hours: Look-back from now when ``since`` is not given
+        since: Window start (inclusive)
+        until: Window end (exclusive); open-ended if omitted
+
+    Returns:
+        Dict with count, sentiment_sum, avg_sentiment (None without news)
+        and impact: {high, medium, low}
+    """
+    from zennews.models import NewsSentimentBucket
+
+    if since is None:
+        since = timezone.now() - timedelta(hours=hours)
+
+    first_full = _ceil_bucket(since)
+    last_full = floor_bucket(until) if until is not None else None
+
+    fields = ['count', 'sentiment_sum'] + [f'{level}_count' for level in IMPACT_LEVELS]
+
+    if last_full is not None and last_full < first_full:
+        # Window inside a single bucket
+        parts = [_raw_totals(symbol, since, until)]
+    else:
+        buckets = NewsSentimentBucket.objects.filter(bucket_start__gte=first_full)
+        if last_full is not None:
+            buckets = buckets.filter(bucket_start__lt=last_full)
+        if symbol:
+            buckets = buckets.filter(symbol=symbol)
+        parts = [buckets.aggregate(**{field: Sum(field) for field in fields})]
+    
+        # Partial buckets at the window edges come from the raw events
+        parts.append(_raw_totals(symbol, since, first_full))
+        if last_full is not None:
+            parts.append(_raw_totals(symbol, last_full, until))
+
+    totals = {field: sum((part.get(field) or 0) for part in parts) for field in fields}
+    count = totals['count']
+
+    return {
+        'count': count,
+        'sentiment_sum': totals['sentiment_sum'],
+        'avg_sentiment': totals['sentiment_sum'] / count if count else None,
+        'impact': {level: totals[f'{level}_count'] for level in IMPACT_LEVELS},
+    }
@@ -0,0 +1,165 @@
+"""
+Symbol -> News Index for ZenNews
+
+Finding "recent news for EURUSD" used to mean loading every recent
+NewsEvent and testing ``matches_symbol`` (a loop over symbol_tags) in
+Python. Events are now expanded into NewsSymbol rows when they are
+stored, and lookups become a single indexed query.
+
+Matching rules (a normalized form of ``NewsEvent.matches_symbol``):
+    - an event is keyed by its symbol and symbol_tags (direct keys), and
+      by both currencies of any forex pair among them (derived keys)
+    - a lookup for ``S`` matches any key equal to ``S``, and direct keys
+      equal to one of the currencies of ``S``
+
+So EURUSD finds news tagged EURUSD, EUR or USD; EUR finds news tagged
+EUR or any EUR pair; news tagged GBPUSD is not returned for EURUSD.
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 500
+
+
+def pair_currencies(symbol: str) -> Tuple[str, ...]:
+    """Base and quote currency of a 6-letter pair (EURUSD -> EUR, USD), else ()"""
+    symbol = (symbol or '').upper()
+    if len(symbol) == 6 and symbol.isalpha():
+        return symbol[:3], symbol[3:]
+    return ()
+
+
+def symbol_keys(symbol: str, symbol_tags: Optional[Iterable[str]] = None) -> List[Tuple[str, bool]]:
+    """
+    Index keys for an event
+
+    Args:
+        symbol: Event symbol
+        symbol_tags: Related symbols/currencies
+
+    Returns:
+        List of (key, is_direct) with each key listed once; direct wins
+    """
+    keys = {}
+    for value in [symbol, *(symbol_tags or [])]:
+        if not isinstance(value, str):
+            continue
+        key = value.strip().upper()[:20]
+        if key:
+            keys[key] = True
+
+    for key in list(keys):
+        for currency in pair_currencies(key):
+            keys.setdefault(currency, False)
+
+    return list(keys.items())
+
+
+def lookup_filter(symbol: str, exact: bool = False, prefix: str = '') -> Q:
+    """
+    Q object selecting the NewsSymbol rows relevant to ``symbol``
+
+    Args:
+        symbol: Trading symbol or currency
+        exact: Only events keyed directly by ``symbol`` (no currency matches)
+        prefix: Lookup path to NewsSymbol (e.g. 'symbol_links__')
+    """
+    symbol = (symbol or '').strip().upper()
+    if exact:
+        return Q(**{f'{prefix}symbol': symbol, f'{prefix}is_direct': True})
+
+    query = Q(**{f'{prefix}symbol': symbol})
+    currencies = pair_currencies(symbol)
+    if currencies:
+        query |= Q(**{f'{prefix}symbol__in': currencies, f'{prefix}is_direct': True})
+    return query
+
+
+def index_news_events(events: Sequence, replace: bool = False) -> int:
+    """
+    Add NewsSymbol rows for ``events``
+
+    Args:
+        events: Saved NewsEvent instances
+        replace: Drop the events' existing rows first (after an edit)
+
+    Returns:
+        Number of rows written
+    """
+    from zennews.models import NewsSymbol
+
+    if replace:
+        NewsSymbol.objects.filter(news_event__in=[event.pk for event in events]).delete()
+
+    links = [
+        NewsSymbol(
+            news_event_id=event.pk,
+            symbol=key,
+            is_direct=is_direct,
+            timestamp=event.published_at or event.timestamp,
+            impact_level=event.impact_level,
+            relevance_rank=event.relevance_rank,
+        )
+        for event in events
+        for key, is_direct in symbol_keys(event.symbol, event.symbol_tags)
+    ]
+    NewsSymbol.objects.bulk_create(links, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+    return len(links)
+
+
+# NewsEvent orderings related_news can apply to NewsSymbol's copied columns
+LINK_ORDER_FIELDS = ('timestamp', 'relevance_rank', 'impact_level')
+
+
+def related_news(symbol: str, since: datetime, until: Optional[datetime] = None,
+                 limit: Optional[int] = None, order_by: Sequence[str] = ('-timestamp',),
+                 impact_levels: Optional[Sequence[str]] = None, exact: bool = False) -> list:
+    """
+    News relevant to ``symbol`` published in [since, until]
+
+    The top-k is taken from NewsSymbol alone, ordered by its own copies
+    of the event columns (the ``(symbol, -relevance_rank, -timestamp)``
+    index), and only those events are then fetched by id. A lookup
+    matches at most three keys per event (symbol and its two
+    currencies), so ``3 * limit`` link rows always hold ``limit``
+    distinct events.
+
+    Args:
+        symbol: Trading symbol or currency
+        since: Window start
+        until: Window end (open-ended if omitted)
+        limit: Top-k items after ordering
+        order_by: Ordering over LINK_ORDER_FIELDS (NewsEvent field names)
+        impact_levels: Restrict to these impact levels
+        exact: Only events keyed directly by ``symbol``
+
+    Returns:
+        List of NewsEvent
+    """
+    from zennews.models import NewsEvent, NewsSymbol
+
+    for field in order_by:
+        if field.lstrip('-') not in LINK_ORDER_FIELDS:
+            raise ValueError(f"related_news cannot order by {field!r}")
+
+    links = NewsSymbol.objects.filter(lookup_filter(symbol, exact=exact), timestamp__gte=since)
+    if until is not None:
+        links = links.filter(timestamp__lte=until)
+    if impact_levels:
+        links = links.filter(impact_level__in=list(impact_levels))
+
+    links = links.order_by(*order_by).values_list('news_event_id', flat=True)
+    if limit is not None:
+        links = links[:3 * limit]
+
+    event_ids = list(dict.fromkeys(links))
+    if limit is not None:
+        event_ids = event_ids[:limit]
+
+    events = NewsEvent.objects.in_bulk(event_ids)
+    return [events[event_id] for event_id in event_ids if event_id in events]